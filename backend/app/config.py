@@ -21,10 +21,30 @@ class Settings(BaseSettings):
     api_timeout: float = 10.0
     ai_timeout_translate: float = 15.0
     ai_timeout_generate: float = 30.0
-    
+    ai_translate_batch_size: int = 25  # 一括翻訳で1回のAI呼び出しにまとめる件数
+    ai_concurrency_gemini: int = 8  # AIプロバイダー毎の同時呼び出し数
+    ai_concurrency_claude: int = 4
+    translation_deadline: float = 5.0  # 1リクエストの翻訳待ち時間（超過分は原文で返し、翻訳は裏で継続）
+
+    # HTTPクライアント設定（上流ホスト単位の接続プール）
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_http2: bool = False  # h2パッケージが必要
+    http_conditional_requests: bool = True  # ETag / Last-Modifiedによる条件付きGET
+
     # 気象庁API
     jma_base_url: str = "https://www.jma.go.jp/bosai"
     
+    # 全国警報の並行取得（同時実行数・都道府県毎のタイムアウト秒）
+    warning_fanout_concurrency: int = 12
+    warning_fanout_timeout: float = 5.0
+
+    # 火山警報の並行取得（同時実行数・火山毎のタイムアウト秒）
+    volcano_fanout_concurrency: int = 10
+    volcano_fanout_timeout: float = 5.0
+
     # P2P地震情報API
     p2p_base_url: str = "https://api.p2pquake.net/v2"
     
@@ -55,14 +75,61 @@ class Settings(BaseSettings):
     
     # キャッシュ設定
     cache_dir: Path = Path(__file__).parent.parent / "data"
-    translation_cache_file: Path = Path(__file__).parent.parent / "data" / "translation_cache.json"
+    translation_cache_db: Path = Path(__file__).parent.parent / "data" / "translation_cache.db"  # SQLite（WAL）
+    translation_cache_file: Path = Path(__file__).parent.parent / "data" / "translation_cache.json"  # 旧形式（初回に取り込み）
+    # 翻訳キャッシュのメモリ上の件数上限（名前空間毎）とTTL（秒、0は無期限）
+    translation_cache_max_entries: int = 2048
+    translation_cache_ttl_location: float = 0.0
+    translation_cache_ttl_text: float = 30 * 86400.0
+    translation_cache_ttl_warning: float = 7 * 86400.0
+    translation_cache_ttl_safety: float = 86400.0  # プロンプト変更を反映するため短め
     shelter_data_dir: Path = Path(__file__).parent.parent / "data" / "shelters"
+    shelter_source_url: str = ""  # 国土地理院の指定緊急避難場所データ（CSV / GeoJSON）のURL
+
+    # 管理用エンドポイント（避難所データの再読み込み等）のトークン（未設定の場合は無効）
+    admin_api_token: Optional[str] = None
+
+    # 上流APIレスポンスキャッシュ（TTL秒、フィード毎）
+    upstream_cache_enabled: bool = True
+    upstream_cache_max_entries: int = 1024
+    cache_ttl_earthquakes: float = 15.0
+    cache_ttl_warnings: float = 60.0
+    cache_ttl_tsunami: float = 30.0
+    cache_ttl_volcano_list: float = 3600.0
+    cache_ttl_volcano_warnings: float = 300.0
+    cache_ttl_weather: float = 600.0
+    cache_stale_while_revalidate: float = 30.0  # TTL切れ後に古い値を返しつつ再取得する猶予
+    cache_stale_if_error: float = 600.0  # 上流エラー時に古い値を返す猶予
     
+    # バックグラウンド取り込み（取得間隔秒）
+    ingestion_enabled: bool = True
+    ingest_interval_earthquakes: float = 15.0
+    ingest_interval_warnings: float = 60.0
+    ingest_interval_tsunami: float = 30.0
+    ingest_interval_volcano: float = 300.0
+    ingest_earthquake_limit: int = 100  # P2P地震情報APIの最大取得件数
+    ingest_tsunami_limit: int = 20
+    ingest_staleness_factor: float = 3.0  # 取得間隔の何倍まで古いデータを返すか
+    response_snapshots_enabled: bool = True  # 取り込み時に地震・津波情報のレスポンスを言語毎に作成
+
+    # 安全ガイドの事前生成（地域名なしの災害種別 × 重要度 × 言語）
+    safety_guide_warmup_on_startup: bool = True  # AIプロバイダー設定時のみ起動時に未生成分を生成
+    safety_guide_warmup_concurrency: int = 4
+
+    # リアルタイム配信（SSE / WebSocket）
+    stream_queue_size: int = 100  # 購読者毎のキュー上限（溢れた購読者は切断）
+    stream_heartbeat_interval: float = 15.0  # 無通信時のハートビート間隔（秒）
+    stream_render_deadline: float = 3.0  # 配信イベントの翻訳待ち時間（超過分は原文で配信し、翻訳は裏で継続）
+    stream_max_subscribers: int = 50000  # ワーカー毎の購読者数上限（超過時はSSEは503、WebSocketは1013で切断）
+
     # サーバー設定
     host: str = "0.0.0.0"
     port: int = 8000
     timeout_keep_alive: int = 30
-    limit_concurrency: int = 100
+    # uvicornの接続数上限（待機中のSSE / WebSocketの購読者も数えるため既定は無制限。
+    # 通常のリクエストはrequest_concurrency_limit、購読者はstream_max_subscribersで制限する）
+    limit_concurrency: Optional[int] = None
+    request_concurrency_limit: int = 100  # 配信以外のリクエストの同時処理数上限（超過時は503）
     
     @property
     def reload(self) -> bool:
@@ -1,11 +1,15 @@
 """
 災害対応AIエージェントシステム - バックエンドAPI
 """
-from fastapi import FastAPI, HTTPException, Request
+import json
+import secrets
+from dataclasses import asdict
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 from datetime import datetime
 from typing import Optional
 
@@ -17,6 +21,8 @@ from slowapi.util import get_remote_address
 from .config import settings
 from .utils.logger import get_logger
 from .utils.error_handler import handle_errors
+from .utils.http_client import http_clients
+from .utils.upstream_cache import upstream_cache
 
 logger = get_logger(__name__)
 
@@ -24,9 +30,11 @@ from .models import (
     EarthquakeInfo,
     WeatherInfo,
     DisasterAlert,
+    FetchFailure,
     HealthResponse,
     TranslatedMessage,
     ShelterInfo,
+    ShelterViewport,
     TsunamiInfo,
     VolcanoInfo,
     VolcanoWarning,
@@ -39,24 +47,59 @@ from .services.warning_service import WarningService
 from .services.tsunami_service import TsunamiService
 from .services.volcano_service import VolcanoService
 from .services.shelter_service import ShelterService
-
-# サービスインスタンス
-jma_service = JMAService()
-p2p_service = P2PQuakeService()
-translator = TranslatorService()
-warning_service = WarningService()
-tsunami_service = TsunamiService()
-volcano_service = VolcanoService()
+from .services.shelter_status import UpdateResult, parse_updates
+from .services.ingestion import FeedStore, IngestionScheduler
+from .services.response_snapshots import ResponseSnapshots
+from .services.safety_guides import MATRIX_NAME, SafetyGuideMatrix
+from .services.event_bus import EVENT_KINDS, EARTHQUAKE, TSUNAMI, WARNING, EventBus, StreamEvent, Subscription
+
+# サービスインスタンス（上流ホスト単位の接続プールとレスポンスキャッシュを共有）
+jma_service = JMAService(http_clients=http_clients, cache=upstream_cache)
+p2p_service = P2PQuakeService(http_clients=http_clients, cache=upstream_cache)
+translator = TranslatorService(http_clients=http_clients)
+# 事前生成した安全ガイド（地域名なし）
+safety_guides = SafetyGuideMatrix(
+    translator, settings.cache_dir / MATRIX_NAME,
+    concurrency=settings.safety_guide_warmup_concurrency, timeout=settings.ai_timeout_generate * 2,
+)
+warning_service = WarningService(
+    translator=translator, http_clients=http_clients, cache=upstream_cache
+)
+tsunami_service = TsunamiService(http_clients=http_clients, cache=upstream_cache)
+volcano_service = VolcanoService(http_clients=http_clients, cache=upstream_cache)
 shelter_service = ShelterService()
 
+# バックグラウンド取り込み（エンドポイントはfeed_storeを優先して参照）
+feed_store = FeedStore()
+ingestion = IngestionScheduler(
+    store=feed_store,
+    p2p_service=p2p_service,
+    warning_service=warning_service,
+    tsunami_service=tsunami_service,
+    volcano_service=volcano_service,
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """アプリケーションのライフサイクル管理"""
     # 起動時
     logger.info("災害対応AIシステム起動中...")
+    http_clients.open()
+    if settings.ingestion_enabled:
+        ingestion.start()
+    if settings.safety_guide_warmup_on_startup and translator.get_active_provider():
+        safety_guides.start()
     yield
     # 終了時
+    await safety_guides.stop()
+    await ingestion.stop()
+    await event_bus.aclose()
+    await response_snapshots.aclose()
+    # 継続中の翻訳はHTTPクライアントを使用するため先に終了する
+    await translator.aclose()
+    await upstream_cache.aclose()
+    await http_clients.aclose()
     logger.info("災害対応AIシステム終了")
 
 
@@ -85,12 +128,21 @@ ALLOWED_ORIGINS = [
     if origin.strip()  # 空文字列を除外
 ]
 
+# 並行取得の部分的な失敗を通知するレスポンスヘッダー
+PARTIAL_RESULT_HEADERS = [
+    "X-Partial-Result",
+    "X-Failed-Areas",
+    "X-Failed-Volcanoes",
+    "X-Timed-Out-Volcanoes",
+]
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS,  # 環境変数で制限
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],  # 必要なメソッドのみ許可
     allow_headers=["Content-Type", "Authorization"],  # 必要なヘッダーのみ許可
+    expose_headers=PARTIAL_RESULT_HEADERS,  # 部分的な取得失敗の通知ヘッダー
 )
 
 
@@ -132,6 +184,199 @@ class ContentSizeLimitMiddleware(BaseHTTPMiddleware):
 app.add_middleware(ContentSizeLimitMiddleware)
 
 
+# 同時処理数制限ミドルウェア
+class RequestConcurrencyLimitMiddleware:
+    """
+    配信（SSE / WebSocket）以外のHTTPリクエストの同時処理数を制限するミドルウェア
+
+    uvicornのlimit_concurrencyは待機中の購読者の接続も数えるため、購読者が増えると
+    通常のリクエストまで503になる。購読者数はstream_max_subscribersで別に制限する。
+    """
+
+    def __init__(self, app, limit: int, exempt_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.limit = limit
+        self.exempt_paths = exempt_paths
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limit <= 0 or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        if self.active >= self.limit:
+            await Response(content="Service Unavailable", status_code=503)(scope, receive, send)
+            return
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+
+app.add_middleware(
+    RequestConcurrencyLimitMiddleware,
+    limit=settings.request_concurrency_limit,
+    exempt_paths=("/api/v1/stream",),
+)
+
+
+def set_partial_result_headers(response: Response, header: str, failed: list[FetchFailure]) -> None:
+    """部分的な取得失敗をレスポンスヘッダーで通知"""
+    if failed:
+        response.headers["X-Partial-Result"] = "true"
+        response.headers[header] = ",".join(f.code for f in failed)
+
+
+async def localize_earthquakes(
+    earthquakes: list[EarthquakeInfo], lang: str, deadline: Optional[float] = None
+) -> None:
+    """地震情報の翻訳フィールドを設定（ハイブリッド方式）"""
+    # 震源地名翻訳（静的マッピング → キャッシュ → 未翻訳分をまとめて1回のAI呼び出し）
+    locations = await translator.translate_locations(
+        [eq.location for eq in earthquakes], target_lang=lang, deadline=deadline
+    )
+    for eq, location in zip(earthquakes, locations):
+        eq.location_translated = location
+        # 震度翻訳（静的マッピング）
+        eq.max_intensity_translated = translator.translate_intensity(
+            eq.max_intensity, target_lang=lang
+        )
+        # 津波警報翻訳（静的マッピング）
+        eq.tsunami_warning_translated = translator.translate_tsunami_warning(
+            eq.tsunami_warning, target_lang=lang
+        )
+        # メッセージ生成（translator.pyのメソッドを使用）
+        eq.message_translated = translator.generate_earthquake_message(
+            lang=lang,
+            location=eq.location_translated,
+            magnitude=eq.magnitude,
+            intensity=eq.max_intensity,
+            depth=eq.depth,
+            tsunami_warning=eq.tsunami_warning,
+            tsunami_warning_translated=eq.tsunami_warning_translated
+        )
+
+
+async def render_stream_event(event: StreamEvent, lang: str) -> dict:
+    """
+    配信イベントを言語毎にレンダリング（購読者間で共有するため元データはコピーして翻訳）
+
+    日本語以外はEventBusがバックグラウンドで言語毎に並行して呼び出す。
+    翻訳待ちはstream_render_deadlineまでとし、超過分は原文で配信する。
+    """
+    if isinstance(event.payload, dict):
+        return event.payload
+
+    payload = event.payload.model_copy()
+    if lang != "ja":
+        if event.kind == EARTHQUAKE:
+            await localize_earthquakes([payload], lang, deadline=settings.stream_render_deadline)
+        elif event.kind == TSUNAMI:
+            (payload.message_translated,) = await translator.translate_many(
+                [payload.message], target_lang=lang, deadline=settings.stream_render_deadline
+            )
+        elif event.kind == WARNING:
+            payload.title_translated, payload.description_translated = await translator.translate_many(
+                [payload.title, payload.description], target_lang=lang,
+                deadline=settings.stream_render_deadline,
+            )
+    return payload.model_dump()
+
+
+# リアルタイム配信（取り込みで検知した新しいイベントを購読者に配信）
+event_bus = EventBus(renderer=render_stream_event, queue_size=settings.stream_queue_size)
+ingestion.add_listener(event_bus.publish_many)
+
+
+# 対応言語一覧（15言語 + 日本語）
+SUPPORTED_LANGUAGES = {
+    "ja": "日本語",
+    "en": "English",
+    "zh": "简体中文",
+    "zh-TW": "繁體中文",
+    "ko": "한국어",
+    "vi": "Tiếng Việt",
+    "th": "ภาษาไทย",
+    "id": "Bahasa Indonesia",
+    "ms": "Bahasa Melayu",
+    "tl": "Filipino",
+    "fr": "Français",
+    "de": "Deutsch",
+    "it": "Italiano",
+    "es": "Español",
+    "ne": "नेपाली",
+    "easy_ja": "やさしい日本語"
+}
+
+
+async def render_earthquakes(earthquakes: list[EarthquakeInfo], lang: str) -> list[bool]:
+    """
+    スナップショット用に地震情報を翻訳
+
+    期限切れで震源地名が原文のままの項目のみ未完了とする
+    （翻訳できない地名・プロバイダー未設定の場合は原文のままで完了）
+    """
+    with translator.watch_deadline() as watch:
+        await localize_earthquakes(earthquakes, lang)
+    return [not watch.hit or eq.location_translated != eq.location for eq in earthquakes]
+
+
+async def render_tsunamis(tsunamis: list[TsunamiInfo], lang: str) -> list[bool]:
+    """スナップショット用に津波情報を翻訳（期限切れで本文が原文のままの項目のみ未完了）"""
+    with translator.watch_deadline() as watch:
+        messages = await translator.translate_many([t.message for t in tsunamis], target_lang=lang)
+    for tsunami, message in zip(tsunamis, messages):
+        tsunami.message_translated = message
+    return [not watch.hit or t.message_translated != t.message for t in tsunamis]
+
+
+# 言語毎のレスポンススナップショット（取り込み時に1回だけ翻訳・シリアライズ）
+response_snapshots = ResponseSnapshots(feed_store, SUPPORTED_LANGUAGES)
+response_snapshots.add_renderer(FeedStore.EARTHQUAKES, render_earthquakes)
+response_snapshots.add_renderer(FeedStore.TSUNAMI, render_tsunamis)
+if settings.response_snapshots_enabled:
+    ingestion.add_feed_listener(response_snapshots.refresh)
+
+
+def snapshot_response(feed: str, lang: str, limit: int) -> Optional[Response]:
+    """作成済みのレスポンス本文があればそのまま返すレスポンス"""
+    body = response_snapshots.get(feed, lang, limit)
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json")
+
+
+def parse_stream_filters(lang: str, area_code: Optional[str], types: Optional[str]) -> tuple[set[str], set[str]]:
+    """
+    配信フィルタ（言語・カンマ区切りの地域コード・イベント種別）を解析
+
+    イベントは購読者の言語毎にレンダリング（翻訳）するため、対応言語以外は受け付けない。
+    """
+    if lang not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"サポートされていない言語です: {lang}",
+        )
+    area_codes = {c.strip() for c in (area_code or "").split(",") if c.strip()}
+    kinds = {t.strip() for t in (types or "").split(",") if t.strip()}
+    unknown = kinds - set(EVENT_KINDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"不明なイベント種別です: {', '.join(sorted(unknown))}",
+        )
+    return area_codes, kinds
+
+
+def stream_full() -> bool:
+    """購読者数が上限に達しているか"""
+    return event_bus.subscriber_count() >= settings.stream_max_subscribers
+
+
+def subscription_closed(subscription: Subscription) -> bool:
+    """切断された購読者のキューを読み終えたか判定"""
+    return subscription.evicted and subscription.queue.empty()
+
+
 @app.get("/", response_model=HealthResponse)
 @limiter.exempt
 async def root():
@@ -154,33 +399,18 @@ async def get_earthquakes(request: Request, limit: int = 10, lang: str = "ja"):
     - **limit**: 取得件数（デフォルト: 10）
     - **lang**: 言語コード（ja, en, zh, ko, vi, ne, easy_ja）
     """
-    earthquakes = await p2p_service.get_recent_earthquakes(limit=limit)
+    # 取り込み時に作成済みのレスポンス（翻訳・検証・シリアライズ不要）
+    snapshot = snapshot_response(FeedStore.EARTHQUAKES, lang, limit)
+    if snapshot is not None:
+        return snapshot
+
+    earthquakes = feed_store.earthquakes(limit)
+    if earthquakes is None:
+        earthquakes = await p2p_service.get_recent_earthquakes(limit=limit)
 
     # 多言語翻訳（ハイブリッド方式）
     if lang != "ja":
-        for eq in earthquakes:
-            # 震源地名翻訳（静的マッピング → Claude API → キャッシュ）
-            eq.location_translated = await translator.translate_location(
-                eq.location, target_lang=lang
-            )
-            # 震度翻訳（静的マッピング）
-            eq.max_intensity_translated = translator.translate_intensity(
-                eq.max_intensity, target_lang=lang
-            )
-            # 津波警報翻訳（静的マッピング）
-            eq.tsunami_warning_translated = translator.translate_tsunami_warning(
-                eq.tsunami_warning, target_lang=lang
-            )
-            # メッセージ生成（translator.pyのメソッドを使用）
-            eq.message_translated = translator.generate_earthquake_message(
-                lang=lang,
-                location=eq.location_translated,
-                magnitude=eq.magnitude,
-                intensity=eq.max_intensity,
-                depth=eq.depth,
-                tsunami_warning=eq.tsunami_warning,
-                tsunami_warning_translated=eq.tsunami_warning_translated
-            )
+        await localize_earthquakes(earthquakes, lang)
 
     return earthquakes
 
@@ -217,6 +447,9 @@ async def get_alerts(request: Request, area_code: str = "130000", lang: str = "j
     - **lang**: 言語コード（ja, en, zh, ko, vi, easy_ja）
     """
     # 警報サービスに多言語翻訳が組み込まれているため直接取得
+    data = feed_store.warning_data(area_code)
+    if data is not None:
+        return await warning_service.build_alerts(data, area_code, lang)
     alerts = await warning_service.get_warnings(area_code, lang)
     return alerts
 
@@ -224,22 +457,29 @@ async def get_alerts(request: Request, area_code: str = "130000", lang: str = "j
 @app.get("/api/v1/warnings/special", response_model=list[DisasterAlert])
 @handle_errors
 @limiter.limit(settings.rate_limit_general)
-async def get_special_warnings(request: Request, lang: str = "ja"):
+async def get_special_warnings(request: Request, response: Response, lang: str = "ja"):
     """
     全国の特別警報を取得
 
+    一部の都道府県の取得に失敗した場合は、取得できた分のみを返し
+    X-Partial-Result / X-Failed-Areas ヘッダーで失敗した地域コードを通知する
+
     - **lang**: 言語コード
     """
-    alerts = await warning_service.get_special_warnings()
+    collection = feed_store.special_warnings()
+    if collection is None:
+        collection = await warning_service.get_special_warnings()
+    set_partial_result_headers(response, "X-Failed-Areas", collection.failed)
+    alerts = collection.alerts
 
     if lang != "ja":
-        for alert in alerts:
-            alert.title_translated = await translator.translate(
-                alert.title, target_lang=lang
-            )
-            alert.description_translated = await translator.translate(
-                alert.description, target_lang=lang
-            )
+        # タイトル・説明文の未翻訳分をまとめて1回のAI呼び出しで翻訳
+        translated = await translator.translate_many(
+            [text for alert in alerts for text in (alert.title, alert.description)],
+            target_lang=lang,
+        )
+        for i, alert in enumerate(alerts):
+            alert.title_translated, alert.description_translated = translated[2 * i:2 * i + 2]
 
     return alerts
 
@@ -278,6 +518,7 @@ async def get_nearby_shelters(
     radius: float = 5.0,
     limit: int = 20,
     disaster_type: Optional[str] = None,
+    match: str = "all",
     lang: str = "ja"
 ):
     """
@@ -287,23 +528,27 @@ async def get_nearby_shelters(
     - **lon**: 経度
     - **radius**: 検索半径（km）
     - **limit**: 取得件数上限
-    - **disaster_type**: 災害種別（earthquake, tsunami, flood等）
+    - **disaster_type**: 災害種別（earthquake, tsunami, flood等。カンマ区切りで複数指定可）
+    - **match**: 複数指定時の条件（all: 全種別に対応, any: いずれかに対応）
     - **lang**: 言語コード
     """
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="不正な条件です。対応: all, any")
+
     shelters = shelter_service.get_nearby_shelters(
         lat=lat,
         lon=lon,
         radius_km=radius,
         limit=limit,
-        disaster_type=disaster_type
+        disaster_type=disaster_type,
+        match_all=match == "all"
     )
 
     # 多言語翻訳
     if lang != "ja":
-        for shelter in shelters:
-            shelter.name_translated = await translator.translate(
-                shelter.name, target_lang=lang
-            )
+        names = await translator.translate_many([s.name for s in shelters], target_lang=lang)
+        for shelter, name in zip(shelters, names):
+            shelter.name_translated = name
 
     return shelters
 
@@ -315,6 +560,197 @@ async def get_shelter_disaster_types():
     return shelter_service.get_disaster_types()
 
 
+MAX_VIEWPORT_LIMIT = 2000
+TILE_CACHE_CONTROL = "public, max-age=300"
+
+
+def validate_viewport_params(limit: int, match: str) -> None:
+    """地図表示用エンドポイントの共通パラメータを検証"""
+    if not 1 <= limit <= MAX_VIEWPORT_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limitは1〜{MAX_VIEWPORT_LIMIT}で指定してください")
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="不正な条件です。対応: all, any")
+
+
+@app.get("/api/v1/shelters/bbox", response_model=ShelterViewport)
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def get_shelters_in_bbox(
+    request: Request,
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    zoom: Optional[int] = None,
+    limit: int = 500,
+    disaster_type: Optional[str] = None,
+    match: str = "all"
+):
+    """
+    地図の表示範囲の避難所を取得（低ズームではクラスタ）
+
+    - **south, west, north, east**: 表示範囲の南端・西端・北端・東端（緯度経度）
+    - **zoom**: 地図のズームレベル（省略時は範囲の大きさから決定。広い範囲は高ズームでもクラスタ）
+    - **limit**: 返すクラスタ・避難所の件数上限
+    - **disaster_type**: 災害種別（カンマ区切りで複数指定可）
+    - **match**: 複数指定時の条件（all: 全種別に対応, any: いずれかに対応）
+    """
+    validate_viewport_params(limit, match)
+    if not (-90 <= south <= north <= 90 and -180 <= west <= east <= 180):
+        raise HTTPException(status_code=400, detail="表示範囲が不正です")
+
+    return shelter_service.get_shelters_in_bbox(
+        south, west, north, east,
+        zoom=zoom, limit=limit, disaster_type=disaster_type, match_all=match == "all",
+    )
+
+
+@app.get("/api/v1/shelters/tiles/{z}/{x}/{y}", response_model=ShelterViewport)
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def get_shelter_tile(
+    request: Request,
+    response: Response,
+    z: int,
+    x: int,
+    y: int,
+    limit: int = 500,
+    disaster_type: Optional[str] = None,
+    match: str = "all"
+):
+    """
+    地図タイル（z/x/y、Webメルカトル）の避難所を取得（低ズームではクラスタ）
+
+    - **z, x, y**: タイル座標
+    - **limit**: 返すクラスタ・避難所の件数上限
+    - **disaster_type**: 災害種別（カンマ区切りで複数指定可）
+    - **match**: 複数指定時の条件（all: 全種別に対応, any: いずれかに対応）
+    """
+    validate_viewport_params(limit, match)
+    if not (0 <= z <= ShelterService.MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="タイル座標が不正です")
+
+    response.headers["Cache-Control"] = TILE_CACHE_CONTROL
+    return shelter_service.get_shelter_tile(
+        z, x, y, limit=limit, disaster_type=disaster_type, match_all=match == "all",
+    )
+
+
+@app.get("/api/v1/shelters/available", response_model=list[ShelterInfo])
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def get_available_shelters(
+    request: Request,
+    lat: float,
+    lon: float,
+    radius: float = 10.0,
+    limit: int = 20,
+    min_remaining: int = 1,
+    disaster_type: Optional[str] = None,
+    match: str = "all",
+    lang: str = "ja"
+):
+    """
+    受け入れ可能な（開設中で満員でない）避難所を近い順に検索
+
+    - **lat**: 緯度
+    - **lon**: 経度
+    - **radius**: 検索半径（km）
+    - **limit**: 取得件数上限
+    - **min_remaining**: 必要な残り収容人数（家族等の人数）
+    - **disaster_type**: 災害種別（カンマ区切りで複数指定可）
+    - **match**: 複数指定時の条件（all: 全種別に対応, any: いずれかに対応）
+    - **lang**: 言語コード
+    """
+    if match not in ("all", "any"):
+        raise HTTPException(status_code=400, detail="不正な条件です。対応: all, any")
+    if min_remaining < 1:
+        raise HTTPException(status_code=400, detail="min_remainingは1以上で指定してください")
+
+    shelters = shelter_service.get_available_shelters(
+        lat=lat,
+        lon=lon,
+        radius_km=radius,
+        limit=limit,
+        min_remaining=min_remaining,
+        disaster_type=disaster_type,
+        match_all=match == "all"
+    )
+    if lang != "ja":
+        names = await translator.translate_many([s.name for s in shelters], target_lang=lang)
+        for shelter, name in zip(shelters, names):
+            shelter.name_translated = name
+    return shelters
+
+
+@app.get("/api/v1/shelters/{shelter_id}", response_model=ShelterInfo)
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def get_shelter(request: Request, shelter_id: str, lang: str = "ja"):
+    """
+    IDで避難所を取得
+
+    - **shelter_id**: 避難所ID
+    - **lang**: 言語コード
+    """
+    shelter = shelter_service.get_shelter_by_id(shelter_id)
+    if shelter is None:
+        raise HTTPException(status_code=404, detail="避難所が見つかりません")
+    if lang != "ja":
+        shelter.name_translated = await translator.translate(shelter.name, target_lang=lang)
+    return shelter
+
+
+def verify_admin_token(request: Request) -> None:
+    """管理用エンドポイントのトークンを検証（未設定の場合は無効）"""
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    token = request.headers.get("X-Admin-Token", "")
+    if not secrets.compare_digest(token.encode(), settings.admin_api_token.encode()):
+        raise HTTPException(status_code=403, detail="認証に失敗しました")
+
+
+@app.post("/api/v1/admin/shelters/reload")
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def reload_shelters(request: Request, fetch: bool = False):
+    """
+    避難所データを再起動なしで差し替え（管理用）
+
+    新しいデータを裏で読み込み、完成後に差し替えます。処理中の検索は差し替え前のデータで完了します。
+
+    - **fetch**: Trueの場合、設定されたURLから取得・取り込みを行ってから差し替え
+    """
+    verify_admin_token(request)
+    if fetch:
+        if not await shelter_service.fetch_and_update_shelter_data():
+            raise HTTPException(status_code=502, detail="避難所データの取得に失敗しました")
+    else:
+        await shelter_service.reload()
+    return {"status": "ok", "shelters": shelter_service.count()}
+
+
+@app.post("/api/v1/admin/shelters/status")
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def update_shelter_status(request: Request):
+    """
+    避難所の避難者数・開設状況を一括更新（管理用）
+
+    本文はJSON Lines（1行1件）またはCSV（Content-Type: text/csv、1行目はヘッダー）。
+    各行は id と occupancy（避難者数）・delta（増減）・is_open（開設状況）のいずれかを含みます。
+    不正な行・存在しないIDはスキップし、件数を応答に含めます。
+    """
+    verify_admin_token(request)
+    body = (await request.body()).decode("utf-8-sig", errors="replace")
+    fmt = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+
+    result = UpdateResult()
+    updates = parse_updates(body, fmt, result)
+    shelter_service.apply_status_updates(updates, result)
+    return asdict(result)
+
+
 @app.get("/api/v1/tsunami", response_model=list[TsunamiInfo])
 @handle_errors
 @limiter.limit(settings.rate_limit_general)
@@ -325,14 +761,19 @@ async def get_tsunami_info(request: Request, limit: int = 10, lang: str = "ja"):
     - **limit**: 取得件数
     - **lang**: 言語コード
     """
-    tsunamis = await tsunami_service.get_tsunami_list(limit=limit)
+    snapshot = snapshot_response(FeedStore.TSUNAMI, lang, limit)
+    if snapshot is not None:
+        return snapshot
+
+    tsunamis = feed_store.tsunamis(limit)
+    if tsunamis is None:
+        tsunamis = await tsunami_service.get_tsunami_list(limit=limit)
 
     # 多言語翻訳
     if lang != "ja":
-        for tsunami in tsunamis:
-            tsunami.message_translated = await translator.translate(
-                tsunami.message, target_lang=lang
-            )
+        messages = await translator.translate_many([t.message for t in tsunamis], target_lang=lang)
+        for tsunami, message in zip(tsunamis, messages):
+            tsunami.message_translated = message
 
     return tsunamis
 
@@ -346,13 +787,16 @@ async def get_active_tsunami_warnings(request: Request, lang: str = "ja"):
 
     - **lang**: 言語コード
     """
-    tsunamis = await tsunami_service.get_active_warnings()
+    latest = feed_store.tsunamis(20)
+    if latest is not None:
+        tsunamis = tsunami_service.filter_active(latest)
+    else:
+        tsunamis = await tsunami_service.get_active_warnings()
 
     if lang != "ja":
-        for tsunami in tsunamis:
-            tsunami.message_translated = await translator.translate(
-                tsunami.message, target_lang=lang
-            )
+        messages = await translator.translate_many([t.message for t in tsunamis], target_lang=lang)
+        for tsunami, message in zip(tsunamis, messages):
+            tsunami.message_translated = message
 
     return tsunamis
 
@@ -375,14 +819,22 @@ async def get_volcanoes(request: Request, monitored_only: bool = True):
 @app.get("/api/v1/volcanoes/warnings")
 @handle_errors
 @limiter.limit(settings.rate_limit_general)
-async def get_volcano_warnings(request: Request, lang: str = "ja"):
+async def get_volcano_warnings(request: Request, response: Response, lang: str = "ja"):
     """
     火山警報を取得
 
+    一部の火山の取得に失敗した場合は、取得できた分のみを返し
+    X-Partial-Result / X-Failed-Volcanoes / X-Timed-Out-Volcanoes ヘッダーで通知する
+
     - **lang**: 言語コード
     """
-    warnings = await volcano_service.get_volcano_warnings()
-    return warnings
+    collection = feed_store.volcano_warnings()
+    if collection is None:
+        collection = await volcano_service.get_volcano_warnings()
+    set_partial_result_headers(response, "X-Failed-Volcanoes", collection.failed)
+    if collection.timed_out:
+        response.headers["X-Timed-Out-Volcanoes"] = ",".join(collection.timed_out)
+    return collection.warnings
 
 
 @app.get("/api/v1/volcanoes/{volcano_code}", response_model=VolcanoInfo)
@@ -400,25 +852,125 @@ async def get_volcano_by_code(request: Request, volcano_code: int):
     return volcano
 
 
-# 対応言語一覧（15言語 + 日本語）
-SUPPORTED_LANGUAGES = {
-    "ja": "日本語",
-    "en": "English",
-    "zh": "简体中文",
-    "zh-TW": "繁體中文",
-    "ko": "한국어",
-    "vi": "Tiếng Việt",
-    "th": "ภาษาไทย",
-    "id": "Bahasa Indonesia",
-    "ms": "Bahasa Melayu",
-    "tl": "Filipino",
-    "fr": "Français",
-    "de": "Deutsch",
-    "it": "Italiano",
-    "es": "Español",
-    "ne": "नेपाली",
-    "easy_ja": "やさしい日本語"
-}
+@app.get("/api/v1/feeds/status")
+@limiter.exempt
+async def get_feed_status():
+    """バックグラウンド取り込みの状況を取得"""
+    return feed_store.status()
+
+
+@app.get("/api/v1/upstream/stats")
+@limiter.exempt
+async def get_upstream_stats():
+    """上流API取得の統計（条件付きGET・パース再利用・レスポンスキャッシュ）を取得"""
+    return {
+        "http": http_clients.get_stats(),
+        "cache": upstream_cache.get_stats(),
+    }
+
+
+@app.get("/api/v1/translation/stats")
+@limiter.exempt
+async def get_translation_stats():
+    """翻訳キャッシュの統計（名前空間毎のヒット・ミス・追い出し件数）を取得"""
+    return translator.get_cache_stats()
+
+
+@app.get("/api/v1/translation/locations/stats")
+@limiter.exempt
+async def get_location_translation_stats():
+    """震源地名の静的翻訳の統計（完全一致・組み立て・AI翻訳へ回した件数）を取得"""
+    return translator.get_location_stats()
+
+
+@app.get("/api/v1/stream")
+@handle_errors
+@limiter.limit(settings.rate_limit_general)
+async def stream_events(
+    request: Request,
+    lang: str = "ja",
+    area_code: Optional[str] = None,
+    types: Optional[str] = None,
+):
+    """
+    新しい地震・津波・警報・火山警報をServer-Sent Eventsで配信
+
+    - **lang**: 言語コード
+    - **area_code**: 警報を受け取る地域コード（カンマ区切り、省略時は全地域）
+    - **types**: イベント種別（earthquake, tsunami, warning, volcano のカンマ区切り、省略時は全種別）
+    """
+    area_codes, kinds = parse_stream_filters(lang, area_code, types)
+    if stream_full():
+        raise HTTPException(status_code=503, detail="購読者数が上限に達しています")
+    subscription = event_bus.subscribe(lang=lang, area_codes=area_codes, kinds=kinds)
+
+    async def event_source():
+        try:
+            yield "retry: 5000\n\n"
+            while not subscription_closed(subscription):
+                event = await subscription.get(settings.stream_heartbeat_interval)
+                if event is None:
+                    # 中継サーバーによる無通信切断を防ぐ
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event.seq}\nevent: {event.kind}\ndata: {event.data}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/api/v1/stream")
+async def stream_events_ws(
+    websocket: WebSocket,
+    lang: str = "ja",
+    area_code: Optional[str] = None,
+    types: Optional[str] = None,
+):
+    """
+    新しい地震・津波・警報・火山警報をWebSocketで配信
+
+    メッセージ形式: {"type": イベント種別, "id": 連番, "data": イベント}
+    無通信時は {"type": "ping"} を送信する
+    """
+    try:
+        area_codes, kinds = parse_stream_filters(lang, area_code, types)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+    if stream_full():
+        await websocket.close(code=1013, reason="購読者数が上限に達しています")
+        return
+
+    await websocket.accept()
+    subscription = event_bus.subscribe(lang=lang, area_codes=area_codes, kinds=kinds)
+    try:
+        while not subscription_closed(subscription):
+            event = await subscription.get(settings.stream_heartbeat_interval)
+            if event is None:
+                await websocket.send_text('{"type": "ping"}')
+                continue
+            # dataはレンダリング済みのJSON文字列をそのまま埋め込む
+            await websocket.send_text(
+                f'{{"type": {json.dumps(event.kind)}, "id": {event.seq}, "data": {event.data}}}'
+            )
+        # 読み出しが遅く切断された購読者（再接続を促す）
+        await websocket.close(code=1013)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@app.get("/api/v1/stream/stats")
+@limiter.exempt
+async def get_stream_stats():
+    """リアルタイム配信の統計（購読者数・配信数・切断数）を取得"""
+    return event_bus.get_stats()
 
 
 @app.get("/api/v1/languages")
@@ -478,13 +1030,17 @@ async def get_safety_guide(
             detail=f"不正な重要度です。対応: {', '.join(valid_severities)}"
         )
 
+    # 地域名の指定が無い場合は事前生成したガイドを使用（AI呼び出しなし）
+    guide_data = await safety_guides.get(disaster_type, severity, lang) if not location else None
+
     # 安全ガイドを生成
-    guide_data = await translator.generate_safety_guide(
-        disaster_type=disaster_type,
-        target_lang=lang,
-        location=location,
-        severity=severity
-    )
+    if guide_data is None:
+        guide_data = await translator.generate_safety_guide(
+            disaster_type=disaster_type,
+            target_lang=lang,
+            location=location,
+            severity=severity
+        )
 
     if not guide_data:
         raise HTTPException(status_code=500, detail="安全ガイドの生成に失敗しました")
@@ -512,7 +1068,8 @@ async def get_safety_guide(
         emergency_contacts=guide_data.get("emergency_contacts"),
         additional_notes=guide_data.get("additional_notes"),
         generated_at=datetime.now().isoformat(),
-        cached=guide_data.get("cached", False)
+        cached=guide_data.get("cached", False),
+        source=guide_data.get("source", "ai")
     )
 
 
@@ -523,6 +1080,13 @@ async def get_disaster_types():
     return SUPPORTED_DISASTER_TYPES
 
 
+@app.get("/api/v1/safety-guide/status")
+@limiter.exempt
+async def get_safety_guide_status():
+    """安全ガイドの事前生成の状況（生成済み件数・実行中か）を取得"""
+    return safety_guides.status()
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -59,6 +59,19 @@ class DisasterAlert(BaseModel):
     action: Optional[str] = None  # 推奨行動（AI生成）
 
 
+class FetchFailure(BaseModel):
+    """並行取得で失敗した上流リソース"""
+    code: str  # 地域コード・火山コード等
+    name: Optional[str] = None
+    reason: str  # timeout, HTTPStatusError, etc.
+
+
+class WarningCollection(BaseModel):
+    """全国警報の取得結果（部分的な失敗を含む）"""
+    alerts: list[DisasterAlert] = []
+    failed: list[FetchFailure] = []
+
+
 class TranslatedMessage(BaseModel):
     """翻訳結果"""
     original: str
@@ -84,6 +97,24 @@ class ShelterInfo(BaseModel):
     types: list[str] = []  # 地震、津波、洪水、等
 
 
+class ShelterCluster(BaseModel):
+    """避難所のクラスタ（低ズームの地図表示用）"""
+    latitude: float  # 重心
+    longitude: float
+    count: int
+    capacity: Optional[int] = None  # 収容人数の合計
+    types: list[str] = []  # クラスタ内の避難所が対応する災害種別
+
+
+class ShelterViewport(BaseModel):
+    """地図の表示範囲・タイルの避難所"""
+    zoom: int
+    clusters: list[ShelterCluster] = []  # 低ズームの場合のクラスタ
+    shelters: list[ShelterInfo] = []  # 高ズームの場合の避難所（1件のみのクラスタも含む）
+    total: int = 0  # 範囲内の避難所数
+    truncated: bool = False  # 件数上限により省略した場合True
+
+
 class UserLocation(BaseModel):
     """ユーザー位置情報"""
     latitude: float
@@ -147,6 +178,17 @@ class VolcanoWarning(BaseModel):
     headline: Optional[str] = None
 
 
+class VolcanoWarningCollection(BaseModel):
+    """火山警報の取得結果（部分的な失敗を含む）"""
+    warnings: list[dict] = []
+    failed: list[FetchFailure] = []
+
+    @property
+    def timed_out(self) -> list[str]:
+        """タイムアウトした火山コード"""
+        return [f.code for f in self.failed if f.reason == "timeout"]
+
+
 class SafetyGuide(BaseModel):
     """安全ガイド（AI生成）"""
     disaster_type: str  # earthquake, tsunami, flood, typhoon, volcano, etc.
@@ -163,4 +205,5 @@ class SafetyGuide(BaseModel):
     emergency_contacts: Optional[str] = None  # 緊急連絡先
     additional_notes: Optional[str] = None  # 補足情報
     generated_at: str  # 生成日時
-    cached: bool = False  # キャッシュから取得したかどうか
+    cached: bool = False  # 保存済みのガイド（事前生成・キャッシュ）かどうか
+    source: str = "ai"  # 取得元（pregenerated: 事前生成, cache: キャッシュ, ai: AI生成, fallback: 基本ガイド）
@@ -0,0 +1,207 @@
+"""
+リアルタイム配信用イベントバス
+
+バックグラウンド取り込みで検知した新しい地震・津波・警報・火山イベントを
+SSE / WebSocketの購読者に配信します。
+
+- 購読者毎に言語・地域コード・イベント種別でフィルタリング
+- イベントは言語毎に1回だけレンダリングし、同じ言語の購読者で共有
+- 日本語の購読者にはその場で配信し、翻訳が必要な言語は取り込みを待たせないよう
+  バックグラウンドで言語毎に並行してレンダリングする（静的に翻訳できる言語は先に届く）
+- 購読者毎のキューは上限付き。キューが溢れた（読み出しが遅い）購読者は切断する
+"""
+import asyncio
+import itertools
+import json
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# イベント種別
+EARTHQUAKE = "earthquake"
+TSUNAMI = "tsunami"
+WARNING = "warning"
+VOLCANO = "volcano"
+EVENT_KINDS = (EARTHQUAKE, TSUNAMI, WARNING, VOLCANO)
+
+
+@dataclass
+class StreamEvent:
+    """配信イベント（日本語の元データ）"""
+    kind: str
+    key: str  # 重複検知用のキー
+    payload: Any  # Pydanticモデルまたはdict
+    area_code: Optional[str] = None  # 地域に紐づくイベントのみ
+    seq: int = 0  # バスが採番する連番（SSEのid）
+
+
+@dataclass
+class RenderedEvent:
+    """言語毎にレンダリング済みのイベント"""
+    kind: str
+    seq: int
+    data: str  # JSON文字列
+
+
+@dataclass(eq=False)
+class Subscription:
+    """購読者"""
+    lang: str
+    area_codes: frozenset[str] = frozenset()  # 空の場合は全地域
+    kinds: frozenset[str] = frozenset(EVENT_KINDS)
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    evicted: bool = False
+
+    def matches(self, event: StreamEvent) -> bool:
+        """イベントが購読条件に合うか判定"""
+        if event.kind not in self.kinds:
+            return False
+        if self.area_codes and event.area_code is not None:
+            return event.area_code in self.area_codes
+        return True
+
+    async def get(self, timeout: float) -> Optional[RenderedEvent]:
+        """
+        次のイベントを取得
+
+        Returns:
+            RenderedEvent: イベント。timeout秒以内に無ければNone（ハートビート用）
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+Renderer = Callable[[StreamEvent, str], Awaitable[dict]]
+
+
+class EventBus:
+    """購読者にイベントを配信するインプロセスのPub/Subバス"""
+
+    def __init__(self, renderer: Renderer, queue_size: int = 100):
+        self.renderer = renderer
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._seq = itertools.count(1)
+        self._rendering: set[asyncio.Task] = set()  # バックグラウンドでレンダリング中の言語
+        self.stats = {"published": 0, "delivered": 0, "evicted": 0, "render_errors": 0}
+
+    def subscribe(
+        self,
+        lang: str = "ja",
+        area_codes: Optional[set[str]] = None,
+        kinds: Optional[set[str]] = None,
+    ) -> Subscription:
+        """購読を開始"""
+        subscription = Subscription(
+            lang=lang,
+            area_codes=frozenset(area_codes or ()),
+            kinds=frozenset(kinds or EVENT_KINDS),
+            queue=asyncio.Queue(maxsize=self.queue_size),
+        )
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """購読を終了"""
+        self._subscribers.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        """購読者数"""
+        return len(self._subscribers)
+
+    async def publish(self, event: StreamEvent) -> None:
+        """イベントを配信"""
+        await self.publish_many([event])
+
+    async def publish_many(self, events: list[StreamEvent]) -> None:
+        """
+        複数のイベントを配信
+
+        購読条件に合う購読者を言語毎にまとめ、言語毎に1回だけレンダリングする。
+        日本語はその場で配信し、他の言語はバックグラウンドで言語毎に並行して
+        レンダリング・配信する（同じ言語ではイベントの順序を保つ）。
+        キューが溢れている購読者は切断する。
+        """
+        deferred: dict[str, list[tuple[StreamEvent, list[Subscription]]]] = {}
+        for event in events:
+            event.seq = next(self._seq)
+            self.stats["published"] += 1
+
+            by_lang: dict[str, list[Subscription]] = {}
+            for subscription in self._subscribers:
+                if not subscription.evicted and subscription.matches(event):
+                    by_lang.setdefault(subscription.lang, []).append(subscription)
+
+            for lang, subscriptions in by_lang.items():
+                if lang == "ja":
+                    await self._render_and_deliver(event, lang, subscriptions)
+                else:
+                    deferred.setdefault(lang, []).append((event, subscriptions))
+
+        if deferred:
+            task = asyncio.create_task(self._render_languages(deferred))
+            self._rendering.add(task)
+            task.add_done_callback(self._rendering.discard)
+
+    async def _render_languages(self, deferred: dict[str, list[tuple[StreamEvent, list[Subscription]]]]) -> None:
+        """言語毎に並行してレンダリング・配信（言語内はイベントの順）"""
+        async def render_language(lang: str, items: list[tuple[StreamEvent, list[Subscription]]]) -> None:
+            for event, subscriptions in items:
+                await self._render_and_deliver(event, lang, subscriptions)
+
+        await asyncio.gather(*(render_language(lang, items) for lang, items in deferred.items()))
+
+    async def _render_and_deliver(self, event: StreamEvent, lang: str, subscriptions: list[Subscription]) -> None:
+        """イベントを1つの言語でレンダリングして購読者に配信"""
+        try:
+            data = await self.renderer(event, lang)
+        except Exception as e:
+            self.stats["render_errors"] += 1
+            logger.error(f"イベントレンダリングエラー ({event.kind}, {lang}): {e}", exc_info=True)
+            return
+
+        rendered = RenderedEvent(
+            kind=event.kind,
+            seq=event.seq,
+            data=json.dumps(data, ensure_ascii=False, default=str),
+        )
+        for subscription in subscriptions:
+            self._deliver(subscription, rendered)
+
+    async def drain(self) -> None:
+        """バックグラウンドのレンダリングの完了を待つ"""
+        while self._rendering:
+            await asyncio.gather(*self._rendering, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """バックグラウンドのレンダリングをキャンセル"""
+        tasks = list(self._rendering)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _deliver(self, subscription: Subscription, rendered: RenderedEvent) -> None:
+        """購読者のキューにイベントを追加（溢れた場合は切断）"""
+        if subscription.evicted:
+            return
+        try:
+            subscription.queue.put_nowait(rendered)
+            self.stats["delivered"] += 1
+        except asyncio.QueueFull:
+            self._evict(subscription)
+
+    def _evict(self, subscription: Subscription) -> None:
+        """読み出しが遅い購読者を切断"""
+        subscription.evicted = True
+        self._subscribers.discard(subscription)
+        self.stats["evicted"] += 1
+        logger.warning("読み出しが遅い購読者を切断しました")
+
+    def get_stats(self) -> dict[str, int]:
+        """配信統計を取得"""
+        return {**self.stats, "subscribers": len(self._subscribers)}
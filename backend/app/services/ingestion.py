@@ -0,0 +1,340 @@
+"""
+バックグラウンド取り込みサービス
+
+P2P地震情報・全国の警報・津波情報・火山警報を設定された間隔で定期取得し、
+正規化したモデルをインメモリのFeedStoreに保存します。
+エンドポイントはFeedStoreから読み出すため、上流への負荷がクライアント数に依存しません。
+FeedStoreにデータが無い・古い場合、エンドポイントは従来通り上流から直接取得します。
+取り込みは上流キャッシュの値（古い値を含む）を使わずに上流から取得し、結果をキャッシュに
+書き戻します。取得に失敗した場合はジョブを失敗させ、フィードを古くなったものとして扱います。
+
+取り込み毎に前回から増えたイベントを検知し、登録されたリスナー（イベントバス等）に通知します。
+また、フィードの更新を登録されたリスナー（言語毎のレスポンススナップショット等）に通知します。
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Collection, Optional
+
+from ..models import (
+    EarthquakeInfo,
+    TsunamiInfo,
+    VolcanoWarningCollection,
+    WarningCollection,
+)
+from .event_bus import EARTHQUAKE, TSUNAMI, VOLCANO, WARNING, StreamEvent
+from ..utils.fanout import FanOutResult
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class FeedSnapshot:
+    """フィードの最新スナップショット"""
+    value: Any
+    updated_at: float  # time.monotonic()
+    fetched_at: str  # ISO形式の取得日時
+    max_age: float  # これより古い場合は利用しない（秒）
+    capacity: Optional[int] = None  # 取得件数上限（リスト系フィード）
+
+
+@dataclass
+class WarningSnapshot:
+    """全国警報のスナップショット"""
+    data_by_area: dict[str, dict] = field(default_factory=dict)  # 地域コード -> 警報JSON
+    collection: WarningCollection = field(default_factory=WarningCollection)  # 日本語の全国警報
+
+
+class FeedStore:
+    """取り込み済みフィードのインメモリストア"""
+
+    EARTHQUAKES = "earthquakes"
+    WARNINGS = "warnings"
+    TSUNAMI = "tsunami"
+    VOLCANO_WARNINGS = "volcano_warnings"
+
+    def __init__(self):
+        self._feeds: dict[str, FeedSnapshot] = {}
+
+    def put(self, feed: str, value: Any, max_age: float, capacity: Optional[int] = None) -> None:
+        """フィードのスナップショットを置き換え"""
+        self._feeds[feed] = FeedSnapshot(
+            value=value,
+            updated_at=time.monotonic(),
+            fetched_at=datetime.now().isoformat(),
+            max_age=max_age,
+            capacity=capacity,
+        )
+
+    def snapshot(self, feed: str) -> Optional[FeedSnapshot]:
+        """有効期限内のフィードのスナップショットを取得"""
+        snapshot = self._feeds.get(feed)
+        if snapshot is None or time.monotonic() - snapshot.updated_at > snapshot.max_age:
+            return None
+        return snapshot
+
+    def get(self, feed: str) -> Optional[Any]:
+        """有効期限内のフィードの値を取得"""
+        snapshot = self.snapshot(feed)
+        return None if snapshot is None else snapshot.value
+
+    def get_list(self, feed: str, limit: int) -> Optional[list]:
+        """
+        リスト系フィードの先頭limit件のコピーを取得
+
+        取得件数上限を超える件数が要求された場合はNoneを返す（上流から直接取得させる）
+        """
+        snapshot = self.snapshot(feed)
+        if snapshot is None or (snapshot.capacity is not None and limit > snapshot.capacity):
+            return None
+        # エンドポイント側で翻訳フィールドを書き換えるためコピーを返す
+        return [item.model_copy() for item in snapshot.value[:limit]]
+
+    def earthquakes(self, limit: int) -> Optional[list[EarthquakeInfo]]:
+        """取り込み済みの地震情報"""
+        return self.get_list(self.EARTHQUAKES, limit)
+
+    def tsunamis(self, limit: int) -> Optional[list[TsunamiInfo]]:
+        """取り込み済みの津波情報"""
+        return self.get_list(self.TSUNAMI, limit)
+
+    def warning_data(self, area_code: str) -> Optional[dict]:
+        """取り込み済みの地域の警報JSON"""
+        snapshot: Optional[WarningSnapshot] = self.get(self.WARNINGS)
+        if snapshot is None:
+            return None
+        return snapshot.data_by_area.get(area_code)
+
+    def special_warnings(self) -> Optional[WarningCollection]:
+        """取り込み済みの全国の特別警報"""
+        snapshot: Optional[WarningSnapshot] = self.get(self.WARNINGS)
+        if snapshot is None:
+            return None
+        return WarningCollection(
+            alerts=[a.model_copy() for a in snapshot.collection.alerts if a.severity == "extreme"],
+            failed=list(snapshot.collection.failed),
+        )
+
+    def volcano_warnings(self) -> Optional[VolcanoWarningCollection]:
+        """取り込み済みの火山警報"""
+        return self.get(self.VOLCANO_WARNINGS)
+
+    def status(self) -> dict[str, dict]:
+        """フィード毎の取り込み状況"""
+        now = time.monotonic()
+        return {
+            feed: {
+                "fetched_at": snapshot.fetched_at,
+                "age_seconds": round(now - snapshot.updated_at, 1),
+                "fresh": now - snapshot.updated_at <= snapshot.max_age,
+            }
+            for feed, snapshot in self._feeds.items()
+        }
+
+
+class IngestionScheduler:
+    """上流フィードを定期取得してFeedStoreに書き込むスケジューラー"""
+
+    def __init__(
+        self,
+        store: FeedStore,
+        p2p_service,
+        warning_service,
+        tsunami_service,
+        volcano_service,
+    ):
+        from ..config import settings
+        self.store = store
+        self.p2p_service = p2p_service
+        self.warning_service = warning_service
+        self.tsunami_service = tsunami_service
+        self.volcano_service = volcano_service
+        self.earthquake_limit = settings.ingest_earthquake_limit
+        self.tsunami_limit = settings.ingest_tsunami_limit
+        self.staleness_factor = settings.ingest_staleness_factor
+        self.intervals = {
+            FeedStore.EARTHQUAKES: settings.ingest_interval_earthquakes,
+            FeedStore.WARNINGS: settings.ingest_interval_warnings,
+            FeedStore.TSUNAMI: settings.ingest_interval_tsunami,
+            FeedStore.VOLCANO_WARNINGS: settings.ingest_interval_volcano,
+        }
+        self._jobs: dict[str, Callable[[], Awaitable[None]]] = {
+            FeedStore.EARTHQUAKES: self.ingest_earthquakes,
+            FeedStore.WARNINGS: self.ingest_warnings,
+            FeedStore.TSUNAMI: self.ingest_tsunami,
+            FeedStore.VOLCANO_WARNINGS: self.ingest_volcano_warnings,
+        }
+        self._tasks: list[asyncio.Task] = []
+        self._seen: dict[str, set[str]] = {}
+        # 一度も取得できていない取得元（最初に取得できた回のイベントは通知しない）
+        self._unknown_sources: dict[str, set[str]] = {}
+        self._listeners: list[Callable[[list[StreamEvent]], Awaitable[None]]] = []
+        self._feed_listeners: list[Callable[[str, Any], Awaitable[None]]] = []
+
+    def add_listener(self, listener: Callable[[list[StreamEvent]], Awaitable[None]]) -> None:
+        """新しいイベントの通知先を登録"""
+        self._listeners.append(listener)
+
+    def add_feed_listener(self, listener: Callable[[str, Any], Awaitable[None]]) -> None:
+        """フィードの更新（フィード名, 保存した値）の通知先を登録"""
+        self._feed_listeners.append(listener)
+
+    async def _notify_updated(self, feed: str, value: Any) -> None:
+        """フィードの更新をリスナーに通知"""
+        for listener in self._feed_listeners:
+            try:
+                await listener(feed, value)
+            except Exception as e:
+                logger.error(f"フィード更新通知エラー ({feed}): {e}", exc_info=True)
+
+    async def _notify_new(self, kind: str, events: list[StreamEvent], failed: Collection[str] = ()) -> None:
+        """
+        前回の取り込みから増えたイベントをリスナーに通知
+
+        起動直後の初回取り込み分は既存データとして扱い、通知しない。
+
+        Args:
+            kind: イベント種別
+            events: 今回の取り込みのイベント（キーは「{取得元のコード}:」で始まる）
+            failed: 今回取得に失敗した取得元のコード。失敗した取得元は前回のキーを引き継ぎ、
+                一度も取得できていない取得元は初めて取得できた回のイベントを既存データとして扱う
+                （復旧時に発表中の情報を新しいイベントとして再通知しない）
+        """
+        keys = {event.key for event in events}
+        seen = self._seen.get(kind)
+        unknown = self._unknown_sources.setdefault(kind, set())
+        if seen is None:
+            self._seen[kind] = keys
+            unknown.update(failed)
+            return
+        keys.update(key for key in seen if key.split(":", 1)[0] in failed)
+        self._seen[kind] = keys
+        new_events = [
+            event for event in events
+            if event.key not in seen and event.key.split(":", 1)[0] not in unknown
+        ]
+        unknown.intersection_update(failed)
+        if not new_events:
+            return
+        for listener in self._listeners:
+            try:
+                await listener(new_events)
+            except Exception as e:
+                logger.error(f"イベント通知エラー ({kind}): {e}", exc_info=True)
+
+    def _max_age(self, feed: str) -> float:
+        """フィードの有効期限（取得間隔 × 係数）"""
+        return self.intervals[feed] * self.staleness_factor
+
+    async def ingest_earthquakes(self) -> None:
+        """地震情報を取り込み"""
+        earthquakes = await self.p2p_service.fetch_recent_earthquakes(limit=self.earthquake_limit, fresh=True)
+        self.store.put(
+            FeedStore.EARTHQUAKES, earthquakes,
+            max_age=self._max_age(FeedStore.EARTHQUAKES), capacity=self.earthquake_limit,
+        )
+        # 新しい順に並んでいるため古い順に通知
+        await self._notify_new(EARTHQUAKE, [
+            StreamEvent(kind=EARTHQUAKE, key=eq.id, payload=eq) for eq in reversed(earthquakes)
+        ])
+        await self._notify_updated(FeedStore.EARTHQUAKES, earthquakes)
+
+    async def ingest_warnings(self) -> None:
+        """全国の警報を取り込み（失敗した地域は前回の値を引き継ぐ）"""
+        result = await self.warning_service.fetch_all_prefectures_data(fresh=True)
+        if not result.results:
+            raise RuntimeError("全地域の警報取得に失敗しました")
+
+        previous: Optional[WarningSnapshot] = self.store.get(FeedStore.WARNINGS)
+        data_by_area = dict(result.results)
+        if previous is not None:
+            for area_code in result.failed:
+                if area_code in previous.data_by_area:
+                    data_by_area[area_code] = previous.data_by_area[area_code]
+
+        # 前回の値を引き継いだ地域も全国警報に含めつつ、失敗として記録する
+        collection = self.warning_service.build_collection(
+            FanOutResult(results=data_by_area, failed=result.failed)
+        )
+
+        self.store.put(
+            FeedStore.WARNINGS,
+            WarningSnapshot(data_by_area=data_by_area, collection=collection),
+            max_age=self._max_age(FeedStore.WARNINGS),
+        )
+        events = []
+        for alert in collection.alerts:
+            # 警報IDの形式: {地域コード}_{警報コード}_{発表日時}
+            area_code, code, _ = alert.id.split("_", 2)
+            events.append(StreamEvent(
+                kind=WARNING, key=f"{area_code}:{code}:{alert.area}",
+                payload=alert, area_code=area_code,
+            ))
+        await self._notify_new(WARNING, events, failed=result.failed)
+
+    async def ingest_tsunami(self) -> None:
+        """津波情報を取り込み"""
+        tsunamis = await self.tsunami_service.fetch_tsunami_list(limit=self.tsunami_limit, fresh=True)
+        self.store.put(
+            FeedStore.TSUNAMI, tsunamis,
+            max_age=self._max_age(FeedStore.TSUNAMI), capacity=self.tsunami_limit,
+        )
+        await self._notify_new(TSUNAMI, [
+            StreamEvent(kind=TSUNAMI, key=t.id, payload=t) for t in reversed(tsunamis)
+        ])
+        await self._notify_updated(FeedStore.TSUNAMI, tsunamis)
+
+    async def ingest_volcano_warnings(self) -> None:
+        """火山警報を取り込み"""
+        collection = await self.volcano_service.get_volcano_warnings(fresh=True)
+        if len(collection.failed) == len(self.volcano_service.MONITORED_VOLCANOES):
+            raise RuntimeError("全火山の警報取得に失敗しました")
+        self.store.put(
+            FeedStore.VOLCANO_WARNINGS, collection,
+            max_age=self._max_age(FeedStore.VOLCANO_WARNINGS),
+        )
+        await self._notify_new(VOLCANO, [
+            StreamEvent(
+                kind=VOLCANO,
+                key=f"{w['volcano_code']}:{w['alert_level']}:{w['issued_at']}",
+                payload=w,
+            )
+            for w in collection.warnings
+        ], failed={failure.code for failure in collection.failed})
+
+    async def run_once(self) -> None:
+        """全フィードを1回取り込み"""
+        await asyncio.gather(*(self._run_job(feed) for feed in self._jobs))
+
+    async def _run_job(self, feed: str) -> None:
+        """取り込みジョブを実行（エラーはログのみ）"""
+        try:
+            await self._jobs[feed]()
+        except Exception as e:
+            logger.warning(f"フィード取り込みエラー ({feed}): {e}")
+
+    async def _loop(self, feed: str) -> None:
+        """フィードを一定間隔で取り込み続ける"""
+        interval = self.intervals[feed]
+        while True:
+            await self._run_job(feed)
+            await asyncio.sleep(interval)
+
+    def start(self) -> None:
+        """定期取り込みを開始"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._loop(feed), name=f"ingest:{feed}")
+            for feed in self._jobs
+        ]
+        logger.info(f"バックグラウンド取り込み開始: {', '.join(self._jobs)}")
+
+    async def stop(self) -> None:
+        """定期取り込みを停止"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -6,6 +6,8 @@ from typing import Optional
 from ..models import WeatherInfo, DisasterAlert
 from ..utils.logger import get_logger
 from ..utils.area_codes import AREA_CODES, get_area_code
+from ..utils.http_client import HTTPClientRegistry, http_clients as default_http_clients
+from ..utils.upstream_cache import UpstreamCache, upstream_cache as default_upstream_cache
 
 logger = get_logger(__name__)
 
@@ -13,10 +15,16 @@ logger = get_logger(__name__)
 class JMAService:
     """気象庁データ取得サービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        cache: Optional[UpstreamCache] = None,
+    ):
         from ..config import settings
         self.BASE_URL = settings.jma_base_url
         self.timeout = settings.api_timeout
+        self.http_clients = http_clients or default_http_clients
+        self.cache = cache or default_upstream_cache
         # 都道府県コードマッピング（共通ユーティリティから取得）
         self.AREA_CODES = AREA_CODES
 
@@ -35,23 +43,24 @@ class JMAService:
         """
         url = f"{self.BASE_URL}/forecast/data/overview_forecast/{area_code}.json"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-
-                return WeatherInfo(
-                    area=data.get("targetArea", ""),
-                    area_code=area_code,
-                    publishing_office=data.get("publishingOffice", "気象庁"),
-                    report_datetime=data.get("reportDatetime", ""),
-                    headline=data.get("headlineText"),
-                    text=data.get("text", "")
-                )
-            except httpx.HTTPError as e:
-                logger.error(f"気象情報取得エラー: {e}", exc_info=True)
-                return None
+        try:
+            data = await self.cache.get_or_fetch(
+                "jma", url,
+                loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+                feed="weather",
+            )
+
+            return WeatherInfo(
+                area=data.get("targetArea", ""),
+                area_code=area_code,
+                publishing_office=data.get("publishingOffice", "気象庁"),
+                report_datetime=data.get("reportDatetime", ""),
+                headline=data.get("headlineText"),
+                text=data.get("text", "")
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"気象情報取得エラー: {e}", exc_info=True)
+            return None
 
     async def get_earthquake_list(self, limit: int = 10) -> list[dict]:
         """
@@ -65,15 +74,16 @@ class JMAService:
         """
         url = f"{self.BASE_URL}/quake/data/list.json"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-                return data[:limit]
-            except httpx.HTTPError as e:
-                logger.error(f"地震情報取得エラー: {e}", exc_info=True)
-                return []
+        try:
+            data = await self.cache.get_or_fetch(
+                "jma", url,
+                loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+                feed="earthquakes",
+            )
+            return data[:limit]
+        except httpx.HTTPError as e:
+            logger.error(f"地震情報取得エラー: {e}", exc_info=True)
+            return []
 
     async def get_current_alerts(self) -> list[DisasterAlert]:
         """
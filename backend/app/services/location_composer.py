@@ -0,0 +1,382 @@
+"""
+震源地名の組み立て翻訳
+
+静的マッピングに完全一致しない震源地名を「登録済みの地名 + 方角・海域の接尾辞」に
+分解し、言語毎のテンプレートで翻訳を組み立てます（例: 奈良県北部 = 奈良県 + 北部）。
+
+- 登録済みの地名はトライ木に格納し、震源地名の先頭から最長一致する地名を探します。
+- 残りが既知の接尾辞（北部・南西部・沖・東方沖・近海・付近など）の場合のみ翻訳します。
+- 海域（〇〇沖・〇〇灘・〇〇湾等）や既に接尾辞の付いた地名（〇〇北部・〇〇付近等）は
+  組み立ての元にしません（「三陸沖北部」「大阪府北部沖」等は接尾辞を重ねず、AI翻訳に回します）。
+- 分解できない地名はNoneを返し、呼び出し元がAI翻訳に回します。
+"""
+from typing import Iterable, Mapping, Optional
+
+from .translation_tables import TranslationTables
+
+# 方角（日本語）
+DIRECTIONS = ("北", "南", "東", "西", "北東", "北西", "南東", "南西")
+
+# この語で終わる登録済みの地名は組み立ての元にしない（海域・接尾辞付きの地名）
+NON_BASE_ENDINGS = ("沖", "近海", "付近", "灘", "湾", "海", "水道", "海峡", "部")
+
+# 言語毎の接尾辞テンプレート
+# - part: 〇〇北部など地域の一部（{dir}はpart_directionsの語）
+# - offshore: 〇〇沖
+# - offshore_dir: 〇〇東方沖・〇〇北西沖など（{dir}はcoast_directionsの語）
+# - near_sea: 〇〇近海
+# - vicinity: 〇〇付近
+# part_directions・coast_directionsはDIRECTIONSと同じ順序（part_directionsの末尾は「中」）
+SUFFIX_TEMPLATES: dict[str, dict] = {
+    "en": {
+        "part": "{dir} {base}",
+        "part_directions": (
+            "Northern", "Southern", "Eastern", "Western",
+            "Northeastern", "Northwestern", "Southeastern", "Southwestern", "Central",
+        ),
+        "offshore": "Off the coast of {base}",
+        "offshore_dir": "Off the {dir} coast of {base}",
+        "coast_directions": (
+            "north", "south", "east", "west", "northeast", "northwest", "southeast", "southwest",
+        ),
+        "near_sea": "Near {base}",
+        "vicinity": "Near {base}",
+    },
+    "zh": {
+        "part": "{base}{dir}部",
+        "part_directions": ("北", "南", "东", "西", "东北", "西北", "东南", "西南", "中"),
+        "offshore": "{base}近海",
+        "offshore_dir": "{base}{dir}近海",
+        "coast_directions": ("北方", "南方", "东方", "西方", "东北", "西北", "东南", "西南"),
+        "near_sea": "{base}近海",
+        "vicinity": "{base}附近",
+    },
+    "zh-TW": {
+        "part": "{base}{dir}部",
+        "part_directions": ("北", "南", "東", "西", "東北", "西北", "東南", "西南", "中"),
+        "offshore": "{base}近海",
+        "offshore_dir": "{base}{dir}近海",
+        "coast_directions": ("北方", "南方", "東方", "西方", "東北", "西北", "東南", "西南"),
+        "near_sea": "{base}近海",
+        "vicinity": "{base}附近",
+    },
+    "ko": {
+        "part": "{base} {dir}부",
+        "part_directions": ("북", "남", "동", "서", "북동", "북서", "남동", "남서", "중"),
+        "offshore": "{base} 앞바다",
+        "offshore_dir": "{base} {dir}쪽 앞바다",
+        "coast_directions": ("북", "남", "동", "서", "북동", "북서", "남동", "남서"),
+        "near_sea": "{base} 근해",
+        "vicinity": "{base} 부근",
+    },
+    "vi": {
+        "part": "{dir} {base}",
+        "part_directions": (
+            "Phía bắc", "Phía nam", "Phía đông", "Phía tây",
+            "Đông bắc", "Tây bắc", "Đông nam", "Tây nam", "Miền trung",
+        ),
+        "offshore": "Ngoài khơi {base}",
+        "offshore_dir": "Ngoài khơi phía {dir} {base}",
+        "coast_directions": ("bắc", "nam", "đông", "tây", "đông bắc", "tây bắc", "đông nam", "tây nam"),
+        "near_sea": "Gần {base}",
+        "vicinity": "Gần {base}",
+    },
+    "th": {
+        "part": "{dir}ของ{base}",
+        "part_directions": (
+            "ภาคเหนือ", "ภาคใต้", "ภาคตะวันออก", "ภาคตะวันตก",
+            "ภาคตะวันออกเฉียงเหนือ", "ภาคตะวันตกเฉียงเหนือ",
+            "ภาคตะวันออกเฉียงใต้", "ภาคตะวันตกเฉียงใต้", "ภาคกลาง",
+        ),
+        "offshore": "นอกชายฝั่ง{base}",
+        "offshore_dir": "นอกชายฝั่ง{dir}ของ{base}",
+        "coast_directions": (
+            "เหนือ", "ใต้", "ตะวันออก", "ตะวันตก",
+            "ตะวันออกเฉียงเหนือ", "ตะวันตกเฉียงเหนือ", "ตะวันออกเฉียงใต้", "ตะวันตกเฉียงใต้",
+        ),
+        "near_sea": "ใกล้{base}",
+        "vicinity": "ใกล้{base}",
+    },
+    "id": {
+        "part": "{base} bagian {dir}",
+        "part_directions": (
+            "utara", "selatan", "timur", "barat",
+            "timur laut", "barat laut", "tenggara", "barat daya", "tengah",
+        ),
+        "offshore": "Lepas pantai {base}",
+        "offshore_dir": "Lepas pantai {dir} {base}",
+        "coast_directions": (
+            "utara", "selatan", "timur", "barat", "timur laut", "barat laut", "tenggara", "barat daya",
+        ),
+        "near_sea": "Dekat {base}",
+        "vicinity": "Dekat {base}",
+    },
+    "ms": {
+        "part": "{dir} {base}",
+        "part_directions": (
+            "Utara", "Selatan", "Timur", "Barat",
+            "Timur laut", "Barat laut", "Tenggara", "Barat daya", "Tengah",
+        ),
+        "offshore": "Luar pantai {base}",
+        "offshore_dir": "Luar pantai {dir} {base}",
+        "coast_directions": (
+            "utara", "selatan", "timur", "barat", "timur laut", "barat laut", "tenggara", "barat daya",
+        ),
+        "near_sea": "Berhampiran {base}",
+        "vicinity": "Berhampiran {base}",
+    },
+    "tl": {
+        "part": "{dir} ng {base}",
+        "part_directions": (
+            "Hilaga", "Timog", "Silangan", "Kanluran",
+            "Hilagang-silangan", "Hilagang-kanluran", "Timog-silangan", "Timog-kanluran", "Gitna",
+        ),
+        "offshore": "Sa baybayin ng {base}",
+        "offshore_dir": "Sa baybayin ng {dir} ng {base}",
+        "coast_directions": (
+            "hilaga", "timog", "silangan", "kanluran",
+            "hilagang-silangan", "hilagang-kanluran", "timog-silangan", "timog-kanluran",
+        ),
+        "near_sea": "Malapit sa {base}",
+        "vicinity": "Malapit sa {base}",
+    },
+    "fr": {
+        "part": "{dir} de {base}",
+        "part_directions": (
+            "Nord", "Sud", "Est", "Ouest", "Nord-est", "Nord-ouest", "Sud-est", "Sud-ouest", "Centre",
+        ),
+        "offshore": "Au large de {base}",
+        "offshore_dir": "Au large de la côte {dir} de {base}",
+        "coast_directions": (
+            "nord", "sud", "est", "ouest", "nord-est", "nord-ouest", "sud-est", "sud-ouest",
+        ),
+        "near_sea": "Près de {base}",
+        "vicinity": "Près de {base}",
+    },
+    "de": {
+        "part": "{dir} {base}",
+        "part_directions": (
+            "Nördliche", "Südliche", "Östliche", "Westliche",
+            "Nordöstliche", "Nordwestliche", "Südöstliche", "Südwestliche", "Zentrale",
+        ),
+        "offshore": "Vor der Küste von {base}",
+        "offshore_dir": "Vor der {dir}küste von {base}",
+        "coast_directions": ("Nord", "Süd", "Ost", "West", "Nordost", "Nordwest", "Südost", "Südwest"),
+        "near_sea": "Nahe {base}",
+        "vicinity": "Nahe {base}",
+    },
+    "it": {
+        "part": "{base} {dir}",
+        "part_directions": (
+            "settentrionale", "meridionale", "orientale", "occidentale",
+            "nord-orientale", "nord-occidentale", "sud-orientale", "sud-occidentale", "centrale",
+        ),
+        "offshore": "Al largo di {base}",
+        "offshore_dir": "Al largo della costa {dir} di {base}",
+        "coast_directions": (
+            "settentrionale", "meridionale", "orientale", "occidentale",
+            "nord-orientale", "nord-occidentale", "sud-orientale", "sud-occidentale",
+        ),
+        "near_sea": "Vicino a {base}",
+        "vicinity": "Vicino a {base}",
+    },
+    "es": {
+        "part": "{dir} de {base}",
+        "part_directions": (
+            "Norte", "Sur", "Este", "Oeste", "Noreste", "Noroeste", "Sureste", "Suroeste", "Centro",
+        ),
+        "offshore": "Frente a la costa de {base}",
+        "offshore_dir": "Frente a la costa {dir} de {base}",
+        "coast_directions": (
+            "norte", "sur", "este", "oeste", "noreste", "noroeste", "sureste", "suroeste",
+        ),
+        "near_sea": "Cerca de {base}",
+        "vicinity": "Cerca de {base}",
+    },
+    "ne": {
+        "part": "{base}को {dir} भाग",
+        "part_directions": (
+            "उत्तरी", "दक्षिणी", "पूर्वी", "पश्चिमी",
+            "उत्तरपूर्वी", "उत्तरपश्चिमी", "दक्षिणपूर्वी", "दक्षिणपश्चिमी", "मध्य",
+        ),
+        "offshore": "{base}को तटमा",
+        "offshore_dir": "{base}को {dir} तटमा",
+        "coast_directions": (
+            "उत्तरी", "दक्षिणी", "पूर्वी", "पश्चिमी",
+            "उत्तरपूर्वी", "उत्तरपश्चिमी", "दक्षिणपूर्वी", "दक्षिणपश्चिमी",
+        ),
+        "near_sea": "{base} नजिक",
+        "vicinity": "{base} नजिक",
+    },
+    "easy_ja": {
+        "part": "{base} の {dir}",
+        "part_directions": (
+            "きた", "みなみ", "ひがし", "にし",
+            "きたひがし", "きたにし", "みなみひがし", "みなみにし", "まんなか",
+        ),
+        "offshore": "{base} の うみ",
+        "offshore_dir": "{base} の {dir} の うみ",
+        "coast_directions": (
+            "きた", "みなみ", "ひがし", "にし", "きたひがし", "きたにし", "みなみひがし", "みなみにし",
+        ),
+        "near_sea": "{base} の うみ",
+        "vicinity": "{base} の ちかく",
+    },
+}
+
+
+def build_suffixes() -> dict[str, tuple[str, Optional[int]]]:
+    """
+    接尾辞 → (テンプレートの種類, 方角の位置) の対応表を作成
+
+    〇〇北部・〇〇中部（part）、〇〇沖（offshore）、〇〇東方沖・〇〇北西沖（offshore_dir）、
+    〇〇近海（near_sea）、〇〇付近（vicinity）
+    """
+    suffixes: dict[str, tuple[str, Optional[int]]] = {
+        "沖": ("offshore", None),
+        "近海": ("near_sea", None),
+        "付近": ("vicinity", None),
+        "中部": ("part", len(DIRECTIONS)),
+    }
+    for i, direction in enumerate(DIRECTIONS):
+        suffixes[f"{direction}部"] = ("part", i)
+        # 単独の方角は「東方沖」、複合した方角は「北西沖」
+        suffixes[f"{direction}方沖" if len(direction) == 1 else f"{direction}沖"] = ("offshore_dir", i)
+    return suffixes
+
+
+class LocationTrie:
+    """地名のトライ木（先頭から一致する登録済みの地名を探す）"""
+
+    _END = ""  # 地名の終端を示すキー
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._root: dict = {}
+        self._size = 0
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        node = self._root
+        for char in name:
+            node = node.setdefault(char, {})
+        if self._END not in node:
+            node[self._END] = True
+            self._size += 1
+
+    def prefixes(self, text: str) -> list[int]:
+        """
+        textの先頭と一致する登録済みの地名の長さ（長い順）
+
+        Args:
+            text: 震源地名
+
+        Returns:
+            list[int]: 一致した地名の文字数
+        """
+        lengths = []
+        node = self._root
+        for i, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                lengths.append(i + 1)
+        return lengths[::-1]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def is_base(name: str, suffixes: Iterable[str] = ()) -> bool:
+    """接尾辞を付けて組み立てる元にできる地名か（陸上の地域名で、接尾辞が付いていない）"""
+    return not name.endswith(NON_BASE_ENDINGS) and not any(name.endswith(suffix) for suffix in suffixes)
+
+
+class LocationComposer:
+    """静的マッピングと接尾辞テンプレートによる震源地名の翻訳"""
+
+    def __init__(self, tables: TranslationTables, templates: Mapping[str, dict] = SUFFIX_TEMPLATES):
+        """
+        Args:
+            tables: 静的翻訳テーブル
+            templates: 言語毎の接尾辞テンプレート
+        """
+        self.tables = tables
+        self.templates = templates
+        self.suffixes = build_suffixes()
+        self._trie: Optional[LocationTrie] = None
+        self.stats = {"exact": 0, "composed": 0, "unknown": 0}
+
+    @property
+    def trie(self) -> LocationTrie:
+        """組み立ての元にできる登録済みの地名のトライ木（初回使用時に作成）"""
+        if self._trie is None:
+            self._trie = LocationTrie(
+                name for name in self.tables.location_names() if is_base(name, self.suffixes)
+            )
+        return self._trie
+
+    def decompose(self, location: str) -> Optional[tuple[str, str]]:
+        """
+        震源地名を (登録済みの地名, 接尾辞) に分解
+
+        最長一致した地名から順に、残りが既知の接尾辞になるものを探します。
+
+        Returns:
+            分解できた場合は (地名, 接尾辞)、できない場合はNone
+        """
+        for length in self.trie.prefixes(location):
+            suffix = location[length:]
+            if suffix in self.suffixes:
+                return location[:length], suffix
+        return None
+
+    def compose(self, location: str, target_lang: str) -> Optional[str]:
+        """
+        分解した震源地名の翻訳をテンプレートで組み立て
+
+        Returns:
+            翻訳された地名（分解できない・言語のテンプレートが無い場合はNone）
+        """
+        templates = self.templates.get(target_lang)
+        parts = self.decompose(location) if templates else None
+        if parts is None:
+            return None
+        base, suffix = parts
+        base_translated = self.tables.location(base, target_lang)
+        if not base_translated:
+            return None
+        kind, direction = self.suffixes[suffix]
+        if kind == "part":
+            direction_word = templates["part_directions"][direction]
+        elif kind == "offshore_dir":
+            direction_word = templates["coast_directions"][direction]
+        else:
+            direction_word = ""
+        return templates[kind].format(base=base_translated, dir=direction_word)
+
+    def translate(self, location: str, target_lang: str) -> Optional[str]:
+        """
+        震源地名を静的に翻訳（完全一致 → 組み立ての順）
+
+        Returns:
+            翻訳された地名（AI翻訳が必要な場合はNone）
+        """
+        exact = self.tables.location(location, target_lang)
+        if exact:
+            self.stats["exact"] += 1
+            return exact
+        composed = self.compose(location, target_lang)
+        self.stats["composed" if composed else "unknown"] += 1
+        return composed
+
+    def get_stats(self) -> dict:
+        """完全一致・組み立て・未知（AI翻訳へ）の件数と静的翻訳の割合を取得"""
+        total = sum(self.stats.values())
+        resolved = self.stats["exact"] + self.stats["composed"]
+        return {
+            **self.stats,
+            "hit_rate": round(resolved / total, 4) if total else 0.0,
+            "known_locations": len(self.trie),
+        }
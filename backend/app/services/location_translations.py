@@ -2,6 +2,9 @@
 震源地名の多言語翻訳データ
 気象庁の震源地リストに基づく静的マッピング
 
+編集用のデータです。実行時はtranslation_tablesが言語毎にコンパイルしたファイルを
+読み込むため、このモジュールはコンパイル時のみインポートされます。
+
 対応言語:
 - en: English (英語)
 - zh: 简体中文 (簡体字中国語)
@@ -0,0 +1,270 @@
+"""
+定型文・津波情報・震度の多言語翻訳データ
+
+編集用のデータです。実行時はtranslation_tablesが言語毎にコンパイルしたファイルを
+読み込むため、このモジュールはコンパイル時のみインポートされます。
+"""
+
+# 定型文の多言語テンプレート（15言語対応）
+TEMPLATES: dict[str, dict[str, str]] = {
+    "earthquake": {
+        "ja": "【地震情報】{location}で地震がありました。マグニチュード{magnitude}、最大震度{intensity}。",
+        "en": "[Earthquake] An earthquake occurred in {location}. Magnitude {magnitude}, Maximum intensity {intensity}.",
+        "zh": "【地震信息】{location}发生地震。震级{magnitude}，最大震度{intensity}。",
+        "zh-TW": "【地震資訊】{location}發生地震。規模{magnitude}，最大震度{intensity}。",
+        "ko": "【지진정보】{location}에서 지진이 발생했습니다. 규모 {magnitude}, 최대진도 {intensity}.",
+        "vi": "[Động đất] Động đất xảy ra tại {location}. Cường độ {magnitude}, Cường độ tối đa {intensity}.",
+        "th": "[แผ่นดินไหว] เกิดแผ่นดินไหวที่ {location} ขนาด {magnitude} ความรุนแรงสูงสุด {intensity}",
+        "id": "[Gempa] Gempa bumi terjadi di {location}. Magnitudo {magnitude}, Intensitas maksimum {intensity}.",
+        "ms": "[Gempa Bumi] Gempa bumi berlaku di {location}. Magnitud {magnitude}, Keamatan maksimum {intensity}.",
+        "tl": "[Lindol] Nagkaroon ng lindol sa {location}. Magnitude {magnitude}, Pinakamataas na intensity {intensity}.",
+        "fr": "[Séisme] Un séisme s'est produit à {location}. Magnitude {magnitude}, Intensité maximale {intensity}.",
+        "de": "[Erdbeben] Ein Erdbeben ereignete sich in {location}. Magnitude {magnitude}, Maximale Intensität {intensity}.",
+        "it": "[Terremoto] Si è verificato un terremoto a {location}. Magnitudo {magnitude}, Intensità massima {intensity}.",
+        "es": "[Terremoto] Ocurrió un terremoto en {location}. Magnitud {magnitude}, Intensidad máxima {intensity}.",
+        "ne": "[भूकम्प] {location} मा भूकम्प आयो। म्याग्निच्युड {magnitude}, अधिकतम तीव्रता {intensity}।",
+        "easy_ja": "【じしん】{location}で じしんが ありました。つよさは {intensity} です。",
+    },
+    "tsunami_warning": {
+        "ja": "【津波警報】沿岸部の方は直ちに高台に避難してください。",
+        "en": "[Tsunami Warning] Those in coastal areas should evacuate to higher ground immediately.",
+        "zh": "【海啸警报】沿海地区的人员请立即撤离到高处。",
+        "zh-TW": "【海嘯警報】沿海地區的民眾請立即撤離到高處。",
+        "ko": "【쓰나미 경보】해안 지역에 계신 분들은 즉시 고지대로 대피하세요.",
+        "vi": "[Cảnh báo sóng thần] Những người ở vùng ven biển hãy sơ tán đến nơi cao hơn ngay lập tức.",
+        "th": "[เตือนภัยสึนามิ] ผู้ที่อยู่ในพื้นที่ชายฝั่งควรอพยพไปยังที่สูงทันที",
+        "id": "[Peringatan Tsunami] Mereka yang berada di daerah pesisir harus segera mengungsi ke tempat yang lebih tinggi.",
+        "ms": "[Amaran Tsunami] Mereka yang berada di kawasan pantai perlu berpindah ke kawasan tinggi dengan segera.",
+        "tl": "[Babala ng Tsunami] Ang mga nasa baybayin ay dapat lumikas agad sa mas mataas na lugar.",
+        "fr": "[Alerte Tsunami] Les personnes dans les zones côtières doivent évacuer immédiatement vers les hauteurs.",
+        "de": "[Tsunami-Warnung] Personen in Küstengebieten sollten sofort auf höhergelegene Gebiete evakuieren.",
+        "it": "[Allerta Tsunami] Le persone nelle zone costiere devono evacuare immediatamente verso zone più elevate.",
+        "es": "[Alerta de Tsunami] Las personas en zonas costeras deben evacuar inmediatamente hacia tierras altas.",
+        "ne": "[सुनामी चेतावनी] तटीय क्षेत्रमा हुनुहुनेहरू तुरुन्तै उच्च भूमिमा सर्नुहोस्।",
+        "easy_ja": "【つなみ けいほう】うみの ちかくの ひとは すぐに たかい ところに にげて ください。",
+    },
+    "evacuation": {
+        "ja": "【避難指示】{area}に避難指示が発令されました。直ちに避難してください。",
+        "en": "[Evacuation Order] An evacuation order has been issued for {area}. Please evacuate immediately.",
+        "zh": "【避难指示】{area}已发布避难指示。请立即避难。",
+        "zh-TW": "【避難指示】{area}已發布避難指示。請立即避難。",
+        "ko": "【대피 지시】{area}에 대피 지시가 발령되었습니다. 즉시 대피하세요.",
+        "vi": "[Lệnh sơ tán] Lệnh sơ tán đã được ban hành cho {area}. Hãy sơ tán ngay lập tức.",
+        "th": "[คำสั่งอพยพ] มีคำสั่งอพยพสำหรับ {area} กรุณาอพยพทันที",
+        "id": "[Perintah Evakuasi] Perintah evakuasi telah dikeluarkan untuk {area}. Harap segera mengungsi.",
+        "ms": "[Arahan Pemindahan] Arahan pemindahan telah dikeluarkan untuk {area}. Sila berpindah segera.",
+        "tl": "[Utos ng Paglikas] May utos ng paglikas para sa {area}. Mangyaring lumikas agad.",
+        "fr": "[Ordre d'évacuation] Un ordre d'évacuation a été émis pour {area}. Veuillez évacuer immédiatement.",
+        "de": "[Evakuierungsbefehl] Für {area} wurde ein Evakuierungsbefehl erlassen. Bitte evakuieren Sie sofort.",
+        "it": "[Ordine di Evacuazione] È stato emesso un ordine di evacuazione per {area}. Si prega di evacuare immediatamente.",
+        "es": "[Orden de Evacuación] Se ha emitido una orden de evacuación para {area}. Por favor evacúe inmediatamente.",
+        "ne": "[खाली गर्ने आदेश] {area} को लागि खाली गर्ने आदेश जारी गरिएको छ। कृपया तुरुन्तै खाली गर्नुहोस्।",
+        "easy_ja": "【ひなん しじ】{area}の ひとは すぐに にげて ください。",
+    },
+    "no_tsunami": {
+        "ja": "この地震による津波の心配はありません。",
+        "en": "There is no tsunami risk from this earthquake.",
+        "zh": "此次地震没有海啸风险。",
+        "zh-TW": "此次地震沒有海嘯風險。",
+        "ko": "이 지진으로 인한 쓰나미 위험은 없습니다.",
+        "vi": "Không có nguy cơ sóng thần từ trận động đất này.",
+        "th": "ไม่มีความเสี่ยงจากสึนามิจากแผ่นดินไหวครั้งนี้",
+        "id": "Tidak ada risiko tsunami dari gempa ini.",
+        "ms": "Tiada risiko tsunami daripada gempa bumi ini.",
+        "tl": "Walang panganib ng tsunami mula sa lindol na ito.",
+        "fr": "Il n'y a pas de risque de tsunami suite à ce séisme.",
+        "de": "Es besteht keine Tsunami-Gefahr durch dieses Erdbeben.",
+        "it": "Non c'è rischio di tsunami da questo terremoto.",
+        "es": "No hay riesgo de tsunami por este terremoto.",
+        "ne": "यस भूकम्पबाट सुनामीको जोखिम छैन।",
+        "easy_ja": "この じしんで つなみの しんぱいは ありません。",
+    },
+    "shelter_info": {
+        "ja": "最寄りの避難所: {shelter_name}（{distance}km）",
+        "en": "Nearest shelter: {shelter_name} ({distance}km)",
+        "zh": "最近的避难所: {shelter_name}（{distance}公里）",
+        "zh-TW": "最近的避難所: {shelter_name}（{distance}公里）",
+        "ko": "가장 가까운 대피소: {shelter_name}({distance}km)",
+        "vi": "Nơi trú ẩn gần nhất: {shelter_name} ({distance}km)",
+        "th": "ที่พักพิงใกล้ที่สุด: {shelter_name} ({distance} กม.)",
+        "id": "Tempat pengungsian terdekat: {shelter_name} ({distance}km)",
+        "ms": "Pusat pemindahan terdekat: {shelter_name} ({distance}km)",
+        "tl": "Pinakamalapit na evacuation center: {shelter_name} ({distance}km)",
+        "fr": "Abri le plus proche: {shelter_name} ({distance}km)",
+        "de": "Nächste Notunterkunft: {shelter_name} ({distance}km)",
+        "it": "Rifugio più vicino: {shelter_name} ({distance}km)",
+        "es": "Refugio más cercano: {shelter_name} ({distance}km)",
+        "ne": "नजिकको आश्रय: {shelter_name} ({distance} किमी)",
+        "easy_ja": "ちかくの ひなんじょ: {shelter_name}（{distance}キロメートル）",
+    }
+}
+
+# 津波情報の翻訳（15言語対応）
+TSUNAMI_TRANSLATIONS: dict[str, dict[str, str]] = {
+    "なし": {
+        "en": "None",
+        "zh": "无",
+        "zh-TW": "無",
+        "ko": "없음",
+        "vi": "Không có",
+        "th": "ไม่มี",
+        "id": "Tidak ada",
+        "ms": "Tiada",
+        "tl": "Wala",
+        "fr": "Aucun",
+        "de": "Keine",
+        "it": "Nessuno",
+        "es": "Ninguno",
+        "ne": "छैन",
+        "easy_ja": "なし",
+    },
+    "不明": {
+        "en": "Unknown",
+        "zh": "不明",
+        "zh-TW": "不明",
+        "ko": "불명",
+        "vi": "Không rõ",
+        "th": "ไม่ทราบ",
+        "id": "Tidak diketahui",
+        "ms": "Tidak diketahui",
+        "tl": "Hindi alam",
+        "fr": "Inconnu",
+        "de": "Unbekannt",
+        "it": "Sconosciuto",
+        "es": "Desconocido",
+        "ne": "अज्ञात",
+        "easy_ja": "わからない",
+    },
+    "調査中": {
+        "en": "Under investigation",
+        "zh": "调查中",
+        "zh-TW": "調查中",
+        "ko": "조사 중",
+        "vi": "Đang điều tra",
+        "th": "กำลังตรวจสอบ",
+        "id": "Sedang diselidiki",
+        "ms": "Sedang disiasat",
+        "tl": "Sinisiyasat",
+        "fr": "En cours d'investigation",
+        "de": "Wird untersucht",
+        "it": "In fase di indagine",
+        "es": "En investigación",
+        "ne": "अनुसन्धान गर्दै",
+        "easy_ja": "しらべている",
+    },
+    "若干の海面変動": {
+        "en": "Slight sea level change",
+        "zh": "轻微海面变动",
+        "zh-TW": "輕微海面變動",
+        "ko": "약간의 해수면 변동",
+        "vi": "Biến động mực nước biển nhẹ",
+        "th": "ระดับน้ำทะเลเปลี่ยนแปลงเล็กน้อย",
+        "id": "Perubahan permukaan laut sedikit",
+        "ms": "Perubahan aras laut sedikit",
+        "tl": "Bahagyang pagbabago sa antas ng dagat",
+        "fr": "Léger changement du niveau de la mer",
+        "de": "Leichte Meeresspiegeländerung",
+        "it": "Leggero cambiamento del livello del mare",
+        "es": "Ligero cambio en el nivel del mar",
+        "ne": "समुद्र सतहमा थोरै परिवर्तन",
+        "easy_ja": "うみの たかさが すこし かわる",
+    },
+    "津波注意報": {
+        "en": "Tsunami Advisory",
+        "zh": "海啸注意报",
+        "zh-TW": "海嘯注意報",
+        "ko": "쓰나미 주의보",
+        "vi": "Cảnh báo sóng thần",
+        "th": "คำเตือนสึนามิ",
+        "id": "Peringatan Tsunami",
+        "ms": "Nasihat Tsunami",
+        "tl": "Payo sa Tsunami",
+        "fr": "Avis de tsunami",
+        "de": "Tsunami-Hinweis",
+        "it": "Avviso tsunami",
+        "es": "Aviso de tsunami",
+        "ne": "सुनामी सावधानी",
+        "easy_ja": "つなみ ちゅういほう",
+    },
+    "津波警報": {
+        "en": "Tsunami Warning",
+        "zh": "海啸警报",
+        "zh-TW": "海嘯警報",
+        "ko": "쓰나미 경보",
+        "vi": "Cảnh báo sóng thần nghiêm trọng",
+        "th": "เตือนภัยสึนามิ",
+        "id": "Peringatan Tsunami Serius",
+        "ms": "Amaran Tsunami",
+        "tl": "Babala ng Tsunami",
+        "fr": "Alerte tsunami",
+        "de": "Tsunami-Warnung",
+        "it": "Allerta tsunami",
+        "es": "Alerta de tsunami",
+        "ne": "सुनामी चेतावनी",
+        "easy_ja": "つなみ けいほう",
+    },
+}
+
+# 震度翻訳（JMA震度階級、10震度 x 16言語）
+INTENSITY_TRANSLATIONS: dict[str, dict[str, str]] = {
+    "0": {
+        "ja": "震度0", "en": "0", "zh": "0", "zh-TW": "0", "ko": "0",
+        "vi": "0", "th": "0", "id": "0", "ms": "0", "tl": "0",
+        "fr": "0", "de": "0", "it": "0", "es": "0", "ne": "0",
+        "easy_ja": "しんど 0",
+    },
+    "1": {
+        "ja": "震度1", "en": "1", "zh": "1", "zh-TW": "1", "ko": "1",
+        "vi": "1", "th": "1", "id": "1", "ms": "1", "tl": "1",
+        "fr": "1", "de": "1", "it": "1", "es": "1", "ne": "1",
+        "easy_ja": "しんど 1",
+    },
+    "2": {
+        "ja": "震度2", "en": "2", "zh": "2", "zh-TW": "2", "ko": "2",
+        "vi": "2", "th": "2", "id": "2", "ms": "2", "tl": "2",
+        "fr": "2", "de": "2", "it": "2", "es": "2", "ne": "2",
+        "easy_ja": "しんど 2",
+    },
+    "3": {
+        "ja": "震度3", "en": "3", "zh": "3", "zh-TW": "3", "ko": "3",
+        "vi": "3", "th": "3", "id": "3", "ms": "3", "tl": "3",
+        "fr": "3", "de": "3", "it": "3", "es": "3", "ne": "3",
+        "easy_ja": "しんど 3",
+    },
+    "4": {
+        "ja": "震度4", "en": "4", "zh": "4", "zh-TW": "4", "ko": "4",
+        "vi": "4", "th": "4", "id": "4", "ms": "4", "tl": "4",
+        "fr": "4", "de": "4", "it": "4", "es": "4", "ne": "4",
+        "easy_ja": "しんど 4",
+    },
+    "5弱": {
+        "ja": "震度5弱", "en": "5 Lower", "zh": "5弱", "zh-TW": "5弱", "ko": "5약",
+        "vi": "5 yếu", "th": "5 อ่อน", "id": "5 Lemah", "ms": "5 Lemah", "tl": "5 Mahina",
+        "fr": "5 Faible", "de": "5 Schwach", "it": "5 Debole", "es": "5 Inferior", "ne": "5 कमजोर",
+        "easy_ja": "しんど 5じゃく",
+    },
+    "5強": {
+        "ja": "震度5強", "en": "5 Upper", "zh": "5强", "zh-TW": "5強", "ko": "5강",
+        "vi": "5 mạnh", "th": "5 แรง", "id": "5 Kuat", "ms": "5 Kuat", "tl": "5 Malakas",
+        "fr": "5 Fort", "de": "5 Stark", "it": "5 Forte", "es": "5 Superior", "ne": "5 बलियो",
+        "easy_ja": "しんど 5きょう",
+    },
+    "6弱": {
+        "ja": "震度6弱", "en": "6 Lower", "zh": "6弱", "zh-TW": "6弱", "ko": "6약",
+        "vi": "6 yếu", "th": "6 อ่อน", "id": "6 Lemah", "ms": "6 Lemah", "tl": "6 Mahina",
+        "fr": "6 Faible", "de": "6 Schwach", "it": "6 Debole", "es": "6 Inferior", "ne": "6 कमजोर",
+        "easy_ja": "しんど 6じゃく",
+    },
+    "6強": {
+        "ja": "震度6強", "en": "6 Upper", "zh": "6强", "zh-TW": "6強", "ko": "6강",
+        "vi": "6 mạnh", "th": "6 แรง", "id": "6 Kuat", "ms": "6 Kuat", "tl": "6 Malakas",
+        "fr": "6 Fort", "de": "6 Stark", "it": "6 Forte", "es": "6 Superior", "ne": "6 बलियो",
+        "easy_ja": "しんど 6きょう",
+    },
+    "7": {
+        "ja": "震度7", "en": "7", "zh": "7", "zh-TW": "7", "ko": "7",
+        "vi": "7", "th": "7", "id": "7", "ms": "7", "tl": "7",
+        "fr": "7", "de": "7", "it": "7", "es": "7", "ne": "7",
+        "easy_ja": "しんど 7",
+    },
+}
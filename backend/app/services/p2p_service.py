@@ -5,6 +5,8 @@ import httpx
 from typing import Optional
 from ..models import EarthquakeInfo
 from ..utils.logger import get_logger
+from ..utils.http_client import HTTPClientRegistry, http_clients as default_http_clients
+from ..utils.upstream_cache import UpstreamCache, upstream_cache as default_upstream_cache
 
 logger = get_logger(__name__)
 
@@ -12,10 +14,16 @@ logger = get_logger(__name__)
 class P2PQuakeService:
     """P2P地震情報サービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        cache: Optional[UpstreamCache] = None,
+    ):
         from ..config import settings
         self.BASE_URL = settings.p2p_base_url
         self.timeout = settings.api_timeout
+        self.http_clients = http_clients or default_http_clients
+        self.cache = cache or default_upstream_cache
 
     # 震度変換マッピング
     INTENSITY_MAP = {
@@ -53,28 +61,56 @@ class P2PQuakeService:
         Raises:
             httpx.HTTPError: APIリクエストに失敗した場合（内部でキャッチされ、空リストを返す）
         """
+        try:
+            return await self.fetch_recent_earthquakes(limit=limit)
+        except httpx.HTTPError as e:
+            logger.error(f"P2P地震情報取得エラー: {e}", exc_info=True)
+            return []
+
+    async def fetch_recent_earthquakes(self, limit: int = 10, fresh: bool = False) -> list[EarthquakeInfo]:
+        """
+        最新の地震情報を取得（取得エラーを呼び出し元に伝播）
+
+        Args:
+            limit: 取得件数
+            fresh: Trueの場合はキャッシュを使わずに上流から取得（定期取り込み用）
+
+        Returns:
+            list[EarthquakeInfo]: 地震情報リスト
+
+        Raises:
+            httpx.HTTPError: APIリクエストに失敗した場合
+        """
         url = f"{self.BASE_URL}/history"
         params = {
             "codes": 551,  # 地震情報コード
             "limit": limit
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-
-                earthquakes = []
-                for item in data:
-                    eq = self._parse_earthquake(item)
-                    if eq:
-                        earthquakes.append(eq)
-
-                return earthquakes
-            except httpx.HTTPError as e:
-                logger.error(f"P2P地震情報取得エラー: {e}", exc_info=True)
-                return []
+        data = await self.cache.get_or_fetch(
+            "p2p", url,
+            loader=lambda: self.http_clients.get_json(url, params=params, timeout=self.timeout),
+            params=params,
+            feed="earthquakes",
+            fresh=fresh,
+        )
+
+        # キャッシュヒットで同一のJSONが返された場合はパースをスキップ
+        earthquakes = self.http_clients.parse_cached(
+            (url, limit), data, self._parse_earthquakes
+        )
+        # エンドポイント側で翻訳フィールドを書き換えるためコピーを返す
+        return [eq.model_copy() for eq in earthquakes]
+
+    def _parse_earthquakes(self, data: list) -> list[EarthquakeInfo]:
+        """APIレスポンスを地震情報リストにパース"""
+        earthquakes = []
+        for item in data:
+            eq = self._parse_earthquake(item)
+            if eq:
+                earthquakes.append(eq)
+
+        return earthquakes
 
     def _parse_earthquake(self, data: dict) -> Optional[EarthquakeInfo]:
         """
@@ -176,11 +212,13 @@ class P2PQuakeService:
             "limit": limit
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, params=params, timeout=self.timeout)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"体感報告取得エラー: {e}", exc_info=True)
-                return []
+        try:
+            return await self.cache.get_or_fetch(
+                "p2p", url,
+                loader=lambda: self.http_clients.get_json(url, params=params, timeout=self.timeout),
+                params=params,
+                feed="earthquakes",
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"体感報告取得エラー: {e}", exc_info=True)
+            return []
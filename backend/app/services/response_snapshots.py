@@ -0,0 +1,178 @@
+"""
+言語毎のレスポンススナップショット
+
+バックグラウンド取り込みで地震・津波情報が更新される度に、各項目を言語毎に1回だけ
+翻訳・シリアライズし、(フィード, 言語, 件数) 毎のレスポンス本文（JSONのバイト列）を
+作成しておきます。エンドポイントは作成済みのバイト列をそのまま返すため、
+リクエスト毎の翻訳・Pydanticの検証・シリアライズを行いません。
+
+- 項目毎のレンダリング結果は元データが変わらない限り再利用し、新しい項目のみ翻訳します。
+- 翻訳が期限内に完了しなかった項目は保持せず、次回の取り込みで再度翻訳します。
+- レンダリングは取り込みを待たせないようフィード毎のバックグラウンドタスクで行い、
+  同じフィードが再度更新された場合は前回のレンダリングをキャンセルして置き換えます。
+- スナップショットは作成元のフィードの値が最新かつ有効期限内の場合のみ使用します。
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from .ingestion import FeedStore
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 本文を事前に連結しておく件数（それ以外の件数は項目のバイト列を連結して返す）
+LIMIT_BUCKETS = (10, 20, 50, 100)
+
+# 項目の一覧を指定言語に翻訳し、項目毎に翻訳が完了したか（期限切れでないか）を返す関数
+Renderer = Callable[[list, str], Awaitable[list[bool]]]
+
+
+@dataclass
+class RenderedFeed:
+    """1つのフィード・言語のレンダリング結果"""
+    source: Any  # 作成元のフィードの値（FeedStoreの値と同一の場合のみ有効）
+    items: list[bytes] = field(default_factory=list)  # 項目毎のJSON
+    bodies: dict[int, bytes] = field(default_factory=dict)  # 件数 → レスポンス本文
+
+
+def join_items(items: list[bytes]) -> bytes:
+    """項目毎のJSONをJSON配列に連結"""
+    return b"[" + b",".join(items) + b"]"
+
+
+class ResponseSnapshots:
+    """取り込み済みフィードの言語毎のレスポンス本文"""
+
+    def __init__(
+        self,
+        store: FeedStore,
+        languages: Iterable[str],
+        limit_buckets: tuple[int, ...] = LIMIT_BUCKETS,
+    ):
+        """
+        Args:
+            store: 取り込み済みフィードのストア
+            languages: レンダリングする言語コード
+            limit_buckets: 本文を事前に連結しておく件数
+        """
+        self.store = store
+        self.languages = list(languages)
+        self.limit_buckets = limit_buckets
+        self._renderers: dict[str, Renderer] = {}
+        # (フィード, 言語) → 項目ID → (元データのJSON, レンダリング済みのJSON)
+        self._items: dict[tuple[str, str], dict[str, tuple[bytes, bytes]]] = {}
+        self._rendered: dict[tuple[str, str], RenderedFeed] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}  # フィード → レンダリング中のタスク
+        self.stats = {"hits": 0, "misses": 0, "rendered_items": 0, "reused_items": 0}
+
+    def add_renderer(self, feed: str, renderer: Renderer) -> None:
+        """フィードの項目を翻訳する関数を登録"""
+        self._renderers[feed] = renderer
+
+    async def refresh(self, feed: str, items: Any) -> None:
+        """
+        フィードの更新を受けて全言語のレスポンス本文の作成を開始（取り込みのリスナー）
+
+        作成はバックグラウンドで行い、同じフィードの作成中のタスクはキャンセルする。
+
+        Args:
+            feed: フィード名
+            items: FeedStoreに保存された項目の一覧（Pydanticモデル）
+        """
+        renderer = self._renderers.get(feed)
+        if renderer is None:
+            return
+        previous = self._refreshing.pop(feed, None)
+        if previous is not None:
+            previous.cancel()
+        task = asyncio.create_task(self._refresh(feed, items, renderer))
+        self._refreshing[feed] = task
+        task.add_done_callback(lambda done: self._finish_refresh(feed, done))
+
+    def _finish_refresh(self, feed: str, task: asyncio.Task) -> None:
+        if self._refreshing.get(feed) is task:
+            del self._refreshing[feed]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"レスポンスのレンダリングエラー ({feed}): {task.exception()}", exc_info=task.exception())
+
+    async def drain(self) -> None:
+        """作成中のレスポンス本文の完了を待つ"""
+        while self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """作成中のレスポンス本文のタスクをキャンセル"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _refresh(self, feed: str, items: Any, renderer: Renderer) -> None:
+        sources = [(item.id, item.model_dump_json().encode()) for item in items]
+        await asyncio.gather(*(
+            self._render_language(feed, lang, items, sources, renderer) for lang in self.languages
+        ))
+
+    async def _render_language(
+        self, feed: str, lang: str, items: list, sources: list[tuple[str, bytes]], renderer: Renderer
+    ) -> None:
+        previous = self._items.get((feed, lang), {})
+        current: dict[str, tuple[bytes, bytes]] = {}
+        rendered: list[Optional[bytes]] = []
+        pending = []  # 翻訳が必要な (位置, 項目のコピー)
+        for i, (item, (item_id, source)) in enumerate(zip(items, sources)):
+            cached = previous.get(item_id)
+            if lang == "ja":
+                rendered.append(source)
+            elif cached is not None and cached[0] == source:
+                rendered.append(cached[1])
+                current[item_id] = cached
+                self.stats["reused_items"] += 1
+            else:
+                rendered.append(None)
+                pending.append((i, item.model_copy()))
+
+        if pending:
+            try:
+                completed = await renderer([copy for _, copy in pending], lang)
+            except Exception as e:
+                logger.error(f"レスポンスのレンダリングエラー ({feed}, {lang}): {e}", exc_info=True)
+                return
+            for (i, copy), complete in zip(pending, completed):
+                body = copy.model_dump_json().encode()
+                rendered[i] = body
+                self.stats["rendered_items"] += 1
+                if complete:
+                    item_id, source = sources[i]
+                    current[item_id] = (source, body)
+
+        self._items[(feed, lang)] = current
+        self._rendered[(feed, lang)] = RenderedFeed(
+            source=items,
+            items=rendered,
+            bodies={limit: join_items(rendered[:limit]) for limit in self.limit_buckets},
+        )
+
+    def get(self, feed: str, lang: str, limit: int) -> Optional[bytes]:
+        """
+        作成済みのレスポンス本文を取得
+
+        フィードが更新・期限切れの場合や、取り込み件数を超える件数の場合はNoneを返す
+        （エンドポイントは従来通り翻訳して応答する）
+        """
+        rendered = self._rendered.get((feed, lang))
+        snapshot = self.store.snapshot(feed)
+        if (
+            rendered is None or snapshot is None or rendered.source is not snapshot.value
+            or limit < 1 or (snapshot.capacity is not None and limit > snapshot.capacity)
+        ):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        body = rendered.bodies.get(limit)
+        return body if body is not None else join_items(rendered.items[:limit])
+
+    def get_stats(self) -> dict[str, int]:
+        """スナップショットの利用状況を取得"""
+        return {**self.stats, "snapshots": len(self._rendered)}
@@ -0,0 +1,344 @@
+"""
+安全ガイドの事前生成
+
+地域名を指定しない安全ガイド（災害種別 × 重要度 × 言語 = 6 × 4 × 16通り）を
+事前にAIで生成して保存し、エンドポイントはAIを呼び出さずに返します。
+
+- 生成済みのガイドはJSON Linesのファイルに1件ずつ追記します。中断しても
+  次回は未生成の組み合わせのみを生成します（ファイル自体がチェックポイント）。
+- 各行には生成時のその組み合わせのプロンプトの指紋を記録し、プロンプトが変わった
+  組み合わせ（重要度の説明・言語名の変更等）のみ作り直します。
+- 同時生成数はconcurrencyで制限します（AIプロバイダー毎の上限も適用されます）。
+- 複数のワーカーが同時に起動した場合は、ロックファイルを取得した1つのみが生成します。
+  他のワーカーは、保存済みのガイドに無い組み合わせを要求された時にファイルを読み直します
+  （読み直しはreload_interval秒に1回まで、イベントループの外で行います）。
+- 生成の完了後、古いプロンプトの行・重複した行・壊れた行を除いてファイルを書き直します。
+
+使用方法（backendディレクトリで実行）:
+    python -m app.services.safety_guides [--concurrency 4] [--lang en,th]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ..utils.fanout import gather_bounded
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MATRIX_NAME = "safety_guides.jsonl"
+SEVERITIES = ("low", "medium", "high", "extreme")
+LOCK_STALE_SECONDS = 3600.0  # これより古いロックファイルは中断した生成のものとして扱う
+RELOAD_INTERVAL_SECONDS = 30.0  # 保存済みのガイドに無い組み合わせの要求でファイルを確認する最短間隔
+
+GuideKey = tuple[str, str, str]  # (災害種別, 重要度, 言語)
+
+
+@dataclass
+class WarmUpResult:
+    """事前生成の結果"""
+    generated: int = 0
+    failed: list[str] = field(default_factory=list)  # "災害種別:重要度:言語"
+    skipped: int = 0  # 生成済みの件数
+
+
+class SafetyGuideMatrix:
+    """事前生成した安全ガイドの保存先"""
+
+    def __init__(
+        self,
+        translator,
+        path: Path,
+        concurrency: int = 4,
+        timeout: float = 60.0,
+        reload_interval: float = RELOAD_INTERVAL_SECONDS,
+    ):
+        """
+        Args:
+            translator: TranslatorService
+            path: 保存先のJSON Linesファイル
+            concurrency: 同時生成数
+            timeout: 1件あたりの生成のタイムアウト（秒）
+            reload_interval: 他のプロセスが追記したファイルを確認する最短間隔（秒）
+        """
+        self.translator = translator
+        self.path = Path(path)
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.reload_interval = reload_interval
+        self._checked_at = time.monotonic()
+        self._fingerprints: dict[GuideKey, str] = {}
+        self.version = self.prompt_version()
+        self._guides: dict[GuideKey, dict] = {}
+        self._mtime_ns: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self.load()
+
+    def fingerprint(self, key: GuideKey) -> str:
+        """組み合わせのプロンプトの指紋（実際に使用するプロンプトから求める）"""
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            disaster_type, severity, lang = key
+            prompt = self.translator.build_safety_guide_prompt(disaster_type, lang, None, severity)
+            fingerprint = self._fingerprints[key] = hashlib.md5(prompt.encode()).hexdigest()[:12]
+        return fingerprint
+
+    def prompt_version(self) -> str:
+        """全ての組み合わせのプロンプトの指紋（いずれかのプロンプトが変わると変わる）"""
+        digest = hashlib.md5()
+        for key in self.keys():
+            digest.update(f"{':'.join(key)}={self.fingerprint(key)}\n".encode())
+        return digest.hexdigest()[:12]
+
+    def keys(self, languages: Optional[Iterable[str]] = None) -> list[GuideKey]:
+        """事前生成する組み合わせ"""
+        languages = list(languages) if languages is not None else list(self.translator.LANGUAGE_NAMES)
+        return [
+            (disaster_type, severity, lang)
+            for disaster_type in self.translator.DISASTER_TYPES
+            for severity in SEVERITIES
+            for lang in languages
+        ]
+
+    def _read_records(self) -> tuple[dict[GuideKey, dict], int, int]:
+        """
+        保存済みの行を読み込み（古いプロンプトの行・壊れた行は読み飛ばす）
+
+        Returns:
+            (組み合わせ -> 最後の有効な行, 古いプロンプトの行数, 不要な行数（古い・重複・壊れた行）)
+        """
+        records: dict[GuideKey, dict] = {}
+        stale = dropped = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = tuple(record["key"])
+                    record["guide"]  # ガイドの無い行はKeyError
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # 書き込み途中で中断した行
+                    dropped += 1
+                    continue
+                if len(key) != 3 or record.get("prompt") != self.fingerprint(key):
+                    stale += 1
+                    continue
+                if key in records:
+                    dropped += 1
+                records[key] = record
+        return records, stale, dropped + stale
+
+    def load(self) -> None:
+        """保存済みのガイドを読み込み（古いプロンプトの行・壊れた行は読み飛ばす）"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._guides, self._mtime_ns = {}, None
+            return
+        records, stale, _ = self._read_records()
+        self._guides = {key: record["guide"] for key, record in records.items()}
+        self._mtime_ns = stat.st_mtime_ns
+        if stale:
+            logger.info(f"古いプロンプトの安全ガイドを{stale}件読み飛ばしました（再生成します）")
+
+    def _compact(self) -> None:
+        """古いプロンプトの行・重複した行・壊れた行を除いてファイルを書き直す"""
+        try:
+            records, _, dropped = self._read_records()
+        except FileNotFoundError:
+            return
+        if not dropped:
+            return
+        # 書き直し中に読み込んだプロセスが書きかけのファイルを読まないよう、一時ファイルから置き換える
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for record in records.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self._mtime_ns = self.path.stat().st_mtime_ns
+        logger.info(f"安全ガイドのファイルを書き直しました: {len(records)}件（{dropped}行を削除）")
+
+    def _reload_if_changed(self) -> None:
+        """他のプロセスが追記した場合は読み直す"""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns != self._mtime_ns:
+            self.load()
+
+    async def get(self, disaster_type: str, severity: str, lang: str) -> Optional[dict]:
+        """
+        事前生成した安全ガイド（無い場合はNone）
+
+        保存済みのガイドに無い場合は、他のプロセスが追記したファイルをイベントループの外で
+        読み直す。要求毎にファイルを確認しないよう、確認はreload_interval秒に1回までとする。
+        """
+        key = (disaster_type, severity, lang)
+        guide = self._guides.get(key)
+        if guide is None:
+            now = time.monotonic()
+            if now - self._checked_at < self.reload_interval:
+                return None
+            self._checked_at = now
+            await asyncio.to_thread(self._reload_if_changed)
+            guide = self._guides.get(key)
+            if guide is None:
+                return None
+        return {**guide, "cached": True, "source": "pregenerated"}
+
+    def missing(self, languages: Optional[Iterable[str]] = None) -> list[GuideKey]:
+        """未生成の組み合わせ"""
+        return [key for key in self.keys(languages) if key not in self._guides]
+
+    def _append(self, key: GuideKey, guide: dict) -> None:
+        """1件を追記（1行を1回のwriteで書き込む）"""
+        record = {
+            "key": list(key), "prompt": self.fingerprint(key), "guide": guide,
+            "generated_at": datetime.now().isoformat(),
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a+b") as f:
+            # 書き込み途中で中断した行に続けて書くと追記した行も壊れるため、改行してから書く
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+
+    async def _generate(self, key: GuideKey) -> dict:
+        disaster_type, severity, lang = key
+        guide = await self.translator.generate_safety_guide_with_ai(disaster_type, lang, None, severity)
+        if not guide:
+            raise RuntimeError("安全ガイドを生成できませんでした")
+        await asyncio.to_thread(self._append, key, guide)
+        self._guides[key] = guide
+        return guide
+
+    def _acquire_lock(self) -> bool:
+        """生成用のロックファイルを作成（他のプロセスが生成中の場合はFalse）"""
+        lock = self.path.with_name(self.path.name + ".lock")
+        lock.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - lock.stat().st_mtime < LOCK_STALE_SECONDS:
+                        return False
+                    lock.unlink()
+                except FileNotFoundError:
+                    pass
+        return False
+
+    def _release_lock(self) -> None:
+        self.path.with_name(self.path.name + ".lock").unlink(missing_ok=True)
+
+    async def warm_up(self, languages: Optional[Iterable[str]] = None) -> WarmUpResult:
+        """
+        未生成の安全ガイドを生成
+
+        Args:
+            languages: 生成する言語（省略時は全対応言語）
+
+        Returns:
+            WarmUpResult: 生成・失敗・生成済みの件数
+        """
+        keys = self.keys(languages)
+        await asyncio.to_thread(self._reload_if_changed)
+        missing = [key for key in keys if key not in self._guides]
+        result = WarmUpResult(skipped=len(keys) - len(missing))
+        if not missing:
+            return result
+        if not self.translator.get_active_provider():
+            logger.info("AIプロバイダーが未設定のため安全ガイドの事前生成を行いません")
+            result.failed = [":".join(key) for key in missing]
+            return result
+        if not self._acquire_lock():
+            logger.info("他のプロセスが安全ガイドを事前生成中のため省略します")
+            return result
+        try:
+            logger.info(f"安全ガイドの事前生成開始: {len(missing)}件（生成済み{result.skipped}件）")
+            fanout = await gather_bounded(missing, self._generate, self.concurrency, self.timeout)
+            await asyncio.to_thread(self._compact)
+        finally:
+            self._release_lock()
+        result.generated = len(fanout.results)
+        result.failed = [":".join(key) for key in fanout.failed]
+        logger.info(f"安全ガイドの事前生成完了: 生成{result.generated}件・失敗{len(result.failed)}件")
+        return result
+
+    def start(self) -> None:
+        """事前生成をバックグラウンドで開始（起動時用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.warm_up(), name="safety_guides:warm_up")
+
+    async def stop(self) -> None:
+        """バックグラウンドの事前生成を中断（生成済みの分は保存済み）"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def status(self) -> dict:
+        """事前生成の状況"""
+        total = len(self.keys())
+        return {
+            "prompt_version": self.version,
+            "generated": sum(1 for key in self.keys() if key in self._guides),
+            "total": total,
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+async def _run(args) -> WarmUpResult:
+    from ..config import settings
+    from .translator import TranslatorService
+
+    translator = TranslatorService()
+    matrix = SafetyGuideMatrix(
+        translator, args.output,
+        concurrency=args.concurrency, timeout=settings.ai_timeout_generate * 2,
+    )
+    languages = [lang.strip() for lang in args.lang.split(",") if lang.strip()] if args.lang else None
+    try:
+        return await matrix.warm_up(languages)
+    finally:
+        await translator.aclose()
+        await translator.http_clients.aclose()
+
+
+def main():
+    from ..config import settings
+
+    parser = argparse.ArgumentParser(description="安全ガイドを事前生成")
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.cache_dir) / MATRIX_NAME,
+        help="保存先（既定: cache_dir/safety_guides.jsonl）",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.safety_guide_warmup_concurrency, help="同時生成数",
+    )
+    parser.add_argument("--lang", default=None, help="生成する言語（カンマ区切り、既定: 全対応言語）")
+    args = parser.parse_args()
+
+    result = asyncio.run(_run(args))
+    print(f"生成: {result.generated}件  生成済み: {result.skipped}件  失敗: {len(result.failed)}件")
+    for key in result.failed[:20]:
+        print(f"  失敗: {key}")
+
+
+if __name__ == "__main__":
+    main()
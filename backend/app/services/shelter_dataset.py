@@ -0,0 +1,112 @@
+"""
+避難所データセット
+
+避難所ストアと、そこから作成する検索用の構造（空間インデックス・距離計算エンジン・
+災害種別の対象行・IDから行への表・地図表示用のクラスタ）を1つにまとめます。
+
+データセットは作成後に変更しません。サービスはデータセットへの参照を1回の代入で
+差し替え、各検索は開始時に参照したデータセットのみを使用するため、
+再読み込み中の検索が読み込み途中のデータを参照することはありません。
+条件毎のキャッシュ（bool配列・災害種別で絞り込んだクラスタ）は同じデータから
+求まる値のみを保持するため、データセット毎に持ちます。
+
+スナップショットから開いたストアでは、災害種別毎の対象行・IDの検索・空き状況の初期値を
+スナップショット上の列から参照し、起動時に避難所数に比例する構築を行いません。
+地図表示用のクラスタは初回の要求時に作成します。
+
+例外として避難所の状況（避難者数・開設状況）はShelterStatusを通して行毎に更新します。
+状況は検索用の構造に含まれないため、更新してもインデックス等は再構築しません。
+"""
+from typing import Optional
+
+from ..utils.cluster_pyramid import ClusterPyramid
+from ..utils.distance_engine import NUMPY_AVAILABLE, DistanceEngine, bits_mask, buffer_view
+from ..utils.spatial_index import GridIndex
+from .shelter_status import ShelterStatus
+from .shelter_store import ShelterStore
+
+
+class ShelterDataset:
+    """避難所ストアと検索用の構造（作成後は変更しない）"""
+
+    __slots__ = (
+        "store", "index", "engine", "types", "_pyramid", "status", "available_view", "remaining_view",
+        "cluster_max_zoom", "typed_pyramid_cache_size", "_type_masks", "_typed_pyramids",
+    )
+
+    def __init__(
+        self,
+        store: ShelterStore,
+        index: Optional[GridIndex] = None,
+        cluster_max_zoom: int = 12,
+        typed_pyramid_cache_size: int = 16,
+    ):
+        """
+        Args:
+            store: 避難所ストア
+            index: 空間インデックス（省略時はストアから構築）
+            cluster_max_zoom: クラスタを作成する最大のズームレベル
+            typed_pyramid_cache_size: 災害種別で絞り込んだクラスタを保持する条件数の上限
+        """
+        self.store = store
+        self.index = index or GridIndex(store.points())
+        # NumPyが利用可能な場合は座標を連続配列で保持し、距離をまとめて計算する
+        # （空間インデックスの計算済みのラジアン列を共有する）
+        self.engine: Optional[DistanceEngine] = (
+            DistanceEngine.from_columns(store.latitudes, store.longitudes, radians=self.index.columns())
+            if NUMPY_AVAILABLE else None
+        )
+        # 災害種別毎の対象行・IDから行への表を事前に求めておく（スナップショットでは作成済み）
+        self.types = store.type_index()
+        store.index_ids()
+        # 空き状況（DistanceEngine用には更新が反映される参照を持つ）
+        self.status = ShelterStatus(store)
+        self.available_view = buffer_view(self.status.available, bool) if NUMPY_AVAILABLE else None
+        self.remaining_view = buffer_view(self.status.remaining, "i4") if NUMPY_AVAILABLE else None
+        # 地図表示用のクラスタ（初回要求時に作成）
+        self.cluster_max_zoom = cluster_max_zoom
+        self.typed_pyramid_cache_size = typed_pyramid_cache_size
+        self._pyramid: Optional[ClusterPyramid] = None
+        self._type_masks: dict = {}
+        self._typed_pyramids: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @property
+    def pyramid(self) -> ClusterPyramid:
+        """全避難所のクラスタ（初回参照時に作成）"""
+        if self._pyramid is None:
+            self._pyramid = self._build_pyramid()
+        return self._pyramid
+
+    def _build_pyramid(self, rows=None) -> ClusterPyramid:
+        """ズームレベル毎のクラスタを作成"""
+        store = self.store
+        return ClusterPyramid(
+            store.latitudes, store.longitudes, store.type_masks, store.capacities,
+            rows=rows, max_zoom=self.cluster_max_zoom,
+        )
+
+    def pyramid_for(self, bits: Optional[int], match_all: bool) -> ClusterPyramid:
+        """災害種別の条件に対応するクラスタ"""
+        if bits is None:
+            return self.pyramid
+        key = (bits, match_all)
+        pyramid = self._typed_pyramids.get(key)
+        if pyramid is None:
+            if len(self._typed_pyramids) >= self.typed_pyramid_cache_size:
+                self._typed_pyramids.pop(next(iter(self._typed_pyramids)), None)
+            pyramid = self._build_pyramid(self.types.rows(bits, match_all))
+            self._typed_pyramids[key] = pyramid
+        return pyramid
+
+    def type_mask(self, bits: Optional[int], match_all: bool = True):
+        """災害種別の条件を満たす避難所のbool配列（DistanceEngine用）"""
+        if bits is None:
+            return None
+        mask = self._type_masks.get((bits, match_all))
+        if mask is None:
+            mask = bits_mask(self.store.type_masks, bits, match_all)
+            self._type_masks[(bits, match_all)] = mask
+        return mask
@@ -0,0 +1,343 @@
+"""
+避難所データ取り込みパイプライン
+
+国土地理院の指定緊急避難場所データ（CSV / GeoJSON）を1行（1地物）ずつ読み込み、
+検証・正規化した上で、起動時に読み込む取り込み済みデータ（gzip圧縮のJSON Lines）を書き出します。
+入力ファイル全体をメモリに載せないため、数百MBのファイルでもメモリ使用量は一定です。
+
+使用方法（backendディレクトリで実行）:
+    python -m app.services.shelter_loader <入力ファイル(.csv/.geojson)> [--output 出力先] [--no-snapshot]
+
+取り込み済みデータと同じディレクトリに、ワーカーがmmapで開くバイナリスナップショットも作成します。
+"""
+import argparse
+import codecs
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 取り込み済みデータのファイル名（shelter_data_dir配下）
+ARTIFACT_NAME = "shelters.jsonl.gz"
+
+# 災害種別コードと国土地理院データの列名
+DISASTER_COLUMNS = {
+    "flood": "洪水",
+    "landslide": "崖崩れ、土石流及び地滑り",
+    "storm_surge": "高潮",
+    "earthquake": "地震",
+    "tsunami": "津波",
+    "fire": "大規模な火事",
+    "inland_flood": "内水氾濫",
+    "volcano": "火山現象",
+}
+
+# 地理院地図のGeoJSONでは災害種別が disaster1〜8 の順で格納される
+GEOJSON_DISASTER_KEYS = {code: f"disaster{i}" for i, code in enumerate(DISASTER_COLUMNS, start=1)}
+
+# 列名の別表記（自治体・配布形式による揺れを吸収）
+ID_COLUMNS = ("共通ID", "ID", "id")
+NAME_COLUMNS = ("施設・場所名", "名称", "施設名", "name")
+ADDRESS_COLUMNS = ("住所", "所在地", "address")
+LAT_COLUMNS = ("緯度", "lat", "latitude")
+LON_COLUMNS = ("経度", "lon", "longitude")
+CAPACITY_COLUMNS = ("想定収容人数", "収容人数", "capacity")
+
+# 対象とする座標の範囲（日本の国土 + 余裕）
+LAT_BOUNDS = (20.0, 46.5)
+LON_BOUNDS = (122.0, 154.5)
+
+# 災害種別の対象を示す値
+TRUE_FLAGS = {"1", "○", "◯", "●", "true", "yes", "y"}
+
+READ_CHUNK_SIZE = 1 << 16
+
+
+class ShelterDataError(ValueError):
+    """避難所データの行が不正な場合のエラー"""
+
+
+@dataclass
+class LoadStats:
+    """取り込み結果の統計"""
+    rows: int = 0
+    written: int = 0
+    skipped: dict[str, int] = field(default_factory=dict)
+
+    def skip(self, reason: str) -> None:
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+
+def _first(row: dict, columns: tuple[str, ...]) -> Optional[str]:
+    """別表記のいずれかの列の値を取得"""
+    for column in columns:
+        value = row.get(column)
+        if value is not None and str(value).strip() != "":
+            return str(value).strip()
+    return None
+
+
+def _is_flag_set(value: Any) -> bool:
+    """災害種別の対象フラグを判定"""
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value == 1
+    return str(value).strip().lower() in TRUE_FLAGS
+
+
+def normalize_record(row: dict, flag_keys: Optional[dict[str, str]] = None) -> dict:
+    """
+    国土地理院データの1行を避難所レコードに正規化
+
+    Args:
+        row: 列名 -> 値
+        flag_keys: 災害種別コード -> 列名（省略時はCSVの列名）
+
+    Returns:
+        dict: ShelterInfoのフィールドを持つレコード
+
+    Raises:
+        ShelterDataError: 必須項目の欠落・座標が不正な場合
+    """
+    name = _first(row, NAME_COLUMNS)
+    if not name:
+        raise ShelterDataError("missing_name")
+
+    try:
+        lat = float(_first(row, LAT_COLUMNS) or "")
+        lon = float(_first(row, LON_COLUMNS) or "")
+    except ValueError:
+        raise ShelterDataError("invalid_coordinates")
+    if not (LAT_BOUNDS[0] <= lat <= LAT_BOUNDS[1] and LON_BOUNDS[0] <= lon <= LON_BOUNDS[1]):
+        raise ShelterDataError("out_of_bounds")
+
+    flag_keys = flag_keys or DISASTER_COLUMNS
+    types = [code for code, key in flag_keys.items() if _is_flag_set(row.get(key))]
+
+    capacity = None
+    capacity_value = _first(row, CAPACITY_COLUMNS)
+    if capacity_value:
+        try:
+            capacity = int(float(capacity_value.replace(",", "")))
+        except ValueError:
+            capacity = None
+
+    address = _first(row, ADDRESS_COLUMNS) or ""
+    shelter_id = _first(row, ID_COLUMNS)
+    if not shelter_id:
+        # IDが無いデータは名称・座標から安定したIDを生成する
+        digest = hashlib.sha1(f"{name}|{lat:.6f}|{lon:.6f}".encode("utf-8")).hexdigest()[:12]
+        shelter_id = f"gsi_{digest}"
+
+    return {
+        "id": shelter_id,
+        "name": name,
+        "address": address,
+        "latitude": round(lat, 6),
+        "longitude": round(lon, 6),
+        "capacity": capacity,
+        "types": types,
+    }
+
+
+def _detect_encoding(stream: IO[bytes]) -> str:
+    """先頭部分からCSVの文字コードを判定（UTF-8 BOM / UTF-8 / Shift_JIS）"""
+    head = stream.read(READ_CHUNK_SIZE)
+    stream.seek(0)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # 末尾のマルチバイト文字が途中で切れていても判定できるよう増分デコーダを使う
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp932"
+
+
+def iter_csv_rows(path: Path) -> Iterator[dict]:
+    """CSVを1行ずつ読み込み"""
+    with open(path, "rb") as raw:
+        encoding = _detect_encoding(raw)
+        with io.TextIOWrapper(raw, encoding=encoding, newline="") as text:
+            yield from csv.DictReader(text)
+
+
+def iter_geojson_features(path: Path) -> Iterator[dict]:
+    """
+    GeoJSONのfeaturesを1件ずつ読み込み
+
+    features配列の要素を順にデコードし、デコード済みの部分はバッファから捨てる。
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8-sig") as f:
+        buffer = ""
+        pos = 0
+
+        def fill() -> bool:
+            nonlocal buffer, pos
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        # features配列の開始位置まで読み進める
+        while True:
+            key = buffer.find('"features"')
+            start = buffer.find("[", key) if key >= 0 else -1
+            if start >= 0:
+                pos = start + 1
+                break
+            if not fill():
+                raise ShelterDataError("features配列が見つかりません")
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                if not fill():
+                    raise ShelterDataError("features配列が閉じられていません")
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                feature, pos_end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 地物の途中でバッファが切れている
+                if not fill():
+                    raise
+                continue
+            pos = pos_end
+            yield feature
+
+
+def geojson_feature_to_row(feature: dict) -> tuple[dict, dict[str, str]]:
+    """GeoJSONの地物を列名 -> 値の行と災害種別の列名に変換"""
+    properties = dict(feature.get("properties") or {})
+    geometry = feature.get("geometry") or {}
+    coordinates = geometry.get("coordinates") or []
+    if geometry.get("type") == "Point" and len(coordinates) >= 2:
+        # GeoJSONの座標は [経度, 緯度]
+        properties.setdefault("経度", coordinates[0])
+        properties.setdefault("緯度", coordinates[1])
+
+    flag_keys = DISASTER_COLUMNS
+    if any(key in properties for key in GEOJSON_DISASTER_KEYS.values()):
+        flag_keys = GEOJSON_DISASTER_KEYS
+    return properties, flag_keys
+
+
+def iter_shelter_records(path: Path, stats: Optional[LoadStats] = None) -> Iterator[dict]:
+    """
+    国土地理院データ（CSV / GeoJSON）を正規化した避難所レコードとして1件ずつ取得
+
+    不正な行はスキップし、理由をstatsに記録する。同じIDの行は最初の1件のみを採用する。
+    """
+    stats = stats if stats is not None else LoadStats()
+    suffix = path.suffix.lower()
+    if suffix in (".geojson", ".json"):
+        rows = (geojson_feature_to_row(f) for f in iter_geojson_features(path))
+    elif suffix == ".csv":
+        rows = ((row, DISASTER_COLUMNS) for row in iter_csv_rows(path))
+    else:
+        raise ShelterDataError(f"未対応の形式です: {path.name}")
+
+    seen_ids: set[str] = set()
+    for row, flag_keys in rows:
+        stats.rows += 1
+        try:
+            record = normalize_record(row, flag_keys)
+        except ShelterDataError as e:
+            stats.skip(str(e))
+            continue
+        if record["id"] in seen_ids:
+            stats.skip("duplicate_id")
+            continue
+        seen_ids.add(record["id"])
+        yield record
+
+
+def build_artifact(source: Path, output: Path) -> LoadStats:
+    """
+    国土地理院データから取り込み済みデータを作成
+
+    一時ファイルに書き出してから置き換えるため、読み込み中のプロセスが
+    書きかけのファイルを読むことはない。
+
+    Args:
+        source: 入力ファイル（.csv / .geojson）
+        output: 出力先（gzip圧縮のJSON Lines）
+
+    Returns:
+        LoadStats: 取り込み結果の統計
+    """
+    stats = LoadStats()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + ".tmp")
+    try:
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as out:
+            for record in iter_shelter_records(source, stats):
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                out.write("\n")
+                stats.written += 1
+        os.replace(tmp, output)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+    logger.info(
+        f"避難所データ取り込み完了: {stats.written}/{stats.rows}件 "
+        f"(スキップ: {stats.skipped or 'なし'}) -> {output}"
+    )
+    return stats
+
+
+def iter_artifact(path: Path) -> Iterator[dict]:
+    """取り込み済みデータのレコードを1件ずつ読み込み"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    from ..config import settings
+
+    parser = argparse.ArgumentParser(description="国土地理院の避難所データを取り込み")
+    parser.add_argument("source", type=Path, help="入力ファイル（.csv / .geojson）")
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.shelter_data_dir) / ARTIFACT_NAME,
+        help="出力先（既定: shelter_data_dir/shelters.jsonl.gz）",
+    )
+    parser.add_argument(
+        "--no-snapshot", action="store_true", help="バイナリスナップショットを作成しない",
+    )
+    args = parser.parse_args()
+
+    stats = build_artifact(args.source, args.output)
+    print(f"{stats.written}/{stats.rows}件を書き出しました: {args.output}")
+    for reason, count in sorted(stats.skipped.items()):
+        print(f"  スキップ ({reason}): {count}件")
+
+    if not args.no_snapshot:
+        from .shelter_snapshot import SNAPSHOT_NAME, build_snapshot
+        snapshot = args.output.with_name(SNAPSHOT_NAME)
+        build_snapshot(args.output, snapshot)
+        print(f"スナップショットを作成しました: {snapshot}")
+
+
+if __name__ == "__main__":
+    main()
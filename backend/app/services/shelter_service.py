@@ -2,13 +2,25 @@
 避難所データサービス
 国土地理院の避難所データを利用
 """
+import asyncio
 import httpx
-import math
 import json
+import math
+import tempfile
 from typing import Optional
 from pathlib import Path
-from ..models import ShelterInfo
+from ..models import ShelterCluster, ShelterInfo, ShelterViewport
 from ..utils.logger import get_logger
+from ..utils.cluster_pyramid import ClusterLevel, tile_bounds
+from ..utils.distance_engine import buffer_view
+from ..utils.spatial_index import GridIndex, haversine_km
+from ..utils.http_client import http_clients
+from ..utils.single_flight import SingleFlight
+from .shelter_loader import ARTIFACT_NAME, build_artifact, iter_artifact
+from .shelter_dataset import ShelterDataset
+from .shelter_status import StatusUpdate, UpdateResult
+from .shelter_store import ShelterStore, mask_matches, mask_to_types, query_mask
+from .shelter_snapshot import SNAPSHOT_NAME, MappedShelterStore, SnapshotError, build_snapshot
 
 logger = get_logger(__name__)
 
@@ -19,10 +31,29 @@ class ShelterService:
     # 国土地理院の避難所データURL
     GSI_SHELTER_URL = "https://www.geospatial.jp/ckan/dataset/hinanbasho"
 
+    # 災害種別で絞り込んだ対象がこの件数以下の場合、空間インデックスを使わず対象全件と距離を計算する
+    TYPE_SCAN_LIMIT = 4096
+
+    # このズームレベル以下はクラスタ、超える場合は避難所をそのまま返す
+    CLUSTER_MAX_ZOOM = 12
+    MAX_ZOOM = 22
+    # CLUSTER_MAX_ZOOMを超えるズームで避難所をそのまま返す範囲の上限（経度・緯度の幅）
+    # 1024px程度の地図をCLUSTER_MAX_ZOOM + 1で表示した範囲（より広い範囲はクラスタで返す）
+    SHELTER_BBOX_MAX_SPAN = 4 * 360.0 / 2 ** (CLUSTER_MAX_ZOOM + 1)
+    # 災害種別で絞り込んだクラスタを保持する条件数の上限
+    TYPED_PYRAMID_CACHE_SIZE = 16
+    # データ取得時にまとめてファイルに書き込む大きさ（書き込み毎にスレッドへ渡すため大きめにする）
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
+
     def __init__(self):
         from ..config import settings
         self.DATA_DIR = settings.shelter_data_dir
-        self._shelters_cache: list[ShelterInfo] = []
+        self._reload_flight = SingleFlight()
+        self._fetch_count = 0  # 国土地理院からの取得の開始回数
+        # 適用済みの状況の更新（ID -> (通番, 避難者数, 開設中)）。再読み込み後のデータにも反映する
+        self._status_log: dict[str, tuple[int, int, bool]] = {}
+        self._status_seq = 0
+        self._data = self._make_dataset(ShelterStore())
         self._load_shelter_data()
 
     # 災害種別マッピング
@@ -39,20 +70,147 @@ class ShelterService:
 
 
     def _load_shelter_data(self):
-        """避難所データをロード"""
+        """避難所データをロード（失敗時はサンプルデータ）"""
         try:
-            # サンプルデータをロード（実際のデータに置き換え可能）
-            sample_file = Path(self.DATA_DIR) / "sample_shelters.json"
-            if sample_file.exists():
-                with open(sample_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self._shelters_cache = [ShelterInfo(**s) for s in data]
-            else:
-                # デフォルトのサンプルデータ
-                self._shelters_cache = self._get_sample_shelters()
+            self._data = self._read_dataset()
         except Exception as e:
             logger.error(f"避難所データロードエラー: {e}", exc_info=True)
-            self._shelters_cache = self._get_sample_shelters()
+            self._set_store(ShelterStore.from_models(self._get_sample_shelters()))
+
+    def _read_dataset(self) -> ShelterDataset:
+        """
+        ファイルから避難所データセットを作成（現在のデータセットは変更しない）
+
+        スナップショット → 取り込み済みの国土地理院データ → サンプルデータの順に読み込む。
+        """
+        snapshot_file = Path(self.DATA_DIR) / SNAPSHOT_NAME
+        artifact_file = Path(self.DATA_DIR) / ARTIFACT_NAME
+        sample_file = Path(self.DATA_DIR) / "sample_shelters.json"
+        if snapshot_file.exists():
+            data = self._read_snapshot(snapshot_file, artifact_file)
+            if data is not None:
+                return data
+        if artifact_file.exists():
+            # 1件ずつ列に追加するため、全件分のモデルを作らない
+            store = ShelterStore.from_records(iter_artifact(artifact_file))
+            logger.info(f"避難所データロード: {len(store)}件")
+        elif sample_file.exists():
+            with open(sample_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                store = ShelterStore.from_records(ShelterInfo(**s).model_dump() for s in data)
+        else:
+            # デフォルトのサンプルデータ
+            store = ShelterStore.from_models(self._get_sample_shelters())
+        return self._make_dataset(store)
+
+    def _read_snapshot(self, snapshot_file: Path, artifact_file: Path) -> Optional[ShelterDataset]:
+        """
+        スナップショットをmmapで開いてデータセットを作成（解析・インデックス構築を行わない）
+
+        Returns:
+            Optional[ShelterDataset]: データセット（破損・古い場合はNone）
+        """
+        try:
+            store = MappedShelterStore(
+                snapshot_file, source=artifact_file if artifact_file.exists() else None
+            )
+        except (SnapshotError, OSError) as e:
+            logger.warning(f"避難所スナップショットを使用できません: {e}")
+            return None
+        logger.info(f"避難所スナップショットロード: {len(store)}件")
+        return self._make_dataset(store, index=store.grid_index())
+
+    def _make_dataset(self, store: ShelterStore, index: Optional[GridIndex] = None) -> ShelterDataset:
+        """ストアから検索用の構造を含むデータセットを作成"""
+        return ShelterDataset(
+            store, index=index,
+            cluster_max_zoom=self.CLUSTER_MAX_ZOOM,
+            typed_pyramid_cache_size=self.TYPED_PYRAMID_CACHE_SIZE,
+        )
+
+    def _set_store(self, store: ShelterStore, index: Optional[GridIndex] = None):
+        """避難所データを設定し、空間インデックスを構築"""
+        self._data = self._make_dataset(store, index)
+
+    async def reload(self) -> int:
+        """
+        避難所データを読み直して差し替え
+
+        新しいデータセットはイベントループの外で作成し、完成後に参照を差し替える。
+        処理中の検索は差し替え前のデータセットで完了する。読み込みに失敗した場合は
+        例外を送出し、現在のデータセットを使い続ける。同時に呼ばれた場合は1回のみ読み込む。
+
+        Returns:
+            int: 差し替え後の避難所数
+        """
+        return await self._reload_flight.do("reload", self._reload)
+
+    async def _reload(self) -> int:
+        # 状況の更新は新しいデータにも反映する（読み込み中に届いた更新は差し替え直前に反映）
+        seq = self._status_seq
+        log = dict(self._status_log)
+        data = await asyncio.to_thread(self._read_dataset_with_status, log)
+        self._replay_status(data, {k: v for k, v in self._status_log.items() if v[0] > seq})
+        self._data = data
+        logger.info(f"避難所データを差し替えました: {len(data)}件")
+        return len(data)
+
+    def _read_dataset_with_status(self, log: dict[str, tuple[int, int, bool]]) -> ShelterDataset:
+        data = self._read_dataset()
+        self._replay_status(data, log)
+        return data
+
+    @staticmethod
+    def _replay_status(data: ShelterDataset, log: dict[str, tuple[int, int, bool]]) -> None:
+        """適用済みの状況の更新をデータセットに反映"""
+        for shelter_id, (_, occupancy, is_open) in log.items():
+            row = data.store.row_of(shelter_id)
+            if row is not None:
+                data.status.set(row, occupancy, is_open)
+
+    def apply_status_updates(self, updates: list[StatusUpdate], result: Optional[UpdateResult] = None) -> UpdateResult:
+        """
+        避難所の避難者数・開設状況の更新を反映（インデックス等は再構築しない）
+
+        Args:
+            updates: 更新の一覧（同じ避難所の更新は順に反映）
+            result: 適用結果（解析時の件数・エラーを含める場合に指定）
+
+        Returns:
+            UpdateResult: 適用結果
+        """
+        result = result or UpdateResult(received=len(updates))
+        data = self._data
+        row_of = data.store.row_of
+        status = data.status
+        log = self._status_log
+        for update in updates:
+            row = row_of(update.shelter_id)
+            if row is None:
+                result.unknown += 1
+                continue
+            occupancy, is_open = status.apply(row, update)
+            self._status_seq += 1
+            log[update.shelter_id] = (self._status_seq, occupancy, is_open)
+            result.applied += 1
+        return result
+
+    def count(self) -> int:
+        """現在のデータセットの避難所数"""
+        return len(self._data)
+
+    @staticmethod
+    def _type_filter(disaster_type: Optional[str]) -> Optional[int]:
+        """
+        災害種別（カンマ区切りで複数指定可）を検索条件のビットマスクに変換
+
+        Returns:
+            Optional[int]: ビットマスク（指定なしの場合None、未知の種別を含む場合0）
+        """
+        codes = [c.strip() for c in (disaster_type or "").split(",") if c.strip()]
+        if not codes:
+            return None
+        return query_mask(codes) or 0
 
     def _get_sample_shelters(self) -> list[ShelterInfo]:
         """サンプル避難所データ（東京都の主要避難所）"""
@@ -120,7 +278,8 @@ class ShelterService:
         lon: float,
         radius_km: float = 5.0,
         limit: int = 20,
-        disaster_type: Optional[str] = None
+        disaster_type: Optional[str] = None,
+        match_all: bool = True
     ) -> list[ShelterInfo]:
         """
         指定座標から近い避難所を取得
@@ -130,30 +289,273 @@ class ShelterService:
             lon: 経度
             radius_km: 検索半径（km）
             limit: 取得件数上限
-            disaster_type: 災害種別でフィルタリング
+            disaster_type: 災害種別でフィルタリング（カンマ区切りで複数指定可）
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
+
+        Returns:
+            list[ShelterInfo]: 近い順にソートされた避難所リスト
+        """
+        # 検索中にデータセットが差し替えられても、開始時に参照したデータセットのみを使う
+        data = self._data
+        bits = self._type_filter(disaster_type)
+        if bits == 0:
+            return []
+        return self._with_distances(
+            data, self._nearest_hits(data, lat, lon, radius_km, limit, bits, match_all)
+        )
+
+    def _nearest_hits(
+        self,
+        data: ShelterDataset,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        limit: int,
+        bits: Optional[int],
+        match_all: bool
+    ) -> list[tuple[float, int]]:
+        """近い順にlimit件の (距離km, 添字)"""
+        if data.engine is not None:
+            indices = None
+            if bits is not None:
+                rows = data.types.rows(bits, match_all)
+                if len(rows) <= self.TYPE_SCAN_LIMIT:
+                    # 対象が少ない災害種別は対象全件との距離を直接計算する
+                    indices = rows
+            if indices is None:
+                # 空間インデックスで候補を絞り込み、種別の条件を満たす候補との距離を配列演算でまとめて計算
+                return data.engine.nearest(
+                    lat, lon, k=limit, max_km=radius_km,
+                    mask=data.type_mask(bits, match_all),
+                    indices=data.index.candidates(lat, lon, radius_km),
+                )
+            return data.engine.nearest(lat, lon, k=limit, max_km=radius_km, indices=indices)
+
+        predicate = None
+        if bits is not None:
+            # 災害種別フィルタリング（距離計算の前にビットマスクで判定）
+            type_masks = data.store.type_masks
+            predicate = lambda i: mask_matches(type_masks[i], bits, match_all)
+        # 空間インデックスで半径内の近い順にlimit件を取得
+        return data.index.nearest(lat, lon, k=limit, max_km=radius_km, predicate=predicate)
+
+    def get_available_shelters(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float = 10.0,
+        limit: int = 20,
+        min_remaining: int = 1,
+        disaster_type: Optional[str] = None,
+        match_all: bool = True
+    ) -> list[ShelterInfo]:
+        """
+        受け入れ可能な（開設中で満員でない）避難所を近い順に取得
+
+        収容人数が未設定の避難所は開設中であれば受け入れ可能とみなす。
+
+        Args:
+            lat: 緯度
+            lon: 経度
+            radius_km: 検索半径（km）
+            limit: 取得件数上限
+            min_remaining: 必要な残り収容人数（家族等の人数）
+            disaster_type: 災害種別でフィルタリング（カンマ区切りで複数指定可）
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
 
         Returns:
             list[ShelterInfo]: 近い順にソートされた避難所リスト
         """
-        shelters_with_distance = []
+        data = self._data
+        bits = self._type_filter(disaster_type)
+        if bits == 0:
+            return []
+        candidates = data.index.candidates(lat, lon, radius_km)
+        if data.engine is not None:
+            # 距離計算の前に受け入れ可否の列で候補を絞り込む
+            indices = buffer_view(candidates, "u4").astype("intp")
+            indices = indices[data.available_view[indices]]
+            if min_remaining > 1:
+                indices = indices[data.remaining_view[indices] >= min_remaining]
+            hits = data.engine.nearest(
+                lat, lon, k=limit, max_km=radius_km,
+                mask=data.type_mask(bits, match_all), indices=indices,
+            )
+        else:
+            status = data.status
+            type_masks = data.store.type_masks
+
+            def predicate(i: int) -> bool:
+                if not status.has_room(i, min_remaining):
+                    return False
+                return bits is None or mask_matches(type_masks[i], bits, match_all)
+
+            hits = data.index.nearest(lat, lon, k=limit, max_km=radius_km, predicate=predicate)
+        return self._with_distances(data, hits)
+
+    def get_nearby_shelters_batch(
+        self,
+        points: list[tuple[float, float]],
+        radius_km: float = 5.0,
+        limit: int = 20,
+        disaster_type: Optional[str] = None,
+        match_all: bool = True
+    ) -> list[list[ShelterInfo]]:
+        """
+        複数地点それぞれの近い避難所を一括取得（住所一覧に対する一括処理用）
 
-        for shelter in self._shelters_cache:
-            # 距離計算（Haversine公式）
-            distance = self._calculate_distance(lat, lon, shelter.latitude, shelter.longitude)
+        Args:
+            points: (緯度, 経度) のリスト
+            radius_km: 検索半径（km）
+            limit: 地点毎の取得件数上限
+            disaster_type: 災害種別でフィルタリング（カンマ区切りで複数指定可）
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
+
+        Returns:
+            list[list[ShelterInfo]]: 地点毎の近い順の避難所リスト（入力順）
+        """
+        data = self._data
+        bits = self._type_filter(disaster_type)
+        if bits == 0:
+            return [[] for _ in points]
+        if data.engine is None:
+            batch_hits = [
+                self._nearest_hits(data, lat, lon, radius_km, limit, bits, match_all)
+                for lat, lon in points
+            ]
+        else:
+            batch_hits = data.engine.nearest_batch(
+                [lat for lat, _ in points], [lon for _, lon in points],
+                k=limit, max_km=radius_km, mask=data.type_mask(bits, match_all),
+            )
+        return [self._with_distances(data, hits) for hits in batch_hits]
+
+    def get_shelters_in_bbox(
+        self,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        zoom: Optional[int] = None,
+        limit: int = 500,
+        disaster_type: Optional[str] = None,
+        match_all: bool = True
+    ) -> ShelterViewport:
+        """
+        地図の表示範囲の避難所を取得（低ズームではクラスタ）
+
+        Args:
+            south, west, north, east: 表示範囲の南端・西端・北端・東端
+            zoom: 地図のズームレベル（省略時は範囲の大きさから決定。
+                CLUSTER_MAX_ZOOMを超えていても範囲がSHELTER_BBOX_MAX_SPANより広い場合はクラスタ）
+            limit: 返すクラスタ・避難所の件数上限
+            disaster_type: 災害種別でフィルタリング（カンマ区切りで複数指定可）
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
+
+        Returns:
+            ShelterViewport: クラスタまたは避難所
+        """
+        if zoom is None:
+            # 1024px程度の地図に範囲全体が収まるズームレベル
+            span = max(east - west, 1e-9)
+            zoom = int(math.floor(math.log2(4 * 360.0 / span)))
+        zoom = max(0, min(zoom, self.MAX_ZOOM))
+        data = self._data
+        if zoom > data.cluster_max_zoom and max(east - west, north - south) > self.SHELTER_BBOX_MAX_SPAN:
+            # 広い範囲の避難所を全件走査しないよう、クラスタで返す
+            zoom = data.cluster_max_zoom
+        bits = self._type_filter(disaster_type)
+        if bits == 0:
+            return ShelterViewport(zoom=zoom)
+
+        if zoom <= data.cluster_max_zoom:
+            pyramid = data.pyramid_for(bits, match_all)
+            clusters = pyramid.bbox(zoom, south, west, north, east)
+            return self._cluster_viewport(data, pyramid.levels[zoom], clusters, limit)
+        return self._shelter_viewport(
+            data, zoom, data.index.in_bbox(south, west, north, east), limit, bits, match_all
+        )
 
-            if distance <= radius_km:
-                # 災害種別フィルタリング
-                if disaster_type and disaster_type not in shelter.types:
-                    continue
+    def get_shelter_tile(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        limit: int = 500,
+        disaster_type: Optional[str] = None,
+        match_all: bool = True
+    ) -> ShelterViewport:
+        """
+        地図タイル（z/x/y）の避難所を取得（低ズームではクラスタ）
 
-                shelter_copy = shelter.model_copy()
-                shelter_copy.distance = round(distance, 2)
-                shelters_with_distance.append(shelter_copy)
+        Args:
+            z, x, y: タイル座標（Webメルカトル）
+            limit: 返すクラスタ・避難所の件数上限
+            disaster_type: 災害種別でフィルタリング（カンマ区切りで複数指定可）
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
 
-        # 距離順にソート
-        shelters_with_distance.sort(key=lambda s: s.distance or float('inf'))
+        Returns:
+            ShelterViewport: クラスタまたは避難所
+        """
+        data = self._data
+        bits = self._type_filter(disaster_type)
+        if bits == 0:
+            return ShelterViewport(zoom=z)
+
+        if z <= data.cluster_max_zoom:
+            pyramid = data.pyramid_for(bits, match_all)
+            return self._cluster_viewport(data, pyramid.levels[z], pyramid.tile(z, x, y), limit)
+        south, west, north, east = tile_bounds(z, x, y)
+        store = data.store
+        rows = [
+            i for i in data.index.in_bbox(south, west, north, east)
+            # タイル境界上の避難所は片方のタイルのみに含める
+            if store.latitudes[i] > south and store.longitudes[i] < east
+        ]
+        return self._shelter_viewport(data, z, rows, limit, bits, match_all)
+
+    def _cluster_viewport(
+        self, data: ShelterDataset, level: ClusterLevel, clusters: list[int], limit: int
+    ) -> ShelterViewport:
+        """クラスタの添字から応答を作成（1件のみのクラスタは避難所として返す）"""
+        total = sum(level.counts[c] for c in clusters)
+        truncated = len(clusters) > limit
+        if truncated:
+            # 件数の多いクラスタを優先する
+            clusters = sorted(sorted(clusters, key=lambda c: -level.counts[c])[:limit])
+
+        viewport = ShelterViewport(zoom=level.zoom, total=total, truncated=truncated)
+        for c in clusters:
+            if level.counts[c] == 1:
+                viewport.shelters.append(data.store.materialize(level.rows[c]))
+            else:
+                viewport.clusters.append(ShelterCluster(
+                    latitude=round(level.latitudes[c], 6),
+                    longitude=round(level.longitudes[c], 6),
+                    count=level.counts[c],
+                    capacity=level.capacities[c] or None,
+                    types=mask_to_types(level.type_masks[c]),
+                ))
+        return viewport
+
+    def _shelter_viewport(
+        self, data: ShelterDataset, zoom: int, rows, limit: int, bits: Optional[int], match_all: bool
+    ) -> ShelterViewport:
+        """範囲内の避難所の添字から応答を作成"""
+        if bits is not None:
+            type_masks = data.store.type_masks
+            rows = [i for i in rows if mask_matches(type_masks[i], bits, match_all)]
+        return ShelterViewport(
+            zoom=zoom,
+            shelters=[data.store.materialize(i) for i in rows[:limit]],
+            total=len(rows),
+            truncated=len(rows) > limit,
+        )
 
-        return shelters_with_distance[:limit]
+    @staticmethod
+    def _with_distances(data: ShelterDataset, hits: list[tuple[float, int]]) -> list[ShelterInfo]:
+        """検索結果（距離, 添字）の行のみShelterInfoを作成"""
+        return [data.store.materialize(i, distance=round(distance, 2)) for distance, i in hits]
 
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -166,20 +568,7 @@ class ShelterService:
         Returns:
             float: 距離（km）
         """
-        R = 6371  # 地球の半径（km）
-
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        a = math.sin(delta_lat / 2) ** 2 + \
-            math.cos(lat1_rad) * math.cos(lat2_rad) * \
-            math.sin(delta_lon / 2) ** 2
-
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return R * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     def get_all_shelters(self, limit: int = 100) -> list[ShelterInfo]:
         """
@@ -191,21 +580,29 @@ class ShelterService:
         Returns:
             list[ShelterInfo]: 避難所リスト
         """
-        return self._shelters_cache[:limit]
+        store = self._data.store
+        return [store.materialize(i) for i in range(min(limit, len(store)))]
 
-    def get_shelters_by_type(self, disaster_type: str, limit: int = 50) -> list[ShelterInfo]:
+    def get_shelters_by_type(
+        self, disaster_type: str, limit: int = 50, match_all: bool = True
+    ) -> list[ShelterInfo]:
         """
         災害種別で避難所を取得
 
         Args:
-            disaster_type: 災害種別（earthquake, tsunami, flood等）
+            disaster_type: 災害種別（earthquake, tsunami, flood等。カンマ区切りで複数指定可）
             limit: 取得件数上限
+            match_all: 複数指定時、Trueは全種別に対応、Falseはいずれかに対応する避難所
 
         Returns:
             list[ShelterInfo]: 該当する避難所リスト
         """
-        filtered = [s for s in self._shelters_cache if disaster_type in s.types]
-        return filtered[:limit]
+        data = self._data
+        bits = self._type_filter(disaster_type)
+        if not bits:
+            return []
+        rows = data.types.rows(bits, match_all)
+        return [data.store.materialize(i) for i in rows[:limit]]
 
     def get_shelter_by_id(self, shelter_id: str) -> Optional[ShelterInfo]:
         """
@@ -217,32 +614,69 @@ class ShelterService:
         Returns:
             ShelterInfo: 避難所情報
         """
-        for shelter in self._shelters_cache:
-            if shelter.id == shelter_id:
-                return shelter
-        return None
+        store = self._data.store
+        row = store.row_of(shelter_id)
+        return None if row is None else store.materialize(row)
 
     async def fetch_and_update_shelter_data(self) -> bool:
         """
         国土地理院からデータを取得して更新（管理用）
 
+        設定（shelter_source_url）のCSV / GeoJSONを一時ファイルにストリーミングで保存し、
+        取り込み済みデータ・スナップショットを作成して差し替える。取得から差し替えまでを
+        reloadと同じシングルフライトで実行するため、同時に呼ばれた再読み込み・更新は
+        実行中の処理の完了を待ち、書きかけのファイルを読み込まない。
+
         Returns:
             bool: 成功時True
-        
-        Note:
-            この機能は将来の拡張用に予約されています。
-            現在はサンプルデータを使用しています。
-            
-            Issue: #避難所データ自動更新機能の実装
-            - 国土地理院のCSV/GeoJSONからデータを取得
-            - 定期的なデータ更新スケジューリング
-            - データ検証とエラーハンドリング
-        """
-        logger.info(
-            "避難所データの更新機能は今後実装予定です。"
-            "現在はサンプルデータを使用しています。"
-        )
-        return True
+        """
+        from ..config import settings
+        if not settings.shelter_source_url:
+            logger.info("避難所データのURL（SHELTER_SOURCE_URL）が未設定のため更新をスキップします")
+            return False
+
+        try:
+            # 実行中の処理が取得を伴わない再読み込みだった場合は、完了後に改めて取得する
+            fetches = self._fetch_count
+            while self._fetch_count == fetches:
+                await self._reload_flight.do("reload", self._fetch_and_reload)
+            return True
+        except (httpx.HTTPError, OSError, ValueError) as e:
+            logger.error(f"避難所データ更新エラー: {e}", exc_info=True)
+            return False
+
+    async def _fetch_and_reload(self) -> int:
+        from ..config import settings
+        self._fetch_count += 1
+        url = settings.shelter_source_url
+        data_dir = Path(self.DATA_DIR)
+        suffix = ".geojson" if url.lower().split("?")[0].endswith((".geojson", ".json")) else ".csv"
+
+        def open_download():
+            data_dir.mkdir(parents=True, exist_ok=True)
+            return tempfile.NamedTemporaryFile(
+                dir=data_dir, prefix="gsi_shelters_download_", suffix=suffix, delete=False
+            )
+
+        # ファイルの作成・書き込みはイベントループの外で実行する
+        f = await asyncio.to_thread(open_download)
+        download = Path(f.name)
+        try:
+            try:
+                client = http_clients.get(url)
+                async with client.stream("GET", url, timeout=settings.api_timeout * 6) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+
+            # 解析・書き出しはCPU処理のためイベントループの外で実行する
+            await asyncio.to_thread(build_artifact, download, data_dir / ARTIFACT_NAME)
+            await asyncio.to_thread(build_snapshot, data_dir / ARTIFACT_NAME, data_dir / SNAPSHOT_NAME)
+            return await self._reload()
+        finally:
+            await asyncio.to_thread(download.unlink, missing_ok=True)
 
     def get_disaster_types(self) -> dict[str, str]:
         """
@@ -0,0 +1,427 @@
+"""
+避難所データのバイナリスナップショット
+
+列指向の避難所ストアと空間インデックスを固定長の列のまま1つのファイルに書き出し、
+各ワーカーはファイルをmmapで開いて列を直接参照します。
+
+- 起動時に避難所データの解析・インデックス構築を行わない
+  （空間インデックスのセル・災害種別毎の対象行・IDの並び順・空き状況の初期値も
+  スナップショットに含め、開く時に避難所数に比例する処理を行わない）
+- ページはOSのページキャッシュ上でワーカー間で共有される
+
+ファイル形式（ヘッダー・メタデータはリトルエンディアン、列は作成したマシンのバイト順）:
+    ヘッダー   MAGIC(8) + バージョン(u32) + メタデータ長(u32) + CRC32(u32) + 予約(u32)
+    メタデータ JSON（行数・セルの大きさ・元データの情報・各列の位置と型）
+    本体       8バイト境界に揃えた列（座標・収容人数・災害種別ビットマスク等）と
+               文字列の位置表 + UTF-8の文字列ブロブ、検索用の列（セル・種別毎の対象行・
+               IDの昇順に並べた行）
+
+CRC32はメタデータと本体全体に対して計算し、破損したファイルを拒否します。
+元データ（shelters.jsonl.gz）のサイズ・更新日時を記録し、元データが更新されていれば
+古いスナップショットとして拒否します。
+"""
+import json
+import mmap
+from bisect import bisect_left
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Optional
+
+from ..utils.logger import get_logger
+from ..utils.spatial_index import GridIndex
+from .shelter_loader import iter_artifact
+from .shelter_status import ShelterStatus
+from .shelter_store import DISASTER_TYPE_BITS, ShelterStore, TypeIndex
+
+logger = get_logger(__name__)
+
+SNAPSHOT_NAME = "shelters.snapshot"
+MAGIC = b"JDASHLTR"
+VERSION = 2
+HEADER = struct.Struct("<8sIII4x")
+ALIGNMENT = 8
+FACILITY_SEPARATOR = "\x1f"
+
+# 列名と型（array / memoryviewの型コード）
+NUMERIC_COLUMNS = {
+    "latitudes": "d",
+    "longitudes": "d",
+    "lat_rad": "d",
+    "lon_rad": "d",
+    "cos_lat": "d",
+    "capacities": "i",
+    "occupancies": "i",
+    "type_masks": "H",
+    "open_flags": "B",
+    "ids": "I",
+    "names": "I",
+    "addresses": "I",
+    "phones": "I",
+    "facilities": "I",
+    "string_offsets": "I",
+    "string_blob": "B",
+    "facility_offsets": "I",
+    "facility_blob": "B",
+    "cell_rows": "i",
+    "cell_cols": "i",
+    "cell_starts": "I",
+    "cell_members": "I",
+    "cell_row_starts": "I",  # セルの行毎の先頭のセル（セルは (行, 列) の昇順）
+    "type_starts": "I",  # 災害種別毎の対象行の位置
+    "type_rows": "I",
+    "id_order": "I",  # IDの昇順に並べた行（同じIDは先頭の行のみ）
+    "remaining": "i",  # 空き状況の初期値
+    "available": "B",
+}
+
+
+class SnapshotError(ValueError):
+    """スナップショットが無効（破損・古い・形式違い）な場合のエラー"""
+
+
+def _source_info(source: Optional[Path]) -> Optional[dict]:
+    """元データのサイズ・更新日時"""
+    if source is None or not source.exists():
+        return None
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _encode_table(values: list[str]) -> tuple[array, bytes]:
+    """文字列の表を位置表とUTF-8のブロブに変換"""
+    offsets = array("I", [0])
+    chunks = []
+    position = 0
+    for value in values:
+        encoded = value.encode("utf-8")
+        chunks.append(encoded)
+        position += len(encoded)
+        offsets.append(position)
+    return offsets, b"".join(chunks)
+
+
+def write_snapshot(
+    store: ShelterStore, path: Path, index: Optional[GridIndex] = None, source: Optional[Path] = None
+) -> None:
+    """
+    避難所ストアと空間インデックスをスナップショットとして書き出し
+
+    Args:
+        store: 避難所ストア
+        path: 出力先
+        index: 空間インデックス（省略時はストアから構築）
+        source: 元データ（古いスナップショットの検出用）
+    """
+    index = index or GridIndex(store.points())
+    lat_rad, lon_rad, cos_lat = index.columns()
+    cells = sorted(index.cells().items())
+
+    string_offsets, string_blob = _encode_table(store.strings.values)
+    facility_offsets, facility_blob = _encode_table(
+        [FACILITY_SEPARATOR.join(facilities) for facilities in store.facility_sets.values]
+    )
+    cell_starts = array("I", [0])
+    cell_members = array("I")
+    for _, members in cells:
+        cell_members.extend(members)
+        cell_starts.append(len(cell_members))
+    # 行毎に先頭のセルの位置を持ち、(行, 列) のセルは行内の列の二分探索で求める
+    cell_row_min = cells[0][0][0] if cells else 0
+    cell_row_starts = array("I")
+    if cells:
+        c = 0
+        for row in range(cell_row_min, cells[-1][0][0] + 2):
+            while c < len(cells) and cells[c][0][0] < row:
+                c += 1
+            cell_row_starts.append(c)
+    cell_ranges = [
+        [cells[0][0][0], cells[-1][0][0]],
+        [min(col for (_, col), _ in cells), max(col for (_, col), _ in cells)],
+    ] if cells else None
+
+    type_index = TypeIndex(store.type_masks)
+    type_starts = array("I", [0])
+    type_rows = array("I")
+    for bit in DISASTER_TYPE_BITS.values():
+        type_rows.extend(type_index.postings[bit])
+        type_starts.append(len(type_rows))
+
+    id_order = array("I")
+    previous = None
+    for i in sorted(range(len(store)), key=lambda i: (store.shelter_id(i), i)):
+        shelter_id = store.shelter_id(i)
+        if shelter_id != previous:
+            id_order.append(i)
+            previous = shelter_id
+    status = ShelterStatus(store)
+
+    columns: dict[str, Any] = {
+        "latitudes": store.latitudes,
+        "longitudes": store.longitudes,
+        "lat_rad": lat_rad,
+        "lon_rad": lon_rad,
+        "cos_lat": cos_lat,
+        "capacities": store.capacities,
+        "occupancies": store.occupancies,
+        "type_masks": store.type_masks,
+        "open_flags": store.open_flags,
+        "ids": store.ids,
+        "names": store.names,
+        "addresses": store.addresses,
+        "phones": store.phones,
+        "facilities": store.facilities,
+        "string_offsets": string_offsets,
+        "string_blob": string_blob,
+        "facility_offsets": facility_offsets,
+        "facility_blob": facility_blob,
+        "cell_rows": array("i", (row for (row, _), _ in cells)),
+        "cell_cols": array("i", (col for (_, col), _ in cells)),
+        "cell_starts": cell_starts,
+        "cell_members": cell_members,
+        "cell_row_starts": cell_row_starts,
+        "type_starts": type_starts,
+        "type_rows": type_rows,
+        "id_order": id_order,
+        "remaining": status.remaining,
+        "available": bytes(status.available),
+    }
+
+    # 本体を組み立て（各列を8バイト境界に揃える）
+    body = bytearray()
+    sections = {}
+    for name, typecode in NUMERIC_COLUMNS.items():
+        data = columns[name]
+        if not isinstance(data, (bytes, bytearray)):
+            data = array(typecode, data).tobytes()
+        body.extend(b"\0" * (-len(body) % ALIGNMENT))
+        sections[name] = [len(body), len(data)]
+        body.extend(data)
+
+    meta = json.dumps({
+        "rows": len(store),
+        "byteorder": sys.byteorder,
+        "cell_deg": index.cell_deg,
+        "cell_row_min": cell_row_min,
+        "cell_ranges": cell_ranges,
+        "source": _source_info(source),
+        "sections": sections,
+    }).encode("utf-8")
+    meta += b" " * (-(HEADER.size + len(meta)) % ALIGNMENT)
+    checksum = zlib.crc32(body, zlib.crc32(meta))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(meta), checksum))
+            f.write(meta)
+            f.write(body)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    logger.info(f"避難所スナップショット作成: {len(store)}件 ({path.stat().st_size / 1e6:.1f}MB) -> {path}")
+
+
+def build_snapshot(artifact: Path, path: Path) -> int:
+    """
+    取り込み済みデータからスナップショットを作成
+
+    Returns:
+        int: 避難所数
+    """
+    store = ShelterStore.from_records(iter_artifact(artifact))
+    write_snapshot(store, path, source=artifact)
+    return len(store)
+
+
+class MappedStringTable:
+    """スナップショット上の文字列の表（参照時にデコード）"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+        self._ids: Optional[dict[str, int]] = None
+
+    def __getitem__(self, value_id: int) -> str:
+        return str(self._blob[self._offsets[value_id]:self._offsets[value_id + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def values(self) -> list[str]:
+        return [self[i] for i in range(len(self))]
+
+    def lookup(self, value: str) -> Optional[int]:
+        """値の添字を取得（初回呼び出し時に逆引き表を作成）"""
+        if self._ids is None:
+            self._ids = {self[i]: i for i in range(len(self))}
+        return self._ids.get(value)
+
+
+class MappedFacilityTable(MappedStringTable):
+    """スナップショット上の設備リストの表"""
+
+    def __getitem__(self, value_id: int) -> tuple[str, ...]:
+        joined = super().__getitem__(value_id)
+        return tuple(joined.split(FACILITY_SEPARATOR)) if joined else ()
+
+    @property
+    def values(self) -> list[tuple[str, ...]]:
+        return [self[i] for i in range(len(self))]
+
+
+class MappedCells:
+    """
+    スナップショット上の空間インデックスのセル（セル -> 地点の添字）
+
+    辞書を作らず、行毎の先頭のセルの位置と行内の列の二分探索でセルを参照する。
+    """
+
+    def __init__(self, row_min: int, row_starts, rows, cols, starts, members):
+        self._row_min = row_min
+        self._row_starts = row_starts
+        self._rows = rows
+        self._cols = cols
+        self._starts = starts
+        self._members = members
+
+    def get(self, cell: tuple[int, int], default=None):
+        row, col = cell
+        r = row - self._row_min
+        if r < 0 or r >= len(self._row_starts) - 1:
+            return default
+        lo, hi = self._row_starts[r], self._row_starts[r + 1]
+        c = bisect_left(self._cols, col, lo, hi)
+        if c == hi or self._cols[c] != col:
+            return default
+        return self._members[self._starts[c]:self._starts[c + 1]]
+
+    def __getitem__(self, cell: tuple[int, int]):
+        members = self.get(cell)
+        if members is None:
+            raise KeyError(cell)
+        return members
+
+    def __len__(self) -> int:
+        return len(self._cols)
+
+    def __iter__(self):
+        return zip(self._rows, self._cols)
+
+    def items(self):
+        for c, cell in enumerate(self):
+            yield cell, self._members[self._starts[c]:self._starts[c + 1]]
+
+
+class MappedShelterStore(ShelterStore):
+    """スナップショットをmmapで参照する読み取り専用の避難所ストア"""
+
+    def __init__(self, path: Path, source: Optional[Path] = None):
+        """
+        Args:
+            path: スナップショット
+            source: 元データ。記録されたサイズ・更新日時と異なる場合は古いとして拒否する
+
+        Raises:
+            SnapshotError: 破損・古い・形式違いのスナップショットの場合
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError("空のファイルです")
+        view = memoryview(self._mmap)
+
+        if len(view) < HEADER.size:
+            raise SnapshotError("ヘッダーが不完全です")
+        magic, version, meta_length, checksum = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise SnapshotError("スナップショットの形式が異なります")
+        if version != VERSION:
+            raise SnapshotError(f"未対応のバージョンです: {version}")
+        body_start = HEADER.size + meta_length
+        if zlib.crc32(view[body_start:], zlib.crc32(view[HEADER.size:body_start])) != checksum:
+            raise SnapshotError("チェックサムが一致しません（破損）")
+
+        meta = json.loads(bytes(view[HEADER.size:body_start]))
+        if meta.get("byteorder") != sys.byteorder:
+            raise SnapshotError("バイト順が異なるマシンで作成されたスナップショットです")
+        if source is not None and meta["source"] != _source_info(source):
+            raise SnapshotError("元データが更新されています（古いスナップショット）")
+
+        columns = {}
+        for name, typecode in NUMERIC_COLUMNS.items():
+            offset, length = meta["sections"][name]
+            start = body_start + offset
+            columns[name] = view[start:start + length].cast(typecode)
+        self._columns = columns
+        self._meta = meta
+
+        self.latitudes = columns["latitudes"]
+        self.longitudes = columns["longitudes"]
+        self.capacities = columns["capacities"]
+        self.type_masks = columns["type_masks"]
+        # 避難者数・開設状況は運用中に更新するため、書き込み可能な配列に複製する（1件5バイト）
+        self.occupancies = array("i")
+        self.occupancies.frombytes(columns["occupancies"].cast("B"))
+        self.open_flags = bytearray(columns["open_flags"])
+        self.ids = columns["ids"]
+        self.names = columns["names"]
+        self.addresses = columns["addresses"]
+        self.phones = columns["phones"]
+        self.facilities = columns["facilities"]
+        self.strings = MappedStringTable(columns["string_offsets"], columns["string_blob"])
+        self.facility_sets = MappedFacilityTable(columns["facility_offsets"], columns["facility_blob"])
+        self._id_rows = None
+
+    def append(self, record: dict) -> int:
+        raise TypeError("スナップショットのストアには追加できません")
+
+    def index_ids(self) -> None:
+        """IDの検索はスナップショット上のIDの並び順を二分探索するため、表を作成しない"""
+
+    def row_of(self, shelter_id: str) -> Optional[int]:
+        """IDの行の添字（存在しない場合はNone）"""
+        order = self._columns["id_order"]
+        i = bisect_left(order, shelter_id, key=self.shelter_id)
+        if i < len(order) and self.shelter_id(order[i]) == shelter_id:
+            return order[i]
+        return None
+
+    def type_index(self) -> TypeIndex:
+        """スナップショット上の災害種別毎の対象行"""
+        starts = self._columns["type_starts"]
+        rows = self._columns["type_rows"]
+        return TypeIndex.from_postings(self.type_masks, {
+            bit: rows[starts[k]:starts[k + 1]] for k, bit in enumerate(DISASTER_TYPE_BITS.values())
+        })
+
+    def status_columns(self) -> tuple[memoryview, memoryview]:
+        """スナップショット作成時の空き状況"""
+        return self._columns["remaining"], self._columns["available"]
+
+    def radians(self) -> tuple[memoryview, memoryview, memoryview]:
+        """地点毎の緯度・経度（ラジアン）と緯度の余弦"""
+        return self._columns["lat_rad"], self._columns["lon_rad"], self._columns["cos_lat"]
+
+    def grid_index(self) -> GridIndex:
+        """スナップショット上の列・セルを参照する空間インデックス"""
+        columns = self._columns
+        meta = self._meta
+        cells = MappedCells(
+            meta["cell_row_min"], columns["cell_row_starts"], columns["cell_rows"], columns["cell_cols"],
+            columns["cell_starts"], columns["cell_members"],
+        )
+        ranges = meta["cell_ranges"]
+        lat_rad, lon_rad, cos_lat = self.radians()
+        return GridIndex.from_cells(
+            meta["cell_deg"], lat_rad, lon_rad, cos_lat, cells,
+            ranges=(tuple(ranges[0]), tuple(ranges[1])) if ranges else None,
+        )
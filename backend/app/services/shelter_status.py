@@ -0,0 +1,214 @@
+"""
+避難所の開設状況・避難者数の更新
+
+自治体等から届く更新（JSON Lines / CSV）を解析し、避難所ストアの状況の列
+（避難者数・開設フラグ）に直接反映します。空間インデックス等は再構築しません。
+
+空き状況の検索のため、行毎の残り収容人数と受け入れ可否（開設中かつ満員でない）を
+更新の度にその行の分だけ更新して保持します。
+
+更新の形式（JSON Lines の1行 / CSV の1行）:
+    {"id": "13101-001", "occupancy": 120, "is_open": true}
+    {"id": "13101-002", "delta": -15}
+    id,occupancy,delta,is_open
+"""
+import csv
+import io
+import json
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from .shelter_loader import TRUE_FLAGS
+from .shelter_store import MISSING, ShelterStore
+
+ID_COLUMNS = ("id", "shelter_id", "共通ID")
+OCCUPANCY_COLUMNS = ("occupancy", "current_occupancy", "避難者数")
+DELTA_COLUMNS = ("delta", "occupancy_delta", "増減")
+OPEN_COLUMNS = ("is_open", "open", "開設")
+FALSE_FLAGS = {"0", "×", "false", "no", "n", "closed"}
+
+UNKNOWN_REMAINING = 2 ** 31 - 1  # 収容人数が未設定の避難所の残り収容人数
+MAX_ERRORS = 20  # 結果に含めるエラーメッセージの上限
+
+
+class StatusUpdateError(ValueError):
+    """更新の行が不正な場合のエラー"""
+
+
+@dataclass
+class StatusUpdate:
+    """1件の避難所の状況の更新"""
+    shelter_id: str
+    occupancy: Optional[int] = None  # 現在の避難者数（指定時は置き換え）
+    delta: int = 0  # 避難者数の増減
+    is_open: Optional[bool] = None
+
+
+@dataclass
+class UpdateResult:
+    """更新の適用結果"""
+    received: int = 0
+    applied: int = 0
+    unknown: int = 0  # 存在しない避難所IDの件数
+    invalid: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def error(self, line: int, message: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{line}行目: {message}")
+
+
+def _first(row: dict, columns: tuple[str, ...]) -> Optional[str]:
+    """候補の列名のうち最初に値がある列の値"""
+    for column in columns:
+        value = row.get(column)
+        if value is not None and str(value).strip() != "":
+            return value
+    return None
+
+
+def _parse_int(value, name: str) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise StatusUpdateError(f"{name}が数値ではありません: {value!r}")
+
+
+def _parse_flag(value) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_FLAGS:
+        return True
+    if text in FALSE_FLAGS:
+        return False
+    raise StatusUpdateError(f"開設状況が不正です: {value!r}")
+
+
+def parse_update(row: dict) -> StatusUpdate:
+    """
+    更新の行を解析
+
+    Raises:
+        StatusUpdateError: IDが無い・値が不正な場合
+    """
+    shelter_id = _first(row, ID_COLUMNS)
+    if shelter_id is None:
+        raise StatusUpdateError("IDがありません")
+    values = [_first(row, columns) for columns in (OCCUPANCY_COLUMNS, DELTA_COLUMNS, OPEN_COLUMNS)]
+    if all(value is None for value in values):
+        raise StatusUpdateError("更新する項目がありません")
+    occupancy = _parse_int(values[0], "避難者数")
+    if occupancy is not None and occupancy < 0:
+        raise StatusUpdateError(f"避難者数が負の値です: {occupancy}")
+    return StatusUpdate(
+        shelter_id=str(shelter_id).strip(),
+        occupancy=occupancy,
+        delta=_parse_int(values[1], "増減") or 0,
+        is_open=_parse_flag(values[2]),
+    )
+
+
+def _iter_jsonl_rows(text: str) -> Iterator[tuple[int, object]]:
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, StatusUpdateError(f"JSONの形式が不正です: {e.msg}")
+
+
+def _iter_csv_rows(text: str) -> Iterator[tuple[int, object]]:
+    # 1行目はヘッダー
+    for line_no, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        yield line_no, row
+
+
+def parse_updates(text: str, fmt: str, result: UpdateResult) -> list[StatusUpdate]:
+    """
+    更新の一覧を解析（不正な行はresultに記録してスキップ）
+
+    Args:
+        text: 更新の本文
+        fmt: "jsonl" または "csv"
+        result: 適用結果（件数・エラーを記録）
+    """
+    rows = _iter_csv_rows(text) if fmt == "csv" else _iter_jsonl_rows(text)
+    updates = []
+    for line_no, row in rows:
+        result.received += 1
+        try:
+            if isinstance(row, Exception):
+                raise row
+            if not isinstance(row, dict):
+                raise StatusUpdateError("オブジェクトではありません")
+            updates.append(parse_update(row))
+        except StatusUpdateError as e:
+            result.error(line_no, str(e))
+    return updates
+
+
+class ShelterStatus:
+    """
+    避難所ストアの状況の列（避難者数・開設フラグ）と、そこから求める空き状況
+
+    - remaining: 行毎の残り収容人数（収容人数が未設定の場合はUNKNOWN_REMAINING）
+    - available: 行毎の受け入れ可否（開設中かつ残り収容人数が1以上の場合1）
+    """
+
+    def __init__(self, store: ShelterStore):
+        self.store = store
+        columns = store.status_columns()
+        if columns is not None:
+            # スナップショット作成時に求めた列を複製する（行毎に計算しない）
+            self.remaining = array("i")
+            self.remaining.frombytes(memoryview(columns[0]).cast("B"))
+            self.available = bytearray(columns[1])
+            return
+        self.remaining = array("i", (self._remaining_of(i) for i in range(len(store))))
+        open_flags = store.open_flags
+        remaining = self.remaining
+        self.available = bytearray(
+            1 if open_flags[i] and remaining[i] > 0 else 0 for i in range(len(store))
+        )
+
+    def _remaining_of(self, row: int) -> int:
+        capacity = self.store.capacities[row]
+        if capacity == MISSING:
+            return UNKNOWN_REMAINING
+        return capacity - max(self.store.occupancies[row], 0)
+
+    def apply(self, row: int, update: StatusUpdate) -> tuple[int, bool]:
+        """
+        更新を行に反映
+
+        Returns:
+            tuple[int, bool]: 反映後の (避難者数, 開設中)。避難者数が未設定の場合はMISSING
+        """
+        store = self.store
+        occupancy = store.occupancies[row]
+        if update.occupancy is not None:
+            occupancy = update.occupancy
+        if update.delta:
+            occupancy = max(max(occupancy, 0) + update.delta, 0)
+        is_open = bool(store.open_flags[row]) if update.is_open is None else update.is_open
+        self.set(row, occupancy, is_open)
+        return occupancy, is_open
+
+    def set(self, row: int, occupancy: int, is_open: bool) -> None:
+        """行の避難者数・開設状況を設定し、空き状況を更新"""
+        store = self.store
+        store.occupancies[row] = occupancy
+        store.open_flags[row] = 1 if is_open else 0
+        remaining = self._remaining_of(row)
+        self.remaining[row] = remaining
+        self.available[row] = 1 if is_open and remaining > 0 else 0
+
+    def has_room(self, row: int, required: int = 1) -> bool:
+        """行が受け入れ可能か（開設中かつ残り収容人数がrequired以上）"""
+        return bool(self.available[row]) and self.remaining[row] >= required
@@ -0,0 +1,270 @@
+"""
+列指向の避難所ストア
+
+避難所1件ごとにPydanticモデルを保持する代わりに、項目毎の配列で保持します。
+
+- 座標: array('d')
+- 収容人数・現在の避難者数: array('i')（-1は未設定）
+- 災害種別: ビットマスク（array('H')）と種別毎の対象行の添字（TypeIndex）
+- ID・名称・住所等の文字列: 重複を除いた文字列表への添字（array('I')）
+- IDから行への表: 文字列表の添字毎の行（array('i')）
+
+ShelterInfoは検索結果として返す行についてのみ作成します。
+"""
+from array import array
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from ..models import ShelterInfo
+
+# 災害種別コード（ビット位置はこの順）
+DISASTER_TYPE_CODES = (
+    "flood",
+    "landslide",
+    "storm_surge",
+    "earthquake",
+    "tsunami",
+    "fire",
+    "inland_flood",
+    "volcano",
+)
+DISASTER_TYPE_BITS = {code: 1 << i for i, code in enumerate(DISASTER_TYPE_CODES)}
+
+MISSING = -1  # 整数列の未設定値
+
+
+def types_to_mask(types: Iterable[str]) -> int:
+    """災害種別コードのリストをビットマスクに変換（未知のコードは無視）"""
+    mask = 0
+    for code in types:
+        mask |= DISASTER_TYPE_BITS.get(code, 0)
+    return mask
+
+
+def mask_to_types(mask: int) -> list[str]:
+    """ビットマスクを災害種別コードのリストに変換"""
+    return [code for code, bit in DISASTER_TYPE_BITS.items() if mask & bit]
+
+
+def query_mask(types: Iterable[str]) -> Optional[int]:
+    """検索条件の災害種別をビットマスクに変換（未知のコードを含む場合はNone）"""
+    mask = 0
+    for code in types:
+        bit = DISASTER_TYPE_BITS.get(code)
+        if bit is None:
+            return None
+        mask |= bit
+    return mask
+
+
+def mask_matches(value: int, bits: int, match_all: bool = True) -> bool:
+    """行のビットマスクが検索条件を満たすか判定（全種別に対応 / いずれかに対応）"""
+    return (value & bits) == bits if match_all else bool(value & bits)
+
+
+class TypeIndex:
+    """
+    災害種別毎の対象行の添字（ポスティングリスト）
+
+    単一種別の絞り込みはリストをそのまま返し、複数種別のAND条件は最も短いリストを
+    ビットマスクの比較1回で絞り込む。結果は条件毎にキャッシュする。
+    """
+
+    def __init__(self, type_masks: Sequence[int]):
+        self._type_masks = type_masks
+        self.postings: dict[int, Sequence[int]] = {bit: array("I") for bit in DISASTER_TYPE_BITS.values()}
+        # 行のビットマスクの種類は高々256通りのため、値毎に追加先のリストを求めておく
+        targets: dict[int, tuple[array, ...]] = {}
+        for i, value in enumerate(type_masks):
+            lists = targets.get(value)
+            if lists is None:
+                lists = tuple(p for bit, p in self.postings.items() if value & bit)
+                targets[value] = lists
+            for posting in lists:
+                posting.append(i)
+        self._cache: dict[tuple[int, bool], array] = {}
+
+    @classmethod
+    def from_postings(cls, type_masks: Sequence[int], postings: dict[int, Sequence[int]]) -> "TypeIndex":
+        """作成済みの種別毎の対象行から作成（スナップショットのメモリマップ等）"""
+        index = cls(())
+        index._type_masks = type_masks
+        index.postings = postings
+        return index
+
+    def rows(self, bits: int, match_all: bool = True) -> Sequence[int]:
+        """
+        条件を満たす行の添字（昇順）
+
+        Args:
+            bits: 災害種別のビットマスク
+            match_all: Trueの場合は全種別に対応する行、Falseの場合はいずれかに対応する行
+        """
+        posting = self.postings.get(bits)
+        if posting is not None:
+            return posting
+        key = (bits, match_all)
+        rows = self._cache.get(key)
+        if rows is None:
+            lists = [p for bit, p in self.postings.items() if bits & bit]
+            if not lists:
+                rows = array("I")
+            elif match_all:
+                masks = self._type_masks
+                shortest = min(lists, key=len)
+                rows = array("I", (i for i in shortest if (masks[i] & bits) == bits))
+            else:
+                rows = array("I", sorted(set().union(*lists)))
+            self._cache[key] = rows
+        return rows
+
+
+class StringTable:
+    """重複を除いた値の表（同じ値は1つだけ保持し、添字で参照する）"""
+
+    __slots__ = ("values", "_ids")
+
+    def __init__(self):
+        self.values: list[Any] = []
+        self._ids: dict[Any, int] = {}
+
+    def intern(self, value: Any) -> int:
+        """値の添字を取得（未登録の場合は追加）"""
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self._ids[value] = value_id
+        return value_id
+
+    def lookup(self, value: Any) -> Optional[int]:
+        """登録済みの値の添字を取得（未登録の場合はNone）"""
+        return self._ids.get(value)
+
+    def __getitem__(self, value_id: int) -> Any:
+        return self.values[value_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ShelterStore:
+    """避難所データを項目毎の配列で保持するストア"""
+
+    def __init__(self):
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        self.capacities = array("i")
+        self.occupancies = array("i")
+        self.type_masks = array("H")
+        self.open_flags = bytearray()
+        # 文字列はIDも含めて文字列表への添字で保持する
+        self.strings = StringTable()
+        self.facility_sets = StringTable()  # 設備リスト（タプル）の表
+        self.ids = array("I")
+        self.names = array("I")
+        self.addresses = array("I")
+        self.phones = array("I")
+        self.facilities = array("I")
+        self._id_rows: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ShelterStore":
+        """レコード（ShelterInfoのフィールドを持つdict）からストアを作成"""
+        store = cls()
+        for record in records:
+            store.append(record)
+        return store
+
+    @classmethod
+    def from_models(cls, shelters: Iterable[ShelterInfo]) -> "ShelterStore":
+        """ShelterInfoのリストからストアを作成"""
+        return cls.from_records(s.model_dump() for s in shelters)
+
+    def append(self, record: dict) -> int:
+        """
+        レコードを追加
+
+        Returns:
+            int: 追加した行の添字
+        """
+        strings = self.strings
+        capacity = record.get("capacity")
+        occupancy = record.get("current_occupancy")
+        self.latitudes.append(float(record["latitude"]))
+        self.longitudes.append(float(record["longitude"]))
+        self.capacities.append(MISSING if capacity is None else int(capacity))
+        self.occupancies.append(MISSING if occupancy is None else int(occupancy))
+        self.type_masks.append(types_to_mask(record.get("types") or ()))
+        self.open_flags.append(1 if record.get("is_open", True) else 0)
+        self.ids.append(strings.intern(str(record["id"])))
+        self.names.append(strings.intern(record["name"]))
+        self.addresses.append(strings.intern(record.get("address") or ""))
+        self.phones.append(strings.intern(record.get("phone") or ""))
+        self.facilities.append(self.facility_sets.intern(tuple(record.get("facilities") or ())))
+        self._id_rows = None
+        return len(self.latitudes) - 1
+
+    def shelter_id(self, i: int) -> str:
+        """行の避難所ID"""
+        return self.strings[self.ids[i]]
+
+    def index_ids(self) -> None:
+        """IDから行への表を作成（同じIDが複数ある場合は先頭の行）"""
+        id_rows = array("i", [MISSING]) * len(self.strings)
+        for i, value_id in enumerate(self.ids):
+            if id_rows[value_id] == MISSING:
+                id_rows[value_id] = i
+        self._id_rows = id_rows
+        if len(self):
+            # 文字列表の逆引き（スナップショットでは初回参照時に作成）も準備しておく
+            self.strings.lookup(self.shelter_id(0))
+
+    def row_of(self, shelter_id: str) -> Optional[int]:
+        """IDの行の添字（存在しない場合はNone）"""
+        value_id = self.strings.lookup(shelter_id)
+        if value_id is None:
+            return None
+        if self._id_rows is None:
+            self.index_ids()
+        row = self._id_rows[value_id]
+        return None if row == MISSING else row
+
+    def type_index(self) -> TypeIndex:
+        """災害種別毎の対象行"""
+        return TypeIndex(self.type_masks)
+
+    def status_columns(self) -> Optional[tuple[Sequence[int], Sequence[int]]]:
+        """作成済みの (残り収容人数, 受け入れ可否) の列（無い場合はNone、ShelterStatusが求める）"""
+        return None
+
+    def has_type(self, i: int, disaster_type: str) -> bool:
+        """行が災害種別の対象か判定"""
+        return bool(self.type_masks[i] & DISASTER_TYPE_BITS.get(disaster_type, 0))
+
+    def points(self) -> Iterator[tuple[float, float]]:
+        """全行の (緯度, 経度)"""
+        return zip(self.latitudes, self.longitudes)
+
+    def materialize(self, i: int, distance: Optional[float] = None) -> ShelterInfo:
+        """行のShelterInfoを作成"""
+        strings = self.strings
+        capacity = self.capacities[i]
+        occupancy = self.occupancies[i]
+        phone = strings[self.phones[i]]
+        return ShelterInfo(
+            id=strings[self.ids[i]],
+            name=strings[self.names[i]],
+            address=strings[self.addresses[i]],
+            latitude=self.latitudes[i],
+            longitude=self.longitudes[i],
+            distance=distance,
+            capacity=None if capacity == MISSING else capacity,
+            current_occupancy=None if occupancy == MISSING else occupancy,
+            facilities=list(self.facility_sets[self.facilities[i]]),
+            is_open=bool(self.open_flags[i]),
+            phone=phone or None,
+            types=mask_to_types(self.type_masks[i]),
+        )
@@ -0,0 +1,221 @@
+"""
+静的翻訳テーブルの言語毎の遅延読み込み
+
+震源地名（location_translations）・定型文・津波情報・震度（message_translations）の
+翻訳データを言語毎のファイル（marshal形式）にコンパイルしておき、
+各言語を初めて使う時にその言語のファイルのみを読み込みます。
+
+- 起動時に大きな辞書リテラルのモジュールをインポート・コンパイルしない
+- 使われない言語の翻訳をメモリに載せない
+
+コンパイル済みのファイルには元データのファイルの内容のハッシュを記録し、
+元データが更新されていれば最初の読み込み時にコンパイルし直します。
+ビルド時に事前にコンパイルしておくこともできます（backendディレクトリで実行）:
+    python -m app.services.translation_tables [--output data/translation_tables]
+"""
+import argparse
+import hashlib
+import marshal
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TABLES_NAME = "translation_tables"
+VERSION = 1
+INDEX_NAME = "index.marshal"
+
+# 元データのモジュール（コンパイル時のみインポート）
+SOURCE_FILES = (
+    Path(__file__).with_name("location_translations.py"),
+    Path(__file__).with_name("message_translations.py"),
+)
+
+
+@dataclass
+class LanguageTable:
+    """1言語分の静的翻訳"""
+    locations: dict[str, str] = field(default_factory=dict)  # 震源地名 → 翻訳
+    templates: dict[str, str] = field(default_factory=dict)  # テンプレートキー → 定型文
+    tsunami: dict[str, str] = field(default_factory=dict)  # 津波情報 → 翻訳
+    intensity: dict[str, str] = field(default_factory=dict)  # 震度 → 翻訳
+
+
+def source_fingerprint() -> str:
+    """元データのファイル内容・形式のバージョンから求めた指紋"""
+    digest = hashlib.md5(f"{VERSION}:{marshal.version}".encode())
+    for path in SOURCE_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def build_tables() -> tuple[list[str], dict[str, LanguageTable]]:
+    """
+    元データから言語毎の翻訳テーブルを作成
+
+    Returns:
+        (震源地名の一覧, 言語コード → 翻訳テーブル)
+    """
+    from .location_translations import LOCATION_TRANSLATIONS
+    from .message_translations import INTENSITY_TRANSLATIONS, TEMPLATES, TSUNAMI_TRANSLATIONS
+
+    tables: dict[str, LanguageTable] = {}
+    for attr, source in (
+        ("locations", LOCATION_TRANSLATIONS),
+        ("templates", TEMPLATES),
+        ("tsunami", TSUNAMI_TRANSLATIONS),
+        ("intensity", INTENSITY_TRANSLATIONS),
+    ):
+        for key, translations in source.items():
+            for lang, text in translations.items():
+                getattr(tables.setdefault(lang, LanguageTable()), attr)[key] = text
+    return list(LOCATION_TRANSLATIONS), tables
+
+
+def _write(path: Path, data: dict) -> None:
+    """一時ファイルに書き込んでから置き換え（読み込み中のワーカーが壊れたファイルを読まない）"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        marshal.dump(data, f)
+    os.replace(tmp, path)
+
+
+def compile_tables(output_dir: Path, fingerprint: Optional[str] = None) -> int:
+    """
+    言語毎の翻訳テーブルをコンパイルして書き出し
+
+    Args:
+        output_dir: 出力先ディレクトリ
+        fingerprint: 元データの指紋（省略時は計算）
+
+    Returns:
+        int: 書き出した言語数
+    """
+    fingerprint = fingerprint or source_fingerprint()
+    locations, tables = build_tables()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for lang, table in tables.items():
+        _write(output_dir / f"{lang}.marshal", {
+            "version": VERSION, "fingerprint": fingerprint,
+            "locations": table.locations, "templates": table.templates,
+            "tsunami": table.tsunami, "intensity": table.intensity,
+        })
+    # 言語毎のファイルを書き終えてから索引を置き換える
+    _write(output_dir / INDEX_NAME, {
+        "version": VERSION, "fingerprint": fingerprint,
+        "languages": sorted(tables), "locations": locations,
+    })
+    return len(tables)
+
+
+class TranslationTables:
+    """コンパイル済みの翻訳テーブル（言語毎に初回使用時に読み込む）"""
+
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory: コンパイル済みのファイルの保存先
+        """
+        self.directory = Path(directory)
+        self._index: Optional[dict] = None
+        self._languages: dict[str, LanguageTable] = {}
+        # コンパイル済みのファイルを使用できない場合の元データから作成したテーブル
+        self._fallback: Optional[dict[str, LanguageTable]] = None
+        self._lock = threading.Lock()
+
+    def _read(self, name: str, fingerprint: str) -> Optional[dict]:
+        try:
+            with open(self.directory / name, "rb") as f:
+                data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+            return None
+        return data
+
+    def _load_index(self) -> dict:
+        """索引を読み込み（無い・古い場合はコンパイル）"""
+        fingerprint = source_fingerprint()
+        index = self._read(INDEX_NAME, fingerprint)
+        if index is None:
+            try:
+                count = compile_tables(self.directory, fingerprint)
+                logger.info(f"翻訳テーブルをコンパイルしました: {count}言語 ({self.directory})")
+                index = self._read(INDEX_NAME, fingerprint)
+            except OSError as e:
+                logger.warning(f"翻訳テーブルを書き出せません（元データを直接使用します）: {e}")
+        if index is None:
+            locations, self._fallback = build_tables()
+            index = {"fingerprint": fingerprint, "languages": sorted(self._fallback), "locations": locations}
+        return index
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index()
+        return self._index
+
+    def language(self, lang: str) -> LanguageTable:
+        """言語の翻訳テーブルを取得（未対応の言語は空のテーブル）"""
+        table = self._languages.get(lang)
+        if table is not None:
+            return table
+        index = self.index
+        with self._lock:
+            table = self._languages.get(lang)
+            if table is not None:
+                return table
+            if self._fallback is not None:
+                table = self._fallback.get(lang, LanguageTable())
+            elif lang in index["languages"]:
+                data = self._read(f"{lang}.marshal", index["fingerprint"])
+                if data is None:
+                    # 読み込み中に他のワーカーがコンパイルし直した等
+                    logger.warning(f"翻訳テーブルを読み込めません（元データを直接使用します）: {lang}")
+                    self._fallback = build_tables()[1]
+                    table = self._fallback.get(lang, LanguageTable())
+                else:
+                    table = LanguageTable(
+                        data["locations"], data["templates"], data["tsunami"], data["intensity"]
+                    )
+            else:
+                table = LanguageTable()
+            self._languages[lang] = table
+            return table
+
+    def location_names(self) -> list[str]:
+        """登録されている全ての震源地名"""
+        return self.index["locations"]
+
+    def location(self, location: str, lang: str) -> Optional[str]:
+        """震源地名の翻訳（見つからない場合はNone）"""
+        return self.language(lang).locations.get(location)
+
+    def loaded_languages(self) -> list[str]:
+        """読み込み済みの言語"""
+        return list(self._languages)
+
+
+def main():
+    from ..config import settings
+
+    parser = argparse.ArgumentParser(description="静的翻訳テーブルをコンパイル")
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.cache_dir) / TABLES_NAME,
+        help="出力先（既定: cache_dir/translation_tables）",
+    )
+    args = parser.parse_args()
+    count = compile_tables(args.output)
+    print(f"コンパイル: {count}言語 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
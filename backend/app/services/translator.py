@@ -2,121 +2,54 @@
 多言語翻訳サービス（ハイブリッド方式）
 
 翻訳優先順位:
-1. 静的マッピング（地名等） - 高速・無料
+1. 静的マッピング（地名等、方角・海域の接尾辞は組み立て） - 高速・無料
 2. Claude API（未知の地名） - 高品質・有料
 3. キャッシュ活用 - APIコスト削減
 """
-from typing import Optional
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
 import os
 import json
+import asyncio
 import hashlib
 from pathlib import Path
 
 import httpx
 
-from .location_translations import get_location_translation, LOCATION_TRANSLATIONS
+from .location_composer import LocationComposer
+from .translation_tables import TABLES_NAME, TranslationTables
 from ..utils.logger import get_logger
+from ..utils.single_flight import SingleFlight
+from ..utils.translation_cache import TranslationCache
+from ..utils.translation_store import TranslationStore
+from ..utils.http_client import (
+    ANTHROPIC_BASE_URL,
+    GEMINI_BASE_URL,
+    HTTPClientRegistry,
+    http_clients as default_http_clients,
+)
 
 logger = get_logger(__name__)
 
+BATCH_TOKENS_PER_ITEM = 200  # 一括翻訳の1件あたりの最大出力トークン数
+
+T = TypeVar("T")
+
+
+@dataclass
+class DeadlineWatch:
+    """翻訳が期限切れになったかの記録（TranslatorService.watch_deadlineで使用）"""
+    hit: bool = False
+
+
+_deadline_watch: ContextVar[Optional[DeadlineWatch]] = ContextVar("deadline_watch", default=None)
+
 
 class TranslatorService:
     """ハイブリッド翻訳サービス"""
 
-    # 定型文の多言語テンプレート（15言語対応）
-    TEMPLATES = {
-        "earthquake": {
-            "ja": "【地震情報】{location}で地震がありました。マグニチュード{magnitude}、最大震度{intensity}。",
-            "en": "[Earthquake] An earthquake occurred in {location}. Magnitude {magnitude}, Maximum intensity {intensity}.",
-            "zh": "【地震信息】{location}发生地震。震级{magnitude}，最大震度{intensity}。",
-            "zh-TW": "【地震資訊】{location}發生地震。規模{magnitude}，最大震度{intensity}。",
-            "ko": "【지진정보】{location}에서 지진이 발생했습니다. 규모 {magnitude}, 최대진도 {intensity}.",
-            "vi": "[Động đất] Động đất xảy ra tại {location}. Cường độ {magnitude}, Cường độ tối đa {intensity}.",
-            "th": "[แผ่นดินไหว] เกิดแผ่นดินไหวที่ {location} ขนาด {magnitude} ความรุนแรงสูงสุด {intensity}",
-            "id": "[Gempa] Gempa bumi terjadi di {location}. Magnitudo {magnitude}, Intensitas maksimum {intensity}.",
-            "ms": "[Gempa Bumi] Gempa bumi berlaku di {location}. Magnitud {magnitude}, Keamatan maksimum {intensity}.",
-            "tl": "[Lindol] Nagkaroon ng lindol sa {location}. Magnitude {magnitude}, Pinakamataas na intensity {intensity}.",
-            "fr": "[Séisme] Un séisme s'est produit à {location}. Magnitude {magnitude}, Intensité maximale {intensity}.",
-            "de": "[Erdbeben] Ein Erdbeben ereignete sich in {location}. Magnitude {magnitude}, Maximale Intensität {intensity}.",
-            "it": "[Terremoto] Si è verificato un terremoto a {location}. Magnitudo {magnitude}, Intensità massima {intensity}.",
-            "es": "[Terremoto] Ocurrió un terremoto en {location}. Magnitud {magnitude}, Intensidad máxima {intensity}.",
-            "ne": "[भूकम्प] {location} मा भूकम्प आयो। म्याग्निच्युड {magnitude}, अधिकतम तीव्रता {intensity}।",
-            "easy_ja": "【じしん】{location}で じしんが ありました。つよさは {intensity} です。",
-        },
-        "tsunami_warning": {
-            "ja": "【津波警報】沿岸部の方は直ちに高台に避難してください。",
-            "en": "[Tsunami Warning] Those in coastal areas should evacuate to higher ground immediately.",
-            "zh": "【海啸警报】沿海地区的人员请立即撤离到高处。",
-            "zh-TW": "【海嘯警報】沿海地區的民眾請立即撤離到高處。",
-            "ko": "【쓰나미 경보】해안 지역에 계신 분들은 즉시 고지대로 대피하세요.",
-            "vi": "[Cảnh báo sóng thần] Những người ở vùng ven biển hãy sơ tán đến nơi cao hơn ngay lập tức.",
-            "th": "[เตือนภัยสึนามิ] ผู้ที่อยู่ในพื้นที่ชายฝั่งควรอพยพไปยังที่สูงทันที",
-            "id": "[Peringatan Tsunami] Mereka yang berada di daerah pesisir harus segera mengungsi ke tempat yang lebih tinggi.",
-            "ms": "[Amaran Tsunami] Mereka yang berada di kawasan pantai perlu berpindah ke kawasan tinggi dengan segera.",
-            "tl": "[Babala ng Tsunami] Ang mga nasa baybayin ay dapat lumikas agad sa mas mataas na lugar.",
-            "fr": "[Alerte Tsunami] Les personnes dans les zones côtières doivent évacuer immédiatement vers les hauteurs.",
-            "de": "[Tsunami-Warnung] Personen in Küstengebieten sollten sofort auf höhergelegene Gebiete evakuieren.",
-            "it": "[Allerta Tsunami] Le persone nelle zone costiere devono evacuare immediatamente verso zone più elevate.",
-            "es": "[Alerta de Tsunami] Las personas en zonas costeras deben evacuar inmediatamente hacia tierras altas.",
-            "ne": "[सुनामी चेतावनी] तटीय क्षेत्रमा हुनुहुनेहरू तुरुन्तै उच्च भूमिमा सर्नुहोस्।",
-            "easy_ja": "【つなみ けいほう】うみの ちかくの ひとは すぐに たかい ところに にげて ください。",
-        },
-        "evacuation": {
-            "ja": "【避難指示】{area}に避難指示が発令されました。直ちに避難してください。",
-            "en": "[Evacuation Order] An evacuation order has been issued for {area}. Please evacuate immediately.",
-            "zh": "【避难指示】{area}已发布避难指示。请立即避难。",
-            "zh-TW": "【避難指示】{area}已發布避難指示。請立即避難。",
-            "ko": "【대피 지시】{area}에 대피 지시가 발령되었습니다. 즉시 대피하세요.",
-            "vi": "[Lệnh sơ tán] Lệnh sơ tán đã được ban hành cho {area}. Hãy sơ tán ngay lập tức.",
-            "th": "[คำสั่งอพยพ] มีคำสั่งอพยพสำหรับ {area} กรุณาอพยพทันที",
-            "id": "[Perintah Evakuasi] Perintah evakuasi telah dikeluarkan untuk {area}. Harap segera mengungsi.",
-            "ms": "[Arahan Pemindahan] Arahan pemindahan telah dikeluarkan untuk {area}. Sila berpindah segera.",
-            "tl": "[Utos ng Paglikas] May utos ng paglikas para sa {area}. Mangyaring lumikas agad.",
-            "fr": "[Ordre d'évacuation] Un ordre d'évacuation a été émis pour {area}. Veuillez évacuer immédiatement.",
-            "de": "[Evakuierungsbefehl] Für {area} wurde ein Evakuierungsbefehl erlassen. Bitte evakuieren Sie sofort.",
-            "it": "[Ordine di Evacuazione] È stato emesso un ordine di evacuazione per {area}. Si prega di evacuare immediatamente.",
-            "es": "[Orden de Evacuación] Se ha emitido una orden de evacuación para {area}. Por favor evacúe inmediatamente.",
-            "ne": "[खाली गर्ने आदेश] {area} को लागि खाली गर्ने आदेश जारी गरिएको छ। कृपया तुरुन्तै खाली गर्नुहोस्।",
-            "easy_ja": "【ひなん しじ】{area}の ひとは すぐに にげて ください。",
-        },
-        "no_tsunami": {
-            "ja": "この地震による津波の心配はありません。",
-            "en": "There is no tsunami risk from this earthquake.",
-            "zh": "此次地震没有海啸风险。",
-            "zh-TW": "此次地震沒有海嘯風險。",
-            "ko": "이 지진으로 인한 쓰나미 위험은 없습니다.",
-            "vi": "Không có nguy cơ sóng thần từ trận động đất này.",
-            "th": "ไม่มีความเสี่ยงจากสึนามิจากแผ่นดินไหวครั้งนี้",
-            "id": "Tidak ada risiko tsunami dari gempa ini.",
-            "ms": "Tiada risiko tsunami daripada gempa bumi ini.",
-            "tl": "Walang panganib ng tsunami mula sa lindol na ito.",
-            "fr": "Il n'y a pas de risque de tsunami suite à ce séisme.",
-            "de": "Es besteht keine Tsunami-Gefahr durch dieses Erdbeben.",
-            "it": "Non c'è rischio di tsunami da questo terremoto.",
-            "es": "No hay riesgo de tsunami por este terremoto.",
-            "ne": "यस भूकम्पबाट सुनामीको जोखिम छैन।",
-            "easy_ja": "この じしんで つなみの しんぱいは ありません。",
-        },
-        "shelter_info": {
-            "ja": "最寄りの避難所: {shelter_name}（{distance}km）",
-            "en": "Nearest shelter: {shelter_name} ({distance}km)",
-            "zh": "最近的避难所: {shelter_name}（{distance}公里）",
-            "zh-TW": "最近的避難所: {shelter_name}（{distance}公里）",
-            "ko": "가장 가까운 대피소: {shelter_name}({distance}km)",
-            "vi": "Nơi trú ẩn gần nhất: {shelter_name} ({distance}km)",
-            "th": "ที่พักพิงใกล้ที่สุด: {shelter_name} ({distance} กม.)",
-            "id": "Tempat pengungsian terdekat: {shelter_name} ({distance}km)",
-            "ms": "Pusat pemindahan terdekat: {shelter_name} ({distance}km)",
-            "tl": "Pinakamalapit na evacuation center: {shelter_name} ({distance}km)",
-            "fr": "Abri le plus proche: {shelter_name} ({distance}km)",
-            "de": "Nächste Notunterkunft: {shelter_name} ({distance}km)",
-            "it": "Rifugio più vicino: {shelter_name} ({distance}km)",
-            "es": "Refugio más cercano: {shelter_name} ({distance}km)",
-            "ne": "नजिकको आश्रय: {shelter_name} ({distance} किमी)",
-            "easy_ja": "ちかくの ひなんじょ: {shelter_name}（{distance}キロメートル）",
-        }
-    }
-
     # 言語名マッピング（15言語対応）
     LANGUAGE_NAMES = {
         "ja": "日本語",
@@ -137,180 +70,12 @@ class TranslatorService:
         "easy_ja": "やさしい日本語"
     }
 
-    # 津波情報の翻訳（15言語対応）
-    TSUNAMI_TRANSLATIONS = {
-        "なし": {
-            "en": "None",
-            "zh": "无",
-            "zh-TW": "無",
-            "ko": "없음",
-            "vi": "Không có",
-            "th": "ไม่มี",
-            "id": "Tidak ada",
-            "ms": "Tiada",
-            "tl": "Wala",
-            "fr": "Aucun",
-            "de": "Keine",
-            "it": "Nessuno",
-            "es": "Ninguno",
-            "ne": "छैन",
-            "easy_ja": "なし",
-        },
-        "不明": {
-            "en": "Unknown",
-            "zh": "不明",
-            "zh-TW": "不明",
-            "ko": "불명",
-            "vi": "Không rõ",
-            "th": "ไม่ทราบ",
-            "id": "Tidak diketahui",
-            "ms": "Tidak diketahui",
-            "tl": "Hindi alam",
-            "fr": "Inconnu",
-            "de": "Unbekannt",
-            "it": "Sconosciuto",
-            "es": "Desconocido",
-            "ne": "अज्ञात",
-            "easy_ja": "わからない",
-        },
-        "調査中": {
-            "en": "Under investigation",
-            "zh": "调查中",
-            "zh-TW": "調查中",
-            "ko": "조사 중",
-            "vi": "Đang điều tra",
-            "th": "กำลังตรวจสอบ",
-            "id": "Sedang diselidiki",
-            "ms": "Sedang disiasat",
-            "tl": "Sinisiyasat",
-            "fr": "En cours d'investigation",
-            "de": "Wird untersucht",
-            "it": "In fase di indagine",
-            "es": "En investigación",
-            "ne": "अनुसन्धान गर्दै",
-            "easy_ja": "しらべている",
-        },
-        "若干の海面変動": {
-            "en": "Slight sea level change",
-            "zh": "轻微海面变动",
-            "zh-TW": "輕微海面變動",
-            "ko": "약간의 해수면 변동",
-            "vi": "Biến động mực nước biển nhẹ",
-            "th": "ระดับน้ำทะเลเปลี่ยนแปลงเล็กน้อย",
-            "id": "Perubahan permukaan laut sedikit",
-            "ms": "Perubahan aras laut sedikit",
-            "tl": "Bahagyang pagbabago sa antas ng dagat",
-            "fr": "Léger changement du niveau de la mer",
-            "de": "Leichte Meeresspiegeländerung",
-            "it": "Leggero cambiamento del livello del mare",
-            "es": "Ligero cambio en el nivel del mar",
-            "ne": "समुद्र सतहमा थोरै परिवर्तन",
-            "easy_ja": "うみの たかさが すこし かわる",
-        },
-        "津波注意報": {
-            "en": "Tsunami Advisory",
-            "zh": "海啸注意报",
-            "zh-TW": "海嘯注意報",
-            "ko": "쓰나미 주의보",
-            "vi": "Cảnh báo sóng thần",
-            "th": "คำเตือนสึนามิ",
-            "id": "Peringatan Tsunami",
-            "ms": "Nasihat Tsunami",
-            "tl": "Payo sa Tsunami",
-            "fr": "Avis de tsunami",
-            "de": "Tsunami-Hinweis",
-            "it": "Avviso tsunami",
-            "es": "Aviso de tsunami",
-            "ne": "सुनामी सावधानी",
-            "easy_ja": "つなみ ちゅういほう",
-        },
-        "津波警報": {
-            "en": "Tsunami Warning",
-            "zh": "海啸警报",
-            "zh-TW": "海嘯警報",
-            "ko": "쓰나미 경보",
-            "vi": "Cảnh báo sóng thần nghiêm trọng",
-            "th": "เตือนภัยสึนามิ",
-            "id": "Peringatan Tsunami Serius",
-            "ms": "Amaran Tsunami",
-            "tl": "Babala ng Tsunami",
-            "fr": "Alerte tsunami",
-            "de": "Tsunami-Warnung",
-            "it": "Allerta tsunami",
-            "es": "Alerta de tsunami",
-            "ne": "सुनामी चेतावनी",
-            "easy_ja": "つなみ けいほう",
-        },
-    }
-
-    # 震度翻訳（JMA震度階級、10震度 x 16言語）
-    INTENSITY_TRANSLATIONS = {
-        "0": {
-            "ja": "震度0", "en": "0", "zh": "0", "zh-TW": "0", "ko": "0",
-            "vi": "0", "th": "0", "id": "0", "ms": "0", "tl": "0",
-            "fr": "0", "de": "0", "it": "0", "es": "0", "ne": "0",
-            "easy_ja": "しんど 0",
-        },
-        "1": {
-            "ja": "震度1", "en": "1", "zh": "1", "zh-TW": "1", "ko": "1",
-            "vi": "1", "th": "1", "id": "1", "ms": "1", "tl": "1",
-            "fr": "1", "de": "1", "it": "1", "es": "1", "ne": "1",
-            "easy_ja": "しんど 1",
-        },
-        "2": {
-            "ja": "震度2", "en": "2", "zh": "2", "zh-TW": "2", "ko": "2",
-            "vi": "2", "th": "2", "id": "2", "ms": "2", "tl": "2",
-            "fr": "2", "de": "2", "it": "2", "es": "2", "ne": "2",
-            "easy_ja": "しんど 2",
-        },
-        "3": {
-            "ja": "震度3", "en": "3", "zh": "3", "zh-TW": "3", "ko": "3",
-            "vi": "3", "th": "3", "id": "3", "ms": "3", "tl": "3",
-            "fr": "3", "de": "3", "it": "3", "es": "3", "ne": "3",
-            "easy_ja": "しんど 3",
-        },
-        "4": {
-            "ja": "震度4", "en": "4", "zh": "4", "zh-TW": "4", "ko": "4",
-            "vi": "4", "th": "4", "id": "4", "ms": "4", "tl": "4",
-            "fr": "4", "de": "4", "it": "4", "es": "4", "ne": "4",
-            "easy_ja": "しんど 4",
-        },
-        "5弱": {
-            "ja": "震度5弱", "en": "5 Lower", "zh": "5弱", "zh-TW": "5弱", "ko": "5약",
-            "vi": "5 yếu", "th": "5 อ่อน", "id": "5 Lemah", "ms": "5 Lemah", "tl": "5 Mahina",
-            "fr": "5 Faible", "de": "5 Schwach", "it": "5 Debole", "es": "5 Inferior", "ne": "5 कमजोर",
-            "easy_ja": "しんど 5じゃく",
-        },
-        "5強": {
-            "ja": "震度5強", "en": "5 Upper", "zh": "5强", "zh-TW": "5強", "ko": "5강",
-            "vi": "5 mạnh", "th": "5 แรง", "id": "5 Kuat", "ms": "5 Kuat", "tl": "5 Malakas",
-            "fr": "5 Fort", "de": "5 Stark", "it": "5 Forte", "es": "5 Superior", "ne": "5 बलियो",
-            "easy_ja": "しんど 5きょう",
-        },
-        "6弱": {
-            "ja": "震度6弱", "en": "6 Lower", "zh": "6弱", "zh-TW": "6弱", "ko": "6약",
-            "vi": "6 yếu", "th": "6 อ่อน", "id": "6 Lemah", "ms": "6 Lemah", "tl": "6 Mahina",
-            "fr": "6 Faible", "de": "6 Schwach", "it": "6 Debole", "es": "6 Inferior", "ne": "6 कमजोर",
-            "easy_ja": "しんど 6じゃく",
-        },
-        "6強": {
-            "ja": "震度6強", "en": "6 Upper", "zh": "6强", "zh-TW": "6強", "ko": "6강",
-            "vi": "6 mạnh", "th": "6 แรง", "id": "6 Kuat", "ms": "6 Kuat", "tl": "6 Malakas",
-            "fr": "6 Fort", "de": "6 Stark", "it": "6 Forte", "es": "6 Superior", "ne": "6 बलियो",
-            "easy_ja": "しんど 6きょう",
-        },
-        "7": {
-            "ja": "震度7", "en": "7", "zh": "7", "zh-TW": "7", "ko": "7",
-            "vi": "7", "th": "7", "id": "7", "ms": "7", "tl": "7",
-            "fr": "7", "de": "7", "it": "7", "es": "7", "ne": "7",
-            "easy_ja": "しんど 7",
-        },
-    }
-
-    def __init__(self):
+    def __init__(self, http_clients: Optional[HTTPClientRegistry] = None):
         """初期化"""
         from ..config import settings
 
+        self.http_clients = http_clients or default_http_clients
+
         # Claude API設定
         self.anthropic_api_key = settings.anthropic_api_key
         self.anthropic_api_version = settings.anthropic_api_version
@@ -326,11 +91,25 @@ class TranslatorService:
         self.timeout = settings.api_timeout
         self.translate_timeout = httpx.Timeout(settings.ai_timeout_translate, connect=5.0)
         self.generate_timeout = httpx.Timeout(settings.ai_timeout_generate, connect=5.0)
-        self._cache: dict[str, str] = {}
-        self._cache_file = settings.translation_cache_file
-        self._load_cache()
+        self.batch_size = settings.ai_translate_batch_size  # 一括翻訳の1回あたりの件数
+        self.deadline = settings.translation_deadline  # 1リクエストの翻訳待ち時間の上限
+        # AIプロバイダー毎の同時呼び出し数の上限
+        self._provider_limits = {
+            "gemini": asyncio.Semaphore(max(1, settings.ai_concurrency_gemini)),
+            "claude": asyncio.Semaphore(max(1, settings.ai_concurrency_claude)),
+        }
+        self._background: set[asyncio.Task] = set()  # 期限後も継続中の翻訳
+        self._flights = SingleFlight()  # 同一テキスト・言語のAI翻訳を集約
+        # 静的翻訳テーブル（言語毎に初回使用時に読み込む）
+        self._tables = TranslationTables(Path(settings.cache_dir) / TABLES_NAME)
+        # 静的マッピング（完全一致・方角や海域の接尾辞の組み立て）
+        self._locations = LocationComposer(self._tables)
+        # 名前空間（location / text / warning / safety）毎のLRUと永続化ストアの2層
+        self._cache = TranslationCache(
+            self._open_store(settings.translation_cache_db, settings.translation_cache_file)
+        )
 
-    def _get_active_provider(self) -> Optional[str]:
+    def get_active_provider(self) -> Optional[str]:
         """使用可能なAIプロバイダーを取得"""
         if self.ai_provider == "gemini" and self.gemini_api_key:
             return "gemini"
@@ -344,24 +123,113 @@ class TranslatorService:
                 return "claude"
         return None
 
-    def _load_cache(self):
-        """キャッシュをファイルから読み込み"""
+    def _provider_slot(self, provider: Optional[str]):
+        """AIプロバイダーの同時呼び出し数の枠（async withで使用）"""
+        return self._provider_limits.get(provider) or nullcontext()
+
+    async def gather_with_deadline(
+        self, aws: list[Awaitable[T]], deadline: Optional[float] = None
+    ) -> list[Optional[T]]:
+        """
+        複数の翻訳・生成を並行実行し、期限までに完了した結果を返す
+
+        期限までに完了しなかった処理は中断せずに裏で継続します（結果はキャッシュに
+        保存されるため、以降のリクエストで使用されます）。
+
+        Args:
+            aws: 実行するコルーチンの一覧
+            deadline: 待ち時間の上限（秒、省略時は設定値）
+
+        Returns:
+            結果の一覧（awsと同じ順序、期限切れ・失敗した要素はNone）
+        """
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+        if not tasks:
+            return []
         try:
-            if self._cache_file.exists():
-                with open(self._cache_file, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-        except Exception as e:
-            logger.error(f"キャッシュ読み込みエラー: {e}", exc_info=True)
-            self._cache = {}
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline if deadline is None else deadline)
+        except asyncio.CancelledError:
+            # 呼び出し元がキャンセルされても翻訳は裏で継続する
+            for task in tasks:
+                self._background.add(task)
+                task.add_done_callback(self._finish_background)
+            raise
+        if pending:
+            logger.info(f"翻訳が期限内に完了しませんでした: {len(pending)}/{len(tasks)}件（裏で継続）")
+            watch = _deadline_watch.get()
+            if watch is not None:
+                watch.hit = True
+        for task in pending:
+            self._background.add(task)
+            task.add_done_callback(self._finish_background)
+
+        results: list[Optional[T]] = []
+        for task in tasks:
+            if task not in done:
+                results.append(None)
+            elif task.exception() is not None:
+                logger.error(f"翻訳エラー: {task.exception()}", exc_info=task.exception())
+                results.append(None)
+            else:
+                results.append(task.result())
+        return results
+
+    @contextmanager
+    def watch_deadline(self) -> Iterator[DeadlineWatch]:
+        """
+        ブロック内の翻訳が期限切れになったかを記録
 
-    def _save_cache(self):
-        """キャッシュをファイルに保存"""
+        原文のままの結果が「翻訳待ち」か「翻訳できない（プロバイダー未設定・翻訳失敗）」かを
+        区別するために使用します。
+        """
+        watch = DeadlineWatch()
+        token = _deadline_watch.set(watch)
         try:
-            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f, ensure_ascii=False, indent=2)
+            yield watch
+        finally:
+            _deadline_watch.reset(token)
+
+    def _finish_background(self, task: asyncio.Task) -> None:
+        """裏で継続した翻訳の完了処理"""
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"翻訳エラー: {task.exception()}", exc_info=task.exception())
+
+    def _open_store(self, db_path: Path, legacy_file: Optional[Path] = None) -> Optional[TranslationStore]:
+        """キャッシュの永続化ストアを開く（旧形式のJSONファイルは初回に取り込み、失敗時はメモリのみ）"""
+        try:
+            return TranslationStore(db_path, legacy_json=legacy_file)
         except Exception as e:
-            logger.error(f"キャッシュ保存エラー: {e}", exc_info=True)
+            logger.error(f"キャッシュ読み込みエラー: {e}", exc_info=True)
+            return None
+
+    def get_cache_stats(self) -> dict:
+        """翻訳キャッシュの名前空間毎の統計を取得"""
+        return self._cache.get_stats()
+
+    def get_location_stats(self) -> dict:
+        """震源地名の静的翻訳（完全一致・組み立て）の件数と割合を取得"""
+        return self._locations.get_stats()
+
+    def close(self):
+        """永続化ストアの接続を閉じる"""
+        self._cache.close()
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """
+        期限後も継続中の翻訳を待ってから永続化ストアの接続を閉じる（終了時用）
+
+        timeout秒以内に完了しない翻訳はキャンセルします（閉じたストアに書き込まない）。
+        """
+        tasks = list(self._background)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if pending:
+                logger.info(f"終了時に継続中の翻訳をキャンセルしました: {len(pending)}件")
+        self.close()
 
     def _get_cache_key(self, text: str, target_lang: str) -> str:
         """キャッシュキーを生成"""
@@ -420,25 +288,25 @@ class TranslatorService:
         if target_lang == "ja":
             return location
 
-        # 1. 静的マッピングを試行
-        static_translation = get_location_translation(location, target_lang)
+        # 1. 静的マッピング（完全一致・接尾辞の組み立て）を試行
+        static_translation = self._locations.translate(location, target_lang)
         if static_translation:
             return static_translation
 
         # 2. キャッシュを確認
         cache_key = self._get_cache_key(location, target_lang)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cached = await self._cache.get("location", cache_key)
+        if cached is not None:
+            return cached
 
         # 3. AI APIで翻訳（利用可能なプロバイダーを使用）
-        provider = self._get_active_provider()
+        provider = self.get_active_provider()
         if provider:
             try:
                 translated = await self._translate_with_ai(location, target_lang)
                 if translated:
                     # キャッシュに保存
-                    self._cache[cache_key] = translated
-                    self._save_cache()
+                    await self._cache.set("location", cache_key, translated)
                     return translated
             except Exception as e:
                 logger.error(f"AI API翻訳エラー ({provider}): {e}", exc_info=True)
@@ -469,6 +337,8 @@ class TranslatorService:
         """
         利用可能なAI APIを使用して翻訳
 
+        同一テキスト・言語の翻訳が実行中の場合は、その結果を共有する。
+
         Args:
             text: 翻訳するテキスト
             target_lang: 翻訳先言語コード
@@ -476,12 +346,20 @@ class TranslatorService:
         Returns:
             翻訳されたテキスト
         """
-        provider = self._get_active_provider()
-        if provider == "gemini":
-            return await self._translate_with_gemini(text, target_lang)
-        elif provider == "claude":
-            return await self._translate_with_claude(text, target_lang)
-        return None
+        return await self._flights.do(
+            ("translate", text, target_lang),
+            lambda: self._translate_with_provider(text, target_lang),
+        )
+
+    async def _translate_with_provider(self, text: str, target_lang: str) -> Optional[str]:
+        """アクティブなAIプロバイダーで翻訳"""
+        provider = self.get_active_provider()
+        async with self._provider_slot(provider):
+            if provider == "gemini":
+                return await self._translate_with_gemini(text, target_lang)
+            elif provider == "claude":
+                return await self._translate_with_claude(text, target_lang)
+            return None
 
     async def _translate_with_gemini(self, text: str, target_lang: str) -> Optional[str]:
         """
@@ -497,32 +375,32 @@ class TranslatorService:
         try:
             target_name = self.LANG_NAMES.get(target_lang, target_lang)
 
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "contents": [{
-                            "parts": [{
-                                "text": f"Translate this Japanese earthquake location name to {target_name}. Only output the translation, nothing else.\n\n{text}"
-                            }]
-                        }],
-                        "generationConfig": {
-                            "maxOutputTokens": 100,
-                            "temperature": 0.1
-                        }
-                    },
-                    timeout=self.translate_timeout
-                )
+            url = f"{GEMINI_BASE_URL}/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["candidates"][0]["content"]["parts"][0]["text"].strip()
-                else:
-                    logger.warning(f"Gemini API error: {response.status_code} - {response.text}")
-                    return None
+            client = self.http_clients.get(GEMINI_BASE_URL)
+            response = await client.post(
+                url,
+                headers={"Content-Type": "application/json"},
+                json={
+                    "contents": [{
+                        "parts": [{
+                            "text": f"Translate this Japanese earthquake location name to {target_name}. Only output the translation, nothing else.\n\n{text}"
+                        }]
+                    }],
+                    "generationConfig": {
+                        "maxOutputTokens": 100,
+                        "temperature": 0.1
+                    }
+                },
+                timeout=self.translate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return data["candidates"][0]["content"]["parts"][0]["text"].strip()
+            else:
+                logger.warning(f"Gemini API error: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             logger.error(f"Gemini API request error: {e}", exc_info=True)
@@ -542,36 +420,180 @@ class TranslatorService:
         try:
             target_name = self.LANG_NAMES.get(target_lang, target_lang)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-API-Key": self.anthropic_api_key,
-                        "anthropic-version": self.anthropic_api_version
-                    },
-                    json={
-                        "model": self.anthropic_model,
-                        "max_tokens": 100,
-                        "messages": [{
-                            "role": "user",
-                            "content": f"Translate this Japanese earthquake location name to {target_name}. Only output the translation, nothing else.\n\n{text}"
-                        }]
-                    },
-                    timeout=self.translate_timeout
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["content"][0]["text"].strip()
-                else:
-                    logger.warning(f"Claude API error: {response.status_code}")
-                    return None
+            client = self.http_clients.get(ANTHROPIC_BASE_URL)
+            response = await client.post(
+                f"{ANTHROPIC_BASE_URL}/v1/messages",
+                headers={
+                    "Content-Type": "application/json",
+                    "X-API-Key": self.anthropic_api_key,
+                    "anthropic-version": self.anthropic_api_version
+                },
+                json={
+                    "model": self.anthropic_model,
+                    "max_tokens": 100,
+                    "messages": [{
+                        "role": "user",
+                        "content": f"Translate this Japanese earthquake location name to {target_name}. Only output the translation, nothing else.\n\n{text}"
+                    }]
+                },
+                timeout=self.translate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return data["content"][0]["text"].strip()
+            else:
+                logger.warning(f"Claude API error: {response.status_code}")
+                return None
 
         except Exception as e:
             logger.error(f"Claude API request error: {e}", exc_info=True)
             return None
 
+    def _build_batch_translate_prompt(self, texts: list[str], target_lang: str) -> str:
+        """一括翻訳用のプロンプトを構築"""
+        target_name = self.LANG_NAMES.get(target_lang, target_lang)
+        return f"""Translate each Japanese string in the JSON array below to {target_name}.
+The strings are disaster information (earthquake locations, warnings, shelter names).
+
+Return ONLY a JSON array of {len(texts)} translated strings in the same order (no markdown, no explanation).
+For "easy_ja", use simple hiragana and basic vocabulary.
+
+{json.dumps(texts, ensure_ascii=False)}"""
+
+    def _extract_json_array(self, content: str, length: int) -> Optional[list[Optional[str]]]:
+        """
+        AI応答から指定件数のJSON配列を抽出
+
+        Returns:
+            文字列の一覧（文字列以外の要素はNone）、件数が一致しない・失敗時はNone
+        """
+        candidates = [content]
+        if "```" in content:
+            block = content.split("```")[1]
+            candidates.append(block[4:] if block.startswith("json") else block)
+        first, last = content.find("["), content.rfind("]")
+        if first != -1 and last > first:
+            candidates.append(content[first:last + 1])
+
+        for candidate in candidates:
+            try:
+                result = json.loads(candidate.strip())
+            except (json.JSONDecodeError, ValueError):
+                continue
+            if isinstance(result, list) and len(result) == length:
+                return [item.strip() if isinstance(item, str) else None for item in result]
+        return None
+
+    async def _translate_batch_with_ai(self, texts: list[str], target_lang: str) -> list[Optional[str]]:
+        """
+        利用可能なAI APIを使用して複数のテキストを1回の呼び出しで翻訳
+
+        同一の一覧・言語の翻訳が実行中の場合は、その結果を共有する。
+
+        Returns:
+            翻訳されたテキストの一覧（textsと同じ順序、失敗した要素はNone）
+        """
+        translated = await self._flights.do(
+            ("translate_batch", tuple(texts), target_lang),
+            lambda: self._translate_batch_with_provider(texts, target_lang),
+        )
+        return translated or [None] * len(texts)
+
+    async def _translate_batch_with_provider(
+        self, texts: list[str], target_lang: str
+    ) -> Optional[list[Optional[str]]]:
+        """アクティブなAIプロバイダーで一括翻訳"""
+        provider = self.get_active_provider()
+        async with self._provider_slot(provider):
+            if provider == "gemini":
+                return await self._translate_batch_with_gemini(texts, target_lang)
+            elif provider == "claude":
+                return await self._translate_batch_with_claude(texts, target_lang)
+            return None
+
+    async def _translate_batch_with_gemini(
+        self, texts: list[str], target_lang: str
+    ) -> Optional[list[Optional[str]]]:
+        """
+        Gemini APIを使用して一括翻訳
+        """
+        try:
+            url = f"{GEMINI_BASE_URL}/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
+
+            client = self.http_clients.get(GEMINI_BASE_URL)
+            response = await client.post(
+                url,
+                headers={"Content-Type": "application/json"},
+                json={
+                    "contents": [{
+                        "parts": [{"text": self._build_batch_translate_prompt(texts, target_lang)}]
+                    }],
+                    "generationConfig": {
+                        "maxOutputTokens": BATCH_TOKENS_PER_ITEM * len(texts) + 100,
+                        "temperature": 0.1,
+                        "responseMimeType": "application/json"
+                    }
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["candidates"][0]["content"]["parts"][0]["text"].strip()
+                result = self._extract_json_array(content, len(texts))
+                if result is None:
+                    logger.warning(f"Gemini応答のJSON配列パースエラー: {content[:200]}")
+                return result
+            else:
+                logger.warning(f"Gemini API error: {response.status_code}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Gemini一括翻訳エラー: {e}", exc_info=True)
+            return None
+
+    async def _translate_batch_with_claude(
+        self, texts: list[str], target_lang: str
+    ) -> Optional[list[Optional[str]]]:
+        """
+        Claude APIを使用して一括翻訳
+        """
+        try:
+            client = self.http_clients.get(ANTHROPIC_BASE_URL)
+            response = await client.post(
+                f"{ANTHROPIC_BASE_URL}/v1/messages",
+                headers={
+                    "Content-Type": "application/json",
+                    "X-API-Key": self.anthropic_api_key,
+                    "anthropic-version": self.anthropic_api_version
+                },
+                json={
+                    "model": self.anthropic_model,
+                    "max_tokens": BATCH_TOKENS_PER_ITEM * len(texts) + 100,
+                    "messages": [{
+                        "role": "user",
+                        "content": self._build_batch_translate_prompt(texts, target_lang)
+                    }]
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["content"][0]["text"].strip()
+                result = self._extract_json_array(content, len(texts))
+                if result is None:
+                    logger.warning(f"Claude応答のJSON配列パースエラー: {content[:200]}")
+                return result
+            else:
+                logger.warning(f"Claude API error: {response.status_code}")
+                return None
+
+        except Exception as e:
+            logger.error(f"Claude一括翻訳エラー: {e}", exc_info=True)
+            return None
+
     def translate_tsunami_warning(self, warning: str, target_lang: str) -> str:
         """
         津波情報を翻訳
@@ -586,10 +608,7 @@ class TranslatorService:
         if target_lang == "ja":
             return warning
 
-        if warning in self.TSUNAMI_TRANSLATIONS:
-            return self.TSUNAMI_TRANSLATIONS[warning].get(target_lang, warning)
-
-        return warning
+        return self._tables.language(target_lang).tsunami.get(warning, warning)
 
     def translate_intensity(self, intensity: str, target_lang: str) -> str:
         """
@@ -602,10 +621,7 @@ class TranslatorService:
         Returns:
             翻訳された震度文字列
         """
-        if target_lang == "ja":
-            return self.INTENSITY_TRANSLATIONS.get(intensity, {}).get("ja", intensity)
-
-        return self.INTENSITY_TRANSLATIONS.get(intensity, {}).get(target_lang, intensity)
+        return self._tables.language(target_lang).intensity.get(intensity, intensity)
 
     async def translate(
         self,
@@ -633,17 +649,17 @@ class TranslatorService:
             return template_translation
 
         # AI APIで翻訳（利用可能なプロバイダーを使用）
-        provider = self._get_active_provider()
+        provider = self.get_active_provider()
         if provider:
             cache_key = self._get_cache_key(text, target_lang)
-            if cache_key in self._cache:
-                return self._cache[cache_key]
+            cached = await self._cache.get("text", cache_key)
+            if cached is not None:
+                return cached
 
             try:
                 translated = await self._translate_with_ai(text, target_lang)
                 if translated:
-                    self._cache[cache_key] = translated
-                    self._save_cache()
+                    await self._cache.set("text", cache_key, translated)
                     return translated
             except Exception as e:
                 logger.error(f"翻訳エラー ({provider}): {e}", exc_info=True)
@@ -651,6 +667,122 @@ class TranslatorService:
         # フォールバック
         return text
 
+    async def translate_locations(
+        self, locations: list[str], target_lang: str, deadline: Optional[float] = None
+    ) -> list[str]:
+        """
+        震源地名をまとめて翻訳
+
+        静的マッピング・キャッシュで翻訳できない地名は、まとめて1回のAI呼び出しで翻訳します。
+
+        Args:
+            locations: 日本語の震源地名の一覧
+            target_lang: 翻訳先言語コード
+            deadline: AI翻訳の待ち時間の上限（秒、省略時は設定値。超過分は原文のまま返す）
+
+        Returns:
+            list[str]: 翻訳された地名（locationsと同じ順序）
+        """
+        if target_lang == "ja":
+            return list(locations)
+        return await self._translate_batch(
+            locations, target_lang, "location",
+            lambda location: self._locations.translate(location, target_lang),
+            deadline,
+        )
+
+    async def translate_many(
+        self, texts: list[str], target_lang: str, source_lang: str = "ja", deadline: Optional[float] = None
+    ) -> list[str]:
+        """
+        テキストをまとめて翻訳
+
+        テンプレート・キャッシュで翻訳できないテキストは、まとめて1回のAI呼び出しで翻訳します。
+
+        Args:
+            texts: 翻訳するテキストの一覧
+            target_lang: 翻訳先言語
+            source_lang: 翻訳元言語
+            deadline: AI翻訳の待ち時間の上限（秒、省略時は設定値。超過分は原文のまま返す）
+
+        Returns:
+            list[str]: 翻訳されたテキスト（textsと同じ順序）
+        """
+        if target_lang == source_lang:
+            return list(texts)
+        return await self._translate_batch(
+            texts, target_lang, "text",
+            lambda text: self._try_template_translation(text, target_lang),
+            deadline,
+        )
+
+    async def _translate_batch(
+        self,
+        texts: list[str],
+        target_lang: str,
+        namespace: str,
+        resolve_local: Callable[[str], Optional[str]],
+        deadline: Optional[float] = None,
+    ) -> list[str]:
+        """
+        静的な翻訳 → キャッシュ → AI（未翻訳分をまとめて1回）の順に翻訳
+
+        翻訳できなかった・期限までに翻訳が完了しなかったテキストは元のテキストのまま返します。
+        """
+        results = list(texts)
+        pending: dict[str, list[int]] = {}  # 未翻訳のテキスト → 位置（重複は1回のみ翻訳）
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            if text in pending:
+                pending[text].append(i)
+                continue
+            local = resolve_local(text)
+            if local:
+                results[i] = local
+                continue
+            cached = await self._cache.get(namespace, self._get_cache_key(text, target_lang))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[text] = [i]
+
+        provider = self.get_active_provider()
+        if not pending or not provider:
+            return results
+
+        # 期限を過ぎた場合は原文のまま返し、翻訳は裏で継続してキャッシュに保存する
+        (translated,) = await self.gather_with_deadline(
+            [self._fill_batch(list(pending), target_lang, namespace)], deadline
+        )
+        for text, value in (translated or {}).items():
+            for i in pending[text]:
+                results[i] = value
+        return results
+
+    async def _fill_batch(self, texts: list[str], target_lang: str, namespace: str) -> dict[str, str]:
+        """
+        未翻訳のテキストをAIでまとめて翻訳し、キャッシュに保存
+
+        Returns:
+            dict: テキスト → 翻訳（翻訳できたもののみ）
+        """
+        size = max(1, self.batch_size)
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        translated_chunks = await asyncio.gather(
+            *(self._translate_batch_with_ai(chunk, target_lang) for chunk in chunks)
+        )
+        translated = {
+            text: value
+            for chunk, values in zip(chunks, translated_chunks)
+            for text, value in zip(chunk, values)
+            if value
+        }
+        await self._cache.set_many(
+            namespace, [(self._get_cache_key(text, target_lang), value) for text, value in translated.items()]
+        )
+        return translated
+
     def _try_template_translation(self, text: str, target_lang: str) -> Optional[str]:
         """
         テンプレートを使用した翻訳を試行
@@ -662,11 +794,11 @@ class TranslatorService:
         Returns:
             str: 翻訳されたテキスト（テンプレートが見つからない場合はNone）
         """
-        for template_key, translations in self.TEMPLATES.items():
-            ja_template = translations.get("ja", "")
+        templates = self._tables.language(target_lang).templates
+        for template_key, ja_template in self._tables.language("ja").templates.items():
             if any(keyword in text for keyword in self._extract_keywords(ja_template)):
-                if target_lang in translations:
-                    return translations[target_lang]
+                if template_key in templates:
+                    return templates[template_key]
 
         return None
 
@@ -703,8 +835,10 @@ class TranslatorService:
         Returns:
             str: フォーマットされたテンプレート
         """
-        templates = self.TEMPLATES.get(template_key, {})
-        template = templates.get(lang) or templates.get("ja")
+        template = (
+            self._tables.language(lang).templates.get(template_key)
+            or self._tables.language("ja").templates.get(template_key)
+        )
 
         if template:
             try:
@@ -810,7 +944,7 @@ class TranslatorService:
         Returns:
             int: 登録地名数
         """
-        return len(LOCATION_TRANSLATIONS)
+        return len(self._tables.location_names())
 
     async def generate_warning_text(
         self,
@@ -840,14 +974,15 @@ class TranslatorService:
 
         # キャッシュを確認
         cache_key = self._get_cache_key(f"warning:{warning_name_ja}:{area_name}:{severity}", target_lang)
-        if cache_key in self._cache:
+        cached = await self._cache.get("warning", cache_key)
+        if cached is not None:
             try:
-                return json.loads(self._cache[cache_key])
+                return json.loads(cached)
             except json.JSONDecodeError:
                 pass
 
         # AI APIで生成
-        provider = self._get_active_provider()
+        provider = self.get_active_provider()
         if provider:
             try:
                 result = await self._generate_warning_with_ai(
@@ -855,8 +990,7 @@ class TranslatorService:
                 )
                 if result:
                     # キャッシュに保存
-                    self._cache[cache_key] = json.dumps(result, ensure_ascii=False)
-                    self._save_cache()
+                    await self._cache.set("warning", cache_key, json.dumps(result, ensure_ascii=False))
                     return result
             except Exception as e:
                 logger.error(f"警報テキスト生成エラー ({provider}): {e}", exc_info=True)
@@ -888,12 +1022,13 @@ class TranslatorService:
         Returns:
             dict: 生成されたテキスト
         """
-        provider = self._get_active_provider()
-        if provider == "gemini":
-            return await self._generate_warning_with_gemini(warning_name_ja, target_lang, area_name, severity)
-        elif provider == "claude":
-            return await self._generate_warning_with_claude(warning_name_ja, target_lang, area_name, severity)
-        return None
+        provider = self.get_active_provider()
+        async with self._provider_slot(provider):
+            if provider == "gemini":
+                return await self._generate_warning_with_gemini(warning_name_ja, target_lang, area_name, severity)
+            elif provider == "claude":
+                return await self._generate_warning_with_claude(warning_name_ja, target_lang, area_name, severity)
+            return None
 
     def _build_warning_prompt(self, warning_name_ja: str, target_lang: str, area_name: Optional[str], severity: str) -> str:
         """警報生成用のプロンプトを構築"""
@@ -938,39 +1073,39 @@ Important:
         """
         try:
             prompt = self._build_warning_prompt(warning_name_ja, target_lang, area_name, severity)
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "contents": [{
-                            "parts": [{"text": prompt}]
-                        }],
-                        "generationConfig": {
-                            "maxOutputTokens": 500,
-                            "temperature": 0.1
-                        }
-                    },
-                    timeout=self.generate_timeout
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["candidates"][0]["content"]["parts"][0]["text"].strip()
-                    result = self._extract_json(content)
-                    if result:
-                        return {
-                            "name": result.get("name", warning_name_ja),
-                            "description": result.get("description", ""),
-                            "action": result.get("action", "")
-                        }
-                    logger.warning(f"Gemini応答のJSONパースエラー: {content[:200]}")
-                    return None
-                else:
-                    logger.warning(f"Gemini API error: {response.status_code}")
-                    return None
+            url = f"{GEMINI_BASE_URL}/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
+
+            client = self.http_clients.get(GEMINI_BASE_URL)
+            response = await client.post(
+                url,
+                headers={"Content-Type": "application/json"},
+                json={
+                    "contents": [{
+                        "parts": [{"text": prompt}]
+                    }],
+                    "generationConfig": {
+                        "maxOutputTokens": 500,
+                        "temperature": 0.1
+                    }
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["candidates"][0]["content"]["parts"][0]["text"].strip()
+                result = self._extract_json(content)
+                if result:
+                    return {
+                        "name": result.get("name", warning_name_ja),
+                        "description": result.get("description", ""),
+                        "action": result.get("action", "")
+                    }
+                logger.warning(f"Gemini応答のJSONパースエラー: {content[:200]}")
+                return None
+            else:
+                logger.warning(f"Gemini API error: {response.status_code}")
+                return None
 
         except Exception as e:
             logger.error(f"Gemini警報テキスト生成エラー: {e}", exc_info=True)
@@ -989,40 +1124,40 @@ Important:
         try:
             prompt = self._build_warning_prompt(warning_name_ja, target_lang, area_name, severity)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-API-Key": self.anthropic_api_key,
-                        "anthropic-version": self.anthropic_api_version
-                    },
-                    json={
-                        "model": self.anthropic_model,
-                        "max_tokens": 500,
-                        "messages": [{
-                            "role": "user",
-                            "content": prompt
-                        }]
-                    },
-                    timeout=self.generate_timeout
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["content"][0]["text"].strip()
-                    result = self._extract_json(content)
-                    if result:
-                        return {
-                            "name": result.get("name", warning_name_ja),
-                            "description": result.get("description", ""),
-                            "action": result.get("action", "")
-                        }
-                    logger.warning(f"Claude応答のJSONパースエラー: {content[:200]}")
-                    return None
-                else:
-                    logger.warning(f"Claude API error: {response.status_code}")
-                    return None
+            client = self.http_clients.get(ANTHROPIC_BASE_URL)
+            response = await client.post(
+                f"{ANTHROPIC_BASE_URL}/v1/messages",
+                headers={
+                    "Content-Type": "application/json",
+                    "X-API-Key": self.anthropic_api_key,
+                    "anthropic-version": self.anthropic_api_version
+                },
+                json={
+                    "model": self.anthropic_model,
+                    "max_tokens": 500,
+                    "messages": [{
+                        "role": "user",
+                        "content": prompt
+                    }]
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["content"][0]["text"].strip()
+                result = self._extract_json(content)
+                if result:
+                    return {
+                        "name": result.get("name", warning_name_ja),
+                        "description": result.get("description", ""),
+                        "action": result.get("action", "")
+                    }
+                logger.warning(f"Claude応答のJSONパースエラー: {content[:200]}")
+                return None
+            else:
+                logger.warning(f"Claude API error: {response.status_code}")
+                return None
 
         except Exception as e:
             logger.error(f"Claude警報テキスト生成エラー: {e}", exc_info=True)
@@ -1101,33 +1236,34 @@ Important:
         cache_key = self._get_cache_key(f"safety:{disaster_type}:{location}:{severity}", target_lang)
 
         # キャッシュ確認
-        if cache_key in self._cache:
+        cached = await self._cache.get("safety", cache_key)
+        if cached is not None:
             try:
-                cached_data = json.loads(self._cache[cache_key])
+                cached_data = json.loads(cached)
                 cached_data["cached"] = True
+                cached_data["source"] = "cache"
                 return cached_data
             except json.JSONDecodeError:
                 pass
 
         # AI APIで生成
-        provider = self._get_active_provider()
+        provider = self.get_active_provider()
         if provider:
             try:
-                result = await self._generate_safety_guide_with_ai(
+                result = await self.generate_safety_guide_with_ai(
                     disaster_type, target_lang, location, severity
                 )
                 if result:
                     # キャッシュに保存
-                    self._cache[cache_key] = json.dumps(result, ensure_ascii=False)
-                    self._save_cache()
-                    return result
+                    await self._cache.set("safety", cache_key, json.dumps(result, ensure_ascii=False))
+                    return {**result, "cached": False, "source": "ai"}
             except Exception as e:
                 logger.error(f"安全ガイド生成エラー ({provider}): {e}", exc_info=True)
 
         # フォールバック: 基本的なガイドを返す
         return self._get_fallback_safety_guide(disaster_type, target_lang, location, severity)
 
-    def _build_safety_guide_prompt(
+    def build_safety_guide_prompt(
         self,
         disaster_type: str,
         target_lang: str,
@@ -1170,7 +1306,7 @@ Important guidelines:
 - Be culturally appropriate and practical
 - Focus on life-saving information first"""
 
-    async def _generate_safety_guide_with_ai(
+    async def generate_safety_guide_with_ai(
         self,
         disaster_type: str,
         target_lang: str,
@@ -1178,12 +1314,13 @@ Important guidelines:
         severity: str
     ) -> Optional[dict]:
         """AIを使用して安全ガイドを生成"""
-        provider = self._get_active_provider()
-        if provider == "gemini":
-            return await self._generate_safety_guide_with_gemini(disaster_type, target_lang, location, severity)
-        elif provider == "claude":
-            return await self._generate_safety_guide_with_claude(disaster_type, target_lang, location, severity)
-        return None
+        provider = self.get_active_provider()
+        async with self._provider_slot(provider):
+            if provider == "gemini":
+                return await self._generate_safety_guide_with_gemini(disaster_type, target_lang, location, severity)
+            elif provider == "claude":
+                return await self._generate_safety_guide_with_claude(disaster_type, target_lang, location, severity)
+            return None
 
     async def _generate_safety_guide_with_gemini(
         self,
@@ -1194,35 +1331,35 @@ Important guidelines:
     ) -> Optional[dict]:
         """Gemini APIを使用して安全ガイドを生成"""
         try:
-            prompt = self._build_safety_guide_prompt(disaster_type, target_lang, location, severity)
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    headers={"Content-Type": "application/json"},
-                    json={
-                        "contents": [{"parts": [{"text": prompt}]}],
-                        "generationConfig": {
-                            "maxOutputTokens": 1500,
-                            "temperature": 0.2
-                        }
-                    },
-                    timeout=self.generate_timeout
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["candidates"][0]["content"]["parts"][0]["text"].strip()
-                    result = self._extract_json(content)
-                    if result:
-                        result["cached"] = False
-                        return result
-                    logger.warning(f"Gemini安全ガイドのJSONパースエラー: {content[:200]}")
-                    return None
-                else:
-                    logger.warning(f"Gemini API error: {response.status_code}")
-                    return None
+            prompt = self.build_safety_guide_prompt(disaster_type, target_lang, location, severity)
+            url = f"{GEMINI_BASE_URL}/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}"
+
+            client = self.http_clients.get(GEMINI_BASE_URL)
+            response = await client.post(
+                url,
+                headers={"Content-Type": "application/json"},
+                json={
+                    "contents": [{"parts": [{"text": prompt}]}],
+                    "generationConfig": {
+                        "maxOutputTokens": 1500,
+                        "temperature": 0.2
+                    }
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["candidates"][0]["content"]["parts"][0]["text"].strip()
+                result = self._extract_json(content)
+                if result:
+                    result["cached"] = False
+                    return result
+                logger.warning(f"Gemini安全ガイドのJSONパースエラー: {content[:200]}")
+                return None
+            else:
+                logger.warning(f"Gemini API error: {response.status_code}")
+                return None
 
         except Exception as e:
             logger.error(f"Gemini安全ガイド生成エラー: {e}", exc_info=True)
@@ -1237,36 +1374,36 @@ Important guidelines:
     ) -> Optional[dict]:
         """Claude APIを使用して安全ガイドを生成"""
         try:
-            prompt = self._build_safety_guide_prompt(disaster_type, target_lang, location, severity)
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "Content-Type": "application/json",
-                        "X-API-Key": self.anthropic_api_key,
-                        "anthropic-version": self.anthropic_api_version
-                    },
-                    json={
-                        "model": self.anthropic_model,
-                        "max_tokens": 1500,
-                        "messages": [{"role": "user", "content": prompt}]
-                    },
-                    timeout=self.generate_timeout
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data["content"][0]["text"].strip()
-                    result = self._extract_json(content)
-                    if result:
-                        result["cached"] = False
-                        return result
-                    logger.warning(f"Claude安全ガイドのJSONパースエラー: {content[:200]}")
-                    return None
-                else:
-                    logger.warning(f"Claude API error: {response.status_code}")
-                    return None
+            prompt = self.build_safety_guide_prompt(disaster_type, target_lang, location, severity)
+
+            client = self.http_clients.get(ANTHROPIC_BASE_URL)
+            response = await client.post(
+                f"{ANTHROPIC_BASE_URL}/v1/messages",
+                headers={
+                    "Content-Type": "application/json",
+                    "X-API-Key": self.anthropic_api_key,
+                    "anthropic-version": self.anthropic_api_version
+                },
+                json={
+                    "model": self.anthropic_model,
+                    "max_tokens": 1500,
+                    "messages": [{"role": "user", "content": prompt}]
+                },
+                timeout=self.generate_timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data["content"][0]["text"].strip()
+                result = self._extract_json(content)
+                if result:
+                    result["cached"] = False
+                    return result
+                logger.warning(f"Claude安全ガイドのJSONパースエラー: {content[:200]}")
+                return None
+            else:
+                logger.warning(f"Claude API error: {response.status_code}")
+                return None
 
         except Exception as e:
             logger.error(f"Claude安全ガイド生成エラー: {e}", exc_info=True)
@@ -1297,7 +1434,8 @@ Important guidelines:
             "evacuation_info": "市区町村の指示に従って避難してください",
             "emergency_contacts": "警察: 110 / 消防・救急: 119 / 海上保安庁: 118",
             "additional_notes": "正確な情報は公式発表をご確認ください",
-            "cached": False
+            "cached": False,
+            "source": "fallback"
         }
 
     def get_disaster_type_name(self, disaster_type: str, lang: str) -> str:
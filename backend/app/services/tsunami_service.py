@@ -6,6 +6,8 @@ from typing import Optional
 from datetime import datetime
 from ..models import TsunamiInfo
 from ..utils.logger import get_logger
+from ..utils.http_client import HTTPClientRegistry, http_clients as default_http_clients
+from ..utils.upstream_cache import UpstreamCache, upstream_cache as default_upstream_cache
 
 logger = get_logger(__name__)
 
@@ -13,10 +15,16 @@ logger = get_logger(__name__)
 class TsunamiService:
     """気象庁の津波情報を取得するサービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        cache: Optional[UpstreamCache] = None,
+    ):
         from ..config import settings
         self.BASE_URL = settings.jma_base_url
         self.timeout = settings.api_timeout
+        self.http_clients = http_clients or default_http_clients
+        self.cache = cache or default_upstream_cache
 
     # 津波警報レベルマッピング
     TSUNAMI_LEVELS = {
@@ -27,6 +35,9 @@ class TsunamiService:
         "なし": "none",
     }
 
+    # 発令中とみなす警報レベル
+    ACTIVE_LEVELS = ("major_warning", "warning", "advisory")
+
     async def get_tsunami_list(self, limit: int = 10) -> list[TsunamiInfo]:
         """
         津波情報一覧を取得
@@ -37,17 +48,37 @@ class TsunamiService:
         Returns:
             list[TsunamiInfo]: 津波情報リスト
         """
-        url = f"{self.BASE_URL}/tsunami/data/list.json"
+        try:
+            return await self.fetch_tsunami_list(limit=limit)
+        except httpx.HTTPError as e:
+            logger.error(f"津波情報取得エラー: {e}", exc_info=True)
+            return []
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-                return self._parse_tsunami_list(data[:limit])
-            except httpx.HTTPError as e:
-                logger.error(f"津波情報取得エラー: {e}", exc_info=True)
-                return []
+    async def fetch_tsunami_list(self, limit: int = 10, fresh: bool = False) -> list[TsunamiInfo]:
+        """
+        津波情報一覧を取得（取得エラーを呼び出し元に伝播）
+
+        Args:
+            limit: 取得件数
+            fresh: Trueの場合はキャッシュを使わずに上流から取得（定期取り込み用）
+
+        Returns:
+            list[TsunamiInfo]: 津波情報リスト
+
+        Raises:
+            httpx.HTTPError: APIリクエストに失敗した場合
+        """
+        url = f"{self.BASE_URL}/tsunami/data/list.json"
+        data = await self.cache.get_or_fetch(
+            "tsunami", url,
+            loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+            feed="tsunami",
+            fresh=fresh,
+        )
+        # 304・キャッシュヒットで同一のJSONが返された場合はパースをスキップ
+        tsunamis = self.http_clients.parse_cached(url, data, self._parse_tsunami_list)
+        # エンドポイント側で翻訳フィールドを書き換えるためコピーを返す
+        return [t.model_copy() for t in tsunamis[:limit]]
 
     def _parse_tsunami_list(self, data: list) -> list[TsunamiInfo]:
         """APIレスポンスを津波情報リストにパース"""
@@ -141,9 +172,11 @@ class TsunamiService:
             list[TsunamiInfo]: 発令中の津波警報リスト
         """
         all_tsunamis = await self.get_tsunami_list(limit=20)
-        # 最新の情報から警報・注意報のみをフィルタリング
-        active = [t for t in all_tsunamis if t.warning_level in ["major_warning", "warning", "advisory"]]
-        return active
+        return self.filter_active(all_tsunamis)
+
+    def filter_active(self, tsunamis: list[TsunamiInfo]) -> list[TsunamiInfo]:
+        """警報・注意報のみを抽出"""
+        return [t for t in tsunamis if t.warning_level in self.ACTIVE_LEVELS]
 
     async def get_tsunami_detail(self, json_filename: str) -> Optional[dict]:
         """
@@ -157,11 +190,12 @@ class TsunamiService:
         """
         url = f"{self.BASE_URL}/tsunami/data/{json_filename}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"津波詳細情報取得エラー: {e}", exc_info=True)
-                return None
+        try:
+            return await self.cache.get_or_fetch(
+                "tsunami", url,
+                loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+                feed="tsunami",
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"津波詳細情報取得エラー: {e}", exc_info=True)
+            return None
@@ -3,8 +3,11 @@
 """
 import httpx
 from typing import Optional
-from ..models import VolcanoInfo, VolcanoWarning
+from ..models import VolcanoInfo, VolcanoWarning, VolcanoWarningCollection, FetchFailure
 from ..utils.logger import get_logger
+from ..utils.http_client import HTTPClientRegistry, http_clients as default_http_clients
+from ..utils.upstream_cache import UpstreamCache, upstream_cache as default_upstream_cache
+from ..utils.fanout import gather_bounded
 
 logger = get_logger(__name__)
 
@@ -12,10 +15,18 @@ logger = get_logger(__name__)
 class VolcanoService:
     """気象庁の火山情報を取得するサービス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        cache: Optional[UpstreamCache] = None,
+    ):
         from ..config import settings
         self.BASE_URL = f"{settings.jma_base_url}/volcano"
         self.timeout = settings.api_timeout
+        self.http_clients = http_clients or default_http_clients
+        self.cache = cache or default_upstream_cache
+        self.fanout_concurrency = settings.volcano_fanout_concurrency
+        self.fanout_timeout = settings.volcano_fanout_timeout
 
     # 噴火警戒レベルの説明
     ALERT_LEVELS = {
@@ -59,15 +70,17 @@ class VolcanoService:
         """
         url = f"{self.BASE_URL}/const/volcano_list.json"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
-                return self._parse_volcano_list(data)
-            except httpx.HTTPError as e:
-                logger.error(f"火山一覧取得エラー: {e}", exc_info=True)
-                return []
+        try:
+            data = await self.cache.get_or_fetch(
+                "volcano", url,
+                loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+                feed="volcano_list",
+            )
+            # 304・キャッシュヒットで同一のJSONが返された場合はパースをスキップ
+            return list(self.http_clients.parse_cached(url, data, self._parse_volcano_list))
+        except httpx.HTTPError as e:
+            logger.error(f"火山一覧取得エラー: {e}", exc_info=True)
+            return []
 
     def _parse_volcano_list(self, data: list) -> list[VolcanoInfo]:
         """APIレスポンスを火山情報リストにパース"""
@@ -105,34 +118,56 @@ class VolcanoService:
         all_volcanoes = await self.get_volcano_list()
         return [v for v in all_volcanoes if v.is_monitored]
 
-    async def get_volcano_warnings(self) -> list[dict]:
+    async def get_volcano_warnings(self, fresh: bool = False) -> VolcanoWarningCollection:
         """
         火山警報を取得
 
+        監視火山を同時実行数を制限して並行取得します。
+        タイムアウト・取得エラーとなった火山は結果のfailedに記録されます。
+
+        Args:
+            fresh: Trueの場合はキャッシュを使わずに上流から取得（定期取り込み用）
+
         Returns:
-            list[dict]: 火山警報リスト
+            VolcanoWarningCollection: 火山警報リストと取得に失敗した火山
         """
-        # 各監視火山の警報情報を取得
-        warnings = []
-
-        async with httpx.AsyncClient() as client:
-            for volcano_code in self.MONITORED_VOLCANOES:
-                try:
-                    url = f"{self.BASE_URL}/data/warning/{volcano_code}.json"
-                    response = await client.get(url, timeout=self.timeout)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            warning = self._parse_volcano_warning(data, volcano_code)
-                            if warning:
-                                warnings.append(warning)
-                except httpx.HTTPError:
-                    continue
-                except Exception as e:
-                    logger.warning(f"火山警報取得エラー ({volcano_code}): {e}")
-                    continue
-
-        return warnings
+        async def fetch(volcano_code: int) -> Optional[dict]:
+            url = f"{self.BASE_URL}/data/warning/{volcano_code}.json"
+            # 警報ファイルが存在しない火山（404）は発表なし
+            data = await self.cache.get_or_fetch(
+                "volcano", url,
+                loader=lambda: self.http_clients.get_json(url, timeout=self.timeout, missing_ok=True),
+                feed="volcano_warnings",
+                fresh=fresh,
+            )
+            if not data:
+                return None
+            return self.http_clients.parse_cached(
+                url, data, lambda d: self._parse_volcano_warning(d, volcano_code)
+            )
+
+        result = await gather_bounded(
+            self.MONITORED_VOLCANOES,
+            fetch,
+            concurrency=self.fanout_concurrency,
+            timeout=self.fanout_timeout,
+        )
+
+        collection = VolcanoWarningCollection()
+        for volcano_code in self.MONITORED_VOLCANOES:
+            warning = result.results.get(volcano_code)
+            if warning:
+                collection.warnings.append(warning)
+            elif volcano_code in result.failed:
+                collection.failed.append(FetchFailure(
+                    code=str(volcano_code), reason=result.failed[volcano_code]
+                ))
+
+        if collection.failed:
+            logger.warning(
+                f"火山警報取得に失敗した火山: {', '.join(f.code for f in collection.failed)}"
+            )
+        return collection
 
     def _parse_volcano_warning(self, data: dict, volcano_code: int) -> Optional[dict]:
         """火山警報情報をパース"""
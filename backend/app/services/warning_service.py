@@ -6,12 +6,16 @@
 2. Claude API（未対応の10言語） - 動的生成・有料
 3. キャッシュ活用 - APIコスト削減
 """
+import asyncio
 import httpx
 from typing import Optional
 from datetime import datetime
-from ..models import DisasterAlert
+from ..models import DisasterAlert, FetchFailure, WarningCollection
 from ..utils.logger import get_logger
 from ..utils.area_codes import AREA_CODES, get_area_code
+from ..utils.http_client import HTTPClientRegistry, http_clients as default_http_clients
+from ..utils.upstream_cache import UpstreamCache, upstream_cache as default_upstream_cache
+from ..utils.fanout import FanOutResult, gather_bounded
 
 logger = get_logger(__name__)
 
@@ -22,10 +26,19 @@ STATIC_LANGUAGES = {"ja", "en", "zh", "ko", "vi", "easy_ja"}
 class WarningService:
     """気象庁の警報・注意報を取得するサービス"""
 
-    def __init__(self, translator=None):
+    def __init__(
+        self,
+        translator=None,
+        http_clients: Optional[HTTPClientRegistry] = None,
+        cache: Optional[UpstreamCache] = None,
+    ):
         from ..config import settings
         self.BASE_URL = settings.jma_base_url
         self.timeout = settings.api_timeout
+        self.http_clients = http_clients or default_http_clients
+        self.cache = cache or default_upstream_cache
+        self.fanout_concurrency = settings.warning_fanout_concurrency
+        self.fanout_timeout = settings.warning_fanout_timeout
         self._translator = translator  # TranslatorServiceへの参照（遅延初期化）
 
     @property
@@ -33,7 +46,7 @@ class WarningService:
         """TranslatorServiceを遅延初期化で取得"""
         if self._translator is None:
             from .translator import TranslatorService
-            self._translator = TranslatorService()
+            self._translator = TranslatorService(http_clients=self.http_clients)
         return self._translator
 
     # 警報・注意報コードマッピング（多言語対応）
@@ -101,24 +114,47 @@ class WarningService:
         Returns:
             list[DisasterAlert]: 警報・注意報リスト
         """
-        url = f"{self.BASE_URL}/warning/data/warning/{area_code}.json"
+        try:
+            data = await self._fetch_warning_data(area_code)
+            return await self.build_alerts(data, area_code, lang)
+
+        except httpx.HTTPError as e:
+            logger.error(f"警報情報取得エラー: {e}", exc_info=True)
+            return []
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
-                data = response.json()
+    async def build_alerts(self, data: dict, area_code: str, lang: str = "ja") -> list[DisasterAlert]:
+        """
+        取得済みの警報JSONから指定言語の警報リストを作成
+
+        Args:
+            data: 気象庁の警報JSON
+            area_code: 地域コード
+            lang: 言語コード
+
+        Returns:
+            list[DisasterAlert]: 警報・注意報リスト
+        """
+        # 静的マッピング対応言語の場合は従来通り
+        if lang in STATIC_LANGUAGES:
+            return self._parse_warnings_cached(data, area_code, lang)
 
-                # 静的マッピング対応言語の場合は従来通り
-                if lang in STATIC_LANGUAGES:
-                    return self._parse_warnings(data, area_code, lang)
+        # 未対応言語の場合はClaude APIで動的生成
+        return await self._parse_warnings_with_ai(data, area_code, lang)
 
-                # 未対応言語の場合はClaude APIで動的生成
-                return await self._parse_warnings_with_ai(data, area_code, lang)
+    async def _fetch_warning_data(self, area_code: str, fresh: bool = False) -> dict:
+        """
+        指定地域の警報JSONを取得（キャッシュ経由、freshの場合は上流から取得してキャッシュに保存）
 
-            except httpx.HTTPError as e:
-                logger.error(f"警報情報取得エラー: {e}", exc_info=True)
-                return []
+        Raises:
+            httpx.HTTPError: APIリクエストに失敗した場合
+        """
+        url = f"{self.BASE_URL}/warning/data/warning/{area_code}.json"
+        return await self.cache.get_or_fetch(
+            "warning", url,
+            loader=lambda: self.http_clients.get_json(url, timeout=self.timeout),
+            feed="warnings",
+            fresh=fresh,
+        )
 
     def _get_warning_name(self, code: str, lang: str) -> str:
         """警報コードから指定言語の名前を取得"""
@@ -186,6 +222,18 @@ class WarningService:
 
         return alerts
 
+    def _parse_warnings_cached(self, data: dict, area_code: str, lang: str = "ja") -> list[DisasterAlert]:
+        """
+        警報JSONをパース（304・キャッシュヒットで同一のJSONの場合は前回の結果を再利用）
+
+        エンドポイント側で翻訳フィールドを書き換えるためコピーを返す
+        """
+        alerts = self.http_clients.parse_cached(
+            ("warning", area_code, lang), data,
+            lambda d: self._parse_warnings(d, area_code, lang),
+        )
+        return [alert.model_copy() for alert in alerts]
+
     def _get_alert_type(self, severity: str) -> str:
         """重要度からアラートタイプを決定"""
         if severity == "extreme":
@@ -201,15 +249,18 @@ class WarningService:
         """
         APIレスポンスを警報リストにパース（Claude API使用版）
 
-        未対応言語（th, id, ms, tl, fr, de, it, es, ne, zh-TW）の場合に使用
+        未対応言語（th, id, ms, tl, fr, de, it, es, ne, zh-TW）の場合に使用。
+        警報テキストの生成・地域名の翻訳は並行して行い（同時呼び出し数はAIプロバイダー毎に制限）、
+        期限までに生成できなかった警報は、翻訳を付けずに日本語のタイトル・説明文で返します
+        （description_translated等はNone。生成は裏で継続しキャッシュに保存）。
         """
-        alerts = []
         report_datetime = data.get("reportDatetime", "")
 
         area_types = data.get("areaTypes", [])
         if not area_types:
-            return alerts
+            return []
 
+        issued = []  # (地域名, 警報コード)
         for area_type in area_types:
             areas = area_type.get("areas", [])
             for area in areas:
@@ -221,87 +272,128 @@ class WarningService:
                     status = warning.get("status", "")
 
                     if status == "発表" and code in self.WARNING_CODES:
-                        warning_info = self.WARNING_CODES[code]
-                        title_ja = self._get_warning_name(code, "ja")
-                        severity = warning_info.get("severity", "medium")
-                        alert_id = f"{area_code}_{code}_{datetime.now().strftime('%Y%m%d%H%M')}"
+                        issued.append((area_name_ja, code))
+        if not issued:
+            return []
+
+        # Claude APIで動的生成（地域名も翻訳）
+        area_names = list(dict.fromkeys(area_name_ja for area_name_ja, _ in issued))
+        generated_list, areas_translated = await asyncio.gather(
+            self.translator.gather_with_deadline([
+                self.translator.generate_warning_text(
+                    warning_name_ja=self._get_warning_name(code, "ja"),
+                    target_lang=lang,
+                    area_name=area_name_ja,
+                    severity=self.WARNING_CODES[code].get("severity", "medium")
+                )
+                for area_name_ja, code in issued
+            ]),
+            self.translator.translate_locations(area_names, lang),
+        )
+        area_translations = dict(zip(area_names, areas_translated))
 
-                        # Claude APIで動的生成
-                        try:
-                            generated = await self.translator.generate_warning_text(
-                                warning_name_ja=title_ja,
-                                target_lang=lang,
-                                area_name=area_name_ja,
-                                severity=severity
-                            )
-
-                            # 地域名も翻訳
-                            area_translated = await self.translator.translate_location(area_name_ja, lang)
-
-                            alerts.append(DisasterAlert(
-                                id=alert_id,
-                                type=self._get_alert_type(severity),
-                                title=title_ja,
-                                title_translated=generated.get("name"),
-                                description=f"{area_name_ja}に{title_ja}が発表されています。",
-                                description_translated=generated.get("description"),
-                                area=area_translated,
-                                issued_at=report_datetime,
-                                expires_at=None,
-                                severity=severity,
-                                action=generated.get("action")  # 推奨行動を追加
-                            ))
-                        except Exception as e:
-                            logger.error(f"AI生成エラー: {e}", exc_info=True)
-                            # フォールバック: 英語版を使用
-                            alerts.append(DisasterAlert(
-                                id=alert_id,
-                                type=self._get_alert_type(severity),
-                                title=title_ja,
-                                title_translated=self._get_warning_name(code, "en"),
-                                description=f"{area_name_ja}に{title_ja}が発表されています。",
-                                description_translated=self._get_description(area_name_ja, self._get_warning_name(code, "en"), "en"),
-                                area=area_name_ja,
-                                issued_at=report_datetime,
-                                expires_at=None,
-                                severity=severity
-                            ))
+        alerts = []
+        for (area_name_ja, code), generated in zip(issued, generated_list):
+            title_ja = self._get_warning_name(code, "ja")
+            severity = self.WARNING_CODES[code].get("severity", "medium")
+            alert_id = f"{area_code}_{code}_{datetime.now().strftime('%Y%m%d%H%M')}"
+
+            if generated is not None:
+                alerts.append(DisasterAlert(
+                    id=alert_id,
+                    type=self._get_alert_type(severity),
+                    title=title_ja,
+                    title_translated=generated.get("name"),
+                    description=f"{area_name_ja}に{title_ja}が発表されています。",
+                    description_translated=generated.get("description"),
+                    area=area_translations.get(area_name_ja, area_name_ja),
+                    issued_at=report_datetime,
+                    expires_at=None,
+                    severity=severity,
+                    action=generated.get("action")  # 推奨行動を追加
+                ))
+            else:
+                # フォールバック: 日本語のみ（利用者の言語ではない英語の訳文は付けない）
+                alerts.append(DisasterAlert(
+                    id=alert_id,
+                    type=self._get_alert_type(severity),
+                    title=title_ja,
+                    title_translated=None,
+                    description=f"{area_name_ja}に{title_ja}が発表されています。",
+                    description_translated=None,
+                    area=area_name_ja,
+                    issued_at=report_datetime,
+                    expires_at=None,
+                    severity=severity
+                ))
 
         return alerts
 
-    async def get_all_prefectures_warnings(self) -> list[DisasterAlert]:
+    async def get_all_prefectures_warnings(self) -> WarningCollection:
         """
         全国の警報・注意報を取得
 
+        47都道府県を同時実行数を制限して並行取得します。
+        取得に失敗した都道府県は結果のfailedに記録されます。
+
+        Returns:
+            WarningCollection: 全国の警報・注意報リストと取得に失敗した地域
+        """
+        result = await self.fetch_all_prefectures_data()
+        return self.build_collection(result)
+
+    async def fetch_all_prefectures_data(self, fresh: bool = False) -> FanOutResult[str, dict]:
+        """
+        全国の警報JSONを並行取得
+
+        Args:
+            fresh: Trueの場合はキャッシュを使わずに上流から取得（定期取り込み用）
+
+        Returns:
+            FanOutResult: 地域コード毎の警報JSONと取得に失敗した地域コード
+        """
+        return await gather_bounded(
+            self.AREA_CODES.values(),
+            lambda area_code: self._fetch_warning_data(area_code, fresh=fresh),
+            concurrency=self.fanout_concurrency,
+            timeout=self.fanout_timeout,
+        )
+
+    def build_collection(self, result: FanOutResult[str, dict]) -> WarningCollection:
+        """
+        並行取得の結果から全国の警報リスト（日本語）を作成
+
+        Args:
+            result: fetch_all_prefectures_dataの結果
+
         Returns:
-            list[DisasterAlert]: 全国の警報・注意報リスト
+            WarningCollection: 全国の警報・注意報リストと取得に失敗した地域
         """
-        all_alerts = []
-
-        async with httpx.AsyncClient() as client:
-            for prefecture, area_code in self.AREA_CODES.items():
-                try:
-                    url = f"{self.BASE_URL}/warning/data/warning/{area_code}.json"
-                    response = await client.get(url, timeout=self.timeout)
-                    if response.status_code == 200:
-                        data = response.json()
-                        alerts = self._parse_warnings(data, area_code)
-                        all_alerts.extend(alerts)
-                except httpx.HTTPError as e:
-                    logger.warning(f"{prefecture}の警報取得エラー: {e}")
-                    continue
-
-        return all_alerts
-
-    async def get_special_warnings(self) -> list[DisasterAlert]:
+        collection = WarningCollection()
+        for prefecture, area_code in self.AREA_CODES.items():
+            if area_code in result.results:
+                collection.alerts.extend(self._parse_warnings_cached(result.results[area_code], area_code))
+            if area_code in result.failed:
+                collection.failed.append(FetchFailure(
+                    code=area_code, name=prefecture, reason=result.failed[area_code]
+                ))
+
+        if collection.failed:
+            logger.warning(
+                f"警報取得に失敗した地域: {', '.join(f.name for f in collection.failed)}"
+            )
+        return collection
+
+    async def get_special_warnings(self) -> WarningCollection:
         """
         全国の特別警報のみを取得
 
         Returns:
-            list[DisasterAlert]: 特別警報リスト
+            WarningCollection: 特別警報リストと取得に失敗した地域
         """
-        all_alerts = await self.get_all_prefectures_warnings()
-        return [alert for alert in all_alerts if alert.severity == "extreme"]
+        collection = await self.get_all_prefectures_warnings()
+        collection.alerts = [alert for alert in collection.alerts if alert.severity == "extreme"]
+        return collection
 
     def get_area_code(self, prefecture_name: str) -> Optional[str]:
         """都道府県名から地域コードを取得"""
@@ -0,0 +1,239 @@
+"""
+地図タイル用のクラスタピラミッド
+
+Webメルカトルのタイル（256px）を4x4のセル（64px）に分割し、ズームレベル毎に
+セル内の地点を1つのクラスタ（件数・重心・災害種別の和集合・収容人数の合計）にまとめます。
+最も細かいレベルを地点から作成し、上位のレベルは子セルを4つずつ統合して作成します。
+
+各レベルはクラスタをタイル順（行優先）に並べた配列で保持し、
+タイル・表示範囲に含まれるクラスタを二分探索で取得します。
+
+NumPyがインストールされている場合は作成を配列演算で行います（未インストールの場合は純Python）。
+"""
+import math
+from array import array
+from bisect import bisect_left
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - NumPy未インストール環境
+    np = None
+    NUMPY_AVAILABLE = False
+
+TILE_SIZE = 256
+CELL_BITS = 2  # タイルあたり 2^CELL_BITS x 2^CELL_BITS セル
+CELL_MASK = (1 << CELL_BITS) - 1
+MAX_LATITUDE = 85.05112878  # Webメルカトルで表示できる緯度の上限
+
+
+def world_xy(lat: float, lon: float) -> tuple[float, float]:
+    """緯度経度をWebメルカトルの正規化座標（0〜1）に変換"""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """タイルの範囲 (南端, 西端, 北端, 東端)"""
+    n = 1 << z
+
+    def lat_of(ty: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+def tile_range(
+    z: int, south: float, west: float, north: float, east: float
+) -> tuple[int, int, int, int]:
+    """表示範囲を覆うタイル番号の範囲 (x_min, y_min, x_max, y_max)"""
+    n = 1 << z
+    x0, y0 = world_xy(north, west)
+    x1, y1 = world_xy(south, east)
+    return int(x0 * n), int(y0 * n), int(x1 * n), int(y1 * n)
+
+
+class ClusterLevel:
+    """1つのズームレベルのクラスタ（タイル順に並べた列）"""
+
+    __slots__ = (
+        "zoom", "tile_keys", "counts", "latitudes", "longitudes",
+        "type_masks", "capacities", "rows",
+    )
+
+    def __init__(self, zoom: int):
+        self.zoom = zoom
+        self.tile_keys = array("q")  # タイルの行 * 2^zoom + タイルの列
+        self.counts = array("I")
+        self.latitudes = array("d")  # 重心
+        self.longitudes = array("d")
+        self.type_masks = array("H")  # 災害種別の和集合
+        self.capacities = array("q")  # 収容人数の合計（未設定の地点は含まない）
+        self.rows = array("I")  # 代表の地点（件数が1のクラスタは地点そのもの）
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def in_tiles(self, x_min: int, y_min: int, x_max: int, y_max: int) -> list[int]:
+        """タイルの範囲に含まれるクラスタの添字"""
+        n = 1 << self.zoom
+        keys = self.tile_keys
+        found: list[int] = []
+        for ty in range(max(y_min, 0), min(y_max, n - 1) + 1):
+            start = bisect_left(keys, ty * n + max(x_min, 0))
+            end = bisect_left(keys, ty * n + min(x_max, n - 1) + 1)
+            found.extend(range(start, end))
+        return found
+
+
+class ClusterPyramid:
+    """ズームレベル毎のクラスタ"""
+
+    def __init__(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        type_masks: Sequence[int],
+        capacities: Sequence[int],
+        rows: Optional[Sequence[int]] = None,
+        max_zoom: int = 12,
+    ):
+        """
+        Args:
+            latitudes, longitudes: 地点毎の緯度・経度
+            type_masks: 地点毎の災害種別のビットマスク
+            capacities: 地点毎の収容人数（負の値は未設定）
+            rows: クラスタに含める地点の添字（省略時は全地点）
+            max_zoom: クラスタを作成する最大のズームレベル
+        """
+        self.max_zoom = max_zoom
+        self.levels: list[ClusterLevel] = [ClusterLevel(z) for z in range(max_zoom + 1)]
+        if rows is None:
+            rows = range(len(latitudes))
+        if NUMPY_AVAILABLE:
+            self._build_numpy(latitudes, longitudes, type_masks, capacities, rows)
+        else:
+            self._build_python(latitudes, longitudes, type_masks, capacities, rows)
+
+    def _build_numpy(self, latitudes, longitudes, type_masks, capacities, rows) -> None:
+        """配列演算でレベル毎のクラスタを作成"""
+        rows = np.asarray(rows, dtype=np.int64)
+        lat = np.asarray(latitudes, dtype=np.float64)[rows]
+        lon = np.asarray(longitudes, dtype=np.float64)[rows]
+        masks = np.asarray(type_masks, dtype=np.int64)[rows]
+        caps = np.maximum(np.asarray(capacities, dtype=np.int64)[rows], 0)
+        counts = np.ones(len(rows), dtype=np.int64)
+
+        sin_lat = np.sin(np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE)))
+        x = np.clip((lon + 180.0) / 360.0, 0.0, 1.0 - 1e-12)
+        y = np.clip(0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi), 0.0, 1.0 - 1e-12)
+        scale = 1 << (self.max_zoom + CELL_BITS)
+        cell_rows = (y * scale).astype(np.int64)
+        cell_cols = (x * scale).astype(np.int64)
+
+        for zoom in range(self.max_zoom, -1, -1):
+            if zoom < self.max_zoom:
+                cell_rows >>= 1
+                cell_cols >>= 1
+            level = self.levels[zoom]
+            if len(counts) == 0:
+                continue
+            # タイル順 → タイル内のセル順に並ぶキー
+            tile_keys = (cell_rows >> CELL_BITS) * (1 << zoom) + (cell_cols >> CELL_BITS)
+            keys = (tile_keys << (2 * CELL_BITS)) | ((cell_rows & CELL_MASK) << CELL_BITS) | (cell_cols & CELL_MASK)
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+
+            counts = np.add.reduceat(counts[order], starts)
+            lat = np.add.reduceat(lat[order], starts)
+            lon = np.add.reduceat(lon[order], starts)
+            masks = np.bitwise_or.reduceat(masks[order], starts)
+            caps = np.add.reduceat(caps[order], starts)
+            rows = rows[order][starts]
+            cell_rows = cell_rows[order][starts]
+            cell_cols = cell_cols[order][starts]
+
+            level.tile_keys.frombytes((keys[starts] >> (2 * CELL_BITS)).astype(np.int64).tobytes())
+            level.counts.frombytes(counts.astype(np.uint32).tobytes())
+            level.latitudes.frombytes((lat / counts).tobytes())
+            level.longitudes.frombytes((lon / counts).tobytes())
+            level.type_masks.frombytes(masks.astype(np.uint16).tobytes())
+            level.capacities.frombytes(caps.astype(np.int64).tobytes())
+            level.rows.frombytes(rows.astype(np.uint32).tobytes())
+
+    def _build_python(self, latitudes, longitudes, type_masks, capacities, rows) -> None:
+        """レベル毎のクラスタを作成（NumPy未インストール時）"""
+        max_zoom = self.max_zoom
+        # 最も細かいレベルのセル毎に集計: セル -> [件数, 緯度の和, 経度の和, 種別, 収容人数, 代表]
+        scale = 1 << (max_zoom + CELL_BITS)
+        cells: dict[tuple[int, int], list] = {}
+        for i in rows:
+            lat = latitudes[i]
+            lon = longitudes[i]
+            x, y = world_xy(lat, lon)
+            key = (int(y * scale), int(x * scale))
+            capacity = max(capacities[i], 0)
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [1, lat, lon, type_masks[i], capacity, i]
+            else:
+                cell[0] += 1
+                cell[1] += lat
+                cell[2] += lon
+                cell[3] |= type_masks[i]
+                cell[4] += capacity
+
+        for zoom in range(max_zoom, -1, -1):
+            self._fill(self.levels[zoom], cells)
+            if zoom == 0:
+                break
+            parents: dict[tuple[int, int], list] = {}
+            for (row, col), cell in cells.items():
+                key = (row >> 1, col >> 1)
+                parent = parents.get(key)
+                if parent is None:
+                    parents[key] = list(cell)
+                else:
+                    parent[0] += cell[0]
+                    parent[1] += cell[1]
+                    parent[2] += cell[2]
+                    parent[3] |= cell[3]
+                    parent[4] += cell[4]
+            cells = parents
+
+    @staticmethod
+    def _fill(level: ClusterLevel, cells: dict[tuple[int, int], list]) -> None:
+        """セル毎の集計をタイル順に並べてレベルに格納"""
+        n = 1 << level.zoom
+
+        def tile_key(cell: tuple[int, int]) -> int:
+            return (cell[0] >> CELL_BITS) * n + (cell[1] >> CELL_BITS)
+
+        for row, col in sorted(cells, key=lambda cell: (tile_key(cell), cell)):
+            count, lat_sum, lon_sum, mask, capacity, representative = cells[(row, col)]
+            level.tile_keys.append(tile_key((row, col)))
+            level.counts.append(count)
+            level.latitudes.append(lat_sum / count)
+            level.longitudes.append(lon_sum / count)
+            level.type_masks.append(mask)
+            level.capacities.append(capacity)
+            level.rows.append(representative)
+
+    def tile(self, z: int, x: int, y: int) -> list[int]:
+        """タイルに含まれるクラスタの添字（z <= max_zoom）"""
+        return self.levels[z].in_tiles(x, y, x, y)
+
+    def bbox(self, z: int, south: float, west: float, north: float, east: float) -> list[int]:
+        """重心が表示範囲に含まれるクラスタの添字（z <= max_zoom）"""
+        level = self.levels[z]
+        lats = level.latitudes
+        lons = level.longitudes
+        return [
+            c for c in level.in_tiles(*tile_range(z, south, west, north, east))
+            if south <= lats[c] <= north and west <= lons[c] <= east
+        ]
@@ -0,0 +1,272 @@
+"""
+NumPyによる距離計算エンジン
+
+地点の緯度経度を連続したfloat配列で保持し、Haversine距離を配列演算でまとめて計算します。
+上位k件の選択は全件ソートではなくargpartitionで行います。
+多数の検索地点（住所一覧等）に対する一括検索にも対応します。
+
+NumPyは任意の依存です。インストールされていない場合はNUMPY_AVAILABLEがFalseになり、
+呼び出し側は空間インデックス（GridIndex）の純Python実装を使用します。
+"""
+import math
+from typing import Iterable, Optional, Sequence
+
+from .spatial_index import EARTH_RADIUS_KM, KM_PER_DEGREE
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - NumPy未インストール環境
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def make_mask(flags: Iterable[bool], count: int) -> "np.ndarray":
+    """地点毎の候補フラグからbool配列を作成"""
+    return np.fromiter(flags, dtype=bool, count=count)
+
+
+def bits_mask(column: Sequence[int], bits: int, match_all: bool = False) -> "np.ndarray":
+    """ビットマスクの列からビットが立っている地点のbool配列を作成（match_all: 全ビット / いずれか）"""
+    masked = np.asarray(column) & bits
+    return masked == bits if match_all else masked != 0
+
+
+def buffer_view(buffer, dtype) -> "np.ndarray":
+    """配列（array / bytearray）を複製せずに参照する配列（元の配列の更新が反映される）"""
+    return np.frombuffer(buffer, dtype=dtype)
+
+
+class DistanceEngine:
+    """連続配列で保持した地点に対する一括距離計算"""
+
+    def __init__(self, points: Sequence[tuple[float, float]], max_matrix_size: int = 2_000_000):
+        """
+        Args:
+            points: (緯度, 経度) のリスト。検索結果はこのリストの添字で返す
+            max_matrix_size: 一括検索で一度に計算する距離行列の要素数上限（メモリ使用量の上限）
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("DistanceEngineにはNumPyが必要です")
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._set_columns(coords[:, 0], coords[:, 1])
+        self.max_matrix_size = max_matrix_size
+
+    @classmethod
+    def from_columns(
+        cls,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        radians: Optional[tuple[Sequence[float], Sequence[float], Sequence[float]]] = None,
+        max_matrix_size: int = 2_000_000,
+    ) -> "DistanceEngine":
+        """
+        緯度・経度の列から作成
+
+        バッファプロトコルに対応した列（array('d')・メモリマップ上のmemoryview等）は
+        コピーせずに参照する。
+
+        Args:
+            latitudes, longitudes: 緯度・経度（度）の列
+            radians: 計算済みの (緯度ラジアン, 経度ラジアン, 緯度の余弦) の列
+            max_matrix_size: 一括検索で一度に計算する距離行列の要素数上限
+        """
+        engine = cls([], max_matrix_size=max_matrix_size)
+        engine._set_columns(
+            np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64),
+            radians=radians,
+        )
+        return engine
+
+    def _set_columns(
+        self,
+        lat_deg: "np.ndarray",
+        lon_deg: "np.ndarray",
+        radians: Optional[tuple[Sequence[float], Sequence[float], Sequence[float]]] = None,
+    ) -> None:
+        """座標の列を設定し、計算用の列を作成"""
+        self.lat_deg = np.ascontiguousarray(lat_deg)
+        self.lon_deg = np.ascontiguousarray(lon_deg)
+        if radians is not None:
+            self.lat_rad, self.lon_rad, self.cos_lat = (
+                np.asarray(column, dtype=np.float64) for column in radians
+            )
+        else:
+            self.lat_rad = np.radians(self.lat_deg)
+            self.lon_rad = np.radians(self.lon_deg)
+            self.cos_lat = np.cos(self.lat_rad)
+        self._lat_order: Optional["np.ndarray"] = None
+        self._lat_sorted: Optional["np.ndarray"] = None
+
+    def _lat_index(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """一括検索で緯度の範囲を二分探索するための緯度順の添字（初回の一括検索時に作成）"""
+        if self._lat_order is None:
+            self._lat_order = np.argsort(self.lat_deg, kind="stable")
+            self._lat_sorted = self.lat_deg[self._lat_order]
+        return self._lat_order, self._lat_sorted
+
+    def __len__(self) -> int:
+        return len(self.lat_rad)
+
+    def distances(self, lat: float, lon: float, indices: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """
+        検索地点から各地点までの距離（km）
+
+        Args:
+            lat, lon: 検索地点
+            indices: 計算対象の地点の添字（省略時は全地点）
+        """
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        if indices is None:
+            lat_rads, lon_rads, cos_lats = self.lat_rad, self.lon_rad, self.cos_lat
+        else:
+            lat_rads, lon_rads, cos_lats = self.lat_rad[indices], self.lon_rad[indices], self.cos_lat[indices]
+        a = np.sin((lat_rads - lat_rad) / 2) ** 2 + \
+            math.cos(lat_rad) * cos_lats * np.sin((lon_rads - lon_rad) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_km: float = math.inf,
+        mask: Optional["np.ndarray"] = None,
+        indices: Optional[Sequence[int]] = None,
+    ) -> list[tuple[float, int]]:
+        """
+        近い順にk件の地点を取得
+
+        Args:
+            lat, lon: 検索地点
+            k: 取得件数
+            max_km: これより遠い地点は含めない（km）
+            mask: 地点毎の候補フラグ（bool配列）
+            indices: 候補とする地点の添字（空間インデックスで絞り込んだ候補等）
+
+        Returns:
+            list[tuple[float, int]]: (距離km, 添字) のリスト（近い順）
+        """
+        if indices is None:
+            candidates = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        else:
+            candidates = np.asarray(indices, dtype=np.intp)
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+        if k <= 0 or len(candidates) == 0:
+            return []
+
+        d = self.distances(lat, lon, candidates)
+        if math.isfinite(max_km):
+            within = d <= max_km
+            candidates, d = candidates[within], d[within]
+        return self._top_k(d, candidates, k)
+
+    @staticmethod
+    def _top_k(d: "np.ndarray", candidates: "np.ndarray", k: int) -> list[tuple[float, int]]:
+        """距離の小さい順にk件を選択（argpartitionで上位k件のみソート）"""
+        if len(d) > k:
+            part = np.argpartition(d, k - 1)[:k]
+            d, candidates = d[part], candidates[part]
+        order = np.argsort(d, kind="stable")
+        return list(zip(d[order].tolist(), candidates[order].tolist()))
+
+    def nearest_batch(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float],
+        k: int,
+        max_km: float = math.inf,
+        mask: Optional["np.ndarray"] = None,
+        chunk_size: int = 256,
+        group_deg: float = 0.1,
+    ) -> list[list[tuple[float, int]]]:
+        """
+        複数の検索地点に対して近い順にk件の地点を一括取得
+
+        検索地点をgroup_deg四方のセル毎にまとめ、セル（＋検索半径）の範囲に
+        入る地点との距離行列を一度に計算する。
+
+        Args:
+            lats, lons: 検索地点の緯度・経度
+            k: 検索地点毎の取得件数
+            max_km: これより遠い地点は含めない（km）
+            mask: 地点毎の候補フラグ（bool配列）
+            chunk_size: まとめて処理する検索地点数の上限
+            group_deg: 検索地点をまとめるセルの大きさ（度）
+
+        Returns:
+            list[list[tuple[float, int]]]: 検索地点毎の (距離km, 添字) のリスト（入力順）
+        """
+        q_lat = np.asarray(lats, dtype=np.float64)
+        q_lon = np.asarray(lons, dtype=np.float64)
+        results: list[list[tuple[float, int]]] = [[] for _ in range(len(q_lat))]
+        if k <= 0 or len(q_lat) == 0:
+            return results
+
+        # 同じセルの検索地点が連続するように並べ、セルの境界とchunk_size毎に分割する
+        rows_of_cell = np.floor(q_lat / group_deg)
+        cols_of_cell = np.floor(q_lon / group_deg)
+        order = np.lexsort((cols_of_cell, rows_of_cell))
+        boundaries = np.flatnonzero(
+            (np.diff(rows_of_cell[order]) != 0) | (np.diff(cols_of_cell[order]) != 0)
+        ) + 1
+        chunks = [
+            group[start:start + chunk_size]
+            for group in np.split(order, boundaries)
+            for start in range(0, len(group), chunk_size)
+        ]
+
+        for chunk in chunks:
+            cols = self._columns_near(q_lat[chunk], q_lon[chunk], max_km, mask)
+            if len(cols) == 0:
+                continue
+            rows_per_matrix = max(1, self.max_matrix_size // len(cols))
+            for row_start in range(0, len(chunk), rows_per_matrix):
+                rows = chunk[row_start:row_start + rows_per_matrix]
+                d = self._distance_matrix(q_lat[rows], q_lon[rows], cols)
+                if math.isfinite(max_km):
+                    d[d > max_km] = np.inf
+                kk = min(k, len(cols))
+                part = np.argpartition(d, kk - 1, axis=1)[:, :kk] if len(cols) > kk else \
+                    np.broadcast_to(np.arange(len(cols)), (len(rows), len(cols)))
+                part_d = np.take_along_axis(d, part, axis=1)
+                sort = np.argsort(part_d, axis=1, kind="stable")
+                part = np.take_along_axis(part, sort, axis=1)
+                part_d = np.take_along_axis(part_d, sort, axis=1)
+                for row, query in enumerate(rows.tolist()):
+                    found = np.isfinite(part_d[row])
+                    results[query] = list(zip(
+                        part_d[row][found].tolist(), cols[part[row][found]].tolist()
+                    ))
+        return results
+
+    def _columns_near(
+        self, q_lat: "np.ndarray", q_lon: "np.ndarray", max_km: float, mask: Optional["np.ndarray"]
+    ) -> "np.ndarray":
+        """検索地点群の範囲＋検索半径に入る候補地点の添字"""
+        if not math.isfinite(max_km):
+            return np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        lat_span = max_km / KM_PER_DEGREE
+        max_lat = min(89.9, float(np.max(np.abs(q_lat))) + lat_span)
+        lon_span = max_km / (KM_PER_DEGREE * max(math.cos(math.radians(max_lat)), 1e-6))
+        lat_order, lat_sorted = self._lat_index()
+        lo = np.searchsorted(lat_sorted, q_lat.min() - lat_span, side="left")
+        hi = np.searchsorted(lat_sorted, q_lat.max() + lat_span, side="right")
+        band = lat_order[lo:hi]
+        lon_deg = self.lon_deg[band]
+        near = (lon_deg >= q_lon.min() - lon_span) & (lon_deg <= q_lon.max() + lon_span)
+        if mask is not None:
+            near &= mask[band]
+        # 添字順に戻し、同距離の地点の順序を単一検索と揃える
+        return np.sort(band[near])
+
+    def _distance_matrix(self, q_lat: "np.ndarray", q_lon: "np.ndarray", cols: "np.ndarray") -> "np.ndarray":
+        """検索地点×地点の距離行列（km）"""
+        q_lat_rad = np.radians(q_lat)[:, None]
+        q_lon_rad = np.radians(q_lon)[:, None]
+        a = np.sin((self.lat_rad[cols][None, :] - q_lat_rad) / 2) ** 2 + \
+            np.cos(q_lat_rad) * self.cos_lat[cols][None, :] * \
+            np.sin((self.lon_rad[cols][None, :] - q_lon_rad) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
@@ -0,0 +1,71 @@
+"""
+並行取得ユーティリティ
+
+複数の上流リソース（都道府県別の警報、火山別の警報等）を同時実行数を制限して
+並行取得し、成功分と失敗分を分けて返します。
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# 失敗理由: タイムアウト
+TIMEOUT = "timeout"
+
+
+@dataclass
+class FanOutResult(Generic[K, V]):
+    """並行取得の結果（部分的な成功を含む）"""
+    results: dict[K, V] = field(default_factory=dict)
+    failed: dict[K, str] = field(default_factory=dict)  # キー -> 失敗理由
+
+    @property
+    def timed_out(self) -> list[K]:
+        """タイムアウトしたキー"""
+        return [key for key, reason in self.failed.items() if reason == TIMEOUT]
+
+    @property
+    def is_partial(self) -> bool:
+        """一部が失敗したかどうか"""
+        return bool(self.failed)
+
+
+async def gather_bounded(
+    keys: Iterable[K],
+    fetch: Callable[[K], Awaitable[V]],
+    concurrency: int,
+    timeout: float,
+) -> FanOutResult[K, V]:
+    """
+    同時実行数を制限して並行取得
+
+    Args:
+        keys: 取得対象のキー
+        fetch: キーを受け取り結果を返すコルーチン関数
+        concurrency: 最大同時実行数
+        timeout: キー毎のタイムアウト（秒）。セマフォ待ち時間は含まない
+
+    Returns:
+        FanOutResult: 成功した結果と失敗したキー（理由付き）
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    result: FanOutResult[K, V] = FanOutResult()
+
+    async def run(key: K) -> None:
+        async with semaphore:
+            try:
+                result.results[key] = await asyncio.wait_for(fetch(key), timeout)
+            except asyncio.TimeoutError:
+                result.failed[key] = TIMEOUT
+            except Exception as e:
+                result.failed[key] = type(e).__name__
+                logger.warning(f"並行取得エラー ({key}): {e}")
+
+    await asyncio.gather(*(run(key) for key in keys))
+    return result
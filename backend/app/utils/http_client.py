@@ -0,0 +1,237 @@
+"""
+共有HTTPクライアントレジストリ
+
+上流API（気象庁・P2P地震情報・Gemini・Claude）ごとに接続プールを持つ
+httpx.AsyncClientを一元管理します。リクエスト毎のTCP/TLSハンドシェイクを避け、
+Keep-Aliveで接続を再利用します。
+
+GETリクエストはETag / Last-Modifiedを保存して条件付きリクエストを送信し、
+304 Not Modifiedの場合は前回のJSON（およびそのパース結果）を再利用します。
+"""
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 起動時に接続プールを作成しておく上流ホスト
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+
+
+def _http2_available() -> bool:
+    """HTTP/2用のh2パッケージが利用可能か確認"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class ValidatorEntry:
+    """条件付きリクエスト用の検証子と前回のレスポンス"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    data: Any
+
+
+class HTTPClientRegistry:
+    """ホスト単位の接続プールを持つhttpx.AsyncClientのレジストリ"""
+
+    def __init__(self, max_validators: int = 512, max_parsed: int = 512):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._http2: Optional[bool] = None
+        self._validators: OrderedDict[str, ValidatorEntry] = OrderedDict()
+        self._parsed: OrderedDict[Any, tuple[Any, Any]] = OrderedDict()
+        self.max_validators = max_validators
+        self.max_parsed = max_parsed
+        self.stats = {
+            "not_modified": 0,  # 304で前回のレスポンスを再利用
+            "modified": 0,  # 検証子付きで送信したが更新されていた
+            "unconditional": 0,  # 検証子なしで送信
+            "parse_hits": 0,
+            "parse_misses": 0,
+        }
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        """URLからオリジン（scheme://host:port）を取得"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _use_http2(self) -> bool:
+        """HTTP/2を使用するか判定（h2が無ければHTTP/1.1にフォールバック）"""
+        if self._http2 is None:
+            self._http2 = bool(settings.http_http2)
+            if self._http2 and not _http2_available():
+                logger.warning("h2パッケージが見つからないため、HTTP/1.1で接続します")
+                self._http2 = False
+        return self._http2
+
+    def _create_client(self, origin: str) -> httpx.AsyncClient:
+        """オリジン用のクライアントを作成"""
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            base_url=origin,
+            limits=limits,
+            timeout=httpx.Timeout(settings.api_timeout, connect=settings.http_connect_timeout),
+            http2=self._use_http2(),
+        )
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """
+        URLのホストに対応する共有クライアントを取得
+
+        Args:
+            url: リクエスト先URL（またはベースURL）
+
+        Returns:
+            httpx.AsyncClient: ホスト単位で共有されるクライアント
+        """
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._create_client(origin)
+            self._clients[origin] = client
+        return client
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        missing_ok: bool = False,
+    ) -> Any:
+        """
+        GETリクエストを送信してJSONを返す
+
+        前回のレスポンスにETag / Last-Modifiedがあれば条件付きリクエストを送信し、
+        304の場合は前回と同一のオブジェクトを返す。
+
+        Args:
+            url: リクエストURL
+            params: クエリパラメータ
+            timeout: タイムアウト（秒）
+            missing_ok: Trueの場合、404はエラーにせずNoneを返す
+
+        Raises:
+            httpx.HTTPError: リクエスト失敗またはステータスエラーの場合
+        """
+        key = url if not params else f"{url}?{json.dumps(params, sort_keys=True, default=str)}"
+        entry = self._validators.get(key) if settings.http_conditional_requests else None
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        client = self.get(url)
+        response = await client.get(
+            url, params=params, headers=headers, timeout=timeout or settings.api_timeout
+        )
+
+        if response.status_code == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            self._validators.move_to_end(key)
+            return entry.data
+        self.stats["modified" if entry is not None else "unconditional"] += 1
+
+        if missing_ok and response.status_code == 404:
+            self._validators.pop(key, None)
+            return None
+        response.raise_for_status()
+        data = response.json()
+        self._store_validators(key, response, data)
+        return data
+
+    def _store_validators(self, key: str, response: httpx.Response, data: Any) -> None:
+        """レスポンスの検証子を保存（検証子が無い場合は保存しない）"""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if not settings.http_conditional_requests or not (etag or last_modified):
+            self._validators.pop(key, None)
+            return
+        self._validators[key] = ValidatorEntry(etag=etag, last_modified=last_modified, data=data)
+        self._validators.move_to_end(key)
+        while len(self._validators) > self.max_validators:
+            self._validators.popitem(last=False)
+
+    def parse_cached(self, key: Any, data: Any, parse: Callable[[Any], T]) -> T:
+        """
+        同一のレスポンスに対するパース結果を再利用
+
+        304やキャッシュヒットで前回と同一のJSONオブジェクトが返された場合、
+        パースをスキップして前回のパース結果を返す。
+
+        Args:
+            key: パース結果のキー（URL・言語等）
+            data: get_jsonが返したJSON
+            parse: パース関数
+
+        Returns:
+            パース結果（呼び出し元で変更する場合はコピーすること）
+        """
+        cached = self._parsed.get(key)
+        if cached is not None and cached[0] is data:
+            self.stats["parse_hits"] += 1
+            self._parsed.move_to_end(key)
+            return cached[1]
+
+        self.stats["parse_misses"] += 1
+        parsed = parse(data)
+        self._parsed[key] = (data, parsed)
+        self._parsed.move_to_end(key)
+        while len(self._parsed) > self.max_parsed:
+            self._parsed.popitem(last=False)
+        return parsed
+
+    def get_stats(self) -> dict[str, int]:
+        """条件付きリクエスト・パース再利用の統計を取得"""
+        return {**self.stats, "clients": len(self._clients), "validators": len(self._validators)}
+
+    def open(self, base_urls: Optional[list[str]] = None) -> None:
+        """
+        既知の上流ホスト用のクライアントを事前に作成
+
+        Args:
+            base_urls: 作成するベースURL（省略時は設定済みの全上流ホスト）
+        """
+        if base_urls is None:
+            base_urls = [settings.jma_base_url, settings.p2p_base_url]
+            if settings.gemini_api_key:
+                base_urls.append(GEMINI_BASE_URL)
+            if settings.anthropic_api_key:
+                base_urls.append(ANTHROPIC_BASE_URL)
+        for url in base_urls:
+            self.get(url)
+        logger.info(f"HTTPクライアント初期化: {', '.join(self._clients)}")
+
+    async def aclose(self) -> None:
+        """全クライアントを閉じる"""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTPクライアント終了エラー: {e}")
+
+
+# アプリケーション共有のレジストリ
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,65 @@
+"""
+シングルフライト（同一リクエストの集約）
+
+同じキーに対する処理が実行中の場合、後続の呼び出しは新たに実行せず
+実行中の処理の結果を共有します。地震発生直後に同時に届く大量のリクエストが
+それぞれ上流API・AI APIを呼び出すことを防ぎます。
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """キー単位で実行中の処理を共有する"""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        キーに対する処理を実行（実行中であれば結果を共有）
+
+        Args:
+            key: 集約キー
+            fn: 実行するコルーチン関数
+
+        Returns:
+            処理結果（例外も全呼び出し元に伝播する）
+        """
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.stats["shared"] += 1
+
+        self._waiters[key] += 1
+        try:
+            # 呼び出し元のキャンセルが共有中の処理に波及しないようにする
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # 待っている呼び出し元がいなくなった場合のみ処理を中断する
+            if self._inflight.get(key) is task and self._waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """完了した処理を削除"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        # 全呼び出し元がキャンセルされた場合の未取得例外の警告を抑止
+        if not task.cancelled():
+            task.exception()
+
+    def inflight_count(self) -> int:
+        """実行中の処理数"""
+        return len(self._inflight)
@@ -0,0 +1,293 @@
+"""
+空間インデックス（緯度経度グリッド）
+
+避難所等の地点を一定間隔の緯度経度グリッドのセルに振り分けて保持し、
+半径検索・k近傍検索で調べる地点を検索地点周辺のセルに限定します。
+
+k近傍検索は検索地点のセルから外側へリング状にセルを広げ、
+未探索のセルまでの最短距離がk番目の候補の距離を上回った時点で打ち切ります。
+"""
+import heapq
+import math
+from array import array
+from typing import Callable, Iterable, Iterator, Mapping, Optional, Sequence
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180  # 緯度1度あたりの距離（約111km）
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    2点間の距離を計算（Haversine公式）
+
+    Returns:
+        float: 距離（km）
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + \
+        math.cos(lat1_rad) * math.cos(lat2_rad) * \
+        math.sin(delta_lon / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class GridIndex:
+    """緯度経度グリッドによる地点の空間インデックス"""
+
+    def __init__(self, points: Iterable[tuple[float, float]], cell_deg: float = 0.05):
+        """
+        Args:
+            points: (緯度, 経度) の並び。検索結果はこの並びの添字で返す
+            cell_deg: セルの大きさ（度）。0.05度は南北約5.6km
+        """
+        self.cell_deg = cell_deg
+        # 座標・セル内の添字は配列で保持する（地点毎のfloat/intオブジェクトを作らない）
+        self._lat_rad = array("d")
+        self._lon_rad = array("d")
+        self._cells: dict[tuple[int, int], array] = {}
+        for i, (lat, lon) in enumerate(points):
+            self._lat_rad.append(math.radians(lat))
+            self._lon_rad.append(math.radians(lon))
+            cell = self._cell_of(lat, lon)
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                bucket = self._cells[cell] = array("I")
+            bucket.append(i)
+        self._cos_lat = array("d", (math.cos(r) for r in self._lat_rad))
+        self._set_ranges()
+
+    @classmethod
+    def from_cells(
+        cls,
+        cell_deg: float,
+        lat_rad: Sequence[float],
+        lon_rad: Sequence[float],
+        cos_lat: Sequence[float],
+        cells: Mapping[tuple[int, int], Sequence[int]],
+        ranges: Optional[tuple[tuple[int, int], tuple[int, int]]] = None,
+    ) -> "GridIndex":
+        """
+        構築済みの列・セルから作成（スナップショットのメモリマップ等）
+
+        Args:
+            cell_deg: セルの大きさ（度）
+            lat_rad, lon_rad, cos_lat: 地点毎の緯度・経度（ラジアン）と緯度の余弦
+            cells: セル -> 地点の添字（get・len・itemsで参照できるもの）
+            ranges: セルの ((行の最小, 最大), (列の最小, 最大))（省略時はcellsから求める）
+        """
+        index = cls([], cell_deg=cell_deg)
+        index._lat_rad = lat_rad
+        index._lon_rad = lon_rad
+        index._cos_lat = cos_lat
+        index._cells = cells
+        if ranges is None:
+            index._set_ranges()
+        else:
+            index._row_range, index._col_range = ranges
+        return index
+
+    def _set_ranges(self) -> None:
+        """セルの行・列の範囲を設定"""
+        if self._cells:
+            rows = [row for row, _ in self._cells]
+            cols = [col for _, col in self._cells]
+            self._row_range = (min(rows), max(rows))
+            self._col_range = (min(cols), max(cols))
+
+    def columns(self) -> tuple[Sequence[float], Sequence[float], Sequence[float]]:
+        """地点毎の緯度・経度（ラジアン）と緯度の余弦"""
+        return self._lat_rad, self._lon_rad, self._cos_lat
+
+    def cells(self) -> Mapping[tuple[int, int], Sequence[int]]:
+        """セル -> 地点の添字"""
+        return self._cells
+
+    def __len__(self) -> int:
+        return len(self._lat_rad)
+
+    def _cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        """地点が属するセル"""
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    def _distances(self, lat: float, lon: float, indices: Iterable[int]) -> Iterator[tuple[float, int]]:
+        """検索地点から各地点までの距離（km）"""
+        lat_rad = math.radians(lat)
+        lon_rad = math.radians(lon)
+        cos_lat = math.cos(lat_rad)
+        lat_rads = self._lat_rad
+        lon_rads = self._lon_rad
+        cos_lats = self._cos_lat
+        for i in indices:
+            a = math.sin((lat_rads[i] - lat_rad) / 2) ** 2 + \
+                cos_lat * cos_lats[i] * math.sin((lon_rads[i] - lon_rad) / 2) ** 2
+            yield 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a))), i
+
+    def _ring(self, center: tuple[int, int], r: int) -> Iterator[array]:
+        """中心セルからチェビシェフ距離rのセルに属する地点"""
+        row0, col0 = center
+        cells = self._cells
+        if r == 0:
+            bucket = cells.get(center)
+            if bucket:
+                yield bucket
+            return
+        for col in range(col0 - r, col0 + r + 1):
+            for row in (row0 - r, row0 + r):
+                bucket = cells.get((row, col))
+                if bucket:
+                    yield bucket
+        for row in range(row0 - r + 1, row0 + r):
+            for col in (col0 - r, col0 + r):
+                bucket = cells.get((row, col))
+                if bucket:
+                    yield bucket
+
+    def _ring_lower_bound_km(self, lat: float, r: int) -> float:
+        """リングr以降の地点までの距離の下限（km）"""
+        # 検索地点は中心セル内のどこにでもあり得るため、間にあるr-1セル分のみを数える
+        # 極に近いほど経度方向のセル幅が狭くなるため、到達し得る最大緯度で評価する
+        max_lat = min(89.9, abs(lat) + (r + 1) * self.cell_deg)
+        cell_km = self.cell_deg * KM_PER_DEGREE * math.cos(math.radians(max_lat))
+        return max(0, r - 1) * cell_km
+
+    def _max_ring(self, center: tuple[int, int]) -> int:
+        """全セルを覆うリング番号"""
+        row0, col0 = center
+        return max(
+            abs(row0 - self._row_range[0]), abs(row0 - self._row_range[1]),
+            abs(col0 - self._col_range[0]), abs(col0 - self._col_range[1]),
+        )
+
+    def candidates(self, lat: float, lon: float, radius_km: float) -> array:
+        """
+        半径内の地点を含み得るセルに属する地点の添字を取得（距離は未確認）
+
+        Args:
+            lat, lon: 検索地点
+            radius_km: 検索半径（km）
+        """
+        if not self._cells:
+            return array("I")
+        lat_span = min(radius_km / KM_PER_DEGREE, 180.0)
+        max_lat = min(89.9, abs(lat) + lat_span)
+        lon_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(max_lat)), 1e-6))
+        row_min, col_min = self._cell_of(lat - lat_span, lon - min(lon_span, 180.0))
+        row_max, col_max = self._cell_of(lat + lat_span, lon + min(lon_span, 180.0))
+        row_min = max(row_min, self._row_range[0])
+        row_max = min(row_max, self._row_range[1])
+        col_min = max(col_min, self._col_range[0])
+        col_max = min(col_max, self._col_range[1])
+
+        candidates = array("I")
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                bucket = self._cells.get((row, col))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
+
+    def in_bbox(self, south: float, west: float, north: float, east: float) -> array:
+        """
+        矩形範囲（緯度経度）に含まれる地点の添字を取得（昇順）
+
+        Args:
+            south, west, north, east: 範囲の南端・西端・北端・東端
+        """
+        if not self._cells:
+            return array("I")
+        row_min, col_min = self._cell_of(south, west)
+        row_max, col_max = self._cell_of(north, east)
+        row_min = max(row_min, self._row_range[0])
+        row_max = min(row_max, self._row_range[1])
+        col_min = max(col_min, self._col_range[0])
+        col_max = min(col_max, self._col_range[1])
+
+        lat_min, lat_max = math.radians(south), math.radians(north)
+        lon_min, lon_max = math.radians(west), math.radians(east)
+        lat_rads = self._lat_rad
+        lon_rads = self._lon_rad
+        found = array("I")
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                bucket = self._cells.get((row, col))
+                if bucket:
+                    found.extend(
+                        i for i in bucket
+                        if lat_min <= lat_rads[i] <= lat_max and lon_min <= lon_rads[i] <= lon_max
+                    )
+        return array("I", sorted(found))
+
+    def within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        predicate: Optional[Callable[[int], bool]] = None,
+    ) -> list[tuple[float, int]]:
+        """
+        半径内の地点を近い順に取得
+
+        Args:
+            lat, lon: 検索地点
+            radius_km: 検索半径（km）
+            predicate: 地点の添字を受け取り、候補に含めるか判定する関数
+
+        Returns:
+            list[tuple[float, int]]: (距離km, 添字) のリスト（近い順）
+        """
+        candidates = self.candidates(lat, lon, radius_km)
+        if predicate is not None:
+            candidates = [i for i in candidates if predicate(i)]
+
+        hits = [(d, i) for d, i in self._distances(lat, lon, candidates) if d <= radius_km]
+        hits.sort()
+        return hits
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        max_km: float = math.inf,
+        predicate: Optional[Callable[[int], bool]] = None,
+    ) -> list[tuple[float, int]]:
+        """
+        近い順にk件の地点を取得
+
+        Args:
+            lat, lon: 検索地点
+            k: 取得件数
+            max_km: これより遠い地点は含めない（km）
+            predicate: 地点の添字を受け取り、候補に含めるか判定する関数
+
+        Returns:
+            list[tuple[float, int]]: (距離km, 添字) のリスト（近い順）
+        """
+        if k <= 0 or not self._cells:
+            return []
+        center = self._cell_of(lat, lon)
+        max_ring = self._max_ring(center)
+        # 距離の符号を反転した最大ヒープでk件の候補を保持する
+        best: list[tuple[float, int]] = []
+
+        for r in range(max_ring + 1):
+            bound = self._ring_lower_bound_km(lat, r)
+            if bound > max_km:
+                break
+            if len(best) == k and -best[0][0] <= bound:
+                break
+            for bucket in self._ring(center, r):
+                indices = bucket if predicate is None else [i for i in bucket if predicate(i)]
+                for d, i in self._distances(lat, lon, indices):
+                    if d > max_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+
+        return sorted((-d, i) for d, i in best)
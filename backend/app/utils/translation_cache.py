@@ -0,0 +1,216 @@
+"""
+翻訳キャッシュ（メモリ + 永続化ストアの2層）
+
+名前空間（地名・テキスト・警報テキスト・安全ガイド）毎に、件数上限付きのLRUを
+メモリに持ち、その後ろにSQLiteの永続化ストア（TranslationStore）を置きます。
+
+- メモリの件数は名前空間毎の上限までで、利用者が送る文字列の種類が増えても増えません。
+  起動時に全件は読み込まず、メモリに無いキーのみストアから読み込みます。
+- 名前空間毎のTTL（秒、0は無期限）を超えた値は、メモリ・ストアのどちらにあっても
+  使用しません（安全ガイドのプロンプト変更後に作り直す等）。
+  ストアの期限切れの行は読み込んだ時に削除し、保存時にも一定間隔（PURGE_INTERVAL）毎に
+  名前空間の期限切れの行をまとめて削除します。
+- 名前空間毎のヒット・ミス・追い出し件数を get_stats で取得できます。
+
+永続化ストアのキーは名前空間を跨いで一意にします（名前空間は行に記録するのみ。
+TranslatorServiceは警報・安全ガイドのキーに接頭辞を付けています）。
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import settings
+from .logger import get_logger
+from .translation_store import TranslationStore
+
+logger = get_logger(__name__)
+
+PURGE_INTERVAL = 3600.0  # ストアの期限切れの行をまとめて削除する間隔（秒）
+
+
+@dataclass(frozen=True)
+class NamespacePolicy:
+    """名前空間毎のキャッシュポリシー"""
+    max_entries: int
+    ttl: float = 0.0  # 秒（0は無期限）
+
+
+def default_namespaces() -> dict[str, NamespacePolicy]:
+    """設定から名前空間毎のキャッシュポリシーを作成"""
+    size = settings.translation_cache_max_entries
+    return {
+        "location": NamespacePolicy(size, settings.translation_cache_ttl_location),
+        "text": NamespacePolicy(size, settings.translation_cache_ttl_text),
+        "warning": NamespacePolicy(size, settings.translation_cache_ttl_warning),
+        "safety": NamespacePolicy(size, settings.translation_cache_ttl_safety),
+    }
+
+
+class NamespaceLRU:
+    """1つの名前空間のメモリ上のキャッシュ（件数上限付きLRU・TTL）"""
+
+    def __init__(self, policy: NamespacePolicy):
+        self.policy = policy
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.stats = {"hits": 0, "store_hits": 0, "misses": 0, "evictions": 0, "expired": 0, "purged": 0}
+        self.purged_at = 0.0  # ストアの期限切れの行を最後にまとめて削除した時刻
+
+    def is_expired(self, stored_at: float, now: Optional[float] = None) -> bool:
+        ttl = self.policy.ttl
+        return ttl > 0 and (now or time.time()) - stored_at > ttl
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if self.is_expired(stored_at):
+            del self._entries[key]
+            self.stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, stored_at: Optional[float] = None) -> None:
+        self._entries[key] = (value, stored_at or time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.policy.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TranslationCache:
+    """名前空間毎のLRUと永続化ストアの2層の翻訳キャッシュ"""
+
+    def __init__(
+        self,
+        store: Optional[TranslationStore] = None,
+        namespaces: Optional[dict[str, NamespacePolicy]] = None,
+    ):
+        """
+        Args:
+            store: 永続化ストア（Noneの場合はメモリのみ）
+            namespaces: 名前空間毎のポリシー（省略時は設定から作成）
+        """
+        self.store = store
+        self.namespaces = {
+            name: NamespaceLRU(policy)
+            for name, policy in (namespaces if namespaces is not None else default_namespaces()).items()
+        }
+
+    def _namespace(self, namespace: str) -> NamespaceLRU:
+        lru = self.namespaces.get(namespace)
+        if lru is None:
+            raise KeyError(f"未定義の名前空間です: {namespace}")
+        return lru
+
+    def peek(self, namespace: str, key: str) -> Optional[str]:
+        """メモリのみを確認（ストアは参照しない）"""
+        return self._namespace(namespace).get(key)
+
+    async def get(self, namespace: str, key: str) -> Optional[str]:
+        """
+        キャッシュから取得
+
+        メモリに無い場合は永続化ストアを確認します（他のワーカーが保存した値を含む）。
+        """
+        lru = self._namespace(namespace)
+        value = lru.get(key)
+        if value is not None:
+            lru.stats["hits"] += 1
+            return value
+        if self.store is not None:
+            try:
+                entry = await self.store.aget_entry(key)
+            except Exception as e:
+                logger.error(f"キャッシュ読み込みエラー: {e}", exc_info=True)
+                entry = None
+            if entry is not None:
+                value, updated_at = entry
+                if not lru.is_expired(updated_at):
+                    lru.stats["store_hits"] += 1
+                    lru.set(key, value, updated_at)
+                    return value
+                lru.stats["expired"] += 1
+                try:
+                    if await self.store.adelete_expired(key, updated_at):
+                        lru.stats["purged"] += 1
+                except Exception as e:
+                    logger.error(f"キャッシュ削除エラー: {e}", exc_info=True)
+        lru.stats["misses"] += 1
+        return None
+
+    def put(self, namespace: str, key: str, value: str) -> None:
+        """メモリのみに保存"""
+        self._namespace(namespace).set(key, value)
+
+    async def set(self, namespace: str, key: str, value: str) -> None:
+        """メモリと永続化ストアに保存（ストアには1件分のみ書き込む）"""
+        self.put(namespace, key, value)
+        if self.store is None:
+            return
+        try:
+            await self.store.aput(key, value, namespace)
+        except Exception as e:
+            logger.error(f"キャッシュ保存エラー: {e}", exc_info=True)
+        await self._purge_if_due(namespace)
+
+    async def set_many(self, namespace: str, items: list[tuple[str, str]]) -> None:
+        """複数件をメモリと永続化ストアに保存（ストアには1トランザクションで書き込む）"""
+        if not items:
+            return
+        lru = self._namespace(namespace)
+        for key, value in items:
+            lru.set(key, value)
+        if self.store is None:
+            return
+        try:
+            await self.store.aput_many(items, namespace)
+        except Exception as e:
+            logger.error(f"キャッシュ保存エラー: {e}", exc_info=True)
+        await self._purge_if_due(namespace)
+
+    async def _purge_if_due(self, namespace: str) -> None:
+        """前回から一定間隔が過ぎていれば、ストアの名前空間の期限切れの行をまとめて削除"""
+        lru = self._namespace(namespace)
+        now = time.time()
+        if lru.policy.ttl <= 0 or now - lru.purged_at < PURGE_INTERVAL:
+            return
+        lru.purged_at = now
+        await self.purge_expired(namespace, now)
+
+    async def purge_expired(self, namespace: str, now: Optional[float] = None) -> int:
+        """
+        ストアの名前空間の期限切れの行を削除
+
+        Returns:
+            int: 削除した件数
+        """
+        lru = self._namespace(namespace)
+        if self.store is None or lru.policy.ttl <= 0:
+            return 0
+        try:
+            count = await self.store.apurge(namespace, (now or time.time()) - lru.policy.ttl)
+        except Exception as e:
+            logger.error(f"キャッシュ削除エラー: {e}", exc_info=True)
+            return 0
+        lru.stats["purged"] += count
+        if count:
+            logger.info(f"期限切れの翻訳キャッシュを削除しました: {namespace} {count}件")
+        return count
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """名前空間毎のヒット・ミス・追い出し件数とメモリ上の件数を取得"""
+        return {
+            name: {**lru.stats, "entries": len(lru), "max_entries": lru.policy.max_entries}
+            for name, lru in self.namespaces.items()
+        }
+
+    def close(self) -> None:
+        """永続化ストアの接続を閉じる"""
+        if self.store is not None:
+            self.store.close()
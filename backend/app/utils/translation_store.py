@@ -0,0 +1,207 @@
+"""
+翻訳キャッシュの永続化（SQLite）
+
+AI翻訳・警報テキスト・安全ガイドの生成結果を SQLite に1件ずつ保存します。
+
+- WALモードのため、読み込みは書き込み中も待たされず、複数のワーカープロセスから
+  同じファイルを共有できます（書き込み同士はbusy_timeoutの範囲で待ち合わせ）。
+- 1件の保存は1件分の書き込みのみで、キャッシュ全体を書き直しません。
+- 非同期版（aget / aput）はスレッドで実行し、イベントループを止めません。
+- 各行に名前空間を記録し、名前空間毎に期限切れの行をまとめて削除できます。
+
+旧形式のJSONファイル（translation_cache.json）がある場合は初回に取り込み、
+取り込み後は ``.migrated`` を付けた名前に変更します。
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+BUSY_TIMEOUT_MS = 5000  # 他のプロセスが書き込み中の場合に待つ時間
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    namespace TEXT NOT NULL DEFAULT ''
+)
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS translations_namespace ON translations (namespace, updated_at)"
+
+
+class TranslationStore:
+    """SQLite（WALモード）に保存する翻訳キャッシュ"""
+
+    def __init__(self, path: Path, legacy_json: Optional[Path] = None):
+        """
+        Args:
+            path: データベースファイルのパス
+            legacy_json: 取り込む旧形式のJSONファイル（存在する場合のみ）
+        """
+        self.path = Path(path)
+        # sqlite3の接続はスレッドを跨いで共有しないため、スレッド毎に持つ
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._init_db()
+        if legacy_json is not None:
+            self._import_legacy(Path(legacy_json))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False
+            )
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _init_db(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        # journal_modeはファイルに記録されるため、作成時に1回設定すればよい
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        # 名前空間の列が無い旧形式のテーブル（既存の行は名前空間なし）
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(translations)")}
+        if "namespace" not in columns:
+            try:
+                conn.execute("ALTER TABLE translations ADD COLUMN namespace TEXT NOT NULL DEFAULT ''")
+            except sqlite3.OperationalError:
+                pass  # 他のワーカーが追加済み
+        conn.execute(INDEX)
+
+    def _import_legacy(self, legacy_json: Path) -> None:
+        """旧形式のJSONファイルを取り込み、取り込み済みの名前に変更"""
+        if not legacy_json.exists():
+            return
+        try:
+            with open(legacy_json, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            # 既に保存されている（新しい）値は上書きしない
+            count = self.put_many(entries.items(), replace=False)
+            legacy_json.rename(legacy_json.with_name(legacy_json.name + ".migrated"))
+            logger.info(f"翻訳キャッシュを移行しました: {count}件 ({legacy_json})")
+        except Exception as e:
+            logger.error(f"翻訳キャッシュ移行エラー: {e}", exc_info=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """キーの値（無い場合はNone）"""
+        row = self._connect().execute(
+            "SELECT value FROM translations WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_entry(self, key: str) -> Optional[tuple[str, float]]:
+        """キーの (値, 保存日時のUNIX時刻)（無い場合はNone）"""
+        row = self._connect().execute(
+            "SELECT value, updated_at FROM translations WHERE key = ?", (key,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, value: str, namespace: str = "") -> None:
+        """1件を保存（同じキーは置き換え）"""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO translations (key, value, updated_at, namespace) VALUES (?, ?, ?, ?)",
+            (key, value, time.time(), namespace),
+        )
+
+    def put_many(self, items: Iterable[tuple[str, str]], replace: bool = True, namespace: str = "") -> int:
+        """
+        複数件を1トランザクションで保存
+
+        Args:
+            items: (キー, 値) の一覧
+            replace: Falseの場合は既にあるキーを上書きしない
+            namespace: 名前空間
+
+        Returns:
+            int: 渡された件数
+        """
+        now = time.time()
+        rows = [(key, value, now, namespace) for key, value in items]
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                f"{verb} INTO translations (key, value, updated_at, namespace) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def delete_expired(self, key: str, updated_at: float) -> bool:
+        """
+        期限切れの1件を削除
+
+        読み込み後に他のワーカーが保存し直した（保存日時が新しい）値は削除しない。
+
+        Returns:
+            bool: 削除した場合True
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM translations WHERE key = ? AND updated_at <= ?", (key, updated_at)
+        )
+        return cursor.rowcount > 0
+
+    def purge(self, namespace: str, before: float) -> int:
+        """
+        名前空間の指定日時より前に保存した行を削除
+
+        Returns:
+            int: 削除した件数
+        """
+        cursor = self._connect().execute(
+            "DELETE FROM translations WHERE namespace = ? AND updated_at < ?", (namespace, before)
+        )
+        return cursor.rowcount
+
+    def load_all(self) -> dict[str, str]:
+        """全件を辞書で取得"""
+        return dict(self._connect().execute("SELECT key, value FROM translations"))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    async def aget(self, key: str) -> Optional[str]:
+        """getをスレッドで実行"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aget_entry(self, key: str) -> Optional[tuple[str, float]]:
+        """get_entryをスレッドで実行"""
+        return await asyncio.to_thread(self.get_entry, key)
+
+    async def aput(self, key: str, value: str, namespace: str = "") -> None:
+        """putをスレッドで実行"""
+        await asyncio.to_thread(self.put, key, value, namespace)
+
+    async def aput_many(self, items: Iterable[tuple[str, str]], namespace: str = "") -> int:
+        """put_manyをスレッドで実行"""
+        return await asyncio.to_thread(self.put_many, list(items), True, namespace)
+
+    async def adelete_expired(self, key: str, updated_at: float) -> bool:
+        """delete_expiredをスレッドで実行"""
+        return await asyncio.to_thread(self.delete_expired, key, updated_at)
+
+    async def apurge(self, namespace: str, before: float) -> int:
+        """purgeをスレッドで実行"""
+        return await asyncio.to_thread(self.purge, namespace, before)
+
+    def close(self) -> None:
+        """全スレッドの接続を閉じる"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,231 @@
+"""
+上流APIレスポンスキャッシュ
+
+気象庁・P2P地震情報APIのレスポンス（JSON）を (サービス, URL, パラメータ) をキーに
+キャッシュします。フィード毎のTTLに加えて、以下の動作に対応します。
+
+- stale-while-revalidate: TTL切れ後の一定時間は古い値を即座に返し、裏で再取得
+- stale-if-error: 再取得に失敗した場合は一定時間まで古い値を返す
+- single-flight: 同一キーの同時取得は1回の上流リクエストに集約
+- fresh: 定期取り込み用。キャッシュを使わずに上流から取得し、結果をキャッシュに書き戻す
+
+保存先はCacheBackendを実装したクラスで差し替え可能です（デフォルトはインメモリ）。
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from ..config import settings
+from .logger import get_logger
+from .single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """キャッシュエントリ"""
+    value: Any
+    stored_at: float  # time.monotonic()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """フィード毎のキャッシュポリシー（秒）"""
+    ttl: float
+    stale_while_revalidate: float = 0.0
+    stale_if_error: float = 0.0
+
+
+class CacheBackend(Protocol):
+    """キャッシュ保存先のインターフェース"""
+
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """インメモリのキャッシュ保存先（エントリ数上限付きLRU）"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def default_policies() -> dict[str, CachePolicy]:
+    """設定からフィード毎のキャッシュポリシーを作成"""
+    swr = settings.cache_stale_while_revalidate
+    sie = settings.cache_stale_if_error
+    return {
+        "earthquakes": CachePolicy(settings.cache_ttl_earthquakes, swr, sie),
+        "warnings": CachePolicy(settings.cache_ttl_warnings, swr, sie),
+        "tsunami": CachePolicy(settings.cache_ttl_tsunami, swr, sie),
+        "volcano_list": CachePolicy(settings.cache_ttl_volcano_list, swr, sie),
+        "volcano_warnings": CachePolicy(settings.cache_ttl_volcano_warnings, swr, sie),
+        "weather": CachePolicy(settings.cache_ttl_weather, swr, sie),
+    }
+
+
+class UpstreamCache:
+    """上流APIレスポンスのTTLキャッシュ"""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        policies: Optional[dict[str, CachePolicy]] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.backend: CacheBackend = backend or MemoryCacheBackend(settings.upstream_cache_max_entries)
+        self.policies = policies if policies is not None else default_policies()
+        self.enabled = settings.upstream_cache_enabled if enabled is None else enabled
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._flights = SingleFlight()
+        self.stats = {"hits": 0, "misses": 0, "stale_served": 0, "stale_on_error": 0, "refresh_errors": 0, "fresh_fetches": 0}
+
+    def get_stats(self) -> dict[str, int]:
+        """キャッシュ・リクエスト集約の統計を取得"""
+        return {
+            **self.stats,
+            "coalesced": self._flights.stats["shared"],
+            "entries": len(self.backend) if hasattr(self.backend, "__len__") else -1,
+        }
+
+    @staticmethod
+    def make_key(service: str, url: str, params: Optional[dict] = None) -> str:
+        """キャッシュキーを生成"""
+        if not params:
+            return f"{service}:{url}"
+        return f"{service}:{url}?{json.dumps(params, sort_keys=True, default=str)}"
+
+    def policy_for(self, feed: str) -> CachePolicy:
+        """フィードのキャッシュポリシーを取得（未定義の場合はキャッシュしない）"""
+        return self.policies.get(feed, CachePolicy(ttl=0.0))
+
+    async def get_or_fetch(
+        self,
+        service: str,
+        url: str,
+        loader: Callable[[], Awaitable[Any]],
+        params: Optional[dict] = None,
+        feed: str = "",
+        fresh: bool = False,
+    ) -> Any:
+        """
+        キャッシュから取得し、無ければloaderで取得してキャッシュする
+
+        Args:
+            service: サービス名（キーの名前空間）
+            url: リクエストURL
+            loader: 上流から値を取得するコルーチン関数
+            params: クエリパラメータ
+            feed: キャッシュポリシーを選択するフィード名
+            fresh: Trueの場合はキャッシュ・古い値を返さず必ず上流から取得する
+                （取得した値はキャッシュに保存し、失敗した場合は例外を送出）
+
+        Returns:
+            キャッシュ済みまたは取得した値
+
+        Raises:
+            Exception: loaderが失敗し、stale-if-errorで返せる値も無い場合
+        """
+        policy = self.policy_for(feed)
+        key = self.make_key(service, url, params)
+        if not self.enabled or policy.ttl <= 0:
+            return await self._flights.do(key, loader)
+        if fresh:
+            self.stats["fresh_fetches"] += 1
+            return await self._flights.do(key, lambda: self._load(key, loader))
+
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.stored_at
+            if age < policy.ttl:
+                self.stats["hits"] += 1
+                return entry.value
+            if age < policy.ttl + policy.stale_while_revalidate:
+                self.stats["stale_served"] += 1
+                self._schedule_refresh(key, loader)
+                return entry.value
+
+        self.stats["misses"] += 1
+        try:
+            value = await self._flights.do(key, lambda: self._load(key, loader))
+        except Exception as e:
+            if entry is not None and time.monotonic() - entry.stored_at < policy.ttl + policy.stale_if_error:
+                self.stats["stale_on_error"] += 1
+                logger.warning(f"上流取得エラーのためキャッシュを返却 ({key}): {e}")
+                return entry.value
+            raise
+
+        return value
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """上流から取得してキャッシュに保存"""
+        value = await loader()
+        self.backend.set(key, CacheEntry(value=value, stored_at=time.monotonic()))
+        return value
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        """バックグラウンドで再取得（同一キーの再取得は1つのみ）"""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._flights.do(key, lambda: self._load(key, loader))
+            except Exception as e:
+                self.stats["refresh_errors"] += 1
+                logger.warning(f"バックグラウンド再取得エラー ({key}): {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def invalidate(self, service: str, url: str, params: Optional[dict] = None) -> None:
+        """キャッシュエントリを削除"""
+        self.backend.delete(self.make_key(service, url, params))
+
+    def clear(self) -> None:
+        """全キャッシュを削除"""
+        self.backend.clear()
+
+    async def aclose(self) -> None:
+        """実行中のバックグラウンド再取得をキャンセル"""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+
+# アプリケーション共有のキャッシュ
+upstream_cache = UpstreamCache()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+起動時間ベンチマーク
+
+新しいプロセスで app.main をインポートする時間（ワーカーのコールドスタート）と、
+静的翻訳テーブルの言語毎の初回読み込み時間・メモリ使用量を計測します。
+--no-bytecode を指定すると、コンパイル済みのバイトコード（.pyc）を使用しない
+（PYTHONDONTWRITEBYTECODE等のコンテナ環境と同じ）条件で計測します。
+
+使用方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_import [--runs 10] [--no-bytecode]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import app.main
+print(time.perf_counter() - start)
+"""
+
+TABLES_SCRIPT = """
+import json, sys, tempfile, time, tracemalloc
+from app.services.translation_tables import TranslationTables, compile_tables
+
+tracemalloc.start()
+import app.services.location_translations, app.services.message_translations
+source = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+
+directory = tempfile.mkdtemp()
+start = time.perf_counter()
+compile_tables(directory)
+compiled = time.perf_counter() - start
+
+tables = TranslationTables(directory)
+tracemalloc.start()
+timings = {}
+for lang in sys.argv[1:]:
+    start = time.perf_counter()
+    tables.language(lang)
+    timings[lang] = time.perf_counter() - start
+one_language = tracemalloc.get_traced_memory()[0]
+for lang in tables.index["languages"]:
+    tables.language(lang)
+all_languages = tracemalloc.get_traced_memory()[0]
+print(json.dumps({
+    "compile": compiled, "timings": timings, "one_language": one_language,
+    "all_languages": all_languages, "languages": len(tables.index["languages"]), "source": source,
+}))
+"""
+
+
+def run(script: str, env: dict, *args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", script, *args], env=env, capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数")
+    parser.add_argument("--no-bytecode", action="store_true", help=".pycを使用しない")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.no_bytecode:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+        env["PYTHONPYCACHEPREFIX"] = tempfile.mkdtemp()  # 空のキャッシュ（毎回ソースからコンパイル）
+
+    run(IMPORT_SCRIPT, env)  # 翻訳テーブルのコンパイル・ファイルキャッシュのウォームアップ
+    timings = sorted(float(run(IMPORT_SCRIPT, env)) * 1000 for _ in range(args.runs))
+    print(
+        f"import app.main ({args.runs}回{'、.pycなし' if args.no_bytecode else ''}): "
+        f"中央値 {statistics.median(timings):.1f}ms  最小 {timings[0]:.1f}ms  最大 {timings[-1]:.1f}ms"
+    )
+
+    tables = json.loads(run(TABLES_SCRIPT, env, "en"))
+    print(f"翻訳テーブルのコンパイル: {tables['compile'] * 1000:.1f}ms ({tables['languages']}言語)")
+    print(f"1言語の初回読み込み (en): {tables['timings']['en'] * 1000:.2f}ms")
+    print(
+        f"メモリ: 1言語 {tables['one_language'] / 1024:.0f}KB  全言語 {tables['all_languages'] / 1024:.0f}KB  "
+        f"（元データのモジュール {tables['source'] / 1024:.0f}KB）"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+避難所検索ベンチマーク
+
+全国規模（既定10万件）の避難所を日本の国土の範囲にランダムに配置し、
+空間インデックスによる検索・NumPyによる一括距離計算と全件のHaversine計算を比較します。
+災害種別（ビットマスク・種別毎の対象行）による絞り込み検索も計測します。
+
+使用方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_shelter_search [--shelters 100000] [--queries 1000] [--batch 5000]
+"""
+import argparse
+import random
+import time
+
+from app.services.shelter_service import ShelterService
+from app.services.shelter_store import DISASTER_TYPE_CODES, ShelterStore
+from app.utils.distance_engine import NUMPY_AVAILABLE, DistanceEngine
+from app.utils.spatial_index import GridIndex, haversine_km
+
+# 日本の国土のおおよその範囲（緯度, 経度）
+LAT_RANGE = (24.0, 45.5)
+LON_RANGE = (123.0, 146.0)
+
+
+def make_points(n: int, rng: random.Random) -> list[tuple[float, float]]:
+    """人口集中地域を模した分布で地点を生成"""
+    # 主要都市周辺に7割、残りを国土全体に一様に配置する
+    cities = [(35.68, 139.77), (34.69, 135.50), (35.18, 136.91), (43.06, 141.35),
+              (33.59, 130.40), (38.27, 140.87), (34.39, 132.46)]
+    points = []
+    for _ in range(n):
+        if rng.random() < 0.7:
+            lat, lon = rng.choice(cities)
+            points.append((rng.gauss(lat, 0.3), rng.gauss(lon, 0.3)))
+        else:
+            points.append((rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)))
+    return points
+
+
+def brute_force(points, lat, lon, radius_km, k):
+    """全件のHaversine計算による検索（比較用）"""
+    hits = []
+    for i, (p_lat, p_lon) in enumerate(points):
+        d = haversine_km(lat, lon, p_lat, p_lon)
+        if d <= radius_km:
+            hits.append((d, i))
+    hits.sort()
+    return hits[:k]
+
+
+def measure(label: str, fn, queries) -> None:
+    """1クエリあたりの処理時間を表示"""
+    latencies = []
+    for lat, lon in queries:
+        start = time.perf_counter()
+        fn(lat, lon)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<32} p50={p50:8.3f}ms  p99={p99:8.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="避難所検索ベンチマーク")
+    parser.add_argument("--shelters", type=int, default=100_000, help="避難所数")
+    parser.add_argument("--queries", type=int, default=1000, help="クエリ数")
+    parser.add_argument("--radius", type=float, default=5.0, help="検索半径（km）")
+    parser.add_argument("--limit", type=int, default=20, help="取得件数")
+    parser.add_argument("--batch", type=int, default=5000, help="一括検索の地点数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    points = make_points(args.shelters, rng)
+    # 検索地点は避難所の近く（住所からの検索を想定）
+    queries = [
+        (lat + rng.uniform(-0.01, 0.01), lon + rng.uniform(-0.01, 0.01))
+        for lat, lon in rng.sample(points, args.queries)
+    ]
+
+    start = time.perf_counter()
+    index = GridIndex(points)
+    print(f"インデックス構築: {args.shelters}件 {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    measure(
+        f"nearest(k={args.limit}, {args.radius}km)",
+        lambda lat, lon: index.nearest(lat, lon, k=args.limit, max_km=args.radius),
+        queries,
+    )
+    measure(
+        f"nearest(k={args.limit})",
+        lambda lat, lon: index.nearest(lat, lon, k=args.limit),
+        queries,
+    )
+    measure(
+        f"within({args.radius}km)",
+        lambda lat, lon: index.within(lat, lon, args.radius),
+        queries,
+    )
+    if NUMPY_AVAILABLE:
+        engine = DistanceEngine(points)
+        measure(
+            f"grid + numpy(k={args.limit}, {args.radius}km)",
+            lambda lat, lon: engine.nearest(
+                lat, lon, k=args.limit, max_km=args.radius,
+                indices=index.candidates(lat, lon, args.radius),
+            ),
+            queries,
+        )
+        measure(
+            f"numpy全件(k={args.limit})",
+            lambda lat, lon: engine.nearest(lat, lon, k=args.limit),
+            queries[:100],
+        )
+
+        addresses = [
+            (lat + rng.uniform(-0.02, 0.02), lon + rng.uniform(-0.02, 0.02))
+            for lat, lon in rng.choices(points, k=args.batch)
+        ]
+        start = time.perf_counter()
+        engine.nearest_batch(
+            [lat for lat, _ in addresses], [lon for _, lon in addresses],
+            k=args.limit, max_km=args.radius,
+        )
+        elapsed = time.perf_counter() - start
+        print(f"一括検索: {args.batch}地点 {elapsed * 1000:.1f}ms ({elapsed / args.batch * 1e6:.1f}us/地点)")
+    else:
+        print("NumPy未インストールのため一括距離計算の計測をスキップ")
+
+    # 災害種別の絞り込み（津波は沿岸部の一部の避難所のみ対象とする）
+    types = [
+        [code for code in DISASTER_TYPE_CODES if rng.random() < (0.05 if code == "tsunami" else 0.5)]
+        for _ in points
+    ]
+    service = ShelterService()
+    service._set_store(ShelterStore.from_records(
+        {"id": str(i), "name": "避難所", "latitude": lat, "longitude": lon, "types": types[i]}
+        for i, (lat, lon) in enumerate(points)
+    ))
+    measure(
+        "種別リスト判定(tsunami, earthquake)",
+        lambda lat, lon: index.nearest(
+            lat, lon, k=args.limit, max_km=args.radius,
+            predicate=lambda i: "tsunami" in types[i] and "earthquake" in types[i],
+        ),
+        queries,
+    )
+    for disaster_type in (None, "earthquake", "tsunami,earthquake"):
+        measure(
+            f"service({disaster_type})",
+            lambda lat, lon: service.get_nearby_shelters(
+                lat, lon, radius_km=args.radius, limit=args.limit, disaster_type=disaster_type,
+            ),
+            queries,
+        )
+
+    # 全件計算は遅いため一部のクエリのみ計測
+    measure(
+        "全件Haversine（比較用）",
+        lambda lat, lon: brute_force(points, lat, lon, args.radius, args.limit),
+        queries[:20],
+    )
+
+
+if __name__ == "__main__":
+    main()
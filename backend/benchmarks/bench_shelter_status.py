@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+避難所の状況更新ベンチマーク
+
+全国規模（既定10万件）の避難所に対して、避難者数・開設状況の更新（JSON Lines）の
+解析・反映のスループットと、受け入れ可能な避難所の検索時間を計測します。
+
+使用方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_shelter_status [--shelters 100000] [--updates 100000]
+"""
+import argparse
+import json
+import random
+import time
+
+from app.services.shelter_service import ShelterService
+from app.services.shelter_status import UpdateResult, parse_updates
+from app.services.shelter_store import ShelterStore
+from benchmarks.bench_shelter_search import make_points, measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description="避難所の状況更新ベンチマーク")
+    parser.add_argument("--shelters", type=int, default=100_000, help="避難所数")
+    parser.add_argument("--updates", type=int, default=100_000, help="更新件数")
+    parser.add_argument("--queries", type=int, default=1000, help="クエリ数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    points = make_points(args.shelters, rng)
+    service = ShelterService()
+    service._set_store(ShelterStore.from_records(
+        {"id": f"s{i}", "name": "避難所", "latitude": lat, "longitude": lon, "capacity": 200}
+        for i, (lat, lon) in enumerate(points)
+    ))
+
+    body = "\n".join(
+        json.dumps(
+            {"id": f"s{rng.randrange(args.shelters)}", "delta": rng.randint(-5, 20)}
+            if rng.random() < 0.9 else
+            {"id": f"s{rng.randrange(args.shelters)}", "is_open": rng.random() < 0.8}
+        )
+        for _ in range(args.updates)
+    )
+    start = time.perf_counter()
+    result = UpdateResult()
+    updates = parse_updates(body, "jsonl", result)
+    parsed = time.perf_counter()
+    service.apply_status_updates(updates, result)
+    applied = time.perf_counter()
+    print(
+        f"更新: {result.applied}件  解析 {(parsed - start) * 1000:.1f}ms  "
+        f"反映 {(applied - parsed) * 1000:.1f}ms  ({result.applied / (applied - start):,.0f}件/秒)"
+    )
+    print(f"受け入れ可能: {sum(service._data.status.available)}/{args.shelters}件")
+
+    queries = [
+        (lat + rng.uniform(-0.01, 0.01), lon + rng.uniform(-0.01, 0.01))
+        for lat, lon in rng.sample(points, args.queries)
+    ]
+    measure("nearby(k=20, 10km)", lambda lat, lon: service.get_nearby_shelters(lat, lon, 10.0, 20), queries)
+    measure("available(k=20, 10km)", lambda lat, lon: service.get_available_shelters(lat, lon, 10.0, 20), queries)
+    measure(
+        "available(k=20, 10km, 4人)",
+        lambda lat, lon: service.get_available_shelters(lat, lon, 10.0, 20, min_remaining=4),
+        queries,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+避難所ストアのメモリ使用量・ロード時間ベンチマーク
+
+取り込み済みデータ（shelters.jsonl.gz）と同じ形式の合成データを作成し、
+全件をShelterInfoのリストとして保持する場合と列指向のShelterStoreで保持する場合、
+スナップショットをmmapで開く場合（空間インデックスを含む起動時の処理）を比較します。
+また、データディレクトリにスナップショットを置いた状態でのShelterServiceの作成
+（ワーカー毎の起動時の処理）と、作成後の最初の検索に掛かる時間を計測します。
+
+使用方法（backendディレクトリで実行）:
+    python -m benchmarks.bench_shelter_store [--shelters 100000]
+"""
+import argparse
+import gc
+import gzip
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.config import settings
+from app.models import ShelterInfo
+from app.services.shelter_loader import iter_artifact
+from app.services.shelter_service import ShelterService
+from app.services.shelter_snapshot import SNAPSHOT_NAME, MappedShelterStore, build_snapshot
+from app.services.shelter_store import DISASTER_TYPE_CODES, ShelterStore
+from app.utils.spatial_index import GridIndex
+
+FACILITIES = [["バリアフリー"], ["駐車場"], ["広域避難場所", "備蓄倉庫"], []]
+
+
+def write_artifact(path: Path, n: int, rng: random.Random) -> None:
+    """合成データを取り込み済みデータの形式で書き出し"""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(n):
+            ward = rng.randrange(200)
+            record = {
+                "id": f"gsi_{i:08d}",
+                "name": f"市立第{i % 5000}小学校",
+                "address": f"東京都第{ward}区{rng.randrange(1, 10)}丁目",
+                "latitude": round(rng.uniform(24.0, 45.5), 6),
+                "longitude": round(rng.uniform(123.0, 146.0), 6),
+                "capacity": rng.choice([None, 200, 500, 1000]),
+                "facilities": rng.choice(FACILITIES),
+                "types": rng.sample(DISASTER_TYPE_CODES, rng.randrange(1, 4)),
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def measure(label: str, load) -> None:
+    """ロード時間と保持しているメモリ量を表示"""
+    gc.collect()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    value = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} ロード {elapsed * 1000:8.1f}ms  保持 {current / 1e6:7.1f}MB  ピーク {peak / 1e6:7.1f}MB")
+    del value
+
+
+def measure_service(data_dir: Path) -> None:
+    """ShelterServiceの作成（ワーカーの起動）と作成後の最初の検索に掛かる時間を表示"""
+    original = settings.shelter_data_dir
+    settings.shelter_data_dir = data_dir
+    try:
+        measure("ShelterService()（スナップショット）", ShelterService)
+        service = ShelterService()
+        data = service._data
+        for label, query in [
+            ("最初の近傍検索", lambda: data.index.nearest(35.68, 139.76, 10)),
+            ("最初のID検索", lambda: data.store.row_of("gsi_00001234")),
+            ("最初の種別の絞り込み", lambda: data.types.rows(0b11, True)),
+            ("最初のクラスタ（地図表示）", lambda: data.pyramid),
+        ]:
+            start = time.perf_counter()
+            query()
+            print(f"  {label:<24} {(time.perf_counter() - start) * 1000:8.1f}ms")
+    finally:
+        settings.shelter_data_dir = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description="避難所ストアのメモリ・ロード時間ベンチマーク")
+    parser.add_argument("--shelters", type=int, default=100_000, help="避難所数")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "shelters.jsonl.gz"
+        write_artifact(path, args.shelters, random.Random(args.seed))
+        print(f"避難所数: {args.shelters}件")
+        measure("list[ShelterInfo]（変更前）", lambda: [ShelterInfo(**r) for r in iter_artifact(path)])
+        measure("ShelterStore（列指向）", lambda: ShelterStore.from_records(iter_artifact(path)))
+
+        def load_and_index():
+            store = ShelterStore.from_records(iter_artifact(path))
+            return store, GridIndex(store.points())
+
+        def open_snapshot():
+            store = MappedShelterStore(snapshot, source=path)
+            return store, store.grid_index()
+
+        snapshot = Path(tmp) / SNAPSHOT_NAME
+        build_snapshot(path, snapshot)
+        print(f"スナップショット: {snapshot.stat().st_size / 1e6:.1f}MB")
+        measure("起動（解析+インデックス）", load_and_index)
+        measure("起動（スナップショット）", open_snapshot)
+        measure_service(Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
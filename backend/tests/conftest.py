@@ -1,14 +1,48 @@
 import pytest
 import pytest_asyncio
-from typing import AsyncGenerator
+from pathlib import Path
+from typing import AsyncGenerator, Iterator
 from httpx import AsyncClient, ASGITransport
-from app.main import app
+from app.config import settings
+
+
+def use_data_dir(monkeypatch: pytest.MonkeyPatch, directory: Path) -> None:
+    """翻訳キャッシュ・翻訳テーブル・安全ガイドの保存先を変更"""
+    monkeypatch.setattr(settings, "cache_dir", directory)
+    monkeypatch.setattr(settings, "translation_cache_db", directory / "translation_cache.db")
+    monkeypatch.setattr(settings, "translation_cache_file", directory / "translation_cache.json")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_data_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """
+    app.mainのインポート時に作成されるサービスの保存先（作業ツリーのdataディレクトリを使わない）
+    """
+    directory = tmp_path_factory.mktemp("data")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        use_data_dir(monkeypatch, directory)
+        yield directory
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    テスト中に作成するサービスの保存先（テスト間で翻訳キャッシュ等を共有しない）
+    """
+    directory = tmp_path / "data"
+    directory.mkdir()
+    use_data_dir(monkeypatch, directory)
+    return directory
+
 
 @pytest_asyncio.fixture
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """
     非同期テストクライアントのフィクスチャ
     """
+    # 保存先を変更してからインポートする
+    from app.main import app
+
     # 非同期クライアントの作成
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -0,0 +1,116 @@
+import pytest
+from httpx import AsyncClient
+
+from app.services.shelter_service import ShelterService
+from app.services.shelter_store import ShelterStore
+from app.utils import cluster_pyramid
+from app.utils.cluster_pyramid import ClusterPyramid, tile_bounds, world_xy
+from app.utils.spatial_index import GridIndex
+from tests.test_spatial_index import make_points
+
+
+def make_pyramid(points, max_zoom=10):
+    lats = [lat for lat, _ in points]
+    lons = [lon for _, lon in points]
+    return ClusterPyramid(lats, lons, [1] * len(points), [10] * len(points), max_zoom=max_zoom)
+
+
+def test_every_level_covers_all_points():
+    """全レベルでクラスタの件数の合計が地点数と一致するテスト"""
+    points = make_points(3000)
+    pyramid = make_pyramid(points)
+    for level in pyramid.levels:
+        assert sum(level.counts) == len(points)
+        assert sum(level.capacities) == 10 * len(points)
+        assert list(level.tile_keys) == sorted(level.tile_keys)
+    assert len(pyramid.levels[0]) <= 16
+
+
+def test_numpy_build_matches_python(monkeypatch):
+    """配列演算による作成結果が純Pythonの作成結果と一致するテスト"""
+    pytest.importorskip("numpy")
+    points = make_points(2000)
+    fast = make_pyramid(points)
+    monkeypatch.setattr(cluster_pyramid, "NUMPY_AVAILABLE", False)
+    slow = make_pyramid(points)
+    for a, b in zip(fast.levels, slow.levels):
+        assert a.tile_keys == b.tile_keys and a.counts == b.counts
+        assert a.latitudes.tolist() == pytest.approx(b.latitudes.tolist())
+        assert a.longitudes.tolist() == pytest.approx(b.longitudes.tolist())
+        assert [r for r, n in zip(a.rows, a.counts) if n == 1] == [r for r, n in zip(b.rows, b.counts) if n == 1]
+
+
+def test_tile_clusters_lie_in_tile():
+    """タイルのクラスタの重心がタイルの範囲内にあるテスト"""
+    points = make_points(3000)
+    pyramid = make_pyramid(points)
+    z = 6
+    seen = 0
+    for lat, lon in points[:50]:
+        x, y = world_xy(lat, lon)
+        tx, ty = int(x * 2 ** z), int(y * 2 ** z)
+        south, west, north, east = tile_bounds(z, tx, ty)
+        clusters = pyramid.tile(z, tx, ty)
+        level = pyramid.levels[z]
+        assert clusters
+        for c in clusters:
+            assert south <= level.latitudes[c] <= north and west <= level.longitudes[c] <= east
+        seen += sum(level.counts[c] for c in clusters)
+    assert seen > 0
+
+
+def test_in_bbox_matches_scan():
+    """矩形範囲の検索結果が全件走査と一致するテスト"""
+    points = make_points(5000)
+    index = GridIndex(points)
+    south, west, north, east = 35.0, 139.0, 36.5, 141.0
+    assert list(index.in_bbox(south, west, north, east)) == [
+        i for i, (lat, lon) in enumerate(points) if south <= lat <= north and west <= lon <= east
+    ]
+
+
+def test_service_switches_between_clusters_and_shelters():
+    """低ズームではクラスタ、高ズームでは避難所を返すテスト"""
+    service = ShelterService()
+    # 全国に散らばった避難所と都心に集まった避難所
+    points = make_points(3000) + [(35.68 + i * 0.001, 139.70 + i * 0.001) for i in range(20)]
+    service._set_store(ShelterStore.from_records(
+        {"id": f"s{i}", "name": "避難所", "latitude": lat, "longitude": lon,
+         "capacity": 100, "types": ["tsunami"] if i % 2 else ["flood"]}
+        for i, (lat, lon) in enumerate(points)
+    ))
+
+    low = service.get_shelters_in_bbox(30.0, 129.0, 45.0, 146.0)
+    assert low.zoom <= service.CLUSTER_MAX_ZOOM
+    assert low.clusters and low.total == 3020 and not low.truncated
+
+    typed = service.get_shelters_in_bbox(30.0, 129.0, 45.0, 146.0, disaster_type="tsunami")
+    assert typed.total == 1510
+    assert all(c.types == ["tsunami"] for c in typed.clusters)
+
+    high = service.get_shelters_in_bbox(35.6, 139.6, 35.75, 139.75, zoom=14, limit=5)
+    assert high.zoom == 14
+    assert not high.clusters and len(high.shelters) == 5 and high.truncated
+    assert high.total == sum(35.6 <= lat <= 35.75 and 139.6 <= lon <= 139.75 for lat, lon in points)
+
+    # 高ズームの指定でも広い範囲はクラスタで返す
+    wide = service.get_shelters_in_bbox(30.0, 129.0, 45.0, 146.0, zoom=16, limit=5)
+    assert wide.zoom == service.CLUSTER_MAX_ZOOM
+    assert wide.clusters and wide.total == 3020
+
+
+@pytest.mark.asyncio
+async def test_tile_endpoint(client: AsyncClient):
+    """タイルのエンドポイントのテスト"""
+    x, y = world_xy(35.6896, 139.6917)
+    response = await client.get(f"/api/v1/shelters/tiles/15/{int(x * 2 ** 15)}/{int(y * 2 ** 15)}")
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public")
+    assert "tokyo_001" in [s["id"] for s in response.json()["shelters"]]
+
+    response = await client.get("/api/v1/shelters/tiles/3/8/0")
+    assert response.status_code == 400
+    response = await client.get(
+        "/api/v1/shelters/bbox", params={"south": 36, "west": 139, "north": 35, "east": 140}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services.shelter_service import ShelterService
+from app.utils.distance_engine import DistanceEngine, make_mask
+from app.utils.spatial_index import GridIndex
+from tests.test_spatial_index import brute_force, make_points
+
+
+def assert_same_hits(actual, expected):
+    assert [i for _, i in actual] == [i for _, i in expected]
+    for (d1, _), (d2, _) in zip(actual, expected):
+        assert math.isclose(d1, d2, abs_tol=1e-9)
+
+
+def test_nearest_matches_brute_force():
+    """配列演算による近傍検索が全件計算と一致するテスト"""
+    points = make_points(5000)
+    engine = DistanceEngine(points)
+    index = GridIndex(points)
+    for lat, lon in make_points(20, seed=2):
+        assert_same_hits(engine.nearest(lat, lon, k=10), brute_force(points, lat, lon)[:10])
+        # 空間インデックスで絞り込んだ候補でも同じ結果になる
+        expected = [hit for hit in brute_force(points, lat, lon) if hit[0] <= 50.0][:10]
+        hits = engine.nearest(lat, lon, k=10, max_km=50.0, indices=index.candidates(lat, lon, 50.0))
+        assert_same_hits(hits, expected)
+
+
+def test_nearest_batch_matches_single_queries():
+    """一括検索の結果が地点毎の検索と一致するテスト（入力順を保持）"""
+    points = make_points(5000)
+    engine = DistanceEngine(points, max_matrix_size=10_000)
+    mask = make_mask((i % 3 == 0 for i in range(len(points))), len(points))
+    queries = make_points(300, seed=4)
+
+    results = engine.nearest_batch(
+        [lat for lat, _ in queries], [lon for _, lon in queries],
+        k=5, max_km=40.0, mask=mask, chunk_size=64,
+    )
+
+    assert len(results) == len(queries)
+    for (lat, lon), hits in zip(queries, results):
+        assert_same_hits(hits, engine.nearest(lat, lon, k=5, max_km=40.0, mask=mask))
+
+
+def test_service_batch_returns_shelters_per_point():
+    """避難所の一括検索が地点毎に近い順の結果を返すテスト"""
+    service = ShelterService()
+    points = [(35.6896, 139.6917), (35.7146, 139.7732), (0.0, 0.0)]
+    results = service.get_nearby_shelters_batch(points, radius_km=10.0, limit=3)
+    assert [r[0].distance for r in results[:2]] == [0.0, 0.0]
+    assert results[2] == []
+    assert results[0][0].id == service.get_nearby_shelters(35.6896, 139.6917, 10.0, 3)[0].id
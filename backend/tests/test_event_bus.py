@@ -0,0 +1,293 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.event_bus import EARTHQUAKE, WARNING, EventBus, StreamEvent
+from app.services.ingestion import FeedStore, IngestionScheduler
+from tests.test_ingestion import make_earthquake
+
+pytestmark = pytest.mark.asyncio
+
+
+class CountingRenderer:
+    """言語毎のレンダリング回数を数えるレンダラー"""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def __call__(self, event: StreamEvent, lang: str) -> dict:
+        self.calls.append(lang)
+        return {"key": event.key, "lang": lang}
+
+
+async def test_event_rendered_once_per_language():
+    """同じ言語の購読者にはレンダリング結果が共有されるテスト"""
+    renderer = CountingRenderer()
+    bus = EventBus(renderer=renderer)
+    subscriptions = [bus.subscribe(lang="en") for _ in range(3)] + [bus.subscribe(lang="ja")]
+
+    await bus.publish(StreamEvent(kind=EARTHQUAKE, key="eq1", payload=None))
+    await bus.drain()
+
+    assert sorted(renderer.calls) == ["en", "ja"]
+    for subscription in subscriptions:
+        event = await subscription.get(timeout=0.1)
+        assert json.loads(event.data)["lang"] == subscription.lang
+
+
+async def test_japanese_delivered_without_waiting_for_translation():
+    """翻訳が必要な言語のレンダリングを待たずに日本語が配信されるテスト"""
+    release = asyncio.Event()
+
+    async def renderer(event: StreamEvent, lang: str) -> dict:
+        if lang != "ja":
+            await release.wait()
+        return {"key": event.key, "lang": lang}
+
+    bus = EventBus(renderer=renderer)
+    ja, en = bus.subscribe(lang="ja"), bus.subscribe(lang="en")
+
+    await bus.publish_many([
+        StreamEvent(kind=EARTHQUAKE, key="eq1", payload=None),
+        StreamEvent(kind=EARTHQUAKE, key="eq2", payload=None),
+    ])
+
+    assert [json.loads((await ja.get(0.1)).data)["key"] for _ in range(2)] == ["eq1", "eq2"]
+    assert await en.get(timeout=0.01) is None
+
+    release.set()
+    await bus.drain()
+    assert [json.loads((await en.get(0.1)).data)["key"] for _ in range(2)] == ["eq1", "eq2"]
+
+
+async def test_aclose_cancels_pending_renders():
+    """終了時にレンダリング中のタスクがキャンセルされるテスト"""
+    async def renderer(event: StreamEvent, lang: str) -> dict:
+        await asyncio.sleep(10)
+        return {}
+
+    bus = EventBus(renderer=renderer)
+    bus.subscribe(lang="en")
+    await bus.publish(StreamEvent(kind=EARTHQUAKE, key="eq1", payload=None))
+
+    await asyncio.wait_for(bus.aclose(), timeout=1)
+    await bus.drain()
+
+
+async def test_subscription_filters_by_area_and_kind():
+    """地域コード・イベント種別で購読を絞り込めるテスト"""
+    bus = EventBus(renderer=CountingRenderer())
+    tokyo = bus.subscribe(area_codes={"130000"})
+    quakes_only = bus.subscribe(kinds={EARTHQUAKE})
+
+    await bus.publish(StreamEvent(kind=WARNING, key="w1", payload=None, area_code="270000"))
+    await bus.publish(StreamEvent(kind=WARNING, key="w2", payload=None, area_code="130000"))
+    await bus.publish(StreamEvent(kind=EARTHQUAKE, key="eq1", payload=None))
+
+    assert [json.loads((await tokyo.get(0.1)).data)["key"] for _ in range(2)] == ["w2", "eq1"]
+    assert json.loads((await quakes_only.get(0.1)).data)["key"] == "eq1"
+    assert await quakes_only.get(timeout=0.01) is None
+
+
+async def test_slow_subscriber_is_evicted():
+    """キューが溢れた購読者が切断されるテスト"""
+    bus = EventBus(renderer=CountingRenderer(), queue_size=2)
+    slow = bus.subscribe()
+
+    for i in range(3):
+        await bus.publish(StreamEvent(kind=EARTHQUAKE, key=str(i), payload=None))
+
+    assert slow.evicted
+    assert bus.subscriber_count() == 0
+    assert bus.get_stats()["evicted"] == 1
+    # 切断前に届いたイベントは読み出せる
+    assert slow.queue.qsize() == 2
+
+
+async def test_ingestion_notifies_only_new_events():
+    """初回取り込みは通知せず、2回目以降は増えたイベントのみ通知するテスト"""
+
+    class GrowingP2PService:
+        def __init__(self):
+            self.count = 2
+
+        async def fetch_recent_earthquakes(self, limit: int = 10, fresh: bool = False):
+            earthquakes = [make_earthquake(i) for i in range(self.count)]
+            return list(reversed(earthquakes))  # 新しい順
+
+    p2p_service = GrowingP2PService()
+    scheduler = IngestionScheduler(
+        store=FeedStore(), p2p_service=p2p_service,
+        warning_service=None, tsunami_service=None, volcano_service=None,
+    )
+    notified: list[list[str]] = []
+
+    async def listener(events):
+        notified.append([event.key for event in events])
+
+    scheduler.add_listener(listener)
+
+    await scheduler.ingest_earthquakes()
+    await scheduler.ingest_earthquakes()
+    p2p_service.count = 4
+    await scheduler.ingest_earthquakes()
+
+    assert notified == [["2", "3"]]
+
+
+async def test_stream_rejects_unknown_types(client: AsyncClient):
+    """不明なイベント種別を指定した場合に400を返すテスト"""
+    response = await client.get("/api/v1/stream", params={"types": "earthquake,meteor"})
+    assert response.status_code == 400
+
+
+async def test_stream_rejects_unsupported_language(client: AsyncClient):
+    """対応言語以外の購読は受け付けない（言語毎の翻訳を増やさない）テスト"""
+    response = await client.get("/api/v1/stream", params={"lang": "xx-attack"})
+    assert response.status_code == 400
+
+
+async def test_stream_rejects_when_subscriber_limit_reached(client: AsyncClient, monkeypatch):
+    """購読者数が上限に達した場合に503を返すテスト"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "stream_max_subscribers", 0)
+    response = await client.get("/api/v1/stream")
+    assert response.status_code == 503
+
+
+async def open_idle_stream(app, i: int, started: asyncio.Event) -> None:
+    """何も送らずに待機し続けるSSEの購読者"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/v1/stream", "raw_path": b"/api/v1/stream",
+        "query_string": b"lang=en", "root_path": "", "headers": [(b"host", b"test")],
+        # 接続元毎のレート制限に掛からないよう別々のアドレスから接続する
+        "client": (f"10.0.{i // 250}.{i % 250 + 1}", 50000), "server": ("test", 80),
+    }
+
+    async def receive():
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+            started.set()
+
+    await app(scope, receive, send)
+
+
+async def test_idle_subscribers_do_not_starve_requests(client: AsyncClient):
+    """数千の待機中の購読者がいても通常のリクエストを処理できる（負荷試験）テスト"""
+    from app import main
+    count = 2000
+    events = [asyncio.Event() for _ in range(count)]
+    tasks = [asyncio.create_task(open_idle_stream(main.app, i, event)) for i, event in enumerate(events)]
+    try:
+        await asyncio.wait_for(asyncio.gather(*(event.wait() for event in events)), timeout=60)
+        assert main.event_bus.subscriber_count() >= count
+
+        responses = await asyncio.gather(*(client.get("/api/v1/stream/stats") for _ in range(20)))
+        assert all(response.status_code == 200 for response in responses)
+        assert responses[0].json()["subscribers"] >= count
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in list(main.event_bus._subscribers):
+            main.event_bus.unsubscribe(subscription)
+
+
+async def test_request_concurrency_limit_excludes_streams():
+    """通常のリクエストのみ同時処理数を制限し、配信は制限しないテスト"""
+    from app.main import RequestConcurrencyLimitMiddleware
+    release = asyncio.Event()
+    statuses = []
+
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def request(middleware, path):
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append((path, message["status"]))
+        scope = {"type": "http", "path": path, "method": "GET", "headers": []}
+        await middleware(scope, None, send)
+
+    middleware = RequestConcurrencyLimitMiddleware(app, limit=1, exempt_paths=("/api/v1/stream",))
+    tasks = [asyncio.create_task(request(middleware, "/api/v1/earthquakes"))]
+    tasks += [asyncio.create_task(request(middleware, "/api/v1/stream")) for _ in range(3)]
+    await asyncio.sleep(0)
+    await request(middleware, "/api/v1/tsunami")
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert statuses[0] == ("/api/v1/tsunami", 503)
+    assert sorted(statuses[1:]) == [("/api/v1/earthquakes", 200)] + [("/api/v1/stream", 200)] * 3
+
+
+async def test_recovered_sources_are_not_notified_again():
+    """取得に失敗した火山・地域が復旧しても、発表中の情報を再通知しないテスト"""
+    from app.models import FetchFailure, VolcanoWarningCollection
+    from app.services.warning_service import WarningService
+    from app.utils.fanout import FanOutResult
+    from tests.test_ingestion import SPECIAL_WARNING_DATA
+
+    class FlakyVolcanoService:
+        MONITORED_VOLCANOES = [1, 2]
+
+        def __init__(self):
+            self.rounds = [{1, 2}, {1}, {1, 2}, {1, 2}]  # 各回に取得できる火山
+            self.level = 3
+
+        async def get_volcano_warnings(self, fresh: bool = False):
+            ok = self.rounds.pop(0)
+            return VolcanoWarningCollection(
+                warnings=[
+                    {"volcano_code": code, "alert_level": self.level if code == 2 else 2, "issued_at": "t"}
+                    for code in sorted(ok)
+                ],
+                failed=[FetchFailure(code=str(code), reason="timeout") for code in (1, 2) if code not in ok],
+            )
+
+    class FlakyWarningService(WarningService):
+        """1回目は東京都のみ失敗、2回目以降は全地域成功"""
+
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        async def fetch_all_prefectures_data(self, fresh: bool = False):
+            self.calls += 1
+            result = FanOutResult()
+            for area_code in self.AREA_CODES.values():
+                if self.calls == 1 and area_code == "130000":
+                    result.failed[area_code] = "timeout"
+                else:
+                    result.results[area_code] = SPECIAL_WARNING_DATA
+            return result
+
+    volcano_service = FlakyVolcanoService()
+    scheduler = IngestionScheduler(
+        store=FeedStore(), p2p_service=None, warning_service=FlakyWarningService(),
+        tsunami_service=None, volcano_service=volcano_service,
+    )
+    notified: list[list[str]] = []
+
+    async def listener(events):
+        notified.append([event.key for event in events])
+
+    scheduler.add_listener(listener)
+
+    await scheduler.ingest_warnings()
+    await scheduler.ingest_warnings()  # 東京都が復旧
+    for _ in range(3):
+        await scheduler.ingest_volcano_warnings()  # 火山2が失敗 → 復旧
+    assert notified == []
+
+    volcano_service.level = 4
+    await scheduler.ingest_volcano_warnings()
+    assert notified == [["2:4:t"]]
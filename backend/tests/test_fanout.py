@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+import httpx
+from app.utils.fanout import gather_bounded, TIMEOUT
+from app.services.warning_service import WarningService
+from app.services.volcano_service import VolcanoService
+from app.utils.upstream_cache import UpstreamCache
+from app.utils.http_client import HTTPClientRegistry
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_gather_bounded_partial_results():
+    """タイムアウト・エラーが部分結果として記録されるテスト"""
+    async def fetch(key):
+        if key == "slow":
+            await asyncio.sleep(1)
+        if key == "error":
+            raise ValueError("boom")
+        return key.upper()
+
+    result = await gather_bounded(["a", "slow", "error", "b"], fetch, concurrency=2, timeout=0.05)
+    assert result.results == {"a": "A", "b": "B"}
+    assert result.failed == {"slow": TIMEOUT, "error": "ValueError"}
+    assert result.timed_out == ["slow"]
+    assert result.is_partial
+
+
+async def test_gather_bounded_limits_concurrency():
+    """同時実行数が制限されるテスト"""
+    running = 0
+    peak = 0
+
+    async def fetch(key):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return key
+
+    result = await gather_bounded(range(20), fetch, concurrency=4, timeout=1)
+    assert len(result.results) == 20
+    assert peak == 4
+
+
+class FakeHTTPClients(HTTPClientRegistry):
+    """都道府県毎に応答を返すテスト用レジストリ"""
+
+    def __init__(self, failing: set[str]):
+        super().__init__()
+        self.failing = failing
+
+    async def get_json(self, url, params=None, timeout=None, missing_ok=False):
+        area_code = url.rsplit("/", 1)[-1].removesuffix(".json")
+        if area_code in self.failing:
+            raise httpx.ConnectError("connection failed")
+        return {
+            "reportDatetime": "2026-01-01T00:00:00+09:00",
+            "areaTypes": [{"areas": [{"name": "テスト地方", "warnings": [{"code": "33", "status": "発表"}]}]}],
+        }
+
+
+async def test_special_warnings_reports_failed_areas():
+    """失敗した都道府県が結果に含まれるテスト"""
+    service = WarningService(
+        http_clients=FakeHTTPClients(failing={"130000"}), cache=UpstreamCache(enabled=False)
+    )
+    collection = await service.get_special_warnings()
+    assert len(collection.alerts) == 46
+    assert [(f.code, f.name, f.reason) for f in collection.failed] == [("130000", "東京都", "ConnectError")]
+
+
+class MockTransportClients(HTTPClientRegistry):
+    """httpx.MockTransportで応答するテスト用レジストリ"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, url):
+        return self.client
+
+
+async def test_volcano_warnings_records_timeouts():
+    """タイムアウトした火山が結果に記録されるテスト"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        code = request.url.path.rsplit("/", 1)[-1].removesuffix(".json")
+        if code == "314":
+            await asyncio.sleep(1)
+        if code == "506":
+            return httpx.Response(200, json={"level": 3, "reportDatetime": "2026-01-01T00:00:00+09:00"})
+        return httpx.Response(404)
+
+    service = VolcanoService(http_clients=MockTransportClients(handler), cache=UpstreamCache(enabled=False))
+    service.fanout_timeout = 0.1
+    collection = await service.get_volcano_warnings()
+    assert [w["volcano_code"] for w in collection.warnings] == [506]
+    assert collection.timed_out == ["314"]
@@ -0,0 +1,83 @@
+import pytest
+import httpx
+from app.utils.http_client import HTTPClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_client_shared_per_host():
+    """同一ホストのクライアントが共有されるテスト"""
+    registry = HTTPClientRegistry()
+    a = registry.get("https://www.jma.go.jp/bosai/quake/data/list.json")
+    b = registry.get("https://www.jma.go.jp/bosai/tsunami/data/list.json")
+    c = registry.get("https://api.p2pquake.net/v2/history")
+    assert a is b
+    assert a is not c
+    await registry.aclose()
+    assert a.is_closed and c.is_closed
+
+
+@pytest.mark.asyncio
+async def test_client_recreated_after_close():
+    """終了後に再取得すると新しいクライアントが作成されるテスト"""
+    registry = HTTPClientRegistry()
+    a = registry.get("https://www.jma.go.jp/bosai")
+    await registry.aclose()
+    b = registry.get("https://www.jma.go.jp/bosai")
+    assert a is not b
+    assert not b.is_closed
+    await registry.aclose()
+
+
+class MockRegistry(HTTPClientRegistry):
+    """httpx.MockTransportで応答するレジストリ"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def get(self, url):
+        return self.client
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_reuses_previous_response():
+    """304の場合に前回のJSONとパース結果が再利用されるテスト"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"code": 1}], headers={"ETag": '"v1"'})
+
+    registry = MockRegistry(handler)
+    url = "https://www.jma.go.jp/bosai/volcano/const/volcano_list.json"
+    parse_calls = 0
+
+    def parse(data):
+        nonlocal parse_calls
+        parse_calls += 1
+        return [item["code"] for item in data]
+
+    first = await registry.get_json(url)
+    second = await registry.get_json(url)
+    assert second is first
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+
+    assert registry.parse_cached(url, first, parse) == [1]
+    assert registry.parse_cached(url, second, parse) == [1]
+    assert parse_calls == 1
+    stats = registry.get_stats()
+    assert stats["not_modified"] == 1
+    assert stats["unconditional"] == 1
+    assert stats["parse_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_ok_returns_none_on_404():
+    """missing_ok指定時は404でNoneを返すテスト"""
+    registry = MockRegistry(lambda request: httpx.Response(404))
+    assert await registry.get_json("https://www.jma.go.jp/bosai/x.json", missing_ok=True) is None
+    with pytest.raises(httpx.HTTPStatusError):
+        await registry.get_json("https://www.jma.go.jp/bosai/x.json")
@@ -0,0 +1,116 @@
+import pytest
+from app.models import EarthquakeInfo
+from app.services.ingestion import FeedStore, IngestionScheduler
+from app.services.warning_service import WarningService
+from app.utils.fanout import FanOutResult
+
+pytestmark = pytest.mark.asyncio
+
+SPECIAL_WARNING_DATA = {
+    "reportDatetime": "2026-01-01T00:00:00+09:00",
+    "areaTypes": [{"areas": [{"name": "テスト地方", "warnings": [{"code": "33", "status": "発表"}]}]}],
+}
+
+
+def make_earthquake(i: int) -> EarthquakeInfo:
+    return EarthquakeInfo(
+        id=str(i), time="2026/01/01 00:00:00", location="石川県能登地方", magnitude=5.0,
+        max_intensity="4", depth=10, latitude=37.0, longitude=137.0,
+        tsunami_warning="なし", message="test",
+    )
+
+
+class FakeP2PQuakeService:
+    async def fetch_recent_earthquakes(self, limit: int = 10, fresh: bool = False):
+        return [make_earthquake(i) for i in range(3)]
+
+
+class FakeWarningService(WarningService):
+    """1回目は全地域成功、2回目は東京都のみ失敗する警報サービス"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def fetch_all_prefectures_data(self, fresh: bool = False):
+        self.calls += 1
+        result = FanOutResult()
+        for area_code in self.AREA_CODES.values():
+            if self.calls > 1 and area_code == "130000":
+                result.failed[area_code] = "timeout"
+            else:
+                result.results[area_code] = SPECIAL_WARNING_DATA
+        return result
+
+
+def make_scheduler(store: FeedStore, warning_service=None) -> IngestionScheduler:
+    return IngestionScheduler(
+        store=store,
+        p2p_service=FakeP2PQuakeService(),
+        warning_service=warning_service or FakeWarningService(),
+        tsunami_service=None,
+        volcano_service=None,
+    )
+
+
+async def test_store_serves_copies_of_ingested_earthquakes():
+    """取り込んだ地震情報のコピーが返されるテスト"""
+    store = FeedStore()
+    assert store.earthquakes(10) is None
+
+    await make_scheduler(store).ingest_earthquakes()
+    earthquakes = store.earthquakes(2)
+    assert [eq.id for eq in earthquakes] == ["0", "1"]
+
+    earthquakes[0].location_translated = "Noto"
+    assert store.earthquakes(1)[0].location_translated is None
+
+
+async def test_store_falls_back_beyond_capacity():
+    """取り込み件数を超える要求はNoneを返すテスト"""
+    store = FeedStore()
+    scheduler = make_scheduler(store)
+    await scheduler.ingest_earthquakes()
+    assert store.earthquakes(scheduler.earthquake_limit + 1) is None
+
+
+async def test_failed_area_keeps_previous_warning_data():
+    """取得に失敗した地域は前回の警報を引き継ぎ、失敗として記録されるテスト"""
+    store = FeedStore()
+    scheduler = make_scheduler(store)
+    await scheduler.ingest_warnings()
+    await scheduler.ingest_warnings()
+
+    assert store.warning_data("130000") == SPECIAL_WARNING_DATA
+    collection = store.special_warnings()
+    assert len(collection.alerts) == 47
+    assert [f.code for f in collection.failed] == ["130000"]
+
+
+async def test_ingestion_bypasses_stale_upstream_cache():
+    """取り込みは上流キャッシュの古い値を使わず、取得に失敗した場合はフィードを更新しないテスト"""
+    from app.services.p2p_service import P2PQuakeService
+    from app.utils.http_client import HTTPClientRegistry
+    from app.utils.upstream_cache import CachePolicy, UpstreamCache
+
+    cache = UpstreamCache(policies={"earthquakes": CachePolicy(15, 30, 600)}, enabled=True)
+    service = P2PQuakeService(http_clients=HTTPClientRegistry(), cache=cache)
+    responses = [[], []]
+
+    async def get_json(url, params=None, timeout=None):
+        if not responses:
+            raise ConnectionError("upstream down")
+        return responses.pop(0)
+
+    service.http_clients.get_json = get_json
+    store = FeedStore()
+    scheduler = IngestionScheduler(
+        store=store, p2p_service=service,
+        warning_service=None, tsunami_service=None, volcano_service=None,
+    )
+    await scheduler.ingest_earthquakes()
+    await scheduler.ingest_earthquakes()
+    assert responses == []
+
+    with pytest.raises(ConnectionError):
+        await scheduler.ingest_earthquakes()
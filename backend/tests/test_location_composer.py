@@ -0,0 +1,60 @@
+import pytest
+
+from app.services.location_composer import SUFFIX_TEMPLATES, LocationComposer, LocationTrie, build_suffixes
+from app.services.translation_tables import TranslationTables
+
+
+@pytest.fixture
+def composer(tmp_path):
+    return LocationComposer(TranslationTables(tmp_path))
+
+
+def test_trie_returns_longest_prefix_first():
+    """先頭から一致する地名を長い順に返すテスト"""
+    trie = LocationTrie(["石川県", "石川県能登地方", "能登半島沖"])
+    assert trie.prefixes("石川県能登地方北部") == [7, 3]
+    assert trie.prefixes("石川県加賀地方") == [3]
+    assert trie.prefixes("富山県") == []
+    assert len(trie) == 3
+
+
+def test_compose_directional_and_sea_suffixes(composer):
+    """登録済みの地名と方角・海域の接尾辞から翻訳を組み立てるテスト"""
+    assert composer.decompose("石川県能登地方北部") == ("石川県能登地方", "北部")
+    assert composer.compose("奈良県北部", "en") == "Northern Nara Prefecture"
+    assert composer.compose("奈良県南西部", "ko") == "나라현 남서부"
+    assert composer.compose("奈良県中部", "zh") == "奈良县中部"
+    assert composer.compose("宮古島北西沖", "en") is None  # 「宮古島」は未登録
+    assert composer.compose("石川県能登地方東方沖", "en") == "Off the east coast of Noto Region, Ishikawa Prefecture"
+    assert composer.compose("石川県能登地方北東沖", "zh-TW") == "石川縣能登地方東北近海"
+    assert composer.compose("台湾東方沖", "en") is None  # 「台湾」は未登録（「台湾付近」のみ）
+    assert composer.compose("奈良県北部", "xx") is None
+    assert composer.compose("奈良県の北", "en") is None
+
+
+@pytest.mark.parametrize("location", [
+    "三陸沖北部", "福島県沖北部", "父島近海付近", "千葉県東方沖付近", "大阪府北部沖", "日向灘南部", "東京湾付近",
+])
+def test_sea_areas_and_suffixed_names_are_not_composed(composer, location):
+    """海域・接尾辞付きの地名に接尾辞を重ねず、AI翻訳に回すテスト"""
+    assert composer.decompose(location) is None
+    assert composer.translate(location, "en") is None
+
+
+def test_translate_counts_hit_rate(composer):
+    """完全一致・組み立て・未知の件数と割合を記録するテスト"""
+    assert composer.translate("宮城県北部", "en") == "Northern Miyagi Prefecture"
+    assert composer.translate("石川県能登地方北部", "en") == "Northern Noto Region, Ishikawa Prefecture"
+    assert composer.translate("未知の地名", "en") is None
+    stats = composer.get_stats()
+    assert (stats["exact"], stats["composed"], stats["unknown"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.6667
+
+
+def test_templates_cover_all_languages_and_suffixes(composer):
+    """全対応言語のテンプレートが全ての接尾辞を組み立てられるテスト"""
+    assert set(SUFFIX_TEMPLATES) == set(composer.tables.index["languages"]) - {"ja"}
+    for lang in SUFFIX_TEMPLATES:
+        for suffix in build_suffixes():
+            translated = composer.compose(f"奈良県{suffix}", lang)
+            assert translated and "{" not in translated
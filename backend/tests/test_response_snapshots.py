@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.ingestion import FeedStore
+from app.services.response_snapshots import ResponseSnapshots
+from tests.test_ingestion import make_earthquake
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRenderer:
+    """項目毎の翻訳回数を記録し、指定したIDは翻訳に失敗する"""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+        self.failing: set[str] = set()
+
+    async def __call__(self, earthquakes, lang):
+        for eq in earthquakes:
+            self.calls.append((eq.id, lang))
+            if eq.id not in self.failing:
+                eq.location_translated = f"{eq.location}:{lang}"
+        return [eq.id not in self.failing for eq in earthquakes]
+
+
+def make_snapshots(languages=("ja", "en")) -> tuple[FeedStore, ResponseSnapshots, FakeRenderer]:
+    store = FeedStore()
+    snapshots = ResponseSnapshots(store, languages, limit_buckets=(2,))
+    renderer = FakeRenderer()
+    snapshots.add_renderer(FeedStore.EARTHQUAKES, renderer)
+    return store, snapshots, renderer
+
+
+async def ingest(store: FeedStore, snapshots: ResponseSnapshots, earthquakes, capacity: int = 10):
+    store.put(FeedStore.EARTHQUAKES, earthquakes, max_age=60, capacity=capacity)
+    await snapshots.refresh(FeedStore.EARTHQUAKES, earthquakes)
+    await snapshots.drain()
+
+
+async def test_snapshot_bodies_match_rendered_items():
+    """言語毎に作成したレスポンス本文が翻訳済みの項目のJSON配列になるテスト"""
+    store, snapshots, _ = make_snapshots()
+    earthquakes = [make_earthquake(i) for i in range(3)]
+    await ingest(store, snapshots, earthquakes)
+
+    ja = json.loads(snapshots.get(FeedStore.EARTHQUAKES, "ja", 10))
+    assert ja == [eq.model_dump() for eq in earthquakes]
+    for limit in (1, 2, 3):
+        en = json.loads(snapshots.get(FeedStore.EARTHQUAKES, "en", limit))
+        assert [e["location_translated"] for e in en] == ["石川県能登地方:en"] * limit
+    # 元データは書き換えない
+    assert earthquakes[0].location_translated is None
+    assert snapshots.get(FeedStore.EARTHQUAKES, "en", 11) is None
+    assert snapshots.get(FeedStore.EARTHQUAKES, "fr", 1) is None
+
+
+async def test_only_new_or_untranslated_items_are_rendered():
+    """新しい項目と前回翻訳できなかった項目のみを翻訳するテスト"""
+    store, snapshots, renderer = make_snapshots()
+    renderer.failing = {"1"}
+    await ingest(store, snapshots, [make_earthquake(i) for i in range(3)])
+    assert sorted(renderer.calls) == [("0", "en"), ("1", "en"), ("2", "en")]
+
+    renderer.calls.clear()
+    renderer.failing = set()
+    await ingest(store, snapshots, [make_earthquake(i) for i in (3, 0, 1, 2)])
+    assert sorted(renderer.calls) == [("1", "en"), ("3", "en")]
+    en = json.loads(snapshots.get(FeedStore.EARTHQUAKES, "en", 4))
+    assert [e["id"] for e in en] == ["3", "0", "1", "2"]
+    assert all(e["location_translated"] for e in en)
+
+
+async def test_snapshot_is_ignored_when_feed_changes():
+    """フィードが更新・期限切れの場合はスナップショットを使用しないテスト"""
+    store, snapshots, _ = make_snapshots()
+    await ingest(store, snapshots, [make_earthquake(0)])
+    assert snapshots.get(FeedStore.EARTHQUAKES, "en", 1) is not None
+    store.put(FeedStore.EARTHQUAKES, [make_earthquake(1)], max_age=60, capacity=10)
+    assert snapshots.get(FeedStore.EARTHQUAKES, "en", 1) is None
+    store.put(FeedStore.EARTHQUAKES, [make_earthquake(1)], max_age=-1, capacity=10)
+    await snapshots.refresh(FeedStore.EARTHQUAKES, store._feeds[FeedStore.EARTHQUAKES].value)
+    await snapshots.drain()
+    assert snapshots.get(FeedStore.EARTHQUAKES, "en", 1) is None
+
+
+async def test_refresh_runs_in_background_and_replaces_previous():
+    """作成は取り込みを待たせず、同じフィードの再更新で前回の作成をキャンセルするテスト"""
+    store = FeedStore()
+    snapshots = ResponseSnapshots(store, ("en",))
+    started = []
+    release = asyncio.Event()
+
+    async def renderer(earthquakes, lang):
+        started.append([eq.id for eq in earthquakes])
+        await release.wait()
+        return [True] * len(earthquakes)
+
+    snapshots.add_renderer(FeedStore.EARTHQUAKES, renderer)
+    first = [make_earthquake(0)]
+    store.put(FeedStore.EARTHQUAKES, first, max_age=60, capacity=10)
+    await asyncio.wait_for(snapshots.refresh(FeedStore.EARTHQUAKES, first), timeout=0.1)
+    await asyncio.sleep(0)
+    previous = snapshots._refreshing[FeedStore.EARTHQUAKES]
+
+    second = [make_earthquake(1)]
+    store.put(FeedStore.EARTHQUAKES, second, max_age=60, capacity=10)
+    await snapshots.refresh(FeedStore.EARTHQUAKES, second)
+    release.set()
+    await snapshots.drain()
+
+    assert previous.cancelled()
+    assert started == [["0"], ["1"]]
+    assert json.loads(snapshots.get(FeedStore.EARTHQUAKES, "en", 1))[0]["id"] == "1"
+
+
+async def test_untranslatable_items_are_complete_unless_deadline_hit(monkeypatch):
+    """原文のままの項目は期限切れの場合のみ未完了となるテスト"""
+    from app import main
+    earthquake = make_earthquake(0)
+    earthquake.location = "未知の地名"
+
+    monkeypatch.setattr(main.translator, "get_active_provider", lambda: None)
+    assert await main.render_earthquakes([earthquake.model_copy()], "en") == [True]
+
+    async def slow_fill(texts, target_lang, namespace):
+        await asyncio.sleep(0.05)
+        return {}
+
+    monkeypatch.setattr(main.translator, "get_active_provider", lambda: "claude")
+    monkeypatch.setattr(main.translator, "_fill_batch", slow_fill)
+    monkeypatch.setattr(main.translator, "deadline", 0.01)
+    assert await main.render_earthquakes([earthquake.model_copy()], "en") == [False]
+    await asyncio.gather(*main.translator._background)
+
+
+async def test_earthquakes_endpoint_serves_snapshot(client: AsyncClient, monkeypatch):
+    """地震情報エンドポイントが作成済みのレスポンスを返すテスト"""
+    from app import main
+    earthquakes = [make_earthquake(i) for i in range(3)]
+    main.feed_store.put(FeedStore.EARTHQUAKES, earthquakes, max_age=60, capacity=10)
+    try:
+        await main.response_snapshots.refresh(FeedStore.EARTHQUAKES, earthquakes)
+        await main.response_snapshots.drain()
+
+        async def fail(*args, **kwargs):
+            raise AssertionError("翻訳は呼ばれない")
+
+        monkeypatch.setattr(main.translator, "translate_locations", fail)
+        response = await client.get("/api/v1/earthquakes", params={"lang": "en", "limit": 2})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert [e["id"] for e in response.json()] == ["0", "1"]
+        assert response.json()[0]["location_translated"] == "Noto Region, Ishikawa Prefecture"
+    finally:
+        main.feed_store._feeds.pop(FeedStore.EARTHQUAKES, None)
@@ -0,0 +1,143 @@
+import json
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.safety_guides import MATRIX_NAME, SafetyGuideMatrix
+from app.services.translator import TranslatorService
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_translator(monkeypatch, failing: set = frozenset()) -> TranslatorService:
+    translator = TranslatorService()
+    calls = []
+
+    async def generate(disaster_type, target_lang, location, severity):
+        calls.append((disaster_type, severity, target_lang))
+        if (disaster_type, severity, target_lang) in failing:
+            return None
+        return {"title": f"{disaster_type}:{severity}:{target_lang}", "summary": "s",
+                "immediate_actions": ["a"], "preparation_tips": ["t"]}
+
+    monkeypatch.setattr(translator, "generate_safety_guide_with_ai", generate)
+    monkeypatch.setattr(translator, "get_active_provider", lambda: "gemini")
+    translator.calls = calls
+    return translator
+
+
+async def test_warm_up_is_resumable(tmp_path: Path, monkeypatch):
+    """失敗・中断した組み合わせのみを次回生成するテスト"""
+    path = tmp_path / MATRIX_NAME
+    translator = make_translator(monkeypatch, failing={("flood", "high", "en")})
+    matrix = SafetyGuideMatrix(translator, path, concurrency=3)
+    assert len(matrix.keys()) == 6 * 4 * 16
+
+    result = await matrix.warm_up(["en", "th"])
+    assert (result.generated, result.failed, result.skipped) == (47, ["flood:high:en"], 0)
+    assert not path.with_name(MATRIX_NAME + ".lock").exists()
+
+    # 別のプロセス相当（ファイルから読み込み）で再開
+    translator = make_translator(monkeypatch)
+    matrix = SafetyGuideMatrix(translator, path)
+    result = await matrix.warm_up(["en", "th"])
+    assert translator.calls == [("flood", "high", "en")]
+    assert (result.generated, result.skipped) == (1, 47)
+    guide = await matrix.get("flood", "high", "en")
+    assert (guide["title"], guide["cached"], guide["source"]) == ("flood:high:en", True, "pregenerated")
+    assert await matrix.get("flood", "high", "fr") is None
+
+
+async def test_prompt_change_regenerates(tmp_path: Path, monkeypatch):
+    """プロンプトが変わった場合は保存済みのガイドを使わず作り直すテスト"""
+    path = tmp_path / MATRIX_NAME
+    translator = make_translator(monkeypatch)
+    await SafetyGuideMatrix(translator, path).warm_up(["en"])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    path.write_text(
+        "\n".join(json.dumps({**json.loads(line), "prompt": "old"}) for line in lines[:3])
+        + "\n" + "\n".join(lines[3:]) + "\n{broken",
+        encoding="utf-8",
+    )
+
+    translator = make_translator(monkeypatch)
+    matrix = SafetyGuideMatrix(translator, path)
+    assert len(matrix.missing(["en"])) == 3
+    assert (await matrix.warm_up(["en"])).generated == 3
+
+    # 生成後は古いプロンプトの行・壊れた行を除いて書き直す
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(matrix.keys(["en"]))
+    assert all(json.loads(line)["prompt"] == matrix.fingerprint(tuple(json.loads(line)["key"])) for line in lines)
+    assert len(SafetyGuideMatrix(translator, path).missing(["en"])) == 0
+
+
+async def test_get_reloads_other_process_guides_at_most_once_per_interval(tmp_path: Path, monkeypatch):
+    """保存済みに無い組み合わせの要求では、間隔を空けてイベントループの外で読み直すテスト"""
+    path = tmp_path / MATRIX_NAME
+    translator = make_translator(monkeypatch)
+    matrix = SafetyGuideMatrix(translator, path, reload_interval=60.0)
+    loads = []
+    load = matrix.load
+    monkeypatch.setattr(matrix, "load", lambda: loads.append(1) or load())
+
+    # 別のプロセスが生成・追記
+    await SafetyGuideMatrix(make_translator(monkeypatch), path).warm_up(["en"])
+    for _ in range(10):
+        assert await matrix.get("flood", "high", "en") is None
+    assert loads == []
+
+    matrix.reload_interval = 0.0
+    assert (await matrix.get("flood", "high", "en"))["title"] == "flood:high:en"
+    assert loads == [1]
+
+
+async def test_severity_context_change_regenerates_only_affected(tmp_path: Path, monkeypatch):
+    """重要度の説明・言語名の変更で、該当する組み合わせのみ作り直すテスト"""
+    path = tmp_path / MATRIX_NAME
+    await SafetyGuideMatrix(make_translator(monkeypatch), path).warm_up(["en", "th"])
+
+    translator = make_translator(monkeypatch)
+    build = translator.build_safety_guide_prompt
+
+    def changed_prompt(disaster_type, target_lang, location, severity):
+        prompt = build(disaster_type, target_lang, location, severity)
+        return prompt + " (revised)" if severity == "extreme" or target_lang == "th" else prompt
+
+    monkeypatch.setattr(translator, "build_safety_guide_prompt", changed_prompt)
+    matrix = SafetyGuideMatrix(translator, path)
+    assert len(matrix.missing(["en", "th"])) == 6 * 4 + 6  # th全件 + enのextreme
+    assert await matrix.get("flood", "high", "en") is not None
+
+
+async def test_warm_up_skips_when_locked(tmp_path: Path, monkeypatch):
+    """他のプロセスが生成中（ロックファイルあり）の場合は生成しないテスト"""
+    path = tmp_path / MATRIX_NAME
+    path.with_name(MATRIX_NAME + ".lock").touch()
+    translator = make_translator(monkeypatch)
+    result = await SafetyGuideMatrix(translator, path).warm_up(["en"])
+    assert result.generated == 0 and translator.calls == []
+
+
+async def test_safety_guide_endpoint_serves_pregenerated(client: AsyncClient, monkeypatch):
+    """地域名なしの安全ガイドは事前生成したガイドを返すテスト"""
+    from app import main
+
+    async def get(disaster_type, severity, lang):
+        return {
+            "title": "Earthquake guide", "summary": "s", "immediate_actions": [], "preparation_tips": [],
+            "cached": True, "source": "pregenerated",
+        }
+
+    monkeypatch.setattr(main.safety_guides, "get", get)
+    response = await client.get("/api/v1/safety-guide", params={"disaster_type": "earthquake", "lang": "en"})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["title"], body["cached"], body["source"]) == ("Earthquake guide", True, "pregenerated")
+
+    # 地域名を指定した場合は従来通り生成（AIプロバイダー未設定のため基本ガイド）
+    response = await client.get(
+        "/api/v1/safety-guide", params={"disaster_type": "earthquake", "lang": "en", "location": "Osaka"}
+    )
+    assert (response.json()["cached"], response.json()["source"]) == (False, "fallback")
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from app.services import shelter_loader
+from app.services.shelter_loader import build_artifact, iter_artifact, iter_shelter_records
+from app.services.shelter_service import ShelterService
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_csv_rows_are_validated_and_normalized():
+    """Shift_JISのCSVを読み込み、不正な行をスキップして正規化するテスト"""
+    stats = shelter_loader.LoadStats()
+    records = list(iter_shelter_records(FIXTURES / "gsi_shelters_sample.csv", stats))
+
+    assert [r["name"] for r in records] == ["千代田区立麹町小学校", "日比谷公園", "竹芝ふ頭"]
+    assert records[0]["types"] == ["earthquake", "fire"]
+    assert records[1]["types"] == ["flood", "earthquake", "fire"]
+    assert records[2]["types"] == ["storm_surge", "earthquake", "tsunami", "inland_flood"]
+    assert records[2]["id"].startswith("gsi_")
+    assert stats.rows == 7
+    assert stats.skipped == {
+        "missing_name": 1, "invalid_coordinates": 1, "out_of_bounds": 1, "duplicate_id": 1,
+    }
+
+
+def test_geojson_features_are_streamed(monkeypatch):
+    """GeoJSONを小さな読み込み単位でも1地物ずつ読み込めるテスト"""
+    monkeypatch.setattr(shelter_loader, "READ_CHUNK_SIZE", 16)
+    stats = shelter_loader.LoadStats()
+    records = list(iter_shelter_records(FIXTURES / "gsi_shelters_sample.geojson", stats))
+
+    assert [r["name"] for r in records] == ["大阪城公園", "扇町公園"]
+    assert records[0]["latitude"] == 34.6937 and records[0]["longitude"] == 135.5023
+    assert records[0]["types"] == ["earthquake", "fire"]
+    assert stats.skipped == {"invalid_coordinates": 1}
+
+
+def test_service_loads_built_artifact(tmp_path: Path, monkeypatch):
+    """取り込み済みデータがサンプルデータより優先して読み込まれるテスト"""
+    stats = build_artifact(FIXTURES / "gsi_shelters_sample.csv", tmp_path / shelter_loader.ARTIFACT_NAME)
+    assert stats.written == 3
+    assert len(list(iter_artifact(tmp_path / shelter_loader.ARTIFACT_NAME))) == 3
+
+    from app.config import settings
+    monkeypatch.setattr(settings, "shelter_data_dir", tmp_path)
+    service = ShelterService()
+    shelters = service.get_nearby_shelters(35.684, 139.7395, radius_km=5.0)
+    assert [s.name for s in shelters] == ["千代田区立麹町小学校", "日比谷公園", "竹芝ふ頭"]
+
+
+def test_unsupported_format_is_rejected(tmp_path: Path):
+    """未対応の形式はエラーになるテスト"""
+    path = tmp_path / "shelters.xml"
+    path.write_text("<xml/>")
+    with pytest.raises(shelter_loader.ShelterDataError):
+        list(iter_shelter_records(path))
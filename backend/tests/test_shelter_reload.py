@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.shelter_loader import ARTIFACT_NAME, build_artifact
+from app.services.shelter_service import ShelterService
+from app.services.shelter_store import ShelterStore
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_row_of_uses_id_index():
+    """IDから行を表で引くテスト（同じIDは先頭の行）"""
+    store = ShelterStore.from_records(
+        {"id": shelter_id, "name": name, "latitude": 35.0, "longitude": 139.0}
+        for shelter_id, name in [("a", "x"), ("b", "y"), ("a", "z"), ("c", "a")]
+    )
+    assert [store.row_of(i) for i in ("a", "b", "c")] == [0, 1, 3]
+    # 名称等の文字列と一致してもIDでなければ見つからない
+    assert store.row_of("x") is None
+    assert store.row_of("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_dataset_without_disturbing_queries(tmp_path: Path, monkeypatch):
+    """再読み込み中の検索は差し替え前のデータで完了し、完了後に新しいデータに切り替わるテスト"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "shelter_data_dir", tmp_path)
+    service = ShelterService()
+    assert service.get_shelter_by_id("tokyo_001") is not None
+
+    build_artifact(FIXTURES / "gsi_shelters_sample.csv", tmp_path / ARTIFACT_NAME)
+    release = threading.Event()
+    calls = []
+    read_dataset = service._read_dataset
+
+    def slow_read():
+        calls.append(1)
+        release.wait(5)
+        return read_dataset()
+
+    monkeypatch.setattr(service, "_read_dataset", slow_read)
+    reloads = asyncio.gather(service.reload(), service.reload())
+    await asyncio.sleep(0.05)
+    # 読み込み中は差し替え前のデータで応答する
+    assert service.get_shelter_by_id("tokyo_001") is not None
+    assert service.count() == 5
+
+    release.set()
+    assert await reloads == [3, 3]
+    assert len(calls) == 1
+    assert service.get_shelter_by_id("tokyo_001") is None
+    assert [s.name for s in service.get_nearby_shelters(35.684, 139.7395)][0] == "千代田区立麹町小学校"
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_current_dataset(monkeypatch):
+    """読み込みに失敗した場合は現在のデータを使い続けるテスト"""
+    service = ShelterService()
+    data = service._data
+
+    def broken():
+        raise ValueError("broken")
+
+    monkeypatch.setattr(service, "_read_dataset", broken)
+    with pytest.raises(ValueError):
+        await service.reload()
+    assert service._data is data
+
+
+@pytest.mark.asyncio
+async def test_shelter_and_admin_endpoints(client: AsyncClient, monkeypatch):
+    """IDによる取得と管理用の再読み込みエンドポイントのテスト"""
+    response = await client.get("/api/v1/shelters/tokyo_001")
+    assert response.status_code == 200 and response.json()["name"] == "東京都庁"
+    assert (await client.get("/api/v1/shelters/missing")).status_code == 404
+
+    from app.config import settings
+    assert (await client.post("/api/v1/admin/shelters/reload")).status_code == 404
+    monkeypatch.setattr(settings, "admin_api_token", "secret")
+    response = await client.post("/api/v1/admin/shelters/reload", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+    response = await client.post("/api/v1/admin/shelters/reload", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200 and response.json()["shelters"] > 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_update_runs_under_reload_single_flight(tmp_path: Path, monkeypatch):
+    """取得から差し替えまでを再読み込みと同じシングルフライトで実行し、一時ファイルを残さないテスト"""
+    import httpx
+
+    from app.config import settings
+    from app.services import shelter_service
+    from tests.test_fanout import MockTransportClients
+
+    data_dir = tmp_path / "shelters"
+    monkeypatch.setattr(settings, "shelter_data_dir", data_dir)
+    monkeypatch.setattr(settings, "shelter_source_url", "https://example.com/shelters.csv")
+    release = asyncio.Event()
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        await release.wait()
+        return httpx.Response(200, content=(FIXTURES / "gsi_shelters_sample.csv").read_bytes())
+
+    monkeypatch.setattr(shelter_service, "http_clients", MockTransportClients(handler))
+    service = ShelterService()
+    assert service.count() == 5
+
+    fetch = asyncio.ensure_future(service.fetch_and_update_shelter_data())
+    await asyncio.sleep(0.01)
+    # 取得中の再読み込みは取得の完了を待ち、取得後のデータの件数を返す
+    reload = asyncio.ensure_future(service.reload())
+    await asyncio.sleep(0.01)
+    assert not reload.done()
+    release.set()
+    assert await fetch is True
+    assert await reload == 3
+    assert len(requests) == 1
+    assert service.count() == 3
+    assert sorted(p.name for p in data_dir.iterdir()) == sorted([ARTIFACT_NAME, "shelters.snapshot"])
+
+    # 取得を伴わない再読み込みの実行中に呼ばれた場合も取得する
+    reload = asyncio.ensure_future(service.reload())
+    assert await service.fetch_and_update_shelter_data() is True
+    assert await reload == 3
+    assert len(requests) == 2
@@ -0,0 +1,133 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.shelter_loader import ARTIFACT_NAME, build_artifact
+from app.services.shelter_service import ShelterService
+from app.services.shelter_snapshot import (
+    SNAPSHOT_NAME,
+    MappedShelterStore,
+    SnapshotError,
+    build_snapshot,
+    write_snapshot,
+)
+from app.services.shelter_store import DISASTER_TYPE_CODES, ShelterStore
+from app.utils.spatial_index import GridIndex
+from tests.test_spatial_index import make_points
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def make_store(n: int) -> ShelterStore:
+    return ShelterStore.from_records(
+        {
+            "id": f"s{i}", "name": f"避難所{i % 50}", "address": f"住所{i % 7}",
+            "latitude": lat, "longitude": lon,
+            "capacity": None if i % 3 == 0 else i, "facilities": ["駐車場"] if i % 2 else [],
+            "types": [DISASTER_TYPE_CODES[i % 8]], "is_open": i % 5 != 0,
+        }
+        for i, (lat, lon) in enumerate(make_points(n))
+    )
+
+
+def test_snapshot_round_trips_store(tmp_path: Path):
+    """スナップショットの行・近傍検索がストアと一致するテスト"""
+    store = make_store(2000)
+    path = tmp_path / SNAPSHOT_NAME
+    write_snapshot(store, path)
+    mapped = MappedShelterStore(path)
+
+    assert len(mapped) == len(store)
+    for i in range(0, len(store), 37):
+        assert mapped.materialize(i) == store.materialize(i)
+    assert mapped.strings.lookup("s1234") == store.strings.lookup("s1234")
+
+    index = GridIndex(store.points())
+    mapped_index = mapped.grid_index()
+    for lat, lon in make_points(20, seed=3):
+        assert mapped_index.nearest(lat, lon, k=5, max_km=300) == index.nearest(lat, lon, k=5, max_km=300)
+    with pytest.raises(TypeError):
+        mapped.append({})
+
+
+def test_snapshot_stores_lookup_structures(tmp_path: Path):
+    """IDの検索・災害種別毎の対象行・セル・空き状況をスナップショットから参照し、ストアと一致するテスト"""
+    from app.services.shelter_dataset import ShelterDataset
+    from app.services.shelter_status import ShelterStatus
+    from app.services.shelter_store import DISASTER_TYPE_BITS, TypeIndex
+
+    store = make_store(2000)
+    store.index_ids()
+    path = tmp_path / SNAPSHOT_NAME
+    write_snapshot(store, path)
+    mapped = MappedShelterStore(path)
+
+    assert all(mapped.row_of(f"s{i}") == store.row_of(f"s{i}") for i in range(len(store)))
+    assert mapped.row_of("missing") is None
+
+    types, mapped_types = TypeIndex(store.type_masks), mapped.type_index()
+    for bits in [*DISASTER_TYPE_BITS.values(), 0b11, 0b101]:
+        for match_all in (True, False):
+            assert list(mapped_types.rows(bits, match_all)) == list(types.rows(bits, match_all))
+
+    status, mapped_status = ShelterStatus(store), ShelterStatus(mapped)
+    assert mapped_status.remaining == status.remaining
+    assert mapped_status.available == status.available
+
+    index, mapped_index = GridIndex(store.points()), mapped.grid_index()
+    assert {cell: list(rows) for cell, rows in mapped_index._cells.items()} == \
+        {cell: list(rows) for cell, rows in index._cells.items()}
+    assert mapped_index.in_bbox(34.0, 135.0, 36.0, 140.0) == index.in_bbox(34.0, 135.0, 36.0, 140.0)
+
+    # 地図表示用のクラスタは初回の参照時に作成する
+    dataset = ShelterDataset(mapped, mapped_index)
+    assert dataset._pyramid is None
+    assert dataset.pyramid is dataset.pyramid
+
+
+def test_corrupt_snapshot_is_rejected(tmp_path: Path):
+    """破損したスナップショットを拒否するテスト"""
+    path = tmp_path / SNAPSHOT_NAME
+    write_snapshot(make_store(100), path)
+    data = bytearray(path.read_bytes())
+    data[-10] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError):
+        MappedShelterStore(path)
+
+    path.write_bytes(b"")
+    with pytest.raises(SnapshotError):
+        MappedShelterStore(path)
+
+
+def test_stale_snapshot_is_rejected(tmp_path: Path):
+    """元データが更新された場合に古いスナップショットを拒否するテスト"""
+    artifact = tmp_path / ARTIFACT_NAME
+    build_artifact(FIXTURES / "gsi_shelters_sample.csv", artifact)
+    assert build_snapshot(artifact, tmp_path / SNAPSHOT_NAME) == 3
+    assert len(MappedShelterStore(tmp_path / SNAPSHOT_NAME, source=artifact)) == 3
+
+    stat = artifact.stat()
+    os.utime(artifact, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(SnapshotError):
+        MappedShelterStore(tmp_path / SNAPSHOT_NAME, source=artifact)
+
+
+def test_service_prefers_valid_snapshot(tmp_path: Path, monkeypatch):
+    """有効なスナップショットを優先し、無効な場合は取り込み済みデータを読み込むテスト"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "shelter_data_dir", tmp_path)
+    artifact = tmp_path / ARTIFACT_NAME
+    build_artifact(FIXTURES / "gsi_shelters_sample.csv", artifact)
+    build_snapshot(artifact, tmp_path / SNAPSHOT_NAME)
+
+    service = ShelterService()
+    assert isinstance(service._data.store, MappedShelterStore)
+    shelters = service.get_nearby_shelters(35.684, 139.7395, radius_km=5.0)
+    assert [s.name for s in shelters] == ["千代田区立麹町小学校", "日比谷公園", "竹芝ふ頭"]
+
+    (tmp_path / SNAPSHOT_NAME).write_bytes(b"broken")
+    service = ShelterService()
+    assert not isinstance(service._data.store, MappedShelterStore)
+    assert len(service.get_nearby_shelters(35.684, 139.7395, radius_km=5.0)) == 3
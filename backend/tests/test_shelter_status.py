@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import shelter_dataset
+from app.services.shelter_loader import ARTIFACT_NAME, build_artifact
+from app.services.shelter_service import ShelterService
+from app.services.shelter_snapshot import SNAPSHOT_NAME, build_snapshot
+from app.services.shelter_status import StatusUpdate, UpdateResult, parse_updates
+from app.services.shelter_store import ShelterStore
+from tests.test_spatial_index import make_points
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def make_service(n: int = 2000) -> ShelterService:
+    service = ShelterService()
+    service._set_store(ShelterStore.from_records(
+        {"id": f"s{i}", "name": f"避難所{i}", "latitude": 35.0 + lat / 100, "longitude": 139.0 + lon / 100,
+         "capacity": None if i % 10 == 0 else 100, "types": ["earthquake"]}
+        for i, (lat, lon) in enumerate(make_points(n))
+    ))
+    return service
+
+
+def test_parse_updates_reports_invalid_rows():
+    """JSON Lines・CSVの更新を解析し、不正な行を記録してスキップするテスト"""
+    result = UpdateResult()
+    updates = parse_updates(
+        '{"id": "a", "occupancy": 10}\n{"id": "b", "delta": -3, "is_open": false}\n'
+        '{broken\n{"occupancy": 1}\n{"id": "c", "occupancy": -1}\n{"id": "d"}\n\n',
+        "jsonl", result,
+    )
+    assert updates == [
+        StatusUpdate("a", occupancy=10), StatusUpdate("b", delta=-3, is_open=False),
+    ]
+    assert (result.received, result.invalid) == (6, 4)
+    assert result.errors[0].startswith("3行目")
+
+    result = UpdateResult()
+    updates = parse_updates("id,occupancy,is_open\na,5,1\nb,,closed\nc,x,\n", "csv", result)
+    assert updates == [StatusUpdate("a", occupancy=5, is_open=True), StatusUpdate("b", is_open=False)]
+    assert result.errors == ["4行目: 避難者数が数値ではありません: 'x'"]
+
+
+def test_updates_are_applied_in_place():
+    """更新がストアに反映され、インデックスを再構築しないテスト"""
+    service = make_service()
+    data = service._data
+    result = service.apply_status_updates([
+        StatusUpdate("s1", occupancy=60), StatusUpdate("s1", delta=50),
+        StatusUpdate("s2", is_open=False), StatusUpdate("missing", occupancy=1),
+    ])
+    assert (result.applied, result.unknown) == (3, 1)
+    assert service._data is data
+    assert service.get_shelter_by_id("s1").current_occupancy == 110
+    assert service.get_shelter_by_id("s2").is_open is False
+    assert not data.status.has_room(1) and not data.status.has_room(2)
+    assert data.status.has_room(3, required=100) and not data.status.has_room(3, required=101)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_available_shelters_skip_full_and_closed(monkeypatch, use_numpy):
+    """満員・閉鎖中の避難所を除いて近い順に返すテスト"""
+    if not use_numpy:
+        monkeypatch.setattr(shelter_dataset, "NUMPY_AVAILABLE", False)
+    service = make_service()
+    lat, lon = 35.38, 140.38
+    nearby = [s.id for s in service.get_nearby_shelters(lat, lon, 20.0, 10)]
+    service.apply_status_updates(
+        [StatusUpdate(nearby[0], occupancy=100), StatusUpdate(nearby[1], is_open=False),
+         StatusUpdate(nearby[2], occupancy=99)]
+    )
+
+    available = service.get_available_shelters(lat, lon, 20.0, 10)
+    assert [s.id for s in available][:7] == nearby[2:9]
+    with_family = [s.id for s in service.get_available_shelters(lat, lon, 20.0, 10, min_remaining=4)]
+    assert nearby[2] not in with_family and nearby[3] in with_family
+
+
+@pytest.mark.asyncio
+async def test_updates_survive_reload(tmp_path: Path, monkeypatch):
+    """状況の更新が再読み込み後のデータ（スナップショット）にも反映されるテスト"""
+    from app.config import settings
+    monkeypatch.setattr(settings, "shelter_data_dir", tmp_path)
+    artifact = tmp_path / ARTIFACT_NAME
+    build_artifact(FIXTURES / "gsi_shelters_sample.csv", artifact)
+    build_snapshot(artifact, tmp_path / SNAPSHOT_NAME)
+    service = ShelterService()
+    shelter_id = service.get_all_shelters()[0].id
+
+    service.apply_status_updates([StatusUpdate(shelter_id, occupancy=42, is_open=False)])
+    await service.reload()
+    shelter = service.get_shelter_by_id(shelter_id)
+    assert (shelter.current_occupancy, shelter.is_open) == (42, False)
+
+
+@pytest.mark.asyncio
+async def test_status_endpoints(client: AsyncClient, monkeypatch):
+    """一括更新・受け入れ可能な避難所のエンドポイントのテスト"""
+    from app.config import settings
+    from app.main import shelter_service
+    monkeypatch.setattr(settings, "admin_api_token", "secret")
+    response = await client.post(
+        "/api/v1/admin/shelters/status",
+        content="id,is_open\ntokyo_002,0\nunknown,1\n",
+        headers={"X-Admin-Token": "secret", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json()["applied"] == 1 and response.json()["unknown"] == 1
+
+    response = await client.get("/api/v1/shelters/available", params={"lat": 35.6896, "lon": 139.6917})
+    assert response.status_code == 200
+    assert "tokyo_002" not in [s["id"] for s in response.json()]
+    shelter_service.apply_status_updates([StatusUpdate("tokyo_002", is_open=True)])
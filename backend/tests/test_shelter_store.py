@@ -0,0 +1,106 @@
+from app.models import ShelterInfo
+from app.services import shelter_dataset
+from app.services.shelter_service import ShelterService
+from app.services.shelter_store import (
+    DISASTER_TYPE_CODES,
+    ShelterStore,
+    TypeIndex,
+    mask_to_types,
+    query_mask,
+    types_to_mask,
+)
+from tests.test_spatial_index import make_points
+
+SHELTER = ShelterInfo(
+    id="tokyo_001", name="東京都庁", address="東京都新宿区西新宿2-8-1",
+    latitude=35.6896, longitude=139.6917, capacity=5000,
+    facilities=["バリアフリー", "駐車場"], types=["earthquake", "fire"], is_open=True,
+)
+
+
+def test_materialize_round_trips_model():
+    """ストアから作成したモデルが元のモデルと一致するテスト"""
+    store = ShelterStore.from_models([SHELTER, SHELTER.model_copy(update={"id": "x", "capacity": None})])
+    assert store.materialize(0) == SHELTER
+    assert store.materialize(1).capacity is None
+    assert store.materialize(0, distance=1.5).distance == 1.5
+
+
+def test_strings_and_facilities_are_interned():
+    """同じ文字列・設備リストは1つだけ保持されるテスト"""
+    store = ShelterStore.from_models(
+        [SHELTER.model_copy(update={"id": f"tokyo_{i}"}) for i in range(100)]
+    )
+    # 100件のID + 共通の名称・住所・電話番号（空）
+    assert len(store.strings) == 103
+    assert len(store.facility_sets) == 1
+
+
+def test_type_mask_conversion():
+    """災害種別とビットマスクの相互変換テスト"""
+    mask = types_to_mask(["fire", "flood", "unknown"])
+    assert mask_to_types(mask) == ["flood", "fire"]
+
+
+def test_service_returns_fresh_models():
+    """サービスが返すモデルを変更してもストアに影響しないテスト"""
+    service = ShelterService()
+    shelter = service.get_shelter_by_id("tokyo_001")
+    shelter.name_translated = "Tokyo Metropolitan Government"
+    assert service.get_shelter_by_id("tokyo_001").name_translated is None
+    assert service.get_shelter_by_id("missing") is None
+    assert all("tsunami" in s.types for s in service.get_shelters_by_type("tsunami"))
+
+
+def make_typed_service(n: int = 3000) -> ShelterService:
+    service = ShelterService()
+    service._set_store(ShelterStore.from_records(
+        {
+            "id": f"s{i}", "name": f"避難所{i}", "latitude": 35.0 + lat / 100, "longitude": 139.0 + lon / 100,
+            "types": [code for b, code in enumerate(DISASTER_TYPE_CODES) if (i * 7919 >> b) % 3 == 0],
+        }
+        for i, (lat, lon) in enumerate(make_points(n))
+    ))
+    return service
+
+
+def test_type_index_matches_scan():
+    """災害種別毎の対象行がビットマスクの全件走査と一致するテスト"""
+    store = make_typed_service()._data.store
+    index = TypeIndex(store.type_masks)
+    for types in (["tsunami"], ["tsunami", "earthquake"], ["flood", "fire", "volcano"]):
+        bits = query_mask(types)
+        assert list(index.rows(bits)) == [
+            i for i in range(len(store)) if all(store.has_type(i, t) for t in types)
+        ]
+        assert list(index.rows(bits, match_all=False)) == [
+            i for i in range(len(store)) if any(store.has_type(i, t) for t in types)
+        ]
+    assert query_mask(["tsunami", "unknown"]) is None
+
+
+def test_multi_type_search_paths_agree(monkeypatch):
+    """複数種別の絞り込み結果が検索経路（対象全件・空間インデックス・純Python）によらず一致するテスト"""
+    service = make_typed_service()
+    lat, lon = 35.38, 140.38
+
+    def search(match_all):
+        return [
+            (s.id, s.distance)
+            for s in service.get_nearby_shelters(lat, lon, 20.0, 10, "tsunami, earthquake", match_all)
+        ]
+
+    expected = {}
+    for match_all in (True, False):
+        expected[match_all] = search(match_all)
+        found = [service.get_shelter_by_id(i) for i, _ in expected[match_all]]
+        check = all if match_all else any
+        assert found and all(check(t in s.types for t in ("tsunami", "earthquake")) for s in found)
+
+    monkeypatch.setattr(ShelterService, "TYPE_SCAN_LIMIT", 0)
+    assert {m: search(m) for m in expected} == expected
+    monkeypatch.setattr(shelter_dataset, "NUMPY_AVAILABLE", False)
+    service._set_store(service._data.store)
+    assert service._data.engine is None
+    assert {m: search(m) for m in expected} == expected
+    assert service.get_nearby_shelters(lat, lon, 20.0, 10, "tsunami,unknown") == []
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from app.utils.single_flight import SingleFlight
+from app.services.translator import TranslatorService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_shares_result_and_exception():
+    """実行中の処理の結果・例外が共有されるテスト"""
+    flights = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("failed")
+
+    results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.inflight_count() == 0
+
+
+async def test_caller_cancellation_does_not_cancel_shared_work():
+    """呼び出し元のキャンセルが共有処理に波及しないテスト"""
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("k", work))
+    second = asyncio.ensure_future(flights.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "done"
+
+
+async def test_translate_with_ai_is_coalesced():
+    """同一テキストのAI翻訳が1回に集約されるテスト"""
+    translator = TranslatorService()
+    calls = 0
+
+    async def fake_provider(text, target_lang):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "Somewhere"
+
+    translator._translate_with_provider = fake_provider
+    results = await asyncio.gather(*(translator._translate_with_ai("どこか", "en") for _ in range(10)))
+    assert calls == 1
+    assert results == ["Somewhere"] * 10
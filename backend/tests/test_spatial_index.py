@@ -0,0 +1,51 @@
+import random
+
+from app.services.shelter_service import ShelterService
+from app.utils.spatial_index import GridIndex, haversine_km
+
+
+def make_points(n: int, seed: int = 1) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    return [(rng.uniform(30.0, 45.0), rng.uniform(129.0, 146.0)) for _ in range(n)]
+
+
+def brute_force(points, lat, lon):
+    return sorted((haversine_km(lat, lon, p_lat, p_lon), i) for i, (p_lat, p_lon) in enumerate(points))
+
+
+def test_nearest_matches_brute_force():
+    """k近傍検索の結果が全件計算と一致するテスト"""
+    points = make_points(5000)
+    index = GridIndex(points)
+    for lat, lon in make_points(30, seed=2):
+        expected = brute_force(points, lat, lon)[:10]
+        actual = index.nearest(lat, lon, k=10)
+        assert [i for _, i in actual] == [i for _, i in expected]
+
+
+def test_within_matches_brute_force():
+    """半径検索の結果が全件計算と一致するテスト"""
+    points = make_points(5000)
+    index = GridIndex(points)
+    for lat, lon in make_points(30, seed=3):
+        expected = [i for d, i in brute_force(points, lat, lon) if d <= 30.0]
+        assert [i for _, i in index.within(lat, lon, 30.0)] == expected
+
+
+def test_nearest_respects_radius_and_predicate():
+    """検索半径・絞り込み条件が反映されるテスト"""
+    points = make_points(2000)
+    index = GridIndex(points)
+    even = lambda i: i % 2 == 0
+    hits = index.nearest(36.0, 138.0, k=50, max_km=40.0, predicate=even)
+    expected = [i for d, i in brute_force(points, 36.0, 138.0) if d <= 40.0 and i % 2 == 0][:50]
+    assert [i for _, i in hits] == expected
+
+
+def test_nearby_shelters_sorted_by_distance():
+    """避難所検索が近い順に件数上限まで返すテスト"""
+    service = ShelterService()
+    shelters = service.get_nearby_shelters(35.6896, 139.6917, radius_km=10.0, limit=3)
+    assert len(shelters) == 3
+    assert shelters[0].distance == 0.0
+    assert [s.distance for s in shelters] == sorted(s.distance for s in shelters)
@@ -0,0 +1,146 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils.translation_cache import NamespacePolicy, TranslationCache
+from app.utils.translation_store import TranslationStore
+
+
+def test_entries_persist_and_are_shared(tmp_path: Path):
+    """保存した値が別の接続（別プロセス相当）からも読めるテスト"""
+    path = tmp_path / "cache.db"
+    first = TranslationStore(path)
+    second = TranslationStore(path)
+    first.put("a", "A")
+    assert second.get("a") == "A"
+    second.put_many([("a", "A2"), ("b", "B")])
+    assert first.load_all() == {"a": "A2", "b": "B"}
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    first.close()
+    second.close()
+    assert TranslationStore(path).get("b") == "B"
+
+
+def test_legacy_json_is_imported_once(tmp_path: Path):
+    """旧形式のJSONファイルを取り込み、既存の値は上書きしないテスト"""
+    legacy = tmp_path / "translation_cache.json"
+    legacy.write_text(json.dumps({"a": "old", "b": "B"}), encoding="utf-8")
+    store = TranslationStore(tmp_path / "cache.db")
+    store.put("a", "new")
+    store.close()
+
+    store = TranslationStore(tmp_path / "cache.db", legacy_json=legacy)
+    assert store.load_all() == {"a": "new", "b": "B"}
+    assert not legacy.exists()
+    assert (tmp_path / "translation_cache.json.migrated").exists()
+
+
+@pytest.mark.asyncio
+async def test_translator_writes_single_entries(tmp_path: Path, monkeypatch):
+    """AI翻訳の結果が1件ずつ保存され、別のインスタンスから参照できるテスト"""
+    from app.config import settings
+    from app.services.translator import TranslatorService
+    monkeypatch.setattr(settings, "translation_cache_db", tmp_path / "cache.db")
+    monkeypatch.setattr(settings, "translation_cache_file", tmp_path / "missing.json")
+    monkeypatch.setattr(settings, "gemini_api_key", "test_key")
+    monkeypatch.setattr(settings, "ai_provider", "gemini")
+
+    writer = TranslatorService()
+    reader = TranslatorService()
+    writer._translate_with_ai = AsyncMock(return_value="Unknown Place")
+    reader._translate_with_ai = AsyncMock(return_value=None)
+    assert await writer.translate_location("未知の地名", "en") == "Unknown Place"
+    # readerは起動後に保存された値もストアから取得する
+    assert await reader.translate_location("未知の地名", "en") == "Unknown Place"
+    reader._translate_with_ai.assert_not_called()
+    assert not (tmp_path / "missing.json").exists()
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_per_namespace(tmp_path: Path):
+    """名前空間毎に件数上限を超えた古い値をメモリから追い出し、ストアから読み直すテスト"""
+    cache = TranslationCache(
+        TranslationStore(tmp_path / "cache.db"),
+        {"text": NamespacePolicy(max_entries=3), "safety": NamespacePolicy(max_entries=3)},
+    )
+    for i in range(10):
+        await cache.set("text", f"k{i}", f"v{i}")
+    await cache.set("safety", "g0", "guide")
+    stats = cache.get_stats()
+    assert (stats["text"]["entries"], stats["text"]["evictions"]) == (3, 7)
+    assert stats["safety"]["entries"] == 1
+    assert cache.peek("text", "k0") is None
+
+    assert await cache.get("text", "k9") == "v9"
+    assert await cache.get("text", "k0") == "v0"
+    assert await cache.get("text", "missing") is None
+    stats = cache.get_stats()["text"]
+    assert (stats["hits"], stats["store_hits"], stats["misses"]) == (1, 1, 1)
+    with pytest.raises(KeyError):
+        await cache.get("unknown", "k0")
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_applies_to_memory_and_store(tmp_path: Path, monkeypatch):
+    """TTLを超えた値はメモリ・ストアのどちらにあっても使用しないテスト"""
+    store = TranslationStore(tmp_path / "cache.db")
+    cache = TranslationCache(store, {"safety": NamespacePolicy(10, ttl=60.0), "location": NamespacePolicy(10)})
+    await cache.set("safety", "g", "guide")
+    await cache.set("location", "p", "place")
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert await cache.get("safety", "g") is None
+    assert await cache.get("location", "p") == "place"
+    assert cache.get_stats()["safety"]["expired"] == 2
+    # 期限切れの行は読み込んだ時に削除する
+    assert store.get("g") is None and store.get("p") == "place"
+    assert cache.get_stats()["safety"]["purged"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_purges_expired_rows_per_namespace(tmp_path: Path, monkeypatch):
+    """名前空間の期限切れの行を読み込まなくてもまとめて削除するテスト"""
+    store = TranslationStore(tmp_path / "cache.db")
+    cache = TranslationCache(store, {"safety": NamespacePolicy(10, ttl=60.0), "location": NamespacePolicy(10)})
+    await cache.set_many("safety", [("g1", "guide"), ("g2", "guide")])
+    await cache.set("location", "p", "place")
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert await cache.purge_expired("location") == 0
+    assert await cache.purge_expired("safety") == 2
+    assert store.get("g1") is None and store.get("p") == "place"
+    assert cache.get_stats()["safety"]["purged"] == 2
+
+
+def test_store_adds_namespace_column_to_old_table(tmp_path: Path):
+    """名前空間の列が無い旧形式のテーブルに列を追加するテスト"""
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE translations (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)")
+    conn.execute("INSERT INTO translations VALUES ('old', 'value', 0)")
+    conn.commit()
+    conn.close()
+
+    store = TranslationStore(path)
+    assert store.get("old") == "value"
+    store.put("new", "value", namespace="safety")
+    assert store.purge("safety", time.time() + 1) == 1
+    assert store.purge("", 1) == 1
+    assert len(store) == 0
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_translation_stats_endpoint(client: AsyncClient):
+    """翻訳キャッシュの統計エンドポイントのテスト"""
+    response = await client.get("/api/v1/translation/stats")
+    assert response.status_code == 200
+    assert set(response.json()) == {"location", "text", "warning", "safety"}
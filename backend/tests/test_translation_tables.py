@@ -0,0 +1,44 @@
+import marshal
+
+from app.services.location_translations import LOCATION_TRANSLATIONS
+from app.services.message_translations import INTENSITY_TRANSLATIONS, TEMPLATES, TSUNAMI_TRANSLATIONS
+from app.services.translation_tables import INDEX_NAME, TranslationTables
+
+
+def test_languages_are_loaded_on_first_use(tmp_path):
+    """コンパイルした言語毎のファイルを初回使用時に読み込むテスト"""
+    tables = TranslationTables(tmp_path)
+    assert tables.loaded_languages() == []
+    assert tables.location("宮城県沖", "en") == LOCATION_TRANSLATIONS["宮城県沖"]["en"]
+    assert tables.loaded_languages() == ["en"]
+    assert (tmp_path / INDEX_NAME).exists() and (tmp_path / "th.marshal").exists()
+
+    # 2つ目のワーカー相当（コンパイル済みのファイルを読み込む）
+    other = TranslationTables(tmp_path)
+    th = other.language("th")
+    assert th.tsunami["津波警報"] == TSUNAMI_TRANSLATIONS["津波警報"]["th"]
+    assert th.templates["earthquake"] == TEMPLATES["earthquake"]["th"]
+    assert other.language("ja").intensity["5弱"] == INTENSITY_TRANSLATIONS["5弱"]["ja"]
+    assert other.location_names() == list(LOCATION_TRANSLATIONS)
+    assert other.language("xx").locations == {}
+
+
+def test_stale_tables_are_recompiled(tmp_path):
+    """元データと指紋が一致しないファイルはコンパイルし直すテスト"""
+    TranslationTables(tmp_path).language("en")
+    with open(tmp_path / "en.marshal", "wb") as f:
+        marshal.dump({"fingerprint": "old", "locations": {"宮城県沖": "Old"}}, f)
+    with open(tmp_path / INDEX_NAME, "wb") as f:
+        marshal.dump({"fingerprint": "old", "languages": ["en"], "locations": []}, f)
+
+    tables = TranslationTables(tmp_path)
+    assert tables.location("宮城県沖", "en") == LOCATION_TRANSLATIONS["宮城県沖"]["en"]
+    assert len(tables.location_names()) == len(LOCATION_TRANSLATIONS)
+
+
+def test_unwritable_directory_uses_source(tmp_path):
+    """書き出せない場合は元データから作成したテーブルを使用するテスト"""
+    path = tmp_path / "tables"
+    path.write_text("")
+    tables = TranslationTables(path)
+    assert tables.location("宮城県沖", "ko") == LOCATION_TRANSLATIONS["宮城県沖"]["ko"]
@@ -3,12 +3,18 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from app.services.translator import TranslatorService
 
 @pytest.fixture
-def mock_settings():
+def mock_settings(tmp_path):
     with patch("app.config.settings") as mock:
         mock.anthropic_api_key = "test_key"
         mock.gemini_api_key = "test_key"
         mock.ai_provider = "auto"
         mock.api_timeout = 10.0
+        mock.ai_translate_batch_size = 25
+        mock.ai_concurrency_gemini = 2
+        mock.ai_concurrency_claude = 2
+        mock.translation_deadline = 5.0
+        mock.translation_cache_db = tmp_path / "translation_cache.db"
+        mock.cache_dir = tmp_path
         mock.translation_cache_file.exists.return_value = False
         yield mock
 
@@ -34,7 +40,7 @@ async def test_translate_cache_hit(translator):
     """キャッシュヒットのテスト"""
     # キャッシュを手動で設定
     cache_key = translator._get_cache_key("未知の地名", "en")
-    translator._cache[cache_key] = "Unknown Place"
+    translator._cache.put("location", cache_key, "Unknown Place")
     
     # モックのAI翻訳メソッド（呼ばれてはいけない）
     translator._translate_with_ai = AsyncMock()
@@ -58,3 +64,121 @@ def test_get_supported_languages(translator):
     assert "ja" in langs
     assert "en" in langs
     assert len(langs) >= 15
+
+@pytest.mark.asyncio
+async def test_translate_locations_batches_misses(translator):
+    """静的マッピング・キャッシュに無い地名のみをまとめて1回で翻訳するテスト"""
+    cache_key = translator._get_cache_key("未知の地名C", "en")
+    translator._cache.put("location", cache_key, "Place C")
+    translator._translate_batch_with_provider = AsyncMock(return_value=["Place A", "Place B"])
+    translator._translate_with_ai = AsyncMock()
+
+    result = await translator.translate_locations(
+        ["北海道北西沖", "未知の地名A", "未知の地名B", "未知の地名A", "未知の地名C"], "en"
+    )
+    assert result == ["Off the northwest coast of Hokkaido", "Place A", "Place B", "Place A", "Place C"]
+    translator._translate_batch_with_provider.assert_awaited_once_with(["未知の地名A", "未知の地名B"], "en")
+    translator._translate_with_ai.assert_not_called()
+    # 翻訳結果はキャッシュに保存される
+    assert await translator.translate_location("未知の地名B", "en") == "Place B"
+
+@pytest.mark.asyncio
+async def test_translate_many_falls_back_on_bad_response(translator):
+    """AI応答の件数が一致しない場合は元のテキストを返すテスト"""
+    assert translator._extract_json_array('```json\n["a", 1]\n```', 2) == ["a", None]
+    assert translator._extract_json_array('結果: ["a", "b"]', 3) is None
+
+    translator._translate_batch_with_provider = AsyncMock(return_value=None)
+    assert await translator.translate_many(["未知の文1", "", "未知の文2"], "en") == ["未知の文1", "", "未知の文2"]
+    translator._translate_batch_with_provider.assert_awaited_once_with(["未知の文1", "未知の文2"], "en")
+
+@pytest.mark.asyncio
+async def test_translate_many_deadline_falls_back_and_fills_cache(translator):
+    """期限までに翻訳できない場合は原文で返し、裏で継続した翻訳がキャッシュに保存されるテスト"""
+    import asyncio
+    release = asyncio.Event()
+
+    async def slow_batch(texts, target_lang):
+        await release.wait()
+        return [f"{text}-en" for text in texts]
+
+    translator._translate_batch_with_provider = slow_batch
+    assert await translator.translate_many(["未知の文"], "en", deadline=0.01) == ["未知の文"]
+    release.set()
+    while translator._background:
+        await asyncio.sleep(0.01)
+    assert await translator.translate_many(["未知の文"], "en", deadline=0.01) == ["未知の文-en"]
+
+@pytest.mark.asyncio
+async def test_aclose_waits_for_background_then_cancels(translator):
+    """終了時に継続中の翻訳を待ち、時間内に終わらない翻訳はキャンセルしてからストアを閉じるテスト"""
+    import asyncio
+
+    async def quick():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def stuck():
+        await asyncio.sleep(10)
+
+    assert await translator.gather_with_deadline([quick(), stuck()], deadline=0) == [None, None]
+    tasks = list(translator._background)
+    await translator.aclose(timeout=0.1)
+    assert [task.cancelled() for task in tasks].count(True) == 1
+    assert not translator._background
+
+@pytest.mark.asyncio
+async def test_provider_concurrency_is_limited(translator):
+    """AIプロバイダー毎の同時呼び出し数が上限を超えないテスト"""
+    import asyncio
+    active, peak = 0, 0
+
+    async def gemini(text, target_lang):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return f"{text}-en"
+
+    translator._translate_with_gemini = gemini
+    results = await translator.gather_with_deadline(
+        [translator._translate_with_provider(f"文{i}", "en") for i in range(6)]
+    )
+    assert results == [f"文{i}-en" for i in range(6)]
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_warnings_with_ai_generate_concurrently(translator):
+    """未対応言語の警報テキストを並行生成し、失敗した警報は日本語のみで返すテスト"""
+    from app.services.warning_service import WarningService
+
+    async def generate(warning_name_ja, target_lang, area_name=None, severity="medium"):
+        if area_name == "失敗地域":
+            raise RuntimeError("AI error")
+        return {"name": f"{warning_name_ja}-th", "description": "d", "action": "a"}
+
+    translator.generate_warning_text = generate
+    translator._translate_batch_with_provider = AsyncMock(return_value=["Area-th", None])
+    service = WarningService(translator=translator)
+    data = {"reportDatetime": "2024-01-01T00:00:00+09:00", "areaTypes": [{"areas": [
+        {"name": "未知地域", "warnings": [{"code": "03", "status": "発表"}, {"code": "10", "status": "発表"}]},
+        {"name": "失敗地域", "warnings": [{"code": "04", "status": "発表"}]},
+    ]}]}
+    alerts = await service._parse_warnings_with_ai(data, "130000", "th")
+    assert [a.title_translated for a in alerts] == ["大雨警報-th", "大雨注意報-th", None]
+    assert (alerts[2].title, alerts[2].description) == ("洪水警報", "失敗地域に洪水警報が発表されています。")
+    assert alerts[2].description_translated is None
+    assert [a.area for a in alerts] == ["Area-th", "Area-th", "失敗地域"]
+    translator._translate_batch_with_provider.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_translate_locations_composes_known_bases(translator):
+    """登録済みの地名 + 接尾辞の震源地名はAIを呼ばずに翻訳するテスト"""
+    translator._translate_batch_with_provider = AsyncMock(return_value=["Place A"])
+
+    result = await translator.translate_locations(["奈良県北部", "未知の地名A", "台湾付近"], "en")
+    assert result == ["Northern Nara Prefecture", "Place A", "Near Taiwan"]
+    translator._translate_batch_with_provider.assert_awaited_once_with(["未知の地名A"], "en")
+    stats = translator.get_location_stats()
+    assert (stats["exact"], stats["composed"], stats["unknown"]) == (1, 1, 1)
@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+from app.utils.upstream_cache import UpstreamCache, CachePolicy, CacheEntry
+
+pytestmark = pytest.mark.asyncio
+
+
+class Loader:
+    """呼び出し回数を記録するテスト用ローダー"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return {"version": self.calls}
+
+
+def make_cache(**policy):
+    return UpstreamCache(policies={"feed": CachePolicy(**policy)}, enabled=True)
+
+
+def age_entry(cache: UpstreamCache, key: str, seconds: float):
+    entry = cache.backend.get(key)
+    cache.backend.set(key, CacheEntry(value=entry.value, stored_at=entry.stored_at - seconds))
+
+
+async def test_fresh_hit_skips_upstream():
+    """TTL内はキャッシュから返すテスト"""
+    cache = make_cache(ttl=60)
+    loader = Loader()
+    first = await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    second = await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    assert first == second == {"version": 1}
+    assert loader.calls == 1
+    assert cache.stats["hits"] == 1
+
+
+async def test_params_are_part_of_key():
+    """パラメータ違いは別キーとして扱うテスト"""
+    cache = make_cache(ttl=60)
+    loader = Loader()
+    await cache.get_or_fetch("svc", "http://x/a", loader, params={"limit": 10}, feed="feed")
+    await cache.get_or_fetch("svc", "http://x/a", loader, params={"limit": 20}, feed="feed")
+    assert loader.calls == 2
+
+
+async def test_stale_while_revalidate():
+    """TTL切れ後は古い値を返しつつ裏で再取得するテスト"""
+    cache = make_cache(ttl=10, stale_while_revalidate=30)
+    loader = Loader()
+    await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    age_entry(cache, "svc:http://x/a", 15)
+
+    stale = await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    assert stale == {"version": 1}
+    await asyncio.gather(*cache._refreshing.values())
+    fresh = await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    assert fresh == {"version": 2}
+
+
+async def test_stale_if_error():
+    """上流エラー時に猶予内の古い値を返すテスト"""
+    cache = make_cache(ttl=10, stale_if_error=100)
+    loader = Loader()
+    await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    age_entry(cache, "svc:http://x/a", 50)
+    loader.fail = True
+    assert await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed") == {"version": 1}
+
+    age_entry(cache, "svc:http://x/a", 100)
+    with pytest.raises(ConnectionError):
+        await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+
+
+async def test_fresh_fetch_bypasses_cache_and_writes_back():
+    """freshの場合はTTL内・古い値を使わずに上流から取得し、キャッシュに書き戻すテスト"""
+    cache = make_cache(ttl=10, stale_while_revalidate=30, stale_if_error=600)
+    loader = Loader()
+    await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed")
+    assert await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed", fresh=True) == {"version": 2}
+    assert await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed") == {"version": 2}
+    assert loader.calls == 2
+
+    # 上流エラー時は古い値を返さずに失敗する
+    age_entry(cache, "svc:http://x/a", 15)
+    loader.fail = True
+    with pytest.raises(ConnectionError):
+        await cache.get_or_fetch("svc", "http://x/a", loader, feed="feed", fresh=True)
+    assert not cache._refreshing
+
+
+async def test_unknown_feed_is_not_cached():
+    """ポリシー未定義のフィードはキャッシュしないテスト"""
+    cache = make_cache(ttl=60)
+    loader = Loader()
+    await cache.get_or_fetch("svc", "http://x/a", loader, feed="other")
+    await cache.get_or_fetch("svc", "http://x/a", loader, feed="other")
+    assert loader.calls == 2
+
+
+async def test_concurrent_misses_are_coalesced():
+    """同時のキャッシュミスが1回の上流取得に集約されるテスト"""
+    cache = make_cache(ttl=60)
+    calls = 0
+
+    async def slow_loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"version": calls}
+
+    results = await asyncio.gather(*(
+        cache.get_or_fetch("svc", "http://x/a", slow_loader, feed="feed") for _ in range(50)
+    ))
+    assert calls == 1
+    assert all(r == {"version": 1} for r in results)
+    assert cache.get_stats()["coalesced"] == 49